@@ -121,6 +121,11 @@ basic_settings = {
             "description": "查看和管理程序日志文件",
             "pushbutton_name": "查看日志",
         },
+        "draw_telemetry": {
+            "name": "抽取耗时",
+            "description": "查看点名和抽奖各阶段的耗时，反馈“抽取很慢”时可复制报告",
+            "pushbutton_name": "查看耗时",
+        },
         "backup_manager": {
             "name": "备份管理",
             "description": "管理自动备份与手动备份",
@@ -482,6 +487,11 @@ basic_settings = {
             "description": "View and manage program log files",
             "pushbutton_name": "Viewer Log",
         },
+        "draw_telemetry": {
+            "name": "Draw timings",
+            "description": "View how long each stage of roll call and lottery draws takes, and copy a report when draws feel slow",
+            "pushbutton_name": "View timings",
+        },
         "backup_manager": {
             "name": "Backup manager",
             "description": "Manage automatic and manual backups",
@@ -920,6 +930,11 @@ basic_settings = {
             "description": "プログラムログファイルを表示・管理",
             "pushbutton_name": "ログを表示",
         },
+        "draw_telemetry": {
+            "name": "抽選の所要時間",
+            "description": "点呼と抽選の各段階の所要時間を表示し、抽選が遅いときはレポートをコピーできます",
+            "pushbutton_name": "所要時間を表示",
+        },
         "backup_manager": {
             "name": "バックアップ管理",
             "description": "自動バックアップと手動バックアップを管理",
@@ -0,0 +1,108 @@
+# 抽取耗时窗口语言配置
+draw_telemetry = {
+    "ZH_CN": {
+        "name": "抽取耗时",
+        "description": "查看本次运行中每次抽取各阶段的耗时",
+        "summary": "最近 {window} 次抽取的统计，每 {seconds} 秒刷新",
+        "empty": "还没有抽取记录，在点名或抽奖页面抽取后这里会显示各阶段的耗时",
+        "reset_button": "清空统计",
+        "copy_button": "复制报告",
+        "copy_success": "报告已复制到剪贴板",
+        "header_kind": "类型",
+        "header_stage": "阶段",
+        "header_count": "次数",
+        "header_last": "最近(ms)",
+        "header_p50": "p50(ms)",
+        "header_p95": "p95(ms)",
+        "header_max": "最大(ms)",
+        "header_blocks": "内存块 p50",
+        "kind_names": {"roll_call": "点名", "lottery": "抽奖"},
+        "stage_names": {
+            "draw": "抽取（合计）",
+            "candidates": "获取候选人",
+            "half_repeat": "半重复过滤",
+            "group": "小组抽取",
+            "subject": "课程信息",
+            "avg_gap": "平均间隔保护",
+            "weights": "计算权重",
+            "sample": "随机抽取",
+            "finish": "结束动画（合计）",
+            "finalize": "完成抽取",
+            "display": "显示结果",
+            "notification": "通知",
+            "voice": "语音播报",
+            "music": "音乐",
+            "save_history": "保存历史记录",
+        },
+    },
+    "EN_US": {
+        "name": "Draw timings",
+        "description": "View how long each stage of a draw took in this session",
+        "summary": "Statistics of the last {window} draws, refreshed every {seconds} s",
+        "empty": "No draws yet. Stage timings appear here after a draw on the roll call or lottery page",
+        "reset_button": "Clear statistics",
+        "copy_button": "Copy report",
+        "copy_success": "Report copied to the clipboard",
+        "header_kind": "Type",
+        "header_stage": "Stage",
+        "header_count": "Count",
+        "header_last": "Last (ms)",
+        "header_p50": "p50 (ms)",
+        "header_p95": "p95 (ms)",
+        "header_max": "Max (ms)",
+        "header_blocks": "Blocks p50",
+        "kind_names": {"roll_call": "Roll call", "lottery": "Lottery"},
+        "stage_names": {
+            "draw": "Draw (total)",
+            "candidates": "Candidates",
+            "half_repeat": "Repeat filter",
+            "group": "Group draw",
+            "subject": "Class info",
+            "avg_gap": "Average gap protection",
+            "weights": "Weights",
+            "sample": "Sampling",
+            "finish": "Finish animation (total)",
+            "finalize": "Finalize",
+            "display": "Display result",
+            "notification": "Notification",
+            "voice": "Voice",
+            "music": "Music",
+            "save_history": "Save history",
+        },
+    },
+    "JA_JP": {
+        "name": "抽選の所要時間",
+        "description": "今回の実行中の各抽選段階の所要時間を表示",
+        "summary": "直近 {window} 回の統計（{seconds} 秒ごとに更新）",
+        "empty": "まだ抽選記録がありません。点呼または抽選ページで抽選すると各段階の所要時間が表示されます",
+        "reset_button": "統計をクリア",
+        "copy_button": "レポートをコピー",
+        "copy_success": "レポートをクリップボードにコピーしました",
+        "header_kind": "種類",
+        "header_stage": "段階",
+        "header_count": "回数",
+        "header_last": "直近(ms)",
+        "header_p50": "p50(ms)",
+        "header_p95": "p95(ms)",
+        "header_max": "最大(ms)",
+        "header_blocks": "メモリブロック p50",
+        "kind_names": {"roll_call": "点呼", "lottery": "抽選"},
+        "stage_names": {
+            "draw": "抽選（合計）",
+            "candidates": "候補者の取得",
+            "half_repeat": "重複フィルター",
+            "group": "グループ抽選",
+            "subject": "授業情報",
+            "avg_gap": "平均間隔保護",
+            "weights": "重みの計算",
+            "sample": "ランダム抽出",
+            "finish": "アニメーション終了（合計）",
+            "finalize": "抽選の確定",
+            "display": "結果表示",
+            "notification": "通知",
+            "voice": "音声読み上げ",
+            "music": "音楽",
+            "save_history": "履歴の保存",
+        },
+    },
+}
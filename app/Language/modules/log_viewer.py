@@ -18,6 +18,7 @@ log_viewer = {
         "no_log_files": "没有找到日志文件",
         "load_failed": "加载失败: {}",
         "status": "文件: {} | 大小: {} 字节",
+        "status_indexing": "文件: {} | 大小: {} 字节 | 正在建立索引，先显示文件末尾...",
         "clear_confirm_title": "确认清空",
         "clear_confirm_content": "确定要清空当前日志文件吗？此操作不可恢复！",
         "yes_button": "确定",
@@ -49,6 +50,7 @@ log_viewer = {
         "no_log_files": "No log files found",
         "load_failed": "Load failed: {}",
         "status": "File: {} | Size: {} bytes",
+        "status_indexing": "File: {} | Size: {} bytes | Indexing, showing the end of the file...",
         "clear_confirm_title": "Confirm Clear",
         "clear_confirm_content": "Are you sure you want to clear the current log file? This action cannot be undone!",
         "clear_success": "Log file has been cleared",
@@ -78,6 +80,7 @@ log_viewer = {
         "no_log_files": "ログファイルが見つかりません",
         "load_failed": "読み込み失敗: {}",
         "status": "ファイル: {} | サイズ: {} バイト",
+        "status_indexing": "ファイル: {} | サイズ: {} バイト | インデックス作成中、ファイルの末尾を表示しています...",
         "clear_confirm_title": "クリア確認",
         "clear_confirm_content": "現在のログファイルをクリアしてもよろしいか？この操作は取り消せません！",
         "yes_button": "確定",
@@ -0,0 +1,69 @@
+# 批量抽奖窗口语言配置
+lottery_batch = {
+    "ZH_CN": {
+        "title": "批量抽奖",
+        "rounds_label": "抽取轮数:",
+        "per_round_label": "每轮抽取 {count} 个奖品（与抽奖页面的数量一致）",
+        "replay_label": "快速回放结果:",
+        "start_button": "开始批量抽取",
+        "export_button": "导出结果",
+        "header_round": "轮次",
+        "header_prize": "奖品",
+        "header_student": "学生",
+        "header_group": "小组",
+        "placeholder": "设置轮数后点击开始，所有轮次在一次事务中完成",
+        "summary": "已完成 {done}/{requested} 轮，共 {prizes} 个奖品，耗时 {ms} ms",
+        "stopped_reset_required": "奖品或学生已抽完，已提前停止，请在抽奖页面重置后继续",
+        "stopped_empty": "没有可抽取的奖品，已停止",
+        "stopped_error": "批量抽取失败，本次批量的记录已全部回滚",
+        "busy": "抽奖页面正在抽取或回放中，请稍后再试",
+        "export_caption": "保存批量抽奖结果",
+        "export_filter": "Excel 文件 (*.xlsx);;CSV 文件 (*.csv)",
+        "export_success": "已导出到: {path}",
+        "export_failed": "导出失败: {message}",
+    },
+    "EN_US": {
+        "title": "Batch draw",
+        "rounds_label": "Rounds:",
+        "per_round_label": "{count} prize(s) per round (same as the lottery page)",
+        "replay_label": "Fast replay:",
+        "start_button": "Start batch draw",
+        "export_button": "Export results",
+        "header_round": "Round",
+        "header_prize": "Prize",
+        "header_student": "Student",
+        "header_group": "Group",
+        "placeholder": "Set the rounds and click start; all rounds run in one transaction",
+        "summary": "Completed {done}/{requested} rounds, {prizes} prizes, {ms} ms",
+        "stopped_reset_required": "Prizes or students ran out, stopped early. Reset on the lottery page to continue",
+        "stopped_empty": "No prizes left to draw, stopped",
+        "stopped_error": "Batch draw failed, all records of this batch were rolled back",
+        "busy": "The lottery page is drawing or replaying, please try again later",
+        "export_caption": "Save batch draw results",
+        "export_filter": "Excel file (*.xlsx);;CSV file (*.csv)",
+        "export_success": "Exported to: {path}",
+        "export_failed": "Export failed: {message}",
+    },
+    "JA_JP": {
+        "title": "一括抽選",
+        "rounds_label": "抽選回数:",
+        "per_round_label": "1 回あたり {count} 個の賞品（抽選ページと同じ数）",
+        "replay_label": "結果を高速再生:",
+        "start_button": "一括抽選を開始",
+        "export_button": "結果をエクスポート",
+        "header_round": "回",
+        "header_prize": "賞品",
+        "header_student": "学生",
+        "header_group": "グループ",
+        "placeholder": "回数を設定して開始を押すと、すべての回を 1 つのトランザクションで実行します",
+        "summary": "{done}/{requested} 回完了、賞品 {prizes} 個、所要時間 {ms} ms",
+        "stopped_reset_required": "賞品または学生がなくなったため途中で停止しました。抽選ページでリセットしてください",
+        "stopped_empty": "抽選できる賞品がないため停止しました",
+        "stopped_error": "一括抽選に失敗しました。今回の記録はすべてロールバックされました",
+        "busy": "抽選ページが抽選中または再生中です。しばらくしてから再試行してください",
+        "export_caption": "一括抽選結果を保存",
+        "export_filter": "Excel ファイル (*.xlsx);;CSV ファイル (*.csv)",
+        "export_success": "エクスポート先: {path}",
+        "export_failed": "エクスポートに失敗しました: {message}",
+    },
+}
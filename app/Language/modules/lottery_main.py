@@ -17,6 +17,10 @@ lottery = {
             "description": "停止抽奖",
             "pushbutton_name": "停止",
         },
+        "batch_draw": {
+            "name": "批量抽取…",
+            "description": "打开批量抽奖窗口",
+        },
         "default_empty_item": {
             "name": "无名单",
             "description": "无名单时的默认选项",
@@ -69,6 +73,10 @@ lottery = {
             "description": "Stop lottery",
             "pushbutton_name": "Stop",
         },
+        "batch_draw": {
+            "name": "Batch draw…",
+            "description": "Open the batch draw window",
+        },
         "default_empty_item": {
             "name": "No list",
             "description": "Default options when no list is available",
@@ -121,6 +129,10 @@ lottery = {
             "description": "抽選を停止",
             "pushbutton_name": "停止",
         },
+        "batch_draw": {
+            "name": "一括抽選…",
+            "description": "一括抽選ウィンドウを開く",
+        },
         "default_empty_item": {
             "name": "リストなし",
             "description": "リストがない場合のデフォルトオプション",
@@ -36,11 +36,14 @@ URL和IPC混合体模块 - 跨平台通用实现
 from .url_ipc_handler import URLIPCHandler
 from .protocol_manager import ProtocolManager
 from .url_command_handler import URLCommandHandler
+from .event_stream import EventStreamClient, get_event_bus, publish_event
 from .security_verifier import (
     SecurityVerifier,
     SimplePasswordVerifier,
     DynamicPasswordVerifier,
     CompositeVerifier,
+    SessionTokenManager,
+    sign_session_request,
 )
 
 __version__ = "1.0.0"
@@ -51,10 +54,15 @@ __all__ = [
     "URLIPCHandler",
     "ProtocolManager",
     "URLCommandHandler",
+    "EventStreamClient",
+    "get_event_bus",
+    "publish_event",
     "SecurityVerifier",
     "SimplePasswordVerifier",
     "DynamicPasswordVerifier",
     "CompositeVerifier",
+    "SessionTokenManager",
+    "sign_session_request",
     "__version__",
     "__author__",
     "__description__",
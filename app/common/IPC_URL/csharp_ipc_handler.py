@@ -4,6 +4,7 @@ import threading
 from typing import Optional, Any, TypedDict
 from loguru import logger
 
+from app.tools.log_control import log_enabled, log_sampled
 from app.tools.path_utils import get_data_path
 
 CSHARP_AVAILABLE = False
@@ -158,7 +159,13 @@ if CSHARP_AVAILABLE:
                 display_duration = 5
 
             logger.debug(
-                f"发送通知到 ClassIsland: 班级={class_name}, 选中学生={selected_students}, 抽取数量={draw_count}, 显示时长={display_duration}, 设置组={settings_group}, 是否动画={is_animating}"
+                "发送通知到 ClassIsland: 班级={}, 选中学生={}, 抽取数量={}, 显示时长={}, 设置组={}, 是否动画={}",
+                class_name,
+                selected_students,
+                draw_count,
+                display_duration,
+                settings_group,
+                is_animating,
             )
 
             randomService = GeneratedIpcFactory.CreateIpcProxy[ISecRandomService](
@@ -170,7 +177,7 @@ if CSHARP_AVAILABLE:
             except Exception as e:
                 plugin_version = Version.Parse("0.0.0.1")
 
-            logger.debug(f"插件版本为 {plugin_version}")
+            logger.debug("插件版本为 {}", plugin_version)
             if plugin_version < Version.Parse("1.2.0.0"):
                 logger.warning("检测到旧版插件 (小于 1.2.0.0)，请尽快升级！")
 
@@ -208,7 +215,7 @@ if CSHARP_AVAILABLE:
             else:
                 notification_type = ResultType.Unknown
 
-            logger.debug(f"通知类型: {notification_type}")
+            logger.debug("通知类型: {}", notification_type)
 
             data = NotificationData()
             data.ResultType = notification_type
@@ -241,7 +248,9 @@ if CSHARP_AVAILABLE:
                 TimeState.AfterSchool,
             ]
             logger.debug(
-                f"获取到的 ClassIsland 时间状态: {lessonSc.CurrentState} 是否下课: {state}"
+                "获取到的 ClassIsland 时间状态: {} 是否下课: {}",
+                lessonSc.CurrentState,
+                state,
             )
             return state
 
@@ -275,7 +284,7 @@ if CSHARP_AVAILABLE:
                     self._last_on_class_left_log_time = current_time
 
                 if should_log and total_seconds != 0:
-                    logger.debug(f"获取到的距离上课剩余时间: {total_seconds} 秒")
+                    logger.debug("获取到的距离上课剩余时间: {} 秒", total_seconds)
 
                 return total_seconds
             except Exception as e:
@@ -400,9 +409,13 @@ if CSHARP_AVAILABLE:
                         self._last_known_subject_name = name
             except Exception:
                 pass
-            logger.debug(
-                f"上课 {lessonSc.CurrentSubject.Name} 时间: {lessonSc.CurrentTimeLayoutItem}"
-            )
+            # 读取这些属性都要经过一次 IPC 调用，不输出调试日志时跳过
+            if log_enabled("DEBUG"):
+                logger.debug(
+                    "上课 {} 时间: {}",
+                    lessonSc.CurrentSubject.Name,
+                    lessonSc.CurrentTimeLayoutItem,
+                )
 
         def _run_client(self):
             """运行 C# IPC 客户端"""
@@ -466,7 +479,10 @@ if CSHARP_AVAILABLE:
                 ](self.ipc_client.Provider, self.ipc_client.PeerProxy)
                 return lessonsService.IsTimerRunning
             except Exception as e:
-                logger.debug(e)
+                # 连接断开时每秒都会检查一次，只按间隔记录
+                log_sampled(
+                    "csharp_ipc.ci_alive", "DEBUG", "ClassIsland 连接检查失败: {}", e
+                )
                 return False
 
         def check_plugin_alive(self) -> bool:
@@ -0,0 +1,420 @@
+# ====================== 1. 事件总线 ======================
+# - IPCEvent                     - 一条事件（序号、类型、时间、数据）
+# - EventSubscriber              - 订阅者：有界缓冲，写不出去时丢弃最早的事件并计数
+# - EventBus                     - 进程内事件总线，发布不阻塞、没有订阅者时几乎无开销
+
+# ====================== 2. 全局总线 ======================
+# - get_event_bus()              - 获取全局事件总线
+# - publish_event()              - 向全局总线发布事件
+# - publish_setting_changed()    - 发布设置变更事件（敏感分组不附带取值）
+# - result_entries()             - 把抽取结果转换为可序列化的列表
+
+# ====================== 3. IPC 推送 ======================
+# - serve_subscription()         - 在连接线程中把订阅者的事件逐行写出，直到断开
+# - EventStreamClient            - 订阅端：连接 IPC 服务器并逐条读取事件
+
+# ==================================================
+# 导入模块
+# ==================================================
+import json
+import os
+import socket
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from multiprocessing.connection import Client
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from loguru import logger
+
+from app.tools.variable import (
+    IPC_EVENT_BUFFER_DEFAULT,
+    IPC_EVENT_BUFFER_MAX,
+    IPC_EVENT_HEARTBEAT_S,
+    IPC_EVENT_IGNORED_SETTING_GROUPS,
+    IPC_EVENT_MAX_SUBSCRIBERS,
+    IPC_EVENT_REDACTED_SETTING_GROUPS,
+)
+
+# 事件类型
+EVENT_DRAW_STARTED = "draw_started"  # 开始抽取（点名 / 抽奖 / 闪抽）
+EVENT_DRAW_FINISHED = "draw_finished"  # 抽取完成，附带最终结果
+EVENT_LIST_CHANGED = "list_changed"  # 名单或奖池文件发生变化
+EVENT_SETTING_CHANGED = "setting_changed"  # 设置项被修改
+EVENT_TYPES = (
+    EVENT_DRAW_STARTED,
+    EVENT_DRAW_FINISHED,
+    EVENT_LIST_CHANGED,
+    EVENT_SETTING_CHANGED,
+)
+
+
+# ==================================================
+# 事件总线
+# ==================================================
+@dataclass(slots=True)
+class IPCEvent:
+    """一条事件，序列化结果在首次写出时生成并在各订阅者之间共用"""
+
+    seq: int
+    name: str
+    data: Dict[str, Any]
+    ts: float = field(default_factory=time.time)
+    _line: Optional[bytes] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": "event",
+            "event": self.name,
+            "seq": self.seq,
+            "ts": self.ts,
+            "data": self.data,
+        }
+
+    def encoded(self) -> bytes:
+        line = self._line
+        if line is None:
+            line = _encode_line(self.to_dict())
+            self._line = line
+        return line
+
+
+class EventSubscriber:
+    """事件订阅者
+
+    发布方只往缓冲里追加，永远不会被订阅者拖慢；缓冲满时丢弃最早的事件，
+    丢弃数量在下一次取事件时一并返回，由推送方通知订阅端。
+    """
+
+    def __init__(
+        self,
+        events: Optional[Iterable[str]] = None,
+        capacity: int = IPC_EVENT_BUFFER_DEFAULT,
+    ):
+        """
+        Args:
+            events: 订阅的事件类型，None 表示全部
+            capacity: 缓冲的事件数，超过 IPC_EVENT_BUFFER_MAX 时按上限处理
+        """
+        self.events = frozenset(events) if events else None
+        self.capacity = max(1, min(int(capacity), IPC_EVENT_BUFFER_MAX))
+        self._buffer: deque = deque()
+        self._cond = threading.Condition()
+        self._pending_dropped = 0
+        self.dropped = 0
+        self.delivered = 0
+        self.closed = False
+
+    def wants(self, name: str) -> bool:
+        return self.events is None or name in self.events
+
+    def offer(self, event: IPCEvent) -> None:
+        """追加一条事件（不阻塞）"""
+        with self._cond:
+            if self.closed:
+                return
+            if len(self._buffer) >= self.capacity:
+                self._buffer.popleft()
+                self._pending_dropped += 1
+                self.dropped += 1
+            self._buffer.append(event)
+            self._cond.notify()
+
+    def take(
+        self, timeout: Optional[float] = None, max_items: int = 64
+    ) -> tuple[List[IPCEvent], int]:
+        """取出缓冲中的事件，没有事件时最多等待 timeout 秒
+
+        Returns:
+            (事件列表, 自上次取出以来丢弃的事件数)
+        """
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._buffer or self._pending_dropped or self.closed,
+                timeout=timeout,
+            )
+            count = min(len(self._buffer), max_items)
+            events = [self._buffer.popleft() for _ in range(count)]
+            dropped, self._pending_dropped = self._pending_dropped, 0
+            self.delivered += count
+            return events, dropped
+
+    def close(self) -> None:
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "buffered": len(self._buffer),
+                "capacity": self.capacity,
+                "delivered": self.delivered,
+                "dropped": self.dropped,
+            }
+
+
+class EventBus:
+    """进程内事件总线"""
+
+    def __init__(self, max_subscribers: int = IPC_EVENT_MAX_SUBSCRIBERS):
+        self._max_subscribers = max(1, int(max_subscribers))
+        self._lock = threading.Lock()
+        self._subscribers: tuple = ()
+        self._seq = 0
+        self._stats: Counter = Counter()
+
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(
+        self,
+        events: Optional[Iterable[str]] = None,
+        capacity: int = IPC_EVENT_BUFFER_DEFAULT,
+    ) -> Optional[EventSubscriber]:
+        """添加订阅者，已达上限时返回 None"""
+        subscriber = EventSubscriber(events, capacity)
+        with self._lock:
+            if len(self._subscribers) >= self._max_subscribers:
+                self._stats["rejected"] += 1
+                return None
+            self._subscribers = self._subscribers + (subscriber,)
+        logger.debug(f"新增事件订阅者，当前 {len(self._subscribers)} 个")
+        return subscriber
+
+    def unsubscribe(self, subscriber: EventSubscriber) -> None:
+        subscriber.close()
+        with self._lock:
+            if subscriber not in self._subscribers:
+                return
+            self._subscribers = tuple(
+                s for s in self._subscribers if s is not subscriber
+            )
+            self._stats["dropped"] += subscriber.dropped
+        logger.debug(
+            f"事件订阅者已断开（送达 {subscriber.delivered} 条，"
+            f"丢弃 {subscriber.dropped} 条）"
+        )
+
+    def publish(self, name: str, data: Any = None) -> Optional[IPCEvent]:
+        """发布事件
+
+        Args:
+            name: 事件类型
+            data: 事件数据，可以是返回数据的函数（只在有订阅者时调用）
+
+        Returns:
+            发布的事件，没有订阅者时返回 None
+        """
+        subscribers = self._subscribers
+        if not subscribers:
+            return None
+        targets = [s for s in subscribers if s.wants(name)]
+        if not targets:
+            return None
+        if callable(data):
+            data = data()
+        with self._lock:
+            self._seq += 1
+            event = IPCEvent(self._seq, name, data or {})
+            self._stats["published"] += 1
+        for subscriber in targets:
+            subscriber.offer(event)
+        return event
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            subscribers = self._subscribers
+        stats["subscribers"] = [s.get_stats() for s in subscribers]
+        return stats
+
+
+# ==================================================
+# 全局总线
+# ==================================================
+_event_bus = EventBus()
+
+
+def get_event_bus() -> EventBus:
+    """获取全局事件总线"""
+    return _event_bus
+
+
+def publish_event(name: str, data: Any = None) -> None:
+    """向全局事件总线发布事件，出错时只记录日志，不影响调用方"""
+    if not _event_bus.has_subscribers():
+        return
+    try:
+        _event_bus.publish(name, data)
+    except Exception as e:
+        logger.exception(f"发布事件失败: {name}, 错误: {e}")
+
+
+def publish_setting_changed(first_level_key: str, second_level_key: str, value: Any):
+    """发布设置变更事件，敏感分组只通知键名，不附带取值"""
+    if first_level_key in IPC_EVENT_IGNORED_SETTING_GROUPS:
+        return
+
+    def build() -> Dict[str, Any]:
+        data: Dict[str, Any] = {"group": first_level_key, "key": second_level_key}
+        if first_level_key in IPC_EVENT_REDACTED_SETTING_GROUPS:
+            data["redacted"] = True
+        else:
+            data["value"] = value
+        return data
+
+    publish_event(EVENT_SETTING_CHANGED, build)
+
+
+def result_entries(items: Any) -> List[Dict[str, Any]]:
+    """把抽取结果转换为可序列化的列表
+
+    支持 (id, 名称, 是否存在) 形式的元组和字典（只保留简单类型的字段）。
+    """
+    entries: List[Dict[str, Any]] = []
+    for item in items or []:
+        if isinstance(item, dict):
+            entries.append(
+                {
+                    key: value
+                    for key, value in item.items()
+                    if isinstance(value, (str, int, float, bool, type(None)))
+                }
+            )
+        elif isinstance(item, (list, tuple)) and len(item) >= 2:
+            entries.append(
+                {
+                    "id": item[0],
+                    "name": item[1],
+                    "exists": bool(item[2]) if len(item) > 2 else True,
+                }
+            )
+        else:
+            entries.append({"name": str(item)})
+    return entries
+
+
+# ==================================================
+# IPC 推送
+# ==================================================
+def _encode_line(message: Dict[str, Any]) -> bytes:
+    return json.dumps(message, ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+
+
+def serve_subscription(
+    subscriber: EventSubscriber,
+    write: Callable[[bytes], None],
+    bus: Optional[EventBus] = None,
+    heartbeat_s: float = IPC_EVENT_HEARTBEAT_S,
+) -> None:
+    """把订阅者的事件逐行写出，直到订阅者关闭或写入失败
+
+    写入在连接线程中进行，对端读得慢时 write 会阻塞，期间新事件在订阅者缓冲中排队，
+    缓冲满后丢弃最早的事件，并在恢复写出前发送一条 dropped 消息说明丢弃了多少条。
+    没有事件时按 heartbeat_s 发送心跳，以便及时发现已断开的订阅端。
+    """
+    bus = bus or _event_bus
+    try:
+        while True:
+            events, dropped = subscriber.take(timeout=heartbeat_s)
+            if subscriber.closed and not events:
+                break
+            if dropped:
+                notice = {"type": "dropped", "count": dropped}
+                notice["total"] = subscriber.dropped
+                write(_encode_line(notice))
+            for event in events:
+                write(event.encoded())
+            if not events and not dropped:
+                write(_encode_line({"type": "heartbeat", "ts": time.time()}))
+    except (OSError, EOFError, ValueError) as e:
+        logger.debug(f"事件订阅连接已断开: {e}")
+    finally:
+        bus.unsubscribe(subscriber)
+
+
+class EventStreamClient:
+    """事件订阅端
+
+    连接 IPC 服务器并发送 subscribe 请求，之后逐条读取服务器推送的消息。
+    可以直接迭代得到事件（心跳消息会被跳过），用完后调用 close()。
+    """
+
+    def __init__(self, address: str, family: str, timeout: Optional[float] = None):
+        """
+        Args:
+            address: IPC 地址
+            family: 地址类型（AF_UNIX / AF_PIPE）
+            timeout: 读取超时（秒），None 表示一直等待
+        """
+        self._conn = None
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+        if os.name == "nt":
+            self._conn = Client(address=address, family=family, authkey=None)
+        else:
+            if family != "AF_UNIX":
+                raise RuntimeError(f"不支持的IPC family: {family}")
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(timeout)
+            self._sock.connect(address)
+            self._reader = self._sock.makefile("rb")
+
+    def subscribe(
+        self,
+        events: Optional[Iterable[str]] = None,
+        buffer: Optional[int] = None,
+        verification: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """发送订阅请求并返回服务器的确认消息"""
+        payload: Dict[str, Any] = {}
+        if events:
+            payload["events"] = list(events)
+        if buffer:
+            payload["buffer"] = int(buffer)
+        if verification:
+            payload["verification"] = verification
+        line = _encode_line({"type": "subscribe", "payload": payload})
+        if self._conn is not None:
+            self._conn.send_bytes(line)
+        else:
+            self._sock.sendall(line)
+        return self.read() or {"success": False, "error": "连接已关闭"}
+
+    def read(self) -> Optional[Dict[str, Any]]:
+        """读取一条消息，连接关闭时返回 None"""
+        if self._conn is not None:
+            try:
+                data = self._conn.recv_bytes()
+            except EOFError:
+                return None
+        else:
+            data = self._reader.readline()
+        if not data:
+            return None
+        return json.loads(data.decode("utf-8").strip())
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        while True:
+            message = self.read()
+            if message is None:
+                return
+            if message.get("type") != "heartbeat":
+                yield message
+
+    def close(self) -> None:
+        for closer in (self._reader, self._sock, self._conn):
+            if closer is None:
+                continue
+            try:
+                closer.close()
+            except Exception:
+                pass
+
+    def __enter__(self) -> "EventStreamClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -3,11 +3,90 @@
 # ==================================================
 import hashlib
 import hmac
+import json
+import secrets
+import threading
 import time
-from typing import Dict, Any
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Optional, Tuple
 from loguru import logger
 from PySide6.QtCore import QObject, Signal
 
+from app.tools.variable import (
+    IPC_SESSION_CLOCK_SKEW_S,
+    IPC_SESSION_IDLE_S,
+    IPC_SESSION_MAX_COUNT,
+    IPC_SESSION_TTL_S,
+    KDF_CACHE_IDLE_S,
+    KDF_CACHE_MAX_ENTRIES,
+)
+
+
+# ==================================================
+# 派生密钥缓存
+# ==================================================
+class DerivedKeyCache:
+    """PBKDF2 派生密钥的内存缓存
+
+    同一 (密钥, 盐值) 只需派生一次，之后的验证只需计算一次 HMAC 指纹。
+
+    安全特性：
+    - 仅保存在内存中，从不写入磁盘或日志；
+    - 缓存键是以进程内随机密钥计算的 HMAC-SHA256 指纹，不保存原始密钥，
+      也无法在进程外用指纹做离线猜测；
+    - 条目数量有上限（LRU），空闲超过 idle_s 秒自动失效；
+    - 新的猜测仍需完整的 PBKDF2 计算，缓存不会降低暴力破解的成本。
+    """
+
+    def __init__(
+        self,
+        max_entries: int = KDF_CACHE_MAX_ENTRIES,
+        idle_s: float = KDF_CACHE_IDLE_S,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._max_entries = max(0, int(max_entries))
+        self._idle_s = max(0.0, float(idle_s))
+        self._clock = clock
+        self._pepper = secrets.token_bytes(32)
+        self._entries: "OrderedDict[bytes, Tuple[bytes, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fingerprint(self, secret: str, salt: bytes) -> bytes:
+        """计算 (密钥, 盐值) 的缓存指纹"""
+        material = len(salt).to_bytes(4, "big") + salt + secret.encode()
+        return hmac.new(self._pepper, material, hashlib.sha256).digest()
+
+    def get(self, fingerprint: bytes) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                return None
+            derived, last_used = entry
+            now = self._clock()
+            if now - last_used > self._idle_s:
+                del self._entries[fingerprint]
+                return None
+            self._entries[fingerprint] = (derived, now)
+            self._entries.move_to_end(fingerprint)
+            return derived
+
+    def put(self, fingerprint: bytes, derived: bytes) -> None:
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[fingerprint] = (derived, self._clock())
+            self._entries.move_to_end(fingerprint)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
 
 # ==================================================
 # 密钥派生函数 (KDF) - 密钥强化
@@ -15,7 +94,8 @@ from PySide6.QtCore import QObject, Signal
 class KeyDerivation:
     """密钥派生函数，使用PBKDF2进行密钥强化
 
-    防止弱密钥和暴力破解攻击
+    防止弱密钥和暴力破解攻击。派生结果缓存在 DerivedKeyCache 中，
+    密钥变更时调用 invalidate_cache() 清空。
     """
 
     # PBKDF2 参数
@@ -23,6 +103,8 @@ class KeyDerivation:
     PBKDF2_SALT = b"SecRandom_KDF_SALT_V1"  # 固定盐值（用于确定性派生）
     PBKDF2_HASH_NAME = "sha512"
 
+    _cache = DerivedKeyCache()
+
     @classmethod
     def derive_key(cls, secret: str, salt: bytes = None) -> bytes:
         """使用PBKDF2进行密钥派生
@@ -39,14 +121,25 @@ class KeyDerivation:
 
         salt = salt or cls.PBKDF2_SALT
 
+        fingerprint = cls._cache.fingerprint(secret, salt)
+        derived = cls._cache.get(fingerprint)
+        if derived is not None:
+            return derived
+
         # 使用PBKDF2进行密钥派生
         # PBKDF2应用多次哈希和盐化来强化弱密钥
         derived = hashlib.pbkdf2_hmac(
             cls.PBKDF2_HASH_NAME, secret.encode(), salt, cls.PBKDF2_ITERATIONS
         )
+        cls._cache.put(fingerprint, derived)
 
         return derived
 
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        """清空派生密钥缓存（密钥或密码变更时调用）"""
+        cls._cache.clear()
+
     @classmethod
     def derive_key_hex(cls, secret: str, salt: bytes = None) -> str:
         """获取十六进制格式的派生密钥
@@ -73,6 +166,7 @@ class SecurityVerifier(QObject):
     - 时间窗口验证
     - 尝试次数限制
     - 验证记录
+    - 会话令牌（验证通过后签发，后续请求只需 HMAC 验证）
     """
 
     verificationRequested = Signal(str, dict)  # 验证请求信号
@@ -83,6 +177,7 @@ class SecurityVerifier(QObject):
         self.max_attempts = 3
         self.attempt_window = 300  # 5分钟
         self.verification_history = {}
+        self.sessions = SessionTokenManager()
 
     def verify(self, verification_data: Dict[str, Any]) -> bool:
         """执行验证
@@ -325,6 +420,10 @@ class SimplePasswordVerifier(SecurityVerifier):
             # 明文密码，直接作为 KDF 的输入
             kdf_input = original_password
 
+        # 旧密码的派生结果和已签发的会话都不能再被复用
+        KeyDerivation.invalidate_cache()
+        self.sessions.revoke_all()
+
         # 始终通过 KDF 强化后再存储，避免存储裸 SHA-512 哈希
         derived = KeyDerivation.derive_key(kdf_input)
         self.hashed_password = derived.hex()
@@ -371,7 +470,7 @@ class DynamicPasswordVerifier(SecurityVerifier):
             expected_password = self._generate_password(
                 current_time + time_offset * self.time_window
             )
-            if password == expected_password:
+            if hmac.compare_digest(str(password), expected_password):
                 logger.info("动态密码验证成功")
                 return True
 
@@ -410,7 +509,9 @@ class DynamicPasswordVerifier(SecurityVerifier):
             logger.warning("秘密密钥不能为空")
             return
 
-        # 重新派生密钥
+        # 重新派生密钥，旧密钥的派生结果和已签发的会话都不能再被复用
+        KeyDerivation.invalidate_cache()
+        self.sessions.revoke_all()
         self.derived_key = KeyDerivation.derive_key(new_secret)
         logger.info("动态密码密钥已更新并使用PBKDF2进行强化")
 
@@ -467,6 +568,187 @@ class CompositeVerifier(SecurityVerifier):
         logger.info(f"组合验证模式已更新: {'全部通过' if require_all else '任一通过'}")
 
 
+# ==================================================
+# 会话令牌
+# ==================================================
+def canonical_session_content(content: Any) -> bytes:
+    """把请求内容序列化为参与签名的字节串（字典按键排序）"""
+    if isinstance(content, bytes):
+        return content
+    if isinstance(content, str):
+        return content.encode("utf-8")
+    return json.dumps(
+        content, ensure_ascii=False, sort_keys=True, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _session_mac(
+    key: bytes, session_id: str, timestamp: int, nonce: str, content: Any
+) -> str:
+    header = f"{session_id}\n{int(timestamp)}\n{nonce}\n".encode("utf-8")
+    return hmac.new(
+        key, header + canonical_session_content(content), hashlib.sha256
+    ).hexdigest()
+
+
+def sign_session_request(
+    session: Dict[str, Any],
+    content: Any,
+    timestamp: Optional[int] = None,
+    nonce: Optional[str] = None,
+) -> Dict[str, Any]:
+    """客户端使用会话令牌为请求签名
+
+    Args:
+        session: 验证通过后服务端返回的会话信息（session_id、session_key）
+        content: 请求内容（URL 字符串或消息负载）
+        timestamp: 请求时间戳（秒），默认为当前时间
+        nonce: 一次性随机数，默认自动生成
+
+    Returns:
+        dict: 放入 verification 字段的会话验证数据
+    """
+    session_id = str(session["session_id"])
+    key = bytes.fromhex(session["session_key"])
+    timestamp = int(time.time()) if timestamp is None else int(timestamp)
+    nonce = nonce or secrets.token_hex(12)
+    return {
+        "session": session_id,
+        "timestamp": timestamp,
+        "nonce": nonce,
+        "mac": _session_mac(key, session_id, timestamp, nonce, content),
+    }
+
+
+class SessionTokenManager:
+    """IPC 会话令牌
+
+    一次密码验证通过后签发会话令牌，同一客户端之后的命令只需附带
+    HMAC-SHA256(会话密钥, 会话ID + 时间戳 + 一次性随机数 + 请求内容)，
+    验证只需一次 HMAC 计算，不再经过 PBKDF2。
+
+    安全特性：
+    - 会话密钥为 256 位随机数，仅在签发时通过本机 IPC 通道返回一次
+      （与密码走同一通道），服务端只保存在内存中；
+    - 签名覆盖请求内容，篡改内容或替换会话 ID 都会导致验证失败；
+    - 时间戳偏差超过 clock_skew_s 的请求被拒绝，窗口内已使用的随机数
+      被记录，重放同一请求会被拒绝；
+    - 会话有最长有效期和空闲失效时间，数量有上限，
+      密码或密钥变更时应调用 revoke_all() 吊销全部会话；
+    - 使用 hmac.compare_digest() 进行恒定时间比较。
+    """
+
+    def __init__(
+        self,
+        ttl_s: float = IPC_SESSION_TTL_S,
+        idle_s: float = IPC_SESSION_IDLE_S,
+        max_sessions: int = IPC_SESSION_MAX_COUNT,
+        clock_skew_s: float = IPC_SESSION_CLOCK_SKEW_S,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._ttl_s = max(1.0, float(ttl_s))
+        self._idle_s = max(1.0, float(idle_s))
+        self._max_sessions = max(1, int(max_sessions))
+        self._clock_skew_s = max(1.0, float(clock_skew_s))
+        self._clock = clock
+        self._sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def issue(self) -> Dict[str, Any]:
+        """签发新的会话令牌
+
+        Returns:
+            dict: 返回给客户端的会话信息（session_id、session_key、expires_at）
+        """
+        now = self._clock()
+        session_id = secrets.token_urlsafe(16)
+        key = secrets.token_bytes(32)
+        with self._lock:
+            self._sessions[session_id] = {
+                "key": key,
+                "expires_at": now + self._ttl_s,
+                "last_used": now,
+                "nonces": {},
+            }
+            while len(self._sessions) > self._max_sessions:
+                self._sessions.popitem(last=False)
+        return {
+            "session_id": session_id,
+            "session_key": key.hex(),
+            "expires_at": int(now + self._ttl_s),
+        }
+
+    def verify(self, verification: Dict[str, Any], content: Any) -> bool:
+        """验证会话签名
+
+        Args:
+            verification: 客户端附带的会话验证数据（sign_session_request 的返回值）
+            content: 请求内容，与签名时一致
+
+        Returns:
+            验证是否通过
+        """
+        try:
+            session_id = str(verification.get("session", ""))
+            timestamp = int(verification.get("timestamp"))
+            nonce = str(verification.get("nonce", ""))
+            mac = str(verification.get("mac", ""))
+        except (TypeError, ValueError):
+            return False
+        if not session_id or not nonce or not mac:
+            return False
+
+        now = self._clock()
+        if abs(now - timestamp) > self._clock_skew_s:
+            logger.warning("会话请求时间戳超出允许范围")
+            return False
+
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return False
+            idle = now - session["last_used"]
+            if now >= session["expires_at"] or idle > self._idle_s:
+                del self._sessions[session_id]
+                logger.debug("会话令牌已过期")
+                return False
+            key = session["key"]
+
+        expected = _session_mac(key, session_id, timestamp, nonce, content)
+        if not hmac.compare_digest(expected, mac):
+            logger.warning("会话签名验证失败")
+            return False
+
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return False
+            nonces = session["nonces"]
+            if nonce in nonces:
+                logger.warning("检测到重放的会话请求")
+                return False
+            # 只需记住时间窗口内的随机数，超出窗口的请求已被时间戳检查拒绝
+            horizon = now - 2 * self._clock_skew_s
+            for old_nonce in [n for n, t in nonces.items() if t < horizon]:
+                del nonces[old_nonce]
+            nonces[nonce] = now
+            session["last_used"] = now
+        return True
+
+    def revoke(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def revoke_all(self) -> None:
+        """吊销全部会话（密码或密钥变更时调用）"""
+        with self._lock:
+            self._sessions.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+
 # ==================================================
 # 验证器工厂
 # ==================================================
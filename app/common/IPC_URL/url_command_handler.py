@@ -1,11 +1,32 @@
 # ==================================================
 # URL和IPC命令处理器
 # ==================================================
+import threading
+import time
+from dataclasses import dataclass, field
 from typing import Dict, Any, Optional, Callable, List
 from loguru import logger
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import QCoreApplication, QObject, QThread, Qt, Signal
 from urllib.parse import urlparse
 
+from app.tools.variable import IPC_BATCH_MAX_COMMANDS, IPC_BATCH_TIMEOUT_S
+
+
+# ==================================================
+# 批量命令任务
+# ==================================================
+@dataclass(slots=True)
+class _BatchJob:
+    """一次批量命令请求，在 IPC 连接线程与主线程之间传递"""
+
+    commands: List[Any]
+    atomic: bool = False
+    stop_on_error: bool = False
+    state: str = "pending"  # pending / running / cancelled
+    result: Optional[Dict[str, Any]] = None
+    done: threading.Event = field(default_factory=threading.Event)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
 
 # ==================================================
 # 命令处理器类
@@ -18,6 +39,7 @@ class URLCommandHandler(QObject):
     - 切换主界面页面
     - 执行托盘功能
     - 安全验证
+    - 批量命令（一次请求按顺序执行多条命令）
     """
 
     # 信号定义
@@ -30,14 +52,23 @@ class URLCommandHandler(QObject):
     windowActionRequested = Signal(
         str, object
     )  # 窗口显示隐藏请求（主窗口/设置窗口/浮窗）
+    _batchRequested = Signal(object)  # 内部：把批量命令转交到处理器所在（主）线程
+
+    _RESOLVED_CACHE_LIMIT = 256  # 命令解析缓存的最大条目数
 
     def __init__(self, main_window=None):
         super().__init__()
         self.main_window = main_window
         self.security_verifier = None
         self.secure_commands: List[str] = []
+        # 命令名 -> 解析后的命令名（含模糊匹配结果），注册/注销命令时清空
+        self._resolved_commands: Dict[str, Optional[str]] = {}
+        # 原子批处理期间暂存的控制信号（按线程区分，只暂存执行批处理的线程发出的信号），
+        # deferred 为 None 表示直接发出
+        self._emit_state = threading.local()
+        self._batchRequested.connect(self._run_batch_job, Qt.QueuedConnection)
 
-        logger.debug(f"初始化URLCommandHandler - main_window: {main_window}")
+        logger.debug("初始化URLCommandHandler - main_window: {}", main_window)
 
         # 定义所有支持的命令映射
         self.command_map = {
@@ -118,22 +149,22 @@ class URLCommandHandler(QObject):
         Returns:
             处理结果字典
         """
-        logger.debug(f"处理URL命令: {url}")
+        logger.debug("处理URL命令: {}", url)
         try:
-            logger.debug(f"收到URL命令: {url}")
+            logger.debug("收到URL命令: {}", url)
 
             # 解析URL
             command, params = self._parse_url(url)
-            logger.debug(f"解析URL命令 - 命令: {command}, 参数: {params}")
+            logger.debug("解析URL命令 - 命令: {}, 参数: {}", command, params)
 
             # 检查是否需要验证
             if require_verification and self._requires_verification(command):
-                logger.debug(f"命令需要验证: {command}")
+                logger.debug("命令需要验证: {}", command)
                 return self._request_verification(command, params)
 
             # 执行命令
             result = self._execute_command(command, params)
-            logger.debug(f"URL命令执行成功: {command}, 结果: {result}")
+            logger.debug("URL命令执行成功: {}, 结果: {}", command, result)
             return result
 
         except Exception as e:
@@ -157,7 +188,7 @@ class URLCommandHandler(QObject):
             command_type = message.get("type", "")
             payload = message.get("payload", {})
 
-            logger.debug(f"收到IPC命令: {command_type}")
+            logger.debug("收到IPC命令: {}", command_type)
 
             if command_type == "url":
                 url = payload.get("url", "")
@@ -174,6 +205,13 @@ class URLCommandHandler(QObject):
 
                 return self._execute_command(command, params)
 
+            elif command_type == "batch":
+                return self.handle_batch(
+                    payload.get("commands", []),
+                    atomic=bool(payload.get("atomic", False)),
+                    stop_on_error=bool(payload.get("stop_on_error", False)),
+                )
+
             else:
                 return {
                     "status": "error",
@@ -184,6 +222,169 @@ class URLCommandHandler(QObject):
             logger.exception(f"IPC命令处理失败: {e}")
             return {"status": "error", "message": f"IPC命令处理失败: {str(e)}"}
 
+    # ==================================================
+    # 批量命令
+    # ==================================================
+
+    def handle_batch(
+        self,
+        commands: List[Any],
+        atomic: bool = False,
+        stop_on_error: bool = False,
+    ) -> Dict[str, Any]:
+        """按顺序执行一批命令，返回每条命令的结果
+
+        整批命令在处理器所在的主线程中一次执行完（从 IPC 连接线程调用时只转交一次），
+        各命令发出的控制信号保持顺序，中间不会插入其他请求。
+        批量请求不会弹出验证窗口，也不接受跳过验证的参数，
+        需要安全验证的命令一律直接判定失败。
+
+        Args:
+            commands: 命令列表，每项为 URL 字符串、{"url": ...}，
+                或 {"command": ..., "params": {...}, "query": {...}}
+            atomic: 全部成功才生效。执行期间的控制信号先暂存，任一命令失败则
+                全部丢弃且不再执行后续命令；数据读取命令读到的是本批生效前的状态
+            stop_on_error: 非原子模式下遇到失败的命令后不再执行后续命令
+
+        Returns:
+            批量处理结果字典，results 按顺序对应已执行的命令
+        """
+        if not isinstance(commands, (list, tuple)) or not commands:
+            return {"status": "error", "message": "批量命令列表为空或格式错误"}
+        if len(commands) > IPC_BATCH_MAX_COMMANDS:
+            return {
+                "status": "error",
+                "message": f"批量命令数量超过上限: {IPC_BATCH_MAX_COMMANDS}",
+            }
+
+        job = _BatchJob(
+            commands=list(commands),
+            atomic=bool(atomic),
+            stop_on_error=bool(stop_on_error),
+        )
+        app = QCoreApplication.instance()
+        if app is None or QThread.currentThread() == self.thread():
+            self._run_batch_job(job)
+            return job.result
+
+        self._batchRequested.emit(job)
+        if not job.done.wait(IPC_BATCH_TIMEOUT_S):
+            with job.lock:
+                if job.state == "pending":
+                    # 主线程迟迟没有处理，整批取消，之后也不会再执行
+                    job.state = "cancelled"
+                    logger.warning(f"批量命令等待主线程超时，已取消 {len(commands)} 条")
+                    return {
+                        "status": "error",
+                        "message": "等待主线程执行超时，批量命令已取消",
+                        "applied": False,
+                    }
+            job.done.wait()
+        return job.result
+
+    def _run_batch_job(self, job: "_BatchJob") -> None:
+        """在主线程中执行批量命令（_batchRequested 的槽）"""
+        with job.lock:
+            if job.state != "pending":
+                return
+            job.state = "running"
+        try:
+            job.result = self._run_batch(job)
+        except Exception as e:
+            logger.exception(f"批量命令处理失败: {e}")
+            job.result = {"status": "error", "message": f"批量命令处理失败: {str(e)}"}
+        finally:
+            job.done.set()
+
+    def _run_batch(self, job: "_BatchJob") -> Dict[str, Any]:
+        start = time.perf_counter()
+        results: List[Dict[str, Any]] = []
+        failed = False
+        deferred: List[tuple] = []
+        if job.atomic:
+            self._emit_state.deferred = deferred
+        try:
+            for index, item in enumerate(job.commands):
+                command, params, result = self._normalize_batch_item(item)
+                if result is None:
+                    if self._requires_verification(command):
+                        op, _ = self._get_op_and_switch(command)
+                        result = {
+                            "status": "error",
+                            "message": "此命令需要安全验证，不能在批量请求中执行",
+                            "requires_verification": True,
+                            "operation_type": op,
+                        }
+                    else:
+                        result = self._execute_command(command, params)
+                ok = self._is_success_result(result)
+                results.append(
+                    {"index": index, "command": command, "ok": ok, "result": result}
+                )
+                if not ok:
+                    failed = True
+                    if job.atomic or job.stop_on_error:
+                        break
+        finally:
+            self._emit_state.deferred = None
+
+        applied = not (job.atomic and failed)
+        if job.atomic and applied:
+            for signal, args in deferred:
+                signal.emit(*args)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.debug(
+            "批量命令执行完成 - 共 {} 条，执行 {} 条，原子: {}，生效: {}，耗时 {:.2f}ms",
+            len(job.commands),
+            len(results),
+            job.atomic,
+            applied,
+            elapsed_ms,
+        )
+        if not failed:
+            message = "批量命令全部执行成功"
+        elif job.atomic:
+            message = "批量命令未全部成功，整批未生效"
+        else:
+            message = "部分批量命令执行失败"
+        return {
+            "status": "error" if failed else "success",
+            "message": message,
+            "atomic": job.atomic,
+            "applied": applied,
+            "executed": len(results),
+            "skipped": len(job.commands) - len(results),
+            "results": results,
+            "elapsed_ms": round(elapsed_ms, 3),
+        }
+
+    def _normalize_batch_item(
+        self, item: Any
+    ) -> tuple[str, Dict[str, Any], Optional[Dict[str, Any]]]:
+        """把批量请求中的一项转换为 (命令, 参数, 错误结果)，格式正确时错误结果为 None"""
+        if isinstance(item, str):
+            command, params = self._parse_url(item)
+            return command, params, None
+        if isinstance(item, dict):
+            if item.get("url"):
+                command, params = self._parse_url(str(item["url"]))
+                return command, params, None
+            command = item.get("command")
+            params = item.get("params") or {}
+            if isinstance(command, str) and command and isinstance(params, dict):
+                params = dict(params)
+                if isinstance(item.get("query"), dict):
+                    params["query"] = item["query"]
+                return command, params, None
+        return "", {}, {"status": "error", "message": f"无效的批量命令: {item!r}"}
+
+    @staticmethod
+    def _is_success_result(result: Any) -> bool:
+        if not isinstance(result, dict):
+            return False
+        return result.get("status") == "success" or result.get("success") is True
+
     def _parse_url(self, url: str) -> tuple:
         """解析URL
 
@@ -193,7 +394,7 @@ class URLCommandHandler(QObject):
         Returns:
             (命令, 参数字典) 元组
         """
-        logger.debug(f"解析URL: {url}")
+        logger.debug("解析URL: {}", url)
 
         parsed = urlparse(url)
         query = parsed.query or ""
@@ -229,12 +430,12 @@ class URLCommandHandler(QObject):
                 q = raw_no_scheme.split("?", 1)[1]
                 params["query"] = self._parse_query_string(q)
 
-        logger.debug(f"URL解析结果 - 命令: {command}, 参数: {params}")
+        logger.debug("URL解析结果 - 命令: {}, 参数: {}", command, params)
         return command, params
 
     def _parse_query_string(self, query: str) -> Dict[str, Any]:
         """解析查询字符串"""
-        logger.debug(f"解析查询字符串: {query}")
+        logger.debug("解析查询字符串: {}", query)
         if not query:
             logger.debug("查询字符串为空")
             return {}
@@ -244,7 +445,7 @@ class URLCommandHandler(QObject):
             if "=" in pair:
                 key, value = pair.split("=", 1)
                 params[key] = value
-        logger.debug(f"查询字符串解析结果: {params}")
+        logger.debug("查询字符串解析结果: {}", params)
         return params
 
     def _requires_verification(self, command: str) -> bool:
@@ -253,21 +454,21 @@ class URLCommandHandler(QObject):
         from app.common.safety.password import is_configured as password_is_configured
 
         if command.startswith("data/"):
-            logger.debug(f"命令无需验证（数据只读）：{command}")
+            logger.debug("命令无需验证（数据只读）：{}", command)
             return False
 
         # 未配置密码则不需要验证
         if not password_is_configured():
-            logger.debug(f"命令无需验证（未配置密码）：{command}")
+            logger.debug("命令无需验证（未配置密码）：{}", command)
             return False
 
         # 检查安全总开关
         if not readme_settings_async("basic_safety_settings", "safety_switch"):
-            logger.debug(f"命令无需验证（安全总开关关闭）：{command}")
+            logger.debug("命令无需验证（安全总开关关闭）：{}", command)
             return False
 
         if command in (self.secure_commands or []):
-            logger.debug(f"命令需验证（自定义受控命令）：{command}")
+            logger.debug("命令需验证（自定义受控命令）：{}", command)
             return True
 
         # 命令到操作类型的映射
@@ -302,19 +503,23 @@ class URLCommandHandler(QObject):
         # 获取操作类型
         op = command_to_op.get(command, None)
         if op is None:
-            logger.debug(f"命令无需验证（默认放行）：{command}")
+            logger.debug("命令无需验证（默认放行）：{}", command)
             return False
 
         # 获取对应的开关
         switch = op_to_switch.get(op)
         if not switch:
-            logger.debug(f"命令需验证（默认受控）：{command}")
+            logger.debug("命令需验证（默认受控）：{}", command)
             return True
 
         # 检查开关状态
         requires = bool(readme_settings_async("basic_safety_settings", switch))
         logger.debug(
-            f"检查命令是否需要验证 - 命令: {command}, 操作: {op}, 开关: {switch}, 结果: {requires}"
+            "检查命令是否需要验证 - 命令: {}, 操作: {}, 开关: {}, 结果: {}",
+            command,
+            op,
+            switch,
+            requires,
         )
         return requires
 
@@ -397,7 +602,7 @@ class URLCommandHandler(QObject):
         self, command: str, params: Dict[str, Any]
     ) -> Dict[str, Any]:
         """请求验证"""
-        logger.debug(f"请求验证 - 命令: {command}, 参数: {params}")
+        logger.debug("请求验证 - 命令: {}, 参数: {}", command, params)
         from app.tools.settings_access import readme_settings_async
 
         op, switch = self._get_op_and_switch(command)
@@ -414,7 +619,7 @@ class URLCommandHandler(QObject):
             """验证通过后执行命令"""
             try:
                 result = self._execute_command(command, params)
-                logger.debug(f"验证后执行命令完成: {command}, 结果: {result}")
+                logger.debug("验证后执行命令完成: {}, 结果: {}", command, result)
                 return result
             except Exception as e:
                 logger.exception(f"验证后执行命令失败: {command}, 错误: {e}")
@@ -445,53 +650,32 @@ class URLCommandHandler(QObject):
 
     def _execute_command(self, command: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """执行命令"""
-        logger.debug(f"执行命令: {command}, 参数: {params}")
+        logger.debug("执行命令: {}, 参数: {}", command, params)
         try:
-            # 查找命令处理器
-            handler = self.command_map.get(command)
-            if handler:
-                logger.debug(f"找到命令处理器 - 命令: {command}")
-                try:
-                    result = handler(params)
-                    logger.debug(f"命令执行成功: {command}, 结果: {result}")
-                    return result
-                except Exception as e:
-                    logger.exception(f"命令执行失败: {command}, 错误: {e}")
-                    return {
-                        "status": "error",
-                        "message": f"命令执行失败: {str(e)}",
-                        "command": command,
-                    }
-
-            # 尝试模糊匹配
-            matched_command = self._fuzzy_match_command(command)
-            if matched_command:
-                handler = self.command_map.get(matched_command)
-                if handler:
-                    logger.debug(f"模糊匹配到命令: {matched_command}")
-                    try:
-                        result = handler(params)
-                        logger.debug(
-                            f"模糊匹配命令执行成功: {matched_command}, 结果: {result}"
-                        )
-                        return result
-                    except Exception as e:
-                        logger.exception(
-                            f"模糊匹配命令执行失败: {matched_command}, 错误: {e}"
-                        )
-                        return {
-                            "status": "error",
-                            "message": f"命令执行失败: {str(e)}",
-                            "command": command,
-                        }
+            # 查找命令处理器（精确匹配或缓存的模糊匹配结果）
+            matched_command = self._resolve_command(command)
+            handler = self.command_map.get(matched_command) if matched_command else None
+            if handler is None:
+                logger.warning(f"未知的命令: {command}")
+                return {
+                    "status": "error",
+                    "message": f"未知命令: {command}",
+                    "available_commands": list(self.command_map.keys()),
+                }
 
-            # 未找到匹配命令
-            logger.warning(f"未知的命令: {command}")
-            return {
-                "status": "error",
-                "message": f"未知命令: {command}",
-                "available_commands": list(self.command_map.keys()),
-            }
+            if matched_command != command:
+                logger.debug("模糊匹配到命令: {}", matched_command)
+            try:
+                result = handler(params)
+                logger.debug("命令执行成功: {}, 结果: {}", matched_command, result)
+                return result
+            except Exception as e:
+                logger.exception(f"命令执行失败: {matched_command}, 错误: {e}")
+                return {
+                    "status": "error",
+                    "message": f"命令执行失败: {str(e)}",
+                    "command": command,
+                }
 
         except Exception as e:
             logger.exception(f"命令执行失败: {e}")
@@ -501,35 +685,62 @@ class URLCommandHandler(QObject):
                 "command": command,
             }
 
+    def _resolve_command(self, command: str) -> Optional[str]:
+        """解析命令名，模糊匹配的结果（包括未匹配）按命令名缓存
+
+        Returns:
+            command_map 中的命令名，未匹配时返回 None
+        """
+        if command in self.command_map:
+            return command
+        if command in self._resolved_commands:
+            return self._resolved_commands[command]
+        matched = self._fuzzy_match_command(command)
+        # 命令名来自外部输入，缓存数量设上限
+        if len(self._resolved_commands) < self._RESOLVED_CACHE_LIMIT:
+            self._resolved_commands[command] = matched
+        return matched
+
+    def _emit(self, signal, *args) -> None:
+        """发出控制信号；原子批处理期间先暂存，整批成功后再依次发出
+
+        只暂存当前线程中正在执行的批处理的信号，其他 IPC 连接线程同时执行的单条命令照常发出。
+        """
+        deferred = getattr(self._emit_state, "deferred", None)
+        if deferred is not None:
+            deferred.append((signal, args))
+        else:
+            signal.emit(*args)
+
     def _fuzzy_match_command(self, command: str) -> Optional[str]:
         """模糊匹配命令"""
-        logger.debug(f"模糊匹配命令: {command}")
+        logger.debug("模糊匹配命令: {}", command)
         available_commands = list(self.command_map.keys())
 
         # 精确匹配
         if command in available_commands:
-            logger.debug(f"精确匹配到命令: {command}")
+            logger.debug("精确匹配到命令: {}", command)
             return command
 
         # 前缀匹配
         for cmd in available_commands:
             if cmd.startswith(command):
-                logger.debug(f"前缀匹配到命令: {cmd} (输入: {command})")
+                logger.debug("前缀匹配到命令: {} (输入: {})", cmd, command)
                 return cmd
 
         # 后缀匹配
         for cmd in available_commands:
             if cmd.endswith(command):
-                logger.debug(f"后缀匹配到命令: {cmd} (输入: {command})")
+                logger.debug("后缀匹配到命令: {} (输入: {})", cmd, command)
                 return cmd
 
         # 包含匹配
         for cmd in available_commands:
             if command in cmd:
-                logger.debug(f"包含匹配到命令: {cmd} (输入: {command})")
+                logger.debug("包含匹配到命令: {} (输入: {})", cmd, command)
                 return cmd
 
-        logger.debug(f"未匹配到命令: {command}")
+        logger.debug("未匹配到命令: {}", command)
         return None
 
     # ==================================================
@@ -539,7 +750,7 @@ class URLCommandHandler(QObject):
     def _handle_basic_settings(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理基础设置"""
         logger.debug("打开基础设置页面")
-        self.showSettingsRequested.emit("basicSettingsInterface")
+        self._emit(self.showSettingsRequested, "basicSettingsInterface")
         return {
             "status": "success",
             "message": "基础设置页面已打开",
@@ -549,7 +760,7 @@ class URLCommandHandler(QObject):
     def _handle_list_settings(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理列表管理设置"""
         logger.debug("打开列表管理设置页面")
-        self.showSettingsRequested.emit("listManagementInterface")
+        self._emit(self.showSettingsRequested, "listManagementInterface")
         return {
             "status": "success",
             "message": "列表管理设置页面已打开",
@@ -559,7 +770,7 @@ class URLCommandHandler(QObject):
     def _handle_extraction_settings(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理抽取设置"""
         logger.debug("打开抽取设置页面")
-        self.showSettingsRequested.emit("extractionSettingsInterface")
+        self._emit(self.showSettingsRequested, "extractionSettingsInterface")
         return {
             "status": "success",
             "message": "抽取设置页面已打开",
@@ -569,7 +780,7 @@ class URLCommandHandler(QObject):
     def _handle_floating_settings(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理浮窗设置"""
         logger.debug("打开浮窗设置页面")
-        self.showSettingsRequested.emit("floatingWindowManagementInterface")
+        self._emit(self.showSettingsRequested, "floatingWindowManagementInterface")
         return {
             "status": "success",
             "message": "浮窗设置页面已打开",
@@ -579,7 +790,7 @@ class URLCommandHandler(QObject):
     def _handle_notification_settings(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理通知设置"""
         logger.debug("打开通知设置页面")
-        self.showSettingsRequested.emit("notificationSettingsInterface")
+        self._emit(self.showSettingsRequested, "notificationSettingsInterface")
         return {
             "status": "success",
             "message": "通知设置页面已打开",
@@ -589,7 +800,7 @@ class URLCommandHandler(QObject):
     def _handle_safety_settings(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理安全设置"""
         logger.debug("打开安全设置页面")
-        self.showSettingsRequested.emit("safetySettingsInterface")
+        self._emit(self.showSettingsRequested, "safetySettingsInterface")
         return {
             "status": "success",
             "message": "安全设置页面已打开",
@@ -599,7 +810,7 @@ class URLCommandHandler(QObject):
     def _handle_custom_settings(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理自定义设置"""
         logger.debug("打开自定义设置页面")
-        self.showSettingsRequested.emit("customSettingsInterface")
+        self._emit(self.showSettingsRequested, "customSettingsInterface")
         return {
             "status": "success",
             "message": "自定义设置页面已打开",
@@ -609,7 +820,7 @@ class URLCommandHandler(QObject):
     def _handle_voice_settings(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理语音设置"""
         logger.debug("打开语音设置页面")
-        self.showSettingsRequested.emit("voiceSettingsInterface")
+        self._emit(self.showSettingsRequested, "voiceSettingsInterface")
         return {
             "status": "success",
             "message": "语音设置页面已打开",
@@ -619,7 +830,7 @@ class URLCommandHandler(QObject):
     def _handle_history_settings(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理历史记录设置"""
         logger.debug("打开历史记录设置页面")
-        self.showSettingsRequested.emit("historyInterface")
+        self._emit(self.showSettingsRequested, "historyInterface")
         return {
             "status": "success",
             "message": "历史记录设置页面已打开",
@@ -629,7 +840,7 @@ class URLCommandHandler(QObject):
     def _handle_more_settings(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理更多设置"""
         logger.debug("打开更多设置页面")
-        self.showSettingsRequested.emit("moreSettingsInterface")
+        self._emit(self.showSettingsRequested, "moreSettingsInterface")
         return {
             "status": "success",
             "message": "更多设置页面已打开",
@@ -639,7 +850,7 @@ class URLCommandHandler(QObject):
     def _handle_update_settings(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理更新设置"""
         logger.debug("打开更新设置页面")
-        self.showSettingsRequested.emit("updateInterface")
+        self._emit(self.showSettingsRequested, "updateInterface")
         return {
             "status": "success",
             "message": "更新设置页面已打开",
@@ -649,7 +860,7 @@ class URLCommandHandler(QObject):
     def _handle_about_settings(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理关于设置"""
         logger.debug("打开关于设置页面")
-        self.showSettingsRequested.emit("aboutInterface")
+        self._emit(self.showSettingsRequested, "aboutInterface")
         return {
             "status": "success",
             "message": "关于设置页面已打开",
@@ -664,12 +875,12 @@ class URLCommandHandler(QObject):
         if not args or (args and args[0] == ""):
             # 默认打开基本设置页面
             logger.debug("打开设置界面 - 基本设置")
-            self.showSettingsRequested.emit("basicSettingsInterface")
+            self._emit(self.showSettingsRequested, "basicSettingsInterface")
             return {"status": "success", "message": "设置界面已打开"}
 
         # 处理特定的设置页面
         page_name = args[0]
-        logger.debug(f"打开设置页面: {page_name}")
+        logger.debug("打开设置页面: {}", page_name)
 
         # 映射设置页面名称
         page_mapping = {
@@ -688,8 +899,8 @@ class URLCommandHandler(QObject):
 
         if page_name in page_mapping:
             mapped_page = page_mapping[page_name]
-            logger.debug(f"切换到设置页面: {mapped_page}")
-            self.showSettingsRequested.emit(mapped_page)
+            logger.debug("切换到设置页面: {}", mapped_page)
+            self._emit(self.showSettingsRequested, mapped_page)
             return {
                 "status": "success",
                 "message": f"设置页面 '{page_name}' 已打开",
@@ -706,7 +917,7 @@ class URLCommandHandler(QObject):
     def _handle_roll_call(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理抽人功能"""
         logger.debug("切换到抽人页面")
-        self.showMainPageRequested.emit("roll_call_page")
+        self._emit(self.showMainPageRequested, "roll_call_page")
         return {
             "status": "success",
             "message": "已切换到抽人页面",
@@ -722,7 +933,7 @@ class URLCommandHandler(QObject):
                 "message": "当前时间在非上课时间段内，禁止抽取",
                 **policy,
             }
-        self.rollCallActionRequested.emit("quick_draw", params or {})
+        self._emit(self.rollCallActionRequested, "quick_draw", params or {})
         return {"status": "success", "message": "已请求执行闪抽", **policy}
 
     def _handle_roll_call_start(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -734,12 +945,12 @@ class URLCommandHandler(QObject):
                 "message": "当前时间在非上课时间段内，禁止抽取",
                 **policy,
             }
-        self.rollCallActionRequested.emit("start", params or {})
+        self._emit(self.rollCallActionRequested, "start", params or {})
         return {"status": "success", "message": "已请求开始点名", **policy}
 
     def _handle_roll_call_stop(self, params: Dict[str, Any]) -> Dict[str, Any]:
         logger.debug("请求停止点名")
-        self.rollCallActionRequested.emit("stop", params or {})
+        self._emit(self.rollCallActionRequested, "stop", params or {})
         return {"status": "success", "message": "已请求停止点名"}
 
     def _handle_roll_call_reset(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -751,7 +962,7 @@ class URLCommandHandler(QObject):
                 "message": "当前时间在非上课时间段内，禁止重置",
                 **policy,
             }
-        self.rollCallActionRequested.emit("reset", params or {})
+        self._emit(self.rollCallActionRequested, "reset", params or {})
         return {"status": "success", "message": "已请求重置点名记录", **policy}
 
     def _handle_roll_call_set_count(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -763,8 +974,10 @@ class URLCommandHandler(QObject):
             return {"status": "error", "message": "参数无效: count"}
         if count <= 0:
             return {"status": "error", "message": "参数无效: count"}
-        self.rollCallActionRequested.emit(
-            "set_count", {"count": count, **(params or {})}
+        self._emit(
+            self.rollCallActionRequested,
+            "set_count",
+            {"count": count, **(params or {})},
         )
         return {"status": "success", "message": "已请求设置点名人数", "count": count}
 
@@ -773,7 +986,9 @@ class URLCommandHandler(QObject):
         group = query.get("group") or query.get("value") or query.get("text")
         index = query.get("index") or query.get("group_index")
         payload: Dict[str, Any] = {"group": group, "index": index}
-        self.rollCallActionRequested.emit("set_group", {**payload, **(params or {})})
+        self._emit(
+            self.rollCallActionRequested, "set_group", {**payload, **(params or {})}
+        )
         return {"status": "success", "message": "已请求设置点名小组/范围", **payload}
 
     def _handle_roll_call_set_gender(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -781,7 +996,9 @@ class URLCommandHandler(QObject):
         gender = query.get("gender") or query.get("value") or query.get("text")
         index = query.get("index") or query.get("gender_index")
         payload: Dict[str, Any] = {"gender": gender, "index": index}
-        self.rollCallActionRequested.emit("set_gender", {**payload, **(params or {})})
+        self._emit(
+            self.rollCallActionRequested, "set_gender", {**payload, **(params or {})}
+        )
         return {"status": "success", "message": "已请求设置点名性别", **payload}
 
     def _handle_roll_call_set_list(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -796,7 +1013,9 @@ class URLCommandHandler(QObject):
         )
         index = query.get("index")
         payload: Dict[str, Any] = {"class_name": class_name, "index": index}
-        self.rollCallActionRequested.emit("set_list", {**payload, **(params or {})})
+        self._emit(
+            self.rollCallActionRequested, "set_list", {**payload, **(params or {})}
+        )
         return {"status": "success", "message": "已请求设置点名名单", **payload}
 
     def _handle_lottery(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -805,7 +1024,7 @@ class URLCommandHandler(QObject):
         logger.debug(
             "URLCommandHandler._handle_lottery: 发出 showMainPageRequested 信号，参数: 'lottery_page'"
         )
-        self.showMainPageRequested.emit("lottery_page")
+        self._emit(self.showMainPageRequested, "lottery_page")
         return {
             "status": "success",
             "message": "已切换到抽奖页面",
@@ -821,12 +1040,12 @@ class URLCommandHandler(QObject):
                 "message": "当前时间在非上课时间段内，禁止抽取",
                 **policy,
             }
-        self.lotteryActionRequested.emit("start", params or {})
+        self._emit(self.lotteryActionRequested, "start", params or {})
         return {"status": "success", "message": "已请求开始抽奖", **policy}
 
     def _handle_lottery_stop(self, params: Dict[str, Any]) -> Dict[str, Any]:
         logger.debug("请求停止抽奖")
-        self.lotteryActionRequested.emit("stop", params or {})
+        self._emit(self.lotteryActionRequested, "stop", params or {})
         return {"status": "success", "message": "已请求停止抽奖"}
 
     def _handle_lottery_reset(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -838,7 +1057,7 @@ class URLCommandHandler(QObject):
                 "message": "当前时间在非上课时间段内，禁止重置",
                 **policy,
             }
-        self.lotteryActionRequested.emit("reset", params or {})
+        self._emit(self.lotteryActionRequested, "reset", params or {})
         return {"status": "success", "message": "已请求重置抽奖记录", **policy}
 
     def _handle_lottery_set_count(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -850,8 +1069,8 @@ class URLCommandHandler(QObject):
             return {"status": "error", "message": "参数无效: count"}
         if count <= 0:
             return {"status": "error", "message": "参数无效: count"}
-        self.lotteryActionRequested.emit(
-            "set_count", {"count": count, **(params or {})}
+        self._emit(
+            self.lotteryActionRequested, "set_count", {"count": count, **(params or {})}
         )
         return {"status": "success", "message": "已请求设置抽奖数量", "count": count}
 
@@ -867,7 +1086,9 @@ class URLCommandHandler(QObject):
         )
         index = query.get("index")
         payload: Dict[str, Any] = {"pool_name": pool_name, "index": index}
-        self.lotteryActionRequested.emit("set_pool", {**payload, **(params or {})})
+        self._emit(
+            self.lotteryActionRequested, "set_pool", {**payload, **(params or {})}
+        )
         return {"status": "success", "message": "已请求设置抽奖奖池", **payload}
 
     def _handle_lottery_set_range(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -875,7 +1096,9 @@ class URLCommandHandler(QObject):
         value = query.get("range") or query.get("value") or query.get("text")
         index = query.get("index") or query.get("range_index")
         payload: Dict[str, Any] = {"range": value, "index": index}
-        self.lotteryActionRequested.emit("set_range", {**payload, **(params or {})})
+        self._emit(
+            self.lotteryActionRequested, "set_range", {**payload, **(params or {})}
+        )
         return {"status": "success", "message": "已请求设置抽奖范围", **payload}
 
     def _handle_lottery_set_gender(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -883,7 +1106,9 @@ class URLCommandHandler(QObject):
         value = query.get("gender") or query.get("value") or query.get("text")
         index = query.get("index") or query.get("gender_index")
         payload: Dict[str, Any] = {"gender": value, "index": index}
-        self.lotteryActionRequested.emit("set_gender", {**payload, **(params or {})})
+        self._emit(
+            self.lotteryActionRequested, "set_gender", {**payload, **(params or {})}
+        )
         return {"status": "success", "message": "已请求设置抽奖性别", **payload}
 
     def _handle_lottery_set_list(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -898,7 +1123,9 @@ class URLCommandHandler(QObject):
         )
         index = query.get("index")
         payload: Dict[str, Any] = {"class_name": class_name, "index": index}
-        self.lotteryActionRequested.emit("set_list", {**payload, **(params or {})})
+        self._emit(
+            self.lotteryActionRequested, "set_list", {**payload, **(params or {})}
+        )
         return {"status": "success", "message": "已请求设置抽奖点名名单", **payload}
 
     def _resolve_window_action(self, query: Dict[str, Any]) -> str:
@@ -943,7 +1170,7 @@ class URLCommandHandler(QObject):
         if page_name:
             payload["page"] = page_name
 
-        self.windowActionRequested.emit("main", {**payload, **(params or {})})
+        self._emit(self.windowActionRequested, "main", {**payload, **(params or {})})
         result: Dict[str, Any] = {
             "status": "success",
             "message": "已请求主窗口操作",
@@ -972,13 +1199,17 @@ class URLCommandHandler(QObject):
             "page": page,
             "is_preview": is_preview,
         }
-        self.windowActionRequested.emit("settings", {**payload, **(params or {})})
+        self._emit(
+            self.windowActionRequested, "settings", {**payload, **(params or {})}
+        )
         return {"status": "success", "message": "已请求设置窗口操作", **payload}
 
     def _handle_window_float(self, params: Dict[str, Any]) -> Dict[str, Any]:
         query = (params or {}).get("query", {}) or {}
         action = self._resolve_window_action(query)
-        self.windowActionRequested.emit("float", {"action": action, **(params or {})})
+        self._emit(
+            self.windowActionRequested, "float", {"action": action, **(params or {})}
+        )
         return {"status": "success", "message": "已请求浮窗操作", "action": action}
 
     def _handle_main_window(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -988,7 +1219,7 @@ class URLCommandHandler(QObject):
             page = args[0]
             if page in self.main_page_map:
                 page_name = self.main_page_map[page]
-                self.showMainPageRequested.emit(page_name)
+                self._emit(self.showMainPageRequested, page_name)
                 return {
                     "status": "success",
                     "message": f"已切换到{page}页面",
@@ -996,37 +1227,37 @@ class URLCommandHandler(QObject):
                 }
 
         # 默认显示主窗口
-        self.showMainPageRequested.emit("main_window")
+        self._emit(self.showMainPageRequested, "main_window")
         return {"status": "success", "message": "主窗口已显示", "page": "main_window"}
 
     def _handle_tray_toggle(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理托盘切换"""
         logger.debug("切换主窗口显示状态")
-        self.showTrayActionRequested.emit("toggle_main_window")
+        self._emit(self.showTrayActionRequested, "toggle_main_window")
         return {"status": "success", "message": "主窗口显示状态已切换"}
 
     def _handle_tray_settings(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理托盘设置"""
         logger.debug("打开设置界面")
-        self.showSettingsRequested.emit("basicSettingsInterface")
+        self._emit(self.showSettingsRequested, "basicSettingsInterface")
         return {"status": "success", "message": "设置界面已打开"}
 
     def _handle_tray_float(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理托盘浮窗"""
         logger.debug("切换浮窗显示状态")
-        self.showTrayActionRequested.emit("float")
+        self._emit(self.showTrayActionRequested, "float")
         return {"status": "success", "message": "浮窗显示状态已切换"}
 
     def _handle_tray_restart(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理托盘重启"""
         logger.debug("执行重启操作")
-        self.showTrayActionRequested.emit("restart")
+        self._emit(self.showTrayActionRequested, "restart")
         return {"status": "success", "message": "应用重启中..."}
 
     def _handle_tray_exit(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理托盘退出"""
         logger.debug("执行退出操作")
-        self.showTrayActionRequested.emit("exit")
+        self._emit(self.showTrayActionRequested, "exit")
         return {"status": "success", "message": "应用退出中..."}
 
     def _handle_get_roll_call_list(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -1150,21 +1381,23 @@ class URLCommandHandler(QObject):
             require_verification: 是否需要验证
         """
         logger.debug(
-            f"注册自定义命令 - 命令: {command}, 需要验证: {require_verification}"
+            "注册自定义命令 - 命令: {}, 需要验证: {}", command, require_verification
         )
         self.command_map[command] = handler
+        self._resolved_commands.clear()
         if require_verification:
             self.secure_commands.append(command)
-        logger.debug(f"注册自定义命令: {command}")
+        logger.debug("注册自定义命令: {}", command)
 
     def unregister_command(self, command: str):
         """注销自定义命令"""
-        logger.debug(f"注销自定义命令: {command}")
+        logger.debug("注销自定义命令: {}", command)
         if command in self.command_map:
             del self.command_map[command]
+            self._resolved_commands.clear()
             if command in self.secure_commands:
                 self.secure_commands.remove(command)
-            logger.debug(f"注销自定义命令: {command}")
+            logger.debug("注销自定义命令: {}", command)
         else:
             logger.warning(f"尝试注销不存在的命令: {command}")
 
@@ -1182,7 +1415,7 @@ class URLCommandHandler(QObject):
                     else str(handler),
                 }
             )
-        logger.debug(f"可用命令数量: {len(commands)}")
+        logger.debug("可用命令数量: {}", len(commands))
         return commands
 
     def verify_and_execute(
@@ -1190,7 +1423,10 @@ class URLCommandHandler(QObject):
     ) -> Dict[str, Any]:
         """验证并执行命令"""
         logger.debug(
-            f"验证并执行命令 - 命令: {command}, 参数: {params}, 验证数据: {verification_data}"
+            "验证并执行命令 - 命令: {}, 参数: {}, 验证数据: {}",
+            command,
+            params,
+            verification_data,
         )
 
         if not self.security_verifier:
@@ -1207,5 +1443,5 @@ class URLCommandHandler(QObject):
         logger.debug("安全验证通过，执行命令")
         # 执行命令
         result = self._execute_command(command, params)
-        logger.debug(f"验证并执行命令完成 - 命令: {command}, 结果: {result}")
+        logger.debug("验证并执行命令完成 - 命令: {}, 结果: {}", command, result)
         return result
@@ -12,9 +12,18 @@ import os
 from loguru import logger
 from urllib.parse import urlparse, parse_qs
 
+from .event_stream import (
+    EVENT_TYPES,
+    EventStreamClient,
+    EventSubscriber,
+    get_event_bus,
+    serve_subscription,
+)
 from .protocol_manager import ProtocolManager
 from .url_command_handler import URLCommandHandler
 from .security_verifier import SimplePasswordVerifier
+from app.tools.json_store import write_json
+from app.tools.variable import IPC_EVENT_BUFFER_DEFAULT, IPC_LISTEN_BACKLOG
 
 
 class URLIPCHandler:
@@ -45,6 +54,8 @@ class URLIPCHandler:
         self.is_running = False
         self.message_handlers: Dict[str, Callable] = {}
         self._listener: Optional[Listener] = None
+        self._subscribers: set[EventSubscriber] = set()
+        self._subscribers_lock = threading.Lock()
 
         # 初始化命令处理器
         self.command_handler = URLCommandHandler()
@@ -112,7 +123,12 @@ class URLIPCHandler:
                 except Exception:
                     pass
 
-            self._listener = Listener(address=address, family=family, authkey=authkey)
+            self._listener = Listener(
+                address=address,
+                family=family,
+                backlog=IPC_LISTEN_BACKLOG,
+                authkey=authkey,
+            )
 
             self.is_running = True
             self.server_thread = threading.Thread(target=self._run_server, daemon=True)
@@ -131,6 +147,10 @@ class URLIPCHandler:
     def stop_ipc_server(self):
         """停止IPC服务器"""
         self.is_running = False
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.close()
         try:
             if self._listener is not None:
                 self._listener.close()
@@ -180,14 +200,12 @@ class URLIPCHandler:
                 return
 
             message = json.loads(data.decode("utf-8").strip())
+            if message.get("type") == "subscribe":
+                # 订阅连接保持打开，直到订阅端断开或服务器停止
+                self._handle_subscription(conn, message.get("payload") or {})
+                return
             response = self._process_message(message)
-            response_bytes = (
-                json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n"
-            )
-            if hasattr(conn, "_send"):
-                self._send_line_to_conn(conn, response_bytes)
-            else:
-                conn.send_bytes(response_bytes)
+            self._send_response(conn, response)
         except EOFError:
             return
         except Exception as e:
@@ -198,6 +216,77 @@ class URLIPCHandler:
             except Exception:
                 pass
 
+    def _send_response(self, conn, response: Dict[str, Any]) -> None:
+        response_bytes = (
+            json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n"
+        )
+        self._write_to_conn(conn, response_bytes)
+
+    def _write_to_conn(self, conn, data: bytes) -> None:
+        if hasattr(conn, "_send"):
+            self._send_line_to_conn(conn, data)
+        else:
+            conn.send_bytes(data)
+
+    def _handle_subscription(self, conn, payload: Dict[str, Any]) -> None:
+        """处理事件订阅：回复确认后在当前连接线程中持续推送事件
+
+        payload 格式: {"events": [...], "buffer": int, "verification": {...}}
+        """
+        verified, _ = self._verify_request(payload.get("verification"), "subscribe")
+        if not verified:
+            self._send_response(
+                conn, {"success": False, "type": "subscribe", "error": "安全验证失败"}
+            )
+            return
+
+        events = payload.get("events") or None
+        unknown = [name for name in events or [] if name not in EVENT_TYPES]
+        if unknown:
+            self._send_response(
+                conn,
+                {
+                    "success": False,
+                    "type": "subscribe",
+                    "error": f"未知的事件类型: {unknown}",
+                    "available_events": list(EVENT_TYPES),
+                },
+            )
+            return
+        try:
+            capacity = int(payload.get("buffer") or IPC_EVENT_BUFFER_DEFAULT)
+        except (TypeError, ValueError):
+            capacity = IPC_EVENT_BUFFER_DEFAULT
+
+        bus = get_event_bus()
+        subscriber = bus.subscribe(events, capacity)
+        if subscriber is None:
+            self._send_response(
+                conn,
+                {"success": False, "type": "subscribe", "error": "订阅者数量已达上限"},
+            )
+            return
+
+        with self._subscribers_lock:
+            self._subscribers.add(subscriber)
+        try:
+            self._send_response(
+                conn,
+                {
+                    "success": True,
+                    "type": "subscribe",
+                    "events": sorted(subscriber.events or EVENT_TYPES),
+                    "buffer": subscriber.capacity,
+                },
+            )
+            serve_subscription(
+                subscriber, lambda data: self._write_to_conn(conn, data), bus
+            )
+        finally:
+            bus.unsubscribe(subscriber)
+            with self._subscribers_lock:
+                self._subscribers.discard(subscriber)
+
     def _recv_line_from_conn(self, conn, max_bytes: int = 262144) -> bytes:
         buf = bytearray()
         try:
@@ -210,6 +299,9 @@ class URLIPCHandler:
                     chunk = recv(1)
                 except EOFError:
                     break
+                # Connection._recv 返回的是 BytesIO
+                if hasattr(chunk, "getvalue"):
+                    chunk = chunk.getvalue()
                 if not chunk:
                     break
                 buf += chunk
@@ -231,7 +323,12 @@ class URLIPCHandler:
         message_type = message.get("type", "")
         payload = message.get("payload", {})
 
-        logger.debug(f"收到消息 - 类型: {message_type}, 负载: {payload}")
+        # 验证数据（密码、会话令牌）不写入日志
+        if isinstance(payload, dict) and "verification" in payload:
+            logged_payload = {k: v for k, v in payload.items() if k != "verification"}
+        else:
+            logged_payload = payload
+        logger.debug("收到消息 - 类型: {}, 负载: {}", message_type, logged_payload)
 
         if message_type == "ping":
             return {"success": True, "type": "ping", "result": "pong"}
@@ -240,7 +337,7 @@ class URLIPCHandler:
             try:
                 result = self.message_handlers[message_type](payload)
                 response = {"success": True, "type": message_type, "result": result}
-                logger.debug(f"消息处理成功 - 类型: {message_type}, 结果: {result}")
+                logger.debug("消息处理成功 - 类型: {}, 结果: {}", message_type, result)
                 return response
             except Exception as e:
                 error_response = {
@@ -253,7 +350,7 @@ class URLIPCHandler:
 
         if message_type == "url":
             result = self._handle_url_message(payload)
-            logger.debug(f"URL消息处理结果: {result}")
+            logger.debug("URL消息处理结果: {}", result)
             return result
 
         unknown_response = {
@@ -271,27 +368,63 @@ class URLIPCHandler:
             logger.warning("URL消息缺少URL参数")
             return {"success": False, "error": "缺少URL参数"}
 
-        logger.debug(f"处理URL消息: {url}")
+        logger.debug("处理URL消息: {}", url)
 
         # 验证URL
-        verification = payload.get("verification", {})
-        if self.security_verifier:
-            logger.debug(f"进行安全验证: {verification}")
-            if not self.security_verifier.verify(verification):
-                logger.warning(f"URL安全验证失败: {url}")
-                return {"success": False, "error": "安全验证失败"}
-            logger.debug("安全验证通过")
+        verified, session = self._verify_request(payload.get("verification"), url)
+        if not verified:
+            logger.warning(f"URL安全验证失败: {url}")
+            return {"success": False, "error": "安全验证失败"}
 
         # 处理URL命令
         try:
-            logger.debug(f"执行URL命令: {url}")
+            logger.debug("执行URL命令: {}", url)
             result = self.command_handler.handle_url_command(url)
             logger.info(f"URL命令执行成功: {url}, 结果: {result}")
-            return {"success": True, "result": result}
+            response = {"success": True, "result": result}
+            if session:
+                response["session"] = session
+            return response
         except Exception as e:
             logger.exception(f"URL命令执行失败: {url}, 错误: {e}")
             return {"success": False, "error": str(e)}
 
+    def _verify_request(
+        self, verification: Optional[Dict[str, Any]], content: Any
+    ) -> tuple[bool, Optional[Dict[str, Any]]]:
+        """验证请求
+
+        带有会话签名（session）的请求只做 HMAC 验证；否则进行密码验证，
+        验证通过且请求中 request_session 为真时签发会话令牌。
+
+        Args:
+            verification: 请求附带的验证数据
+            content: 参与会话签名的请求内容
+
+        Returns:
+            tuple: (是否通过, 新签发的会话信息或None)
+        """
+        if not self.security_verifier:
+            return True, None
+
+        verification = verification or {}
+        if "session" in verification:
+            verified = self.security_verifier.sessions.verify(verification, content)
+            logger.debug("会话验证{}", "通过" if verified else "失败")
+            return verified, None
+
+        # 不记录验证数据本身，避免密码出现在日志中
+        logger.debug("进行安全验证，字段: {}", sorted(verification))
+        if not self.security_verifier.verify(verification):
+            return False, None
+        logger.debug("安全验证通过")
+
+        session = None
+        if verification.get("request_session"):
+            session = self.security_verifier.sessions.issue()
+            logger.debug("已签发IPC会话令牌")
+        return True, session
+
     def register_message_handler(self, message_type: str, handler: Callable):
         """
         注册消息处理器
@@ -378,6 +511,42 @@ class URLIPCHandler:
             except Exception:
                 pass
 
+    def open_event_stream(
+        self,
+        events: Optional[list] = None,
+        buffer: Optional[int] = None,
+        target_ipc_name: str | None = None,
+        verification: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[EventStreamClient]:
+        """
+        订阅目标实例的事件推送
+
+        Args:
+            events: 订阅的事件类型，None 表示全部
+            buffer: 服务器端为此订阅缓冲的事件数
+            target_ipc_name: 目标IPC名称，默认为本实例
+            verification: 目标实例启用安全验证时附带的验证数据
+            timeout: 读取超时（秒），None 表示一直等待
+
+        Returns:
+            订阅成功返回 EventStreamClient（可迭代读取事件），失败返回None
+        """
+        client = None
+        try:
+            target_name = self._normalize_ipc_name(target_ipc_name or self.ipc_name)
+            address, family = self._get_ipc_address_for_name(target_name)
+            client = EventStreamClient(address, family, timeout=timeout)
+            ack = client.subscribe(events, buffer, verification)
+            if ack.get("success"):
+                return client
+            logger.warning(f"订阅事件失败: {ack.get('error')}")
+        except Exception as e:
+            logger.exception(f"订阅事件失败: {e}")
+        if client is not None:
+            client.close()
+        return None
+
     def send_ipc_message_to_app(
         self,
         target_app_name: str,
@@ -422,8 +591,8 @@ class URLIPCHandler:
         config_file = config_dir / "ipc_config.json"
         config = {"address": address, "family": family}
 
-        with open(config_file, "w", encoding="utf-8") as f:
-            json.dump(config, f, ensure_ascii=False, indent=2)
+        # 其它实例随时可能读取该文件，立即原子写入
+        write_json(config_file, config, indent=2, delay_ms=0)
 
     def _load_ipc_config(self) -> Optional[Dict[str, Any]]:
         config_file = self._get_config_dir() / "ipc_config.json"
@@ -444,8 +613,8 @@ class URLIPCHandler:
         config_file = config_dir / "ipc_config.json"
         config = {"port": port}
 
-        with open(config_file, "w", encoding="utf-8") as f:
-            json.dump(config, f, ensure_ascii=False, indent=2)
+        # 其它实例随时可能读取该文件，立即原子写入
+        write_json(config_file, config, indent=2, delay_ms=0)
 
     def load_port_config(self) -> Optional[int]:
         """加载端口配置"""
@@ -471,7 +640,7 @@ class URLIPCHandler:
         Returns:
             解析后的参数
         """
-        logger.debug(f"处理URL参数: {url}")
+        logger.debug("处理URL参数: {}", url)
 
         try:
             parsed = urlparse(url)
@@ -495,7 +664,7 @@ class URLIPCHandler:
                 "params": flat_params,
                 "action": parsed.path.lstrip("/"),
             }
-            logger.debug(f"URL参数解析成功: {result}")
+            logger.debug("URL参数解析成功: {}", result)
             return result
 
         except Exception as e:
@@ -515,22 +684,22 @@ class URLIPCHandler:
         Returns:
             执行结果
         """
-        logger.debug(f"执行URL命令: {url}")
+        logger.debug("执行URL命令: {}", url)
 
         # 验证URL
-        if self.security_verifier:
-            verification = verification or {}
-            logger.debug(f"进行安全验证: {verification}")
-            if not self.security_verifier.verify(verification):
-                logger.warning(f"安全验证失败: {url}")
-                return {"success": False, "error": "安全验证失败"}
-            logger.debug("安全验证通过")
+        verified, session = self._verify_request(verification, url)
+        if not verified:
+            logger.warning(f"安全验证失败: {url}")
+            return {"success": False, "error": "安全验证失败"}
 
         # 执行命令
         try:
             result = self.command_handler.handle_url_command(url)
             logger.info(f"URL命令执行成功: {url}, 结果: {result}")
-            return {"success": True, "result": result}
+            response = {"success": True, "result": result}
+            if session:
+                response["session"] = session
+            return response
         except Exception as e:
             logger.exception(f"URL命令执行失败: {url}, 错误: {e}")
             return {"success": False, "error": str(e)}
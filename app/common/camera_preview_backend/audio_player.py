@@ -7,23 +7,12 @@ from typing import Optional
 from loguru import logger
 
 
-try:
-    import sounddevice as sd
-except Exception as e:
-    sd = None
-    logger.warning(f"sounddevice 不可用: {e}")
+from app.tools.lazy_import import lazy_import, module_available
 
-try:
-    import soundfile as sf
-except Exception as e:
-    sf = None
-    logger.warning(f"soundfile 不可用: {e}")
-
-try:
-    import numpy as np
-except Exception as e:
-    np = None
-    logger.warning(f"numpy 不可用: {e}")
+# 音频依赖延迟到首次播放时才导入，避免拖慢启动
+sd = lazy_import("sounddevice", optional=True)
+sf = lazy_import("soundfile", optional=True)
+np = lazy_import("numpy", optional=True)
 
 
 class CameraPreviewAudioPlayer:
@@ -63,7 +52,7 @@ class CameraPreviewAudioPlayer:
         self.stop(wait=False)
 
         vol = max(0.0, min(float(volume), 1.0))
-        if sd is not None and sf is not None and np is not None:
+        if module_available(sd) and module_available(sf) and module_available(np):
             try:
                 with sf.SoundFile(audio_path_str):
                     pass
@@ -14,6 +14,7 @@ from app.common.camera_preview_backend.detection import (
     list_onnx_model_filenames,
     resolve_onnx_model_path,
 )
+from app.tools.log_control import get_log_sampler, log_sampled
 
 
 CameraSource = Union[int, str]
@@ -187,8 +188,7 @@ class OpenCVCaptureWorker(QObject):
         except Exception as exc:
             try:
                 self._consecutive_failures += 1
-                if self._consecutive_failures in (1, 5, 10, 20):
-                    logger.warning("读取摄像头帧失败: {}", exc)
+                log_sampled("camera.read_frame", "WARNING", "读取摄像头帧失败: {}", exc)
                 if self._consecutive_failures >= 5:
                     try:
                         self._release()
@@ -215,6 +215,9 @@ class OpenCVCaptureWorker(QObject):
                 self.stop()
             return
 
+        if self._consecutive_failures:
+            # 恢复后重新开始采样，下一次故障的第一条日志立即记录
+            get_log_sampler().reset("camera.read_frame")
         self._consecutive_failures = 0
         self._last_ok = time.monotonic()
         now = time.monotonic()
@@ -428,7 +431,14 @@ class FaceDetectorWorker(QObject):
                 return
             results = detect_faces_onnx(frame_bgr, detector_state=state)
         except Exception as exc:
-            logger.exception("人脸检测失败: {}", exc)
+            # 每帧都会检测，模型出错时只按间隔记录堆栈
+            log_sampled(
+                "camera.detect_faces",
+                "ERROR",
+                "人脸检测失败: {}",
+                exc,
+                exception=True,
+            )
             key = "detect_failed"
             msg = str(exc)
             if (
@@ -6,6 +6,7 @@ from typing import List, Dict, Any, Tuple
 from loguru import logger
 
 from app.tools.path_utils import *
+from app.tools.json_store import read_json
 
 
 # ==================================================
@@ -71,8 +72,7 @@ def get_student_list(class_name: str) -> List[Dict[str, Any]]:
             return []
 
         # 读取JSON文件
-        with open(class_file_path, "r", encoding="utf-8") as f:
-            student_data = json.load(f)
+        student_data = read_json(class_file_path)
 
         # 将字典数据转换为列表形式
         student_list = []
@@ -231,8 +231,7 @@ def get_pool_list(pool_name: str) -> List[Dict[str, Any]]:
             return []
 
         # 读取JSON文件
-        with open(pool_file_path, "r", encoding="utf-8") as f:
-            pool_data = json.load(f)
+        pool_data = read_json(pool_file_path)
 
         # 将字典数据转换为列表形式
         pool_list = []
@@ -373,8 +372,7 @@ def export_student_data(
             return False, error_msg
 
         # 读取JSON文件
-        with open(class_file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = read_json(class_file_path)
 
         if not data:
             error_msg = "当前班级没有学生数据"
@@ -538,3 +536,49 @@ def _export_prize_to_csv(data: Dict[str, Any], file_path: str) -> Tuple[bool, st
 def _export_prize_to_txt(data: Dict[str, Any], file_path: str) -> Tuple[bool, str]:
     """导出奖品数据为TXT文件"""
     return _generic_export_txt(list(data.keys()), file_path)
+
+
+def _prepare_lottery_batch_export_data(rows: List[Dict[str, Any]]) -> List[Dict]:
+    """准备批量抽奖结果导出数据"""
+    export_data = []
+    for row in rows:
+        export_data.append(
+            {
+                "轮次": row.get("round", ""),
+                "序号": row.get("index", ""),
+                "奖品ID": row.get("prize_id", ""),
+                "奖品名称": row.get("prize_name", ""),
+                "学号": row.get("student_id", ""),
+                "姓名": row.get("student_name", ""),
+                "小组": row.get("group_name", ""),
+            }
+        )
+    return export_data
+
+
+def export_lottery_batch_results(
+    rows: List[Dict[str, Any]], file_path: str, export_format: str
+) -> Tuple[bool, str]:
+    """导出批量抽奖结果
+
+    Args:
+        rows: 结果行，见 LotteryBatchResult.rows()
+        file_path: 导出文件路径
+        export_format: 导出格式 ('excel', 'csv')
+
+    Returns:
+        Tuple[bool, str]: (是否成功, 成功/错误消息)
+    """
+    if not rows:
+        error_msg = "没有可导出的抽奖结果"
+        logger.warning(error_msg)
+        return False, error_msg
+
+    export_data = _prepare_lottery_batch_export_data(rows)
+    if export_format.lower() == "excel":
+        return _generic_export_excel(export_data, file_path)
+    elif export_format.lower() == "csv":
+        return _generic_export_csv(export_data, file_path)
+    error_msg = f"不支持的导出格式: {export_format}"
+    logger.error(error_msg)
+    return False, error_msg
@@ -0,0 +1,107 @@
+# ==================================================
+# 导入库
+# ==================================================
+import random
+import threading
+from collections import deque
+from typing import Any, Callable, Optional
+
+from loguru import logger
+
+from app.tools.variable import (
+    ANIMATION_FRAME_BUFFER_SIZE,
+    ANIMATION_FRAME_REFILL_THRESHOLD,
+)
+
+
+# ==================================================
+# 动画帧预计算流
+# ==================================================
+class AnimationFrameStream:
+    """动画帧预计算环形缓冲区
+
+    动画开始时根据候选快照预先生成一批显示帧，消费过半后在后台线程中补充，
+    动画的每一帧只需从缓冲区取出一帧再更新组件。
+    动画帧只用于视觉效果，使用由系统熵源播种的独立 random.Random 生成，
+    不消耗随机数服务（包括确定性抽取会话）的序列；
+    最终显示的结果仍然来自真正的抽取逻辑。
+    """
+
+    def __init__(
+        self,
+        frame_factory: Callable[[random.Random], Any],
+        capacity: int = ANIMATION_FRAME_BUFFER_SIZE,
+        refill_threshold: int = ANIMATION_FRAME_REFILL_THRESHOLD,
+        key: Any = None,
+    ):
+        """初始化动画帧流
+
+        Args:
+            frame_factory: 帧生成函数，接收随机数生成器并返回一帧显示数据，
+                只能访问创建时的候选快照，不能读取文件或设置
+            capacity: 缓冲区容量
+            refill_threshold: 剩余帧数低于该值时触发后台补充
+            key: 帧流对应的参数标识，参数变化时调用方应重建帧流
+        """
+        self.key = key
+        self._frame_factory = frame_factory
+        self._capacity = max(1, int(capacity))
+        self._refill_threshold = max(0, min(int(refill_threshold), self._capacity))
+        self._frames = deque(maxlen=self._capacity)
+        self._rng = random.Random(random.SystemRandom().getrandbits(64))
+        self._rng_lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._refill_requested = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    def start(self) -> "AnimationFrameStream":
+        """同步填满缓冲区并启动后台补充线程"""
+        self._fill()
+        self._worker = threading.Thread(
+            target=self._refill_loop, daemon=True, name="AnimationFrameRefill"
+        )
+        self._worker.start()
+        return self
+
+    def next_frame(self) -> Any:
+        """取出下一帧；缓冲区耗尽时同步生成一帧"""
+        try:
+            frame = self._frames.popleft()
+        except IndexError:
+            frame = self._generate()
+        if len(self._frames) <= self._refill_threshold:
+            self._refill_requested.set()
+        return frame
+
+    def cancel(self) -> None:
+        """取消帧流，后台线程会在当前帧生成完成后退出"""
+        self._cancelled.set()
+        self._refill_requested.set()
+        self._frames.clear()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def _generate(self) -> Any:
+        with self._rng_lock:
+            return self._frame_factory(self._rng)
+
+    def _fill(self) -> None:
+        while not self._cancelled.is_set() and len(self._frames) < self._capacity:
+            self._frames.append(self._generate())
+
+    def _refill_loop(self) -> None:
+        while not self._cancelled.is_set():
+            self._refill_requested.wait()
+            self._refill_requested.clear()
+            if self._cancelled.is_set():
+                break
+            try:
+                self._fill()
+            except Exception as e:
+                logger.exception(f"补充动画帧失败: {e}")
+                break
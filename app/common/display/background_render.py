@@ -0,0 +1,593 @@
+# ====================== 1. 背景渲染 ======================
+# - background_size_bucket()  - 物理像素尺寸按步长向上取整
+# - source_digest()           - 图片文件摘要（路径、大小、修改时间）
+# - compose_background()      - 缩放裁剪、调整亮度、模糊（可在后台线程调用）
+# - render_background_image() - 按目标尺寸解码图片并合成背景（可在后台线程调用）
+# - blur_image()              - 缩小再放大的近似高斯模糊（可在后台线程调用）
+# ====================== 2. 背景缓存 ======================
+# - BackgroundRenderKey       - 缓存键（源摘要、尺寸、DPR、亮度、模糊半径）
+# - BackgroundRenderCache     - 内存 LRU + 磁盘缓存，在后台线程渲染，先返回最接近的尺寸
+# - get_background_render_cache() - 获取全局背景缓存
+# ====================== 3. 动画背景 ======================
+# - AnimatedBackground        - 预渲染 GIF 的全部帧，放不下时逐帧渲染，按帧率节流
+
+# ==================================================
+# 导入模块
+# ==================================================
+import bisect
+import hashlib
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+
+from loguru import logger
+from PySide6.QtCore import QObject, QRunnable, QSize, Qt, QThreadPool, QTimer, Signal
+from PySide6.QtGui import QColor, QImage, QImageReader, QMovie, QPainter
+
+from app.tools.path_utils import get_data_path
+from app.tools.variable import (
+    BACKGROUND_ANIMATION_MAX_FPS,
+    BACKGROUND_ANIMATION_PRERENDER_MB,
+    BACKGROUND_RENDER_DISK_CACHE_DIR,
+    BACKGROUND_RENDER_DISK_CACHE_MB,
+    BACKGROUND_RENDER_MEMORY_CACHE_SIZE,
+    BACKGROUND_RENDER_SIZE_STEP,
+)
+
+
+# ==================================================
+# 背景渲染
+# ==================================================
+def background_size_bucket(width: float, height: float, dpr: float) -> Tuple[int, int]:
+    """窗口尺寸换算为物理像素并按 BACKGROUND_RENDER_SIZE_STEP 向上取整
+
+    拖动调整窗口大小时尺寸每次只变化几个像素，取整后多数情况下仍命中同一个缓存。
+    """
+    step = max(1, int(BACKGROUND_RENDER_SIZE_STEP))
+    w = max(1, math.ceil(width * dpr))
+    h = max(1, math.ceil(height * dpr))
+    return -(-w // step) * step, -(-h // step) * step
+
+
+def source_digest(path: str) -> Optional[str]:
+    """图片文件摘要，文件不存在时返回 None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    raw = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def blur_image(image: QImage, radius: float) -> QImage:
+    """近似高斯模糊
+
+    先平滑缩小再平滑放大，缩小倍数随半径增大；与 QGraphicsBlurEffect 不同，
+    只使用 QImage，可以在后台线程中调用，边缘也不会变透明。
+
+    Args:
+        image: 源图片
+        radius: 模糊半径（像素）
+
+    Returns:
+        QImage: 模糊后的图片，尺寸不变
+    """
+    if image.isNull() or radius <= 0:
+        return image
+    w, h = image.width(), image.height()
+    factor = max(1.0, float(radius) / 2.0)
+    sw = max(1, int(w / factor))
+    sh = max(1, int(h / factor))
+    small = image.scaled(
+        sw,
+        sh,
+        Qt.AspectRatioMode.IgnoreAspectRatio,
+        Qt.TransformationMode.SmoothTransformation,
+    )
+    return small.scaled(
+        w,
+        h,
+        Qt.AspectRatioMode.IgnoreAspectRatio,
+        Qt.TransformationMode.SmoothTransformation,
+    )
+
+
+def compose_background(
+    image: QImage, width: int, height: int, brightness: int, blur_radius: float
+) -> QImage:
+    """把图片缩放裁剪为 width x height（铺满），再叠加亮度并模糊
+
+    Args:
+        image: 源图片
+        width: 目标宽度（物理像素）
+        height: 目标高度（物理像素）
+        brightness: 亮度（0-200，100 为原图）
+        blur_radius: 模糊半径（物理像素），0 表示不模糊
+
+    Returns:
+        QImage: 合成后的背景
+    """
+    if image.isNull() or width <= 0 or height <= 0:
+        return QImage()
+    pw, ph = image.width(), image.height()
+    if (pw, ph) != (width, height):
+        ratio = max(width / pw, height / ph)
+        sw = max(width, math.ceil(pw * ratio))
+        sh = max(height, math.ceil(ph * ratio))
+        image = image.scaled(
+            sw,
+            sh,
+            Qt.AspectRatioMode.IgnoreAspectRatio,
+            Qt.TransformationMode.SmoothTransformation,
+        ).copy((sw - width) // 2, (sh - height) // 2, width, height)
+    image = image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+
+    if brightness != 100:
+        alpha = int(abs(brightness - 100) / 100 * 180)
+        alpha = max(0, min(180, alpha))
+        value = 255 if brightness > 100 else 0
+        painter = QPainter(image)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceAtop)
+        painter.fillRect(image.rect(), QColor(value, value, value, alpha))
+        painter.end()
+
+    return blur_image(image, blur_radius)
+
+
+def render_background_image(
+    path: str, width: int, height: int, brightness: int, blur_radius: float
+) -> Optional[QImage]:
+    """按目标尺寸解码图片并合成背景，失败时返回 None
+
+    大图在解码时直接缩小到铺满目标所需的尺寸（JPEG 可按比例解码），
+    避免先解码出完整的原图再缩放。
+    """
+    reader = QImageReader(path)
+    size = reader.size()
+    if size.isValid() and size.width() > 0 and size.height() > 0:
+        ratio = max(width / size.width(), height / size.height())
+        if ratio < 1:
+            reader.setScaledSize(
+                QSize(
+                    max(width, math.ceil(size.width() * ratio)),
+                    max(height, math.ceil(size.height() * ratio)),
+                )
+            )
+    image = reader.read()
+    if image.isNull():
+        logger.debug(f"读取背景图片失败: {path}, {reader.errorString()}")
+        return None
+    return compose_background(image, width, height, brightness, blur_radius)
+
+
+# ==================================================
+# 背景缓存
+# ==================================================
+class BackgroundRenderKey(NamedTuple):
+    """背景缓存键，尺寸为取整后的物理像素"""
+
+    source: str
+    width: int
+    height: int
+    dpr: float
+    brightness: int
+    blur_radius: int
+
+    @property
+    def variant(self) -> tuple:
+        """除尺寸外的部分，相同 variant 的缓存可以缩放后临时代替"""
+        return (self.source, self.dpr, self.brightness, self.blur_radius)
+
+    @property
+    def file_stem(self) -> str:
+        return hashlib.sha1(repr(tuple(self)).encode("utf-8")).hexdigest()[:24]
+
+
+class _DiskCache:
+    """磁盘背景缓存，按修改时间淘汰（读取时会更新修改时间）"""
+
+    _EXTENSIONS = (".jpg", ".png")
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+
+    def load(self, key: BackgroundRenderKey) -> Optional[QImage]:
+        for ext in self._EXTENSIONS:
+            path = self.directory / f"{key.file_stem}{ext}"
+            if not path.exists():
+                continue
+            image = QImage(str(path))
+            if image.isNull() or (image.width(), image.height()) != (
+                key.width,
+                key.height,
+            ):
+                continue
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            return image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+        return None
+
+    def store(self, key: BackgroundRenderKey, image: QImage) -> None:
+        if self.max_bytes <= 0:
+            return
+        # 不透明的背景用 JPEG 保存，体积和编码耗时都小得多
+        ext = ".png" if _has_transparency(image) else ".jpg"
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / f"{key.file_stem}{ext}"
+            temp_path = path.with_suffix(ext + ".tmp")
+            if not image.save(str(temp_path), ext[1:].upper(), 92):
+                return
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.debug(f"写入背景缓存失败: {e}")
+            return
+        self._prune()
+
+    def _prune(self) -> None:
+        with self._lock:
+            try:
+                files = [
+                    (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                    for entry in os.scandir(self.directory)
+                    if entry.is_file() and entry.name.endswith(self._EXTENSIONS)
+                ]
+            except OSError:
+                return
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+
+
+def _has_transparency(image: QImage) -> bool:
+    if not image.hasAlphaChannel():
+        return False
+    # 只抽查四角和中心，背景图片很少有局部透明
+    w, h = image.width(), image.height()
+    points = ((0, 0), (w - 1, 0), (0, h - 1), (w - 1, h - 1), (w // 2, h // 2))
+    return any(image.pixelColor(x, y).alpha() < 255 for x, y in points)
+
+
+class _RenderSignals(QObject):
+    finished = Signal(object, object)  # BackgroundRenderKey, QImage | None
+
+
+class _RenderTask(QRunnable):
+    def __init__(self, key: BackgroundRenderKey, path: str, disk, signals):
+        super().__init__()
+        # 由 BackgroundRenderCache 持有引用，取消尚未开始的任务时还要用到
+        self.setAutoDelete(False)
+        self.key = key
+        self.path = path
+        self.disk = disk
+        self.signals = signals
+
+    def run(self):
+        key = self.key
+        image = None
+        try:
+            start = time.perf_counter()
+            image = self.disk.load(key)
+            if image is None:
+                image = render_background_image(
+                    self.path, key.width, key.height, key.brightness, key.blur_radius
+                )
+                if image is not None:
+                    self.disk.store(key, image)
+                    logger.debug(
+                        f"渲染背景 {key.width}x{key.height} 耗时 "
+                        f"{(time.perf_counter() - start) * 1000:.0f}ms"
+                    )
+        except Exception as e:
+            logger.exception(f"渲染背景失败: {e}")
+            image = None
+        self.signals.finished.emit(key, image)
+
+
+class BackgroundRenderCache(QObject):
+    """已渲染背景的缓存
+
+    - 内存中按 LRU 保留 BACKGROUND_RENDER_MEMORY_CACHE_SIZE 个背景，
+      磁盘缓存保存在 TEMP/background_cache 中，重新打开窗口或重启后直接读取；
+    - 缺少的尺寸在后台线程中渲染，期间 lookup 返回同一图片、亮度和模糊下最接近的已缓存尺寸；
+    - 同一背景连续请求多个尺寸时（拖动调整窗口大小），尚未开始的旧请求会被取消。
+    """
+
+    imageReady = Signal(object)  # BackgroundRenderKey
+
+    def __init__(self, parent=None, cache_dir=None, max_items=None):
+        super().__init__(parent)
+        if cache_dir is None:
+            cache_dir = get_data_path("TEMP", BACKGROUND_RENDER_DISK_CACHE_DIR)
+        max_bytes = BACKGROUND_RENDER_DISK_CACHE_MB * 1024 * 1024
+        self._disk = _DiskCache(cache_dir, max_bytes)
+        self._max_items = max(1, int(max_items or BACKGROUND_RENDER_MEMORY_CACHE_SIZE))
+        self._items: "OrderedDict[BackgroundRenderKey, QImage]" = OrderedDict()
+        self._pending: dict = {}  # variant -> (key, task)
+        self._failed: set = set()
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._signals = _RenderSignals(self)
+        self._signals.finished.connect(self._on_finished)
+
+    def lookup(self, key: BackgroundRenderKey, path: str) -> Tuple[QImage, bool]:
+        """获取背景
+
+        Args:
+            key: 缓存键
+            path: 图片路径（需要渲染时使用）
+
+        Returns:
+            tuple: (图片, 是否为所请求的尺寸)；还没有任何可用的尺寸时图片为空
+        """
+        image = self._items.get(key)
+        if image is not None:
+            self._items.move_to_end(key)
+            return image, True
+        if key not in self._failed:
+            self._schedule(key, path)
+        return self.nearest(key), False
+
+    def nearest(self, key: BackgroundRenderKey) -> QImage:
+        """同一 variant 中尺寸最接近的已缓存背景"""
+        best = None
+        best_distance = None
+        for other, image in self._items.items():
+            if other.variant != key.variant:
+                continue
+            distance = abs(other.width - key.width) + abs(other.height - key.height)
+            if best_distance is None or distance < best_distance:
+                best, best_distance = image, distance
+        return best if best is not None else QImage()
+
+    def _schedule(self, key: BackgroundRenderKey, path: str) -> None:
+        pending = self._pending.get(key.variant)
+        if pending is not None:
+            pending_key, task = pending
+            if pending_key == key:
+                return
+            if not self._pool.tryTake(task):
+                # 旧请求已经开始渲染，等它完成后再处理新的尺寸
+                return
+        task = _RenderTask(key, path, self._disk, self._signals)
+        self._pending[key.variant] = (key, task)
+        self._pool.start(task)
+
+    def _on_finished(self, key: BackgroundRenderKey, image) -> None:
+        pending = self._pending.get(key.variant)
+        if pending is not None and pending[0] == key:
+            self._pending.pop(key.variant, None)
+        if image is None or image.isNull():
+            self._failed.add(key)
+        else:
+            self._items[key] = image
+            self._items.move_to_end(key)
+            while len(self._items) > self._max_items:
+                self._items.popitem(last=False)
+        self.imageReady.emit(key)
+
+    def clear(self) -> None:
+        """清空内存缓存（磁盘缓存保留）"""
+        self._items.clear()
+        self._failed.clear()
+
+
+_background_render_cache: Optional[BackgroundRenderCache] = None
+
+
+def get_background_render_cache() -> BackgroundRenderCache:
+    """获取全局背景缓存（需要在 GUI 线程中首次调用）"""
+    global _background_render_cache
+    if _background_render_cache is None:
+        _background_render_cache = BackgroundRenderCache()
+    return _background_render_cache
+
+
+# ==================================================
+# 动画背景
+# ==================================================
+class _FrameSignals(QObject):
+    finished = Signal(object, object)  # 渲染参数, list | None
+
+
+class _FrameTask(QRunnable):
+    def __init__(self, path: str, params: tuple, signals):
+        super().__init__()
+        self.path = path
+        self.params = params
+        self.signals = signals
+
+    def run(self):
+        frames = None
+        try:
+            frames = _prerender_frames(self.path, *self.params)
+        except Exception as e:
+            logger.exception(f"预渲染动画背景失败: {e}")
+        self.signals.finished.emit(self.params, frames)
+
+
+def _frame_scale(blur_radius: float) -> float:
+    # 模糊后细节已经丢失，帧可以用较低的分辨率保存，绘制时再放大
+    return 1.0 if blur_radius <= 4 else 4.0 / blur_radius
+
+
+def _prerender_frames(
+    path: str, width: int, height: int, brightness: int, blur_radius: float
+) -> Optional[List[Tuple[QImage, int]]]:
+    """渲染 GIF 的全部帧，超出内存上限时返回 None"""
+    scale = _frame_scale(blur_radius)
+    fw = max(1, int(width * scale))
+    fh = max(1, int(height * scale))
+    budget = BACKGROUND_ANIMATION_PRERENDER_MB * 1024 * 1024
+    frame_bytes = fw * fh * 4
+    reader = QImageReader(path)
+    if reader.imageCount() > 0 and reader.imageCount() * frame_bytes > budget:
+        return None
+    frames: List[Tuple[QImage, int]] = []
+    while reader.canRead():
+        image = reader.read()
+        if image.isNull():
+            break
+        delay = reader.nextImageDelay()
+        frames.append(
+            (
+                compose_background(image, fw, fh, brightness, blur_radius * scale),
+                delay if delay > 0 else 100,
+            )
+        )
+        if len(frames) * frame_bytes > budget:
+            return None
+    return frames or None
+
+
+class AnimatedBackground(QObject):
+    """动画背景（GIF）
+
+    背景尺寸、亮度或模糊变化后，在后台线程把全部帧按当前参数渲染一次，之后直接循环播放；
+    帧数据超过 BACKGROUND_ANIMATION_PRERENDER_MB 时改为播放时逐帧渲染当前帧。
+    两种方式下 frameChanged 的频率都不超过 max_fps。
+    """
+
+    frameChanged = Signal()
+
+    def __init__(self, path: str, parent=None, max_fps: float = 0):
+        super().__init__(parent)
+        self.path = str(path)
+        self.max_fps = float(max_fps or BACKGROUND_ANIMATION_MAX_FPS)
+        self._params = None
+        self._frames: Optional[List[Tuple[QImage, int]]] = None
+        self._frame_ends: List[int] = []
+        self._prerender_failed: set = set()
+        self._pending = None
+        self._started = time.monotonic()
+        self._last_emit = 0.0
+        self._live_frame = -1
+        self._live_image = QImage()
+        self._shown_index = -1
+
+        self._movie = QMovie(self.path)
+        self._movie.setCacheMode(QMovie.CacheMode.CacheNone)
+        self._movie.frameChanged.connect(self._on_movie_frame)
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._on_tick)
+
+        self._signals = _FrameSignals(self)
+        self._signals.finished.connect(self._on_prerendered)
+
+    def is_valid(self) -> bool:
+        try:
+            return self._movie.isValid() and self._movie.jumpToFrame(0)
+        except Exception:
+            return False
+
+    def start(self) -> None:
+        self._started = time.monotonic()
+        if self._frames:
+            self._timer.start(self._interval_ms())
+        elif self._movie.state() != QMovie.MovieState.Running:
+            self._movie.start()
+
+    def stop(self) -> None:
+        self._timer.stop()
+        try:
+            self._movie.stop()
+        except Exception:
+            pass
+
+    def _interval_ms(self) -> int:
+        return max(1, int(1000 / max(1.0, self.max_fps)))
+
+    def current_image(
+        self, width: int, height: int, brightness: int, blur_radius: float
+    ) -> QImage:
+        """当前帧（已合成亮度和模糊），尺寸为物理像素
+
+        参数变化时在后台预渲染新的帧，完成前逐帧渲染当前帧。
+        """
+        params = (int(width), int(height), int(brightness), float(blur_radius))
+        if params != self._params:
+            self._params = params
+            self._frames = None
+            self._frame_ends = []
+            self._live_frame = -1
+            self._timer.stop()
+            if self._movie.state() != QMovie.MovieState.Running:
+                self._movie.start()
+            self._schedule_prerender(params)
+
+        if self._frames:
+            self._shown_index = self._frame_index()
+            return self._frames[self._shown_index][0]
+
+        frame = self._movie.currentFrameNumber()
+        if frame != self._live_frame or self._live_image.isNull():
+            source = self._movie.currentImage()
+            scale = _frame_scale(blur_radius)
+            self._live_image = compose_background(
+                source,
+                max(1, int(width * scale)),
+                max(1, int(height * scale)),
+                brightness,
+                blur_radius * scale,
+            )
+            self._live_frame = frame
+        return self._live_image
+
+    def _frame_index(self) -> int:
+        elapsed = int((time.monotonic() - self._started) * 1000)
+        index = bisect.bisect_right(self._frame_ends, elapsed % self._frame_ends[-1])
+        return min(index, len(self._frames) - 1)
+
+    def _schedule_prerender(self, params: tuple) -> None:
+        # 同时只预渲染一组参数，完成后如果参数已变化再渲染新的
+        if params in self._prerender_failed or self._pending is not None:
+            return
+        self._pending = params
+        QThreadPool.globalInstance().start(_FrameTask(self.path, params, self._signals))
+
+    def _on_prerendered(self, params: tuple, frames) -> None:
+        if self._pending == params:
+            self._pending = None
+        if params != self._params:
+            if self._pending is None and self._params is not None:
+                self._schedule_prerender(self._params)
+            return
+        if not frames:
+            self._prerender_failed.add(params)
+            logger.debug("动画背景帧过多，改为逐帧渲染")
+            return
+        self._frames = frames
+        ends, total = [], 0
+        for _, delay in frames:
+            total += delay
+            ends.append(total)
+        self._frame_ends = ends
+        self._movie.stop()
+        self._timer.start(self._interval_ms())
+        self.frameChanged.emit()
+
+    def _on_tick(self) -> None:
+        if self._frames and self._frame_index() != self._shown_index:
+            self.frameChanged.emit()
+
+    def _on_movie_frame(self, _frame: int) -> None:
+        now = time.monotonic()
+        if (now - self._last_emit) * 1000 < self._interval_ms():
+            return
+        self._last_emit = now
+        self.frameChanged.emit()
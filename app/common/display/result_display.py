@@ -1,14 +1,17 @@
 # ==================================================
 # 导入库
 # ==================================================
+import os
 import random
 import colorsys
+import threading
 import weakref
+from collections import OrderedDict
 from loguru import logger
 
 from PySide6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QMenu, QSizePolicy
-from PySide6.QtGui import QMouseEvent
-from PySide6.QtCore import Qt, QPoint, QTimer, QEvent
+from PySide6.QtGui import QMouseEvent, QImage
+from PySide6.QtCore import Qt, QPoint, QTimer, QEvent, QSize
 from qfluentwidgets import BodyLabel, AvatarWidget, ElevatedCardWidget, qconfig
 
 from app.tools.variable import (
@@ -29,15 +32,15 @@ from app.tools.variable import (
     DARK_THEME_MIN_VALUE,
     DARK_THEME_MAX_VALUE,
     RGB_COLOR_FORMAT,
+    AVATAR_PIXMAP_CACHE_SIZE,
+    RESULT_CELL_POOL_MAX_IDLE,
+    RESULT_CELL_POOL_TRIM_IDLE,
 )
-from app.tools.path_utils import file_exists, get_data_path
+from app.tools.path_utils import get_data_path
 from app.tools.personalised import is_dark_theme
 from app.tools.settings_access import readme_settings_async
 from app.common.data.list import get_group_members
-
-from random import SystemRandom
-
-system_random = SystemRandom()
+from app.tools.random_source import get_display_random
 
 # 移除了循环导入，将导入移到函数内部使用
 
@@ -191,6 +194,304 @@ class TouchResultWidget(QWidget):
             )
 
 
+# ==================================================
+# 头像图片索引与缓存
+# ==================================================
+class AvatarImageIndex:
+    """头像图片目录索引
+
+    每个图片目录只扫描一次，建立“文件名（不含扩展名）-> 路径”的映射，
+    之后通过目录 mtime 判断是否需要重建，避免每个学生逐个扩展名调用 file_exists。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._indexes = {}  # image_dir -> (mtime_ns, {stem: path})
+
+    def find(self, image_dir, image_name):
+        """查找图片路径，不存在时返回 None"""
+        index = self._get_index(image_dir)
+        return index.get(str(image_name))
+
+    def invalidate(self, image_dir=None):
+        """使索引失效，下次查找时重新扫描"""
+        with self._lock:
+            if image_dir is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(image_dir, None)
+
+    def _get_index(self, image_dir):
+        dir_path = str(get_data_path("images", image_dir))
+        try:
+            mtime_ns = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+
+        with self._lock:
+            cached = self._indexes.get(image_dir)
+            if cached is not None and cached[0] == mtime_ns:
+                return cached[1]
+
+        index = self._scan(dir_path) if mtime_ns is not None else {}
+        with self._lock:
+            self._indexes[image_dir] = (mtime_ns, index)
+        if cached is not None:
+            # 目录内容发生变化，已缓存的缩放头像可能已过期
+            ResultDisplayUtils._avatar_cache.invalidate(dir_path)
+        return index
+
+    @staticmethod
+    def _scan(dir_path):
+        ext_priority = {ext: i for i, ext in enumerate(SUPPORTED_IMAGE_EXTENSIONS)}
+        best = {}
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    if not entry.is_file():
+                        continue
+                    stem, ext = os.path.splitext(entry.name)
+                    priority = ext_priority.get(ext.lower())
+                    if priority is None:
+                        continue
+                    current = best.get(stem)
+                    if current is None or priority < current[0]:
+                        best[stem] = (priority, entry.path)
+        except OSError as e:
+            logger.debug("扫描头像目录失败: {}, {}", dir_path, e)
+            return {}
+        return {stem: path for stem, (_, path) in best.items()}
+
+
+class AvatarPixmapCache:
+    """已缩放头像图片的 LRU 缓存
+
+    键为 (图片路径, 边长, 设备像素比)，值为居中裁剪为正方形、
+    按物理像素缩放好的 QImage，AvatarWidget 绘制时无需再次解码和缩放。
+    """
+
+    def __init__(self, max_size=AVATAR_PIXMAP_CACHE_SIZE):
+        self._max_size = max(1, int(max_size))
+        self._lock = threading.Lock()
+        self._items = OrderedDict()
+
+    def get(self, image_path, size, dpr):
+        """获取缩放后的头像图片，加载失败时返回 None"""
+        key = (image_path, int(size), round(float(dpr), 2))
+        with self._lock:
+            image = self._items.get(key)
+            if image is not None:
+                self._items.move_to_end(key)
+                return image
+
+        image = self._render(image_path, key[1], key[2])
+        if image is None:
+            return None
+        with self._lock:
+            self._items[key] = image
+            self._items.move_to_end(key)
+            while len(self._items) > self._max_size:
+                self._items.popitem(last=False)
+        return image
+
+    def invalidate(self, path_prefix=None):
+        """清除缓存，指定 path_prefix 时只清除该目录下的图片"""
+        with self._lock:
+            if path_prefix is None:
+                self._items.clear()
+                return
+            for key in [k for k in self._items if k[0].startswith(path_prefix)]:
+                self._items.pop(key, None)
+
+    def __len__(self):
+        return len(self._items)
+
+    @staticmethod
+    def _render(image_path, size, dpr):
+        source = QImage(image_path)
+        if source.isNull():
+            return None
+        side = max(1, int(size * dpr))
+        scaled = source.scaled(
+            QSize(side, side),
+            Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+            Qt.TransformationMode.SmoothTransformation,
+        )
+        x = max(0, (scaled.width() - side) // 2)
+        y = max(0, (scaled.height() - side) // 2)
+        return scaled.copy(x, y, side, side)
+
+
+# ==================================================
+# 可复用的结果单元格
+# ==================================================
+class ResultCellWidget(TouchResultWidget):
+    """可复用的结果单元格
+
+    结构（是否显示头像、头像位置、是否卡片样式、排列方向）由 signature 决定，
+    在动画的每一帧中只更新文本、样式和头像，不再销毁重建子组件。
+    """
+
+    def __init__(self, signature, parent=None):
+        super().__init__(parent)
+        self.signature = signature
+        vertical, show_image, image_position, use_card = signature
+
+        self._text = None
+        self._style_sheet = None
+        self._avatar_key = None
+        self._radius = None
+
+        inner_layout = QVBoxLayout(self) if vertical else QHBoxLayout(self)
+        inner_layout.setContentsMargins(0, 0, 0, 0)
+        inner_layout.setSpacing(0)
+
+        self.text_label = BodyLabel()
+        self.text_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.avatar = None
+
+        content = self.text_label
+        if show_image:
+            content = QWidget(self)
+            use_vertical_layout = image_position in (1, 3)
+            layout = (
+                QVBoxLayout(content) if use_vertical_layout else QHBoxLayout(content)
+            )
+            layout.setSpacing(AVATAR_LABEL_SPACING)
+            layout.setContentsMargins(0, 0, 0, 0)
+            self.avatar = AvatarWidget()
+            align = (
+                Qt.AlignmentFlag.AlignHCenter
+                if use_vertical_layout
+                else Qt.AlignmentFlag.AlignVCenter
+            )
+            if image_position in (2, 3):
+                layout.addWidget(self.text_label, 0, align)
+                layout.addWidget(self.avatar, 0, align)
+            else:
+                layout.addWidget(self.avatar, 0, align)
+                layout.addWidget(self.text_label, 0, align)
+
+        self.card = None
+        if use_card:
+            self.card = ElevatedCardWidget(self)
+            card_layout = QVBoxLayout(self.card)
+            card_layout.setContentsMargins(12, 12, 12, 12)
+            card_layout.setSpacing(4)
+            card_layout.addWidget(content, 0, Qt.AlignmentFlag.AlignCenter)
+            card_layout.setSizeConstraint(QVBoxLayout.SizeConstraint.SetMinimumSize)
+            self.card.setSizePolicy(
+                QSizePolicy.Policy.MinimumExpanding,
+                QSizePolicy.Policy.MinimumExpanding,
+            )
+            content = self.card
+
+        inner_layout.addWidget(content)
+
+    def bind(self, text, style_sheet, image_path=None, name="", radius=None):
+        """更新单元格内容，仅在值发生变化时才调用 Qt 的 setter"""
+        changed = False
+        if text != self._text:
+            self.text_label.setText(text)
+            self._text = text
+            changed = True
+        if style_sheet != self._style_sheet:
+            self.text_label.setStyleSheet(style_sheet)
+            self._style_sheet = style_sheet
+            changed = True
+
+        if self.avatar is not None:
+            if radius != self._radius:
+                self.avatar.setRadius(radius)
+                self._radius = radius
+                self._avatar_key = None
+            avatar_key = (image_path, name)
+            if avatar_key != self._avatar_key:
+                image = None
+                if image_path is not None:
+                    image = ResultDisplayUtils._avatar_cache.get(
+                        image_path, radius * 2, self.devicePixelRatioF()
+                    )
+                if image is not None:
+                    self.avatar.setImage(image)
+                else:
+                    self.avatar.setImage(QImage())
+                    self.avatar.setText(name)
+                self.avatar.setRadius(radius)
+                self._avatar_key = avatar_key
+                changed = True
+
+        if changed and self.card is not None:
+            layout = self.card.layout()
+            layout.activate()
+            self.card.setMinimumSize(layout.sizeHint())
+
+
+class ResultCellPool:
+    """结果单元格对象池，按结构签名复用 ResultCellWidget"""
+
+    def __init__(self, max_idle=RESULT_CELL_POOL_MAX_IDLE):
+        self._max_idle = max(0, int(max_idle))
+        self._idle = {}
+        self._idle_count = 0
+        self.active = []
+        self.created_count = 0
+
+    def acquire(self, signature, parent=None):
+        """取出一个指定结构的单元格，池中没有时才新建"""
+        idle_cells = self._idle.get(signature)
+        while idle_cells:
+            cell = idle_cells.pop()
+            self._idle_count -= 1
+            try:
+                if parent is not None and cell.parentWidget() is not parent:
+                    cell.setParent(parent)
+                return cell
+            except RuntimeError:
+                # 单元格已随父组件一起被销毁
+                continue
+        self.created_count += 1
+        return ResultCellWidget(signature, parent)
+
+    def release(self, cell):
+        """归还单元格，超出空闲上限时直接销毁"""
+        try:
+            cell.hide()
+        except RuntimeError:
+            return
+        if self._idle_count >= self._max_idle:
+            cell.setParent(None)
+            cell.deleteLater()
+            return
+        self._idle.setdefault(cell.signature, []).append(cell)
+        self._idle_count += 1
+
+    def owns(self, widget):
+        return isinstance(widget, ResultCellWidget) and widget in self.active
+
+    def trim(self, keep):
+        """销毁多余的空闲单元格，只保留 keep 个，先销毁较早归还的"""
+        keep = max(0, int(keep))
+        for signature, cells in list(self._idle.items()):
+            if self._idle_count <= keep:
+                break
+            drop = min(len(cells), self._idle_count - keep)
+            for cell in cells[:drop]:
+                try:
+                    cell.setParent(None)
+                    cell.deleteLater()
+                except RuntimeError:
+                    pass
+            del cells[:drop]
+            self._idle_count -= drop
+            if not cells:
+                del self._idle[signature]
+
+    def clear(self):
+        """销毁池中所有空闲单元格"""
+        self.trim(0)
+
+
 # ==================================================
 # 结果显示工具类
 # ==================================================
@@ -200,6 +501,9 @@ class ResultDisplayUtils:
     _color_cache = {}
     _max_cache_size = 100  # 限制颜色缓存大小
     _weak_widget_refs = weakref.WeakSet()  # 使用弱引用跟踪widget
+    _avatar_index = AvatarImageIndex()  # 头像图片目录索引
+    _avatar_cache = AvatarPixmapCache()  # 已缩放头像的 LRU 缓存
+    _cell_pools = weakref.WeakSet()  # 各结果网格的单元格对象池
 
     @staticmethod
     def _clear_color_cache():
@@ -260,13 +564,15 @@ class ResultDisplayUtils:
         """
         # 小组模式下，根据show_random设置显示格式
         if is_group_mode:
-            # 获取小组成员列表
-            group_members = get_group_members(class_name, name)
+            # 获取小组成员列表（仅在需要显示随机成员时读取名单）
+            group_members = (
+                get_group_members(class_name, name) if show_random in (1, 2) else []
+            )
 
             if show_random == 1:  # 组名[换行]随机选择的成员
                 if group_members:
                     # 随机选择一个成员
-                    selected_member = system_random.choice(group_members)
+                    selected_member = get_display_random().choice(group_members)
                     selected_name = selected_member["name"]
                     return f"{name}\n{selected_name}"
                 else:
@@ -274,7 +580,7 @@ class ResultDisplayUtils:
             elif show_random == 2:  # 组名[短横杠]随机选择的成员
                 if group_members:
                     # 随机选择一个成员
-                    selected_member = system_random.choice(group_members)
+                    selected_member = get_display_random().choice(group_members)
                     selected_name = selected_member["name"]
                     return f"{name} - {selected_name}"
                 else:
@@ -366,6 +672,38 @@ class ResultDisplayUtils:
             except Exception:
                 return "#000000"
 
+    @staticmethod
+    def _resolve_label_font(settings_group, custom_font_family=""):
+        """
+        读取标签样式相关设置（每次渲染只需读取一次）
+
+        返回:
+            tuple: (字体族样式前缀, 固定颜色)
+        """
+        # 检查是否使用全局字体
+        use_global_font = readme_settings_async(settings_group, "use_global_font")
+        custom_font = None
+        if use_global_font == 1:  # 不使用全局字体，使用自定义字体
+            custom_font = readme_settings_async(settings_group, "custom_font")
+
+        # 如果传入了自定义字体族，则使用传入的字体族
+        if custom_font_family:
+            custom_font = custom_font_family
+
+        fixed_color = readme_settings_async(settings_group, "animation_fixed_color")
+        font_prefix = (
+            f"font-family: '{custom_font}'; "
+            if custom_font and use_global_font == 1
+            else ""
+        )
+        return font_prefix, fixed_color
+
+    @staticmethod
+    def _compose_label_style(font_size, animation_color, font_prefix, fixed_color):
+        """根据已读取的设置生成标签样式表"""
+        color_str = ResultDisplayUtils._get_style_color(animation_color, fixed_color)
+        return f"{font_prefix}font-size: {font_size}pt; color: {color_str} !important;"
+
     @staticmethod
     def _apply_label_style(
         label,
@@ -384,22 +722,12 @@ class ResultDisplayUtils:
             settings_group: 设置组名称，默认为roll_call_settings
             custom_font_family: 自定义字体族
         """
-        # 检查是否使用全局字体
-        use_global_font = readme_settings_async(settings_group, "use_global_font")
-        custom_font = None
-        if use_global_font == 1:  # 不使用全局字体，使用自定义字体
-            custom_font = readme_settings_async(settings_group, "custom_font")
-
-        # 如果传入了自定义字体族，则使用传入的字体族
-        if custom_font_family:
-            custom_font = custom_font_family
-
-        fixed_color = readme_settings_async(settings_group, "animation_fixed_color")
-        color_str = ResultDisplayUtils._get_style_color(animation_color, fixed_color)
-
-        style_sheet = f"font-size: {font_size}pt; color: {color_str} !important;"
-        if custom_font and use_global_font == 1:
-            style_sheet = f"font-family: '{custom_font}'; {style_sheet}"
+        font_prefix, fixed_color = ResultDisplayUtils._resolve_label_font(
+            settings_group, custom_font_family
+        )
+        style_sheet = ResultDisplayUtils._compose_label_style(
+            font_size, animation_color, font_prefix, fixed_color
+        )
 
         def apply_to_widget(widget):
             if isinstance(widget, BodyLabel):
@@ -419,56 +747,28 @@ class ResultDisplayUtils:
 
     @staticmethod
     def _find_student_image(image_dir, image_name):
-        """查找学生图片"""
-        for ext in SUPPORTED_IMAGE_EXTENSIONS:
-            path = get_data_path("images", f"{image_dir}/{image_name}{ext}")
-            if file_exists(path):
-                return str(path)
-        return None
+        """查找学生图片（通过目录索引，目录变化时自动刷新）"""
+        return ResultDisplayUtils._avatar_index.find(image_dir, image_name)
 
     @staticmethod
-    def create_student_label(
+    def _prepare_student_cells(
         class_name,
         selected_students,
-        draw_count=1,
-        font_size=50,
-        animation_color=0,
-        display_format=0,
-        display_style=None,
-        show_student_image=False,
-        image_position=None,
-        group_index=0,
-        show_random=0,
-        settings_group="roll_call_settings",
-        custom_font_family="",
+        draw_count,
+        display_format,
+        display_style,
+        show_student_image,
+        image_position,
+        group_index,
+        show_random,
+        settings_group,
     ):
         """
-        创建学生显示标签
-
-        参数:
-            selected_students: 选中的学生列表 [(num, selected, exist), ...]
-            draw_count: 抽取人数
-            font_size: 字体大小
-            animation_color: 动画颜色模式 (0:默认, 1:随机颜色, 2:固定颜色)
-            display_format: 显示格式 (0:学号+姓名, 1:仅姓名, 2:仅学号)
-            show_student_image: 是否显示学生头像
-            group_index: 小组索引 (0:全班, 1:随机小组, >1:指定小组)
-            show_random: 随机组员显示格式 (0:不显示, 1:组名[换行]姓名, 2:组名[短横杠]姓名)
-            settings_group: 设置组名称，默认为roll_call_settings
-            custom_font_family: 自定义字体族
+        计算每个结果单元格需要显示的内容（不创建任何组件）
 
         返回:
-            list: 创建的标签列表
+            tuple: (display_style, image_position, [(文本, 名称, 图片路径), ...])
         """
-        # 检查 selected_students 是否为 None，避免后续的 len() 调用和迭代操作失败
-        if selected_students is None:
-            logger.warning(
-                "create_student_label: selected_students 为 None，可能是未设置默认班级或抽取名单"
-            )
-            return []
-
-        student_labels = [None] * len(selected_students)
-
         # 确定图片目录
         image_dir = (
             "prize_images" if settings_group == "lottery_settings" else "student_images"
@@ -497,7 +797,8 @@ class ResultDisplayUtils:
         except Exception:
             image_position = 0
 
-        for i, (num, selected, exist) in enumerate(selected_students):
+        cells = []
+        for num, selected, exist in selected_students:
             current_image_path = None
             if show_student_image:
                 image_name = str(selected)
@@ -530,6 +831,68 @@ class ResultDisplayUtils:
                 is_group_mode=(group_index == 1),
                 show_random=show_random,
             )
+            cells.append((text, name, current_image_path))
+
+        return display_style, image_position, cells
+
+    @staticmethod
+    def create_student_label(
+        class_name,
+        selected_students,
+        draw_count=1,
+        font_size=50,
+        animation_color=0,
+        display_format=0,
+        display_style=None,
+        show_student_image=False,
+        image_position=None,
+        group_index=0,
+        show_random=0,
+        settings_group="roll_call_settings",
+        custom_font_family="",
+    ):
+        """
+        创建学生显示标签
+
+        参数:
+            selected_students: 选中的学生列表 [(num, selected, exist), ...]
+            draw_count: 抽取人数
+            font_size: 字体大小
+            animation_color: 动画颜色模式 (0:默认, 1:随机颜色, 2:固定颜色)
+            display_format: 显示格式 (0:学号+姓名, 1:仅姓名, 2:仅学号)
+            show_student_image: 是否显示学生头像
+            group_index: 小组索引 (0:全班, 1:随机小组, >1:指定小组)
+            show_random: 随机组员显示格式 (0:不显示, 1:组名[换行]姓名, 2:组名[短横杠]姓名)
+            settings_group: 设置组名称，默认为roll_call_settings
+            custom_font_family: 自定义字体族
+
+        返回:
+            list: 创建的标签列表
+        """
+        # 检查 selected_students 是否为 None，避免后续的 len() 调用和迭代操作失败
+        if selected_students is None:
+            logger.warning(
+                "create_student_label: selected_students 为 None，可能是未设置默认班级或抽取名单"
+            )
+            return []
+
+        display_style, image_position, cells = (
+            ResultDisplayUtils._prepare_student_cells(
+                class_name,
+                selected_students,
+                draw_count,
+                display_format,
+                display_style,
+                show_student_image,
+                image_position,
+                group_index,
+                show_random,
+                settings_group,
+            )
+        )
+
+        student_labels = [None] * len(cells)
+        for i, (text, name, current_image_path) in enumerate(cells):
             # 使用支持触屏的容器包装所有内容，确保整个区域都能响应触屏操作
             touch_container = TouchResultWidget()
             touch_container.setAttribute(Qt.WA_DeleteOnClose)  # 自动清理
@@ -585,6 +948,102 @@ class ResultDisplayUtils:
 
         return student_labels
 
+    @staticmethod
+    def get_cell_pool(result_grid):
+        """获取（必要时创建）结果网格对应的单元格对象池"""
+        pool = getattr(result_grid, "_result_cell_pool", None)
+        if pool is None:
+            pool = ResultCellPool()
+            result_grid._result_cell_pool = pool
+            ResultDisplayUtils._cell_pools.add(pool)
+        return pool
+
+    @staticmethod
+    def render_student_labels(
+        result_grid,
+        class_name,
+        selected_students,
+        draw_count=1,
+        font_size=50,
+        animation_color=0,
+        display_format=0,
+        display_style=None,
+        show_student_image=False,
+        image_position=None,
+        group_index=0,
+        show_random=0,
+        settings_group="roll_call_settings",
+        custom_font_family="",
+    ):
+        """
+        使用对象池中的单元格在网格中显示结果
+
+        参数与 create_student_label 相同。结果数量和结构不变时（动画的每一帧），
+        只更新已有单元格的文本、样式和头像，不创建也不销毁任何组件。
+
+        返回:
+            list: 当前显示的单元格列表
+        """
+        if selected_students is None:
+            logger.warning(
+                "render_student_labels: selected_students 为 None，可能是未设置默认班级或抽取名单"
+            )
+            selected_students = []
+
+        display_style, image_position, cells = (
+            ResultDisplayUtils._prepare_student_cells(
+                class_name,
+                selected_students,
+                draw_count,
+                display_format,
+                display_style,
+                show_student_image,
+                image_position,
+                group_index,
+                show_random,
+                settings_group,
+            )
+        )
+        signature = (
+            draw_count == 1,
+            bool(show_student_image),
+            image_position,
+            display_style == 1,
+        )
+        radius = font_size * 2 if draw_count == 1 else int(font_size * 1.5)
+        font_prefix, fixed_color = ResultDisplayUtils._resolve_label_font(
+            settings_group, custom_font_family
+        )
+
+        pool = ResultDisplayUtils.get_cell_pool(result_grid)
+        current = ResultDisplayUtils.collect_grid_widgets(result_grid)
+        reusable = (
+            len(current) == len(cells)
+            and current == pool.active
+            and all(cell.signature == signature for cell in current)
+        )
+        if not reusable:
+            ResultDisplayUtils.clear_grid(result_grid)
+            parent_widget = None
+            try:
+                parent_widget = result_grid.parentWidget()
+            except Exception:
+                parent_widget = None
+            current = [pool.acquire(signature, parent_widget) for _ in cells]
+
+        for cell, (text, name, image_path) in zip(current, cells, strict=True):
+            style_sheet = ResultDisplayUtils._compose_label_style(
+                font_size, animation_color, font_prefix, fixed_color
+            )
+            cell.bind(text, style_sheet, image_path, name, radius)
+
+        if not reusable:
+            ResultDisplayUtils.display_results_in_grid(result_grid, current)
+            pool.active = list(current)
+            for cell in current:
+                cell.show()
+        return current
+
     @staticmethod
     def _generate_vibrant_color(
         min_saturation=DEFAULT_MIN_SATURATION,
@@ -877,8 +1336,11 @@ class ResultDisplayUtils:
             ResultDisplayUtils._color_cache.clear()
             return
 
+        pool = getattr(result_grid, "_result_cell_pool", None)
         count = result_grid.count()
         if count == 0:
+            if pool is not None:
+                pool.active = []
             ResultDisplayUtils._color_cache.clear()
             return
 
@@ -896,6 +1358,10 @@ class ResultDisplayUtils:
                 except Exception:
                     widget = None
             if widget:
+                if pool is not None and isinstance(widget, ResultCellWidget):
+                    # 池化的单元格归还对象池，供下一次显示复用
+                    pool.release(widget)
+                    continue
                 widget.hide()
                 widget.setParent(None)
                 widget.deleteLater()
@@ -914,8 +1380,11 @@ class ResultDisplayUtils:
                 except Exception:
                     pass
 
+        if pool is not None:
+            pool.active = []
+
         if log_debug and removed_count > 0:
-            logger.debug(f"本次销毁了{removed_count}个组件")
+            logger.debug("本次销毁了{}个组件", removed_count)
 
         ResultDisplayUtils._color_cache.clear()
 
@@ -965,6 +1434,11 @@ class ResultDisplayUtils:
         # 清理弱引用集合
         ResultDisplayUtils._weak_widget_refs.clear()
 
+        # 清理已缩放头像缓存，各对象池只保留少量空闲单元格供下次抽取复用
+        ResultDisplayUtils._avatar_cache.invalidate()
+        for pool in list(ResultDisplayUtils._cell_pools):
+            pool.trim(RESULT_CELL_POOL_TRIM_IDLE)
+
         # 可选：强制垃圾回收
         # import gc
         # gc.collect()
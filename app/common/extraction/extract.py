@@ -1,5 +1,4 @@
-import json
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 from PySide6.QtCore import QDateTime
 from PySide6.QtGui import *
@@ -11,8 +10,10 @@ from qfluentwidgets import *
 from app.Language.obtain_language import get_content_name_async
 from app.common.IPC_URL.csharp_ipc_handler import CSharpIPCHandler
 from app.common.extraction.cses_parser import CSESParser
+from app.tools.json_store import read_json, write_json
 from app.tools.path_utils import *
 from app.tools.settings_access import readme_settings_async
+from app.tools.variable import CLASSISLAND_BOUNDARY_FALLBACK_S
 
 
 def _get_break_assignment_class_info() -> Dict:
@@ -191,6 +192,76 @@ def _is_non_class_time() -> bool:
         return False
 
 
+def _get_seconds_to_next_non_class_boundary() -> Optional[float]:
+    """计算距离 _is_non_class_time() 结果可能发生变化的下一个时间点的秒数
+
+    边界包括每节课的开始/结束时间、提前解禁时间点、下课延迟禁用时间点以及午夜（换日）。
+    调用方只需在这些边界重新检测一次，而不必按固定间隔轮询。
+
+    Returns:
+        Optional[float]: 距下一个边界的秒数；结果在设置变化前不会改变时返回None
+    """
+    try:
+        if not readme_settings_async("linkage_settings", "instant_draw_disable"):
+            return None
+
+        data_source = readme_settings_async("linkage_settings", "data_source")
+        if data_source == 0:
+            return None
+
+        pre_class_enable_time = int(
+            readme_settings_async("linkage_settings", "pre_class_enable_time") or 0
+        )
+        post_class_disable_delay = int(
+            readme_settings_async("linkage_settings", "post_class_disable_delay") or 0
+        )
+
+        candidates = []
+        if data_source == 2:
+            # ClassIsland 只提供距离上课的时间，下课时间无法预知时退回固定间隔
+            handler = CSharpIPCHandler.instance()
+            on_class_left_time = handler.get_on_class_left_time()
+            if on_class_left_time > 0:
+                candidates.append(on_class_left_time - pre_class_enable_time)
+                candidates.append(on_class_left_time)
+                elapsed = handler.get_elapsed_since_previous_time_point_end_seconds()
+                if 0 < elapsed <= post_class_disable_delay:
+                    candidates.append(post_class_disable_delay - elapsed + 1)
+            candidates = [c for c in candidates if c > 0]
+            if not candidates:
+                return float(CLASSISLAND_BOUNDARY_FALLBACK_S)
+            return float(min(candidates))
+
+        current_total_seconds = _get_current_time_in_seconds()
+        candidates.append(24 * 3600)
+        class_times = _get_class_times_by_day(_get_current_day_of_week())
+        if isinstance(class_times, dict):
+            for time_range in class_times.values():
+                try:
+                    start_time_str, end_time_str = time_range.split("-")
+                    start_seconds = _parse_time_string_to_seconds(start_time_str)
+                    end_seconds = _parse_time_string_to_seconds(end_time_str)
+                except Exception:
+                    continue
+                candidates.extend(
+                    (
+                        start_seconds - pre_class_enable_time,
+                        start_seconds,
+                        end_seconds,
+                        end_seconds + post_class_disable_delay + 1,
+                    )
+                )
+
+        return float(
+            min(c for c in candidates if c > current_total_seconds)
+            - current_total_seconds
+        )
+
+    except Exception as e:
+        logger.exception(f"计算下一个上下课时间边界失败: {e}")
+        return None
+
+
 def _get_current_time_in_seconds() -> int:
     """获取当前时间并转换为总秒数
 
@@ -272,8 +343,11 @@ def _is_time_in_ranges(current_seconds: int, time_ranges: Dict[str, str]) -> boo
     return False
 
 
+_cses_parser_cache: Optional[Tuple[Tuple[str, int], CSESParser]] = None
+
+
 def _get_cses_parser() -> CSESParser | None:
-    """获取CSES解析器实例
+    """获取CSES解析器实例（文件未修改时复用上次的解析结果）
 
     Returns:
         CSESParser | None: 成功返回解析器实例，失败返回None
@@ -290,11 +364,18 @@ def _get_cses_parser() -> CSESParser | None:
             logger.info("CSES文件不存在")
             return None
 
+        global _cses_parser_cache
+        mtime_ns = cses_file_path.stat().st_mtime_ns
+        cache_key = (str(cses_file_path), mtime_ns)
+        if _cses_parser_cache is not None and _cses_parser_cache[0] == cache_key:
+            return _cses_parser_cache[1]
+
         parser = CSESParser()
         if not parser.load_from_file(str(cses_file_path)):
             logger.error(f"加载CSES文件失败: {str(cses_file_path)}")
             return None
 
+        _cses_parser_cache = (cache_key, parser)
         return parser
 
     except Exception as e:
@@ -480,15 +561,13 @@ def _save_non_class_times_to_settings(non_class_times: Dict[str, str]) -> bool:
         settings_path = get_settings_path()
 
         if file_exists(settings_path):
-            with open_file(settings_path, "r", encoding="utf-8") as f:
-                settings = json.load(f)
+            settings = read_json(settings_path)
         else:
             settings = {}
 
         settings["non_class_times"] = non_class_times
 
-        with open_file(settings_path, "w", encoding="utf-8") as f:
-            json.dump(settings, f, ensure_ascii=False, indent=2)
+        write_json(settings_path, settings, indent=2)
 
         logger.info(f"成功保存{len(non_class_times)}个非上课时间段到设置文件")
         return True
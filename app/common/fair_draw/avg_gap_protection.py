@@ -54,19 +54,19 @@ def _get_expanded_pool(
         if count <= new_threshold:
             expanded_pool.append(student)
 
-    logger.debug(f"第一次扩大后候选池人数: {len(expanded_pool)}")
+    logger.debug("第一次扩大后候选池人数: {}", len(expanded_pool))
 
     # 如果仍然不足，继续向上扩大，直到达到最大次数
     while len(expanded_pool) < target_count and new_threshold < max_count:
         new_threshold += 1
-        logger.debug(f"扩大后仍不足，继续扩大到阈值: {new_threshold}")
+        logger.debug("扩大后仍不足，继续扩大到阈值: {}", new_threshold)
         expanded_pool = []
         for student in candidates:
             student_name = _get_student_name(student)
             count = student_counts.get(student_name, 0)
             if count <= new_threshold:
                 expanded_pool.append(student)
-        logger.debug(f"再次扩大后候选池人数: {len(expanded_pool)}")
+        logger.debug("再次扩大后候选池人数: {}", len(expanded_pool))
 
     return expanded_pool
 
@@ -103,7 +103,10 @@ def apply_avg_gap_protection(
     min_pool_size = readme_settings_async("fair_draw_settings", "min_pool_size")
 
     logger.debug(
-        f"应用平均值差值保护，抽取人数: {draw_count}, 差距阈值: {gap_threshold}, 最小池大小: {min_pool_size}"
+        "应用平均值差值保护，抽取人数: {}, 差距阈值: {}, 最小池大小: {}",
+        draw_count,
+        gap_threshold,
+        min_pool_size,
     )
 
     # 检查候选列表是否为空
@@ -154,7 +157,7 @@ def apply_avg_gap_protection(
         max_count = max(counts)
 
         logger.debug(
-            f"当前平均值: {avg:.2f}, 最小次数: {min_count}, 最大次数: {max_count}"
+            "当前平均值: {:.2f}, 最小次数: {}, 最大次数: {}", avg, min_count, max_count
         )
 
         # Step 3: 初始候选池（≤平均值）
@@ -181,7 +184,7 @@ def apply_avg_gap_protection(
             if filtered_candidates:
                 # 重新计算剩余人的平均值
                 new_avg = sum(filtered_counts) / len(filtered_counts)
-                logger.debug(f"排除极值后，新平均值: {new_avg:.2f}")
+                logger.debug("排除极值后，新平均值: {:.2f}", new_avg)
 
                 # 更新 pool_initial 为剩余人中 ≤ 新平均值 的人
                 pool_initial = []
@@ -191,7 +194,7 @@ def apply_avg_gap_protection(
                     if count <= new_avg:
                         pool_initial.append(student)
 
-        logger.debug(f"初始候选池人数: {len(pool_initial)}")
+        logger.debug("初始候选池人数: {}", len(pool_initial))
 
         # Step 5: 综合处理 - 人数不足时向上补齐 + 候选池最小人数保障
         # 计算需要满足的最小池大小（取draw_count和min_pool_size中的较大值）
@@ -199,14 +202,16 @@ def apply_avg_gap_protection(
 
         if len(pool_initial) < required_size:
             logger.debug(
-                f"候选池人数({len(pool_initial)})低于所需大小({required_size})，执行扩展"
+                "候选池人数({})低于所需大小({})，执行扩展",
+                len(pool_initial),
+                required_size,
             )
 
             # 向上的一个总抽取次数 - 先尝试使用整数平均值+1作为新的阈值
             avg_int = int(avg) if avg.is_integer() else int(avg) + 1
             new_threshold = avg_int
 
-            logger.debug(f"当前平均次数: {avg:.2f}, 初始扩展阈值: {new_threshold}")
+            logger.debug("当前平均次数: {:.2f}, 初始扩展阈值: {}", avg, new_threshold)
 
             # 扩展候选池
             expanded_pool = _get_expanded_pool(
@@ -215,7 +220,7 @@ def apply_avg_gap_protection(
 
             # 如果还是不足，就使用所有候选学生
             if len(expanded_pool) < required_size:
-                logger.debug(f"扩大到最大阈值({max_count})后仍不足，使用所有候选学生")
+                logger.debug("扩大到最大阈值({})后仍不足，使用所有候选学生", max_count)
                 expanded_pool = candidates.copy()
 
             # 按次数从小到大排序
@@ -225,7 +230,7 @@ def apply_avg_gap_protection(
             if len(pool_initial) > required_size:
                 pool_initial = pool_initial[:required_size]
 
-        logger.debug(f"扩展后候选池人数: {len(pool_initial)}")
+        logger.debug("扩展后候选池人数: {}", len(pool_initial))
 
         # Step 6: 最终检查 - 确保候选池不为空
         if not pool_initial:
@@ -238,6 +243,6 @@ def apply_avg_gap_protection(
         # 发生错误时，返回原始候选列表，确保系统可用性
         return candidates
 
-    logger.debug(f"最终候选池人数: {len(pool_initial)}")
+    logger.debug("最终候选池人数: {}", len(pool_initial))
 
     return pool_initial
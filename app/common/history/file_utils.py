@@ -1,12 +1,12 @@
 # ==================================================
 # 导入库
 # ==================================================
-import json
 from typing import Dict, List, Any
 from pathlib import Path
 
 from loguru import logger
 
+from app.tools.json_store import read_json, write_json
 from app.tools.path_utils import get_path
 
 
@@ -45,12 +45,8 @@ def load_history_data(history_type: str, file_name: str) -> Dict[str, Any]:
     """
     file_path = get_history_file_path(history_type, file_name)
 
-    if not file_path.exists():
-        return {}
-
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return read_json(file_path, default={})
     except Exception as e:
         logger.error(f"加载历史记录数据失败: {e}")
         return {}
@@ -69,8 +65,7 @@ def save_history_data(history_type: str, file_name: str, data: Dict[str, Any]) -
     """
     file_path = get_history_file_path(history_type, file_name)
     try:
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+        write_json(file_path, data)
         return True
     except Exception as e:
         logger.error(f"保存历史记录数据失败: {e}")
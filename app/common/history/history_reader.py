@@ -1,12 +1,12 @@
 # ==================================================
 # 导入库
 # ==================================================
-import json
 from typing import Dict, List, Any, Optional, Tuple
 
 from loguru import logger
 
-from app.tools.path_utils import get_data_path, open_file, file_exists
+from app.tools.json_store import read_json
+from app.tools.path_utils import get_data_path, file_exists
 from app.common.data.list import get_gender_list, get_group_list
 
 
@@ -26,8 +26,7 @@ def get_roll_call_student_list(
     """
     try:
         student_file = get_data_path("list/roll_call_list", f"{class_name}.json")
-        with open_file(student_file, "r", encoding="utf-8") as f:
-            class_data = json.load(f)
+        class_data = read_json(student_file)
 
         cleaned_students = []
         for name, info in class_data.items():
@@ -62,8 +61,7 @@ def get_roll_call_history_data(
         if not file_exists(history_file):
             return {}
 
-        with open_file(history_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return read_json(history_file)
     except Exception as e:
         logger.error(f"获取点名历史记录数据失败: {e}")
         return {}
@@ -350,8 +348,7 @@ def get_lottery_pool_list(
     """
     try:
         lottery_file = get_data_path("list/lottery_list", f"{pool_name}.json")
-        with open_file(lottery_file, "r", encoding="utf-8") as f:
-            pool_data = json.load(f)
+        pool_data = read_json(lottery_file)
 
         cleaned_lotterys = []
         for name, info in pool_data.items():
@@ -385,8 +382,7 @@ def get_lottery_history_data(
         if not file_exists(history_file):
             return {}
 
-        with open_file(history_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return read_json(history_file)
     except Exception as e:
         logger.error(f"获取抽奖历史记录数据失败: {e}")
         return {}
@@ -1,10 +1,11 @@
-from PySide6.QtCore import QObject, Signal, QTimer, QEasingCurve, QFileSystemWatcher
+from PySide6.QtCore import QObject, Signal, QTimer, QEasingCurve
 from PySide6.QtGui import QFont
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import time
 from loguru import logger
-from random import SystemRandom
 
 from app.common.data.list import (
+    get_student_list,
     get_pool_list,
     get_pool_name_list,
     get_class_name_list,
@@ -13,28 +14,44 @@ from app.common.data.list import (
 )
 from app.common.history import save_lottery_history
 from app.common.display.result_display import ResultDisplayUtils
+from app.common.IPC_URL.event_stream import (
+    EVENT_DRAW_FINISHED,
+    EVENT_DRAW_STARTED,
+    EVENT_LIST_CHANGED,
+    publish_event,
+    result_entries,
+)
+from app.common.display.animation_frames import AnimationFrameStream
 from app.common.lottery.lottery_utils import LotteryUtils
+from app.common.lottery.prize_inventory import get_prize_inventory
 from app.common.roll_call.roll_call_utils import RollCallUtils
 from app.common.music.music_player import music_player
 from app.common.voice.voice import TTSHandler
 from app.common.extraction.extract import _is_non_class_time
 from app.common.safety.verify_ops import require_and_run
-from app.page_building.another_window import create_remaining_list_window
+from app.page_building.another_window import (
+    create_lottery_batch_window,
+    create_remaining_list_window,
+)
+from app.tools.file_change_service import FILE_KIND_ROSTER, subscribe_file_changes
 from app.tools.path_utils import get_data_path
 from app.tools.personalised import load_custom_font
-from app.tools.config import (
-    record_drawn_prize,
-    reset_drawn_prize_record,
-)
+from app.tools.config import reset_drawn_prize_record
 from app.tools.settings_access import readme_settings_async, get_safe_font_size
+from app.tools.random_source import draw_session, get_display_random
+from app.tools.draw_telemetry import draw_stage
+from app.tools.draw_trace import trace_save
 from app.Language.obtain_language import (
     get_content_combo_name_async,
     get_content_name_async,
     get_content_pushbutton_name_async,
 )
-from app.tools.variable import APP_INIT_DELAY
-
-system_random = SystemRandom()
+from app.tools.json_batch import json_write_batch
+from app.tools.variable import (
+    APP_INIT_DELAY,
+    LOTTERY_BATCH_MAX_ROUNDS,
+    LOTTERY_BATCH_REPLAY_INTERVAL_MS,
+)
 
 
 @dataclass(frozen=True, slots=True)
@@ -56,6 +73,48 @@ class LotteryDrawPlan:
     result_music: str | None
 
 
+@dataclass(slots=True)
+class LotteryBatchResult:
+    """批量抽奖结果
+
+    rounds 中每一项与一次普通抽取的结果相同；stopped_reason 为空表示全部轮次完成，
+    "reset_required" 表示库存或学生已抽完，"error" 表示出错且所有记录已回滚。
+    """
+
+    pool_name: str
+    requested: int
+    count: int
+    rounds: list = field(default_factory=list)
+    stopped_reason: str = ""
+    elapsed_ms: float = 0.0
+
+    def rows(self) -> list:
+        """展开为结果表格的行，每个中奖奖品一行"""
+        rows = []
+        for round_index, result in enumerate(self.rounds, start=1):
+            for index, prize in enumerate(
+                result.get("selected_prizes_dict") or [], start=1
+            ):
+                if not isinstance(prize, dict):
+                    continue
+                prize_name = prize.get("ipc_lottery_name") or prize.get("name", "")
+                rows.append(
+                    {
+                        "round": round_index,
+                        "index": index,
+                        "prize_id": prize.get("id", ""),
+                        "prize_name": str(prize_name or ""),
+                        "student_id": prize.get("student_id", ""),
+                        "student_name": str(prize.get("student_name", "") or ""),
+                        "group_name": str(prize.get("ipc_group_name", "") or ""),
+                        "display_text": str(
+                            prize.get("ipc_display_text") or prize_name or ""
+                        ),
+                    }
+                )
+        return rows
+
+
 class LotteryManager(QObject):
     # 信号定义
     data_loaded = Signal(bool)
@@ -75,6 +134,7 @@ class LotteryManager(QObject):
         self._total_count_cache_value = None
         self._render_settings_cache = None
         self._notification_settings_cache = None
+        self._animation_frames = None
 
     def _format_prize_student_text(self, prize_name, group_name, student_name, mode):
         prize_name = str(prize_name or "")
@@ -130,6 +190,7 @@ class LotteryManager(QObject):
         加载抽奖池数据（用于动画缓存）
         """
         try:
+            self.stop_animation_frames()
             self.current_pool_name = pool_name
             self.current_class_name = class_name
             self.current_group_filter = group_filter
@@ -156,7 +217,7 @@ class LotteryManager(QObject):
 
             self.prizes = get_pool_list(pool_name)
             self.prizes = [p for p in self.prizes if p.get("exist", True)]
-            logger.info(f"加载 {len(self.prizes)} 个奖品在这个奖池中 {pool_name}")
+            logger.info("加载 {} 个奖品在这个奖池中 {}", len(self.prizes), pool_name)
 
             self.data_loaded.emit(True)
             return True
@@ -277,6 +338,16 @@ class LotteryManager(QObject):
         self.get_render_settings(refresh=refresh_settings)
         self.get_notification_settings(refresh=refresh_settings)
         self.get_pool_total_count(context.pool_name, refresh=refresh_total_count)
+        publish_event(
+            EVENT_DRAW_STARTED,
+            lambda: {
+                "kind": "lottery",
+                "pool_name": context.pool_name,
+                "class_name": context.class_name,
+                "group_filter": context.group_filter,
+                "gender_filter": context.gender_filter,
+            },
+        )
 
         animation = readme_settings_async("lottery_settings", "animation")
         autoplay_count = readme_settings_async("lottery_settings", "autoplay_count")
@@ -317,8 +388,26 @@ class LotteryManager(QObject):
         gender_filter: str = "",
         parent=None,
     ):
-        result = self.draw_final_items(count)
-        if isinstance(result, dict) and result.get("reset_required"):
+        threshold = LotteryUtils._get_prize_draw_threshold()
+        save_temp = threshold is not None
+
+        # 抽样和发放在同一个库存锁内完成，并发的抽取不会抽中同一份剩余库存
+        with get_prize_inventory(self.current_pool_name).transaction():
+            result = self.draw_final_items(count)
+            reset_required = isinstance(result, dict) and result.get("reset_required")
+            if not reset_required:
+                selected_items_dict = (
+                    (result or {}).get("selected_prizes_dict")
+                    or (result or {}).get("selected_students_dict")
+                    or []
+                )
+                self.save_result(
+                    selected_items_dict,
+                    group_filter=group_filter,
+                    gender_filter=gender_filter,
+                    save_temp=save_temp,
+                )
+        if reset_required:
             reset_drawn_prize_record(parent, self.current_pool_name)
             if (
                 result.get("reset_scope") == "students"
@@ -333,25 +422,109 @@ class LotteryManager(QObject):
                 )
             return {"reset_required": True, "pool_name": self.current_pool_name}
 
-        selected_items_dict = (
-            (result or {}).get("selected_prizes_dict")
-            or (result or {}).get("selected_students_dict")
-            or []
+        publish_event(
+            EVENT_DRAW_FINISHED,
+            lambda: {
+                "kind": "lottery",
+                "pool_name": self.current_pool_name,
+                "results": result_entries((result or {}).get("selected_prizes")),
+            },
         )
 
+        result = dict(result or {})
+        result["save_temp"] = save_temp
+        return result
+
+    def draw_batch(
+        self,
+        rounds: int,
+        count: int,
+        *,
+        group_filter: str = "",
+        gender_filter: str = "",
+    ) -> LotteryBatchResult:
+        """
+        在一个事务中连续执行多次抽取
+
+        每一轮与 finalize_draw 走相同的抽取和保存流程，后一轮能看到前一轮更新后的
+        库存、学生记录和历史权重，因此结果与依次抽取 rounds 次同分布；历史记录和
+        抽取记录在内存中累积，结束时每个文件只写一次。库存或学生抽完时提前停止
+        （不自动重置），出错时丢弃本次批量的全部记录。
+
+        Args:
+            rounds: 抽取轮数，超过 LOTTERY_BATCH_MAX_ROUNDS 时截断
+            count: 每轮抽取的奖品数量
+            group_filter: 班级/小组过滤器
+            gender_filter: 性别过滤器
+
+        Returns:
+            LotteryBatchResult: 批量抽奖结果
+        """
+        rounds = max(0, min(int(rounds), LOTTERY_BATCH_MAX_ROUNDS))
+        batch = LotteryBatchResult(
+            pool_name=self.current_pool_name, requested=rounds, count=count
+        )
         threshold = LotteryUtils._get_prize_draw_threshold()
         save_temp = threshold is not None
-
-        self.save_result(
-            selected_items_dict,
-            group_filter=group_filter,
-            gender_filter=gender_filter,
-            save_temp=save_temp,
+        start = time.perf_counter()
+        try:
+            with (
+                get_prize_inventory(self.current_pool_name).transaction(),
+                json_write_batch(),
+            ):
+                for _ in range(rounds):
+                    result = self.draw_final_items(count)
+                    if isinstance(result, dict) and result.get("reset_required"):
+                        batch.stopped_reason = "reset_required"
+                        break
+                    selected_items_dict = (result or {}).get(
+                        "selected_prizes_dict"
+                    ) or []
+                    if not selected_items_dict:
+                        batch.stopped_reason = "empty"
+                        break
+                    self.save_result(
+                        selected_items_dict,
+                        group_filter=group_filter,
+                        gender_filter=gender_filter,
+                        save_temp=save_temp,
+                    )
+                    result = dict(result)
+                    result["save_temp"] = save_temp
+                    batch.rounds.append(result)
+        except Exception as e:
+            logger.exception(f"批量抽奖失败，已回滚本次批量的记录: {e}")
+            get_prize_inventory(self.current_pool_name).invalidate()
+            RollCallUtils._drawn_record_cache.clear()
+            batch.rounds = []
+            batch.stopped_reason = "error"
+        batch.elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info(
+            "批量抽奖完成: 奖池 {}，{}/{} 轮，耗时 {:.1f}ms",
+            batch.pool_name,
+            len(batch.rounds),
+            rounds,
+            batch.elapsed_ms,
         )
 
-        result = dict(result or {})
-        result["save_temp"] = save_temp
-        return result
+        if batch.rounds:
+            publish_event(
+                EVENT_DRAW_FINISHED,
+                lambda: {
+                    "kind": "lottery",
+                    "pool_name": batch.pool_name,
+                    "batch": True,
+                    "rounds": len(batch.rounds),
+                    "results": result_entries(
+                        [
+                            prize
+                            for result in batch.rounds
+                            for prize in result.get("selected_prizes") or []
+                        ]
+                    ),
+                },
+            )
+        return batch
 
     def reset_all_records(self, *, parent=None):
         reset_drawn_prize_record(parent, self.current_pool_name)
@@ -363,93 +536,190 @@ class LotteryManager(QObject):
                 self.current_group_filter,
             )
 
-    def get_random_items(self, count):
+    def _snapshot_animation_candidates(self):
         """
-        获取随机项（用于动画帧）
+        读取动画帧所需的候选快照（奖品、分配模式、学生候选、显示设置、小组成员）
+
+        Returns:
+            dict: 候选快照，之后生成动画帧时不再读取名单文件或设置
         """
-        if not self.prizes:
-            return []
+        assign_students = bool(
+            self.enable_student_assignment and self.current_class_name
+        )
+        snapshot = {
+            "prizes": list(self.prizes),
+            "assign_students": assign_students,
+            "group_mode": self.current_group_index == 1,
+            "candidates": [],
+            "show_random": 0,
+            "group_members": {},
+        }
+        if not assign_students:
+            return snapshot
 
-        # 简单的随机选择用于动画效果
-        try:
-            # 允许重复用于动画效果
-            selected_prizes = [system_random.choice(self.prizes) for _ in range(count)]
-
-            if not self.enable_student_assignment or not self.current_class_name:
-                prizes_with_meta = []
-                for prize in selected_prizes:
-                    prize_copy = dict(prize)
-                    prize_name = prize_copy.get("name", "")
-                    prize_copy["ipc_lottery_name"] = str(prize_name or "")
-                    prize_copy["ipc_group_name"] = ""
-                    prize_copy["ipc_student_name"] = ""
-                    prize_copy["ipc_display_text"] = str(prize_name or "")
-                    prizes_with_meta.append(prize_copy)
-                return prizes_with_meta
-
-            candidates = RollCallUtils._get_filtered_candidates(
+        snapshot["candidates"] = (
+            RollCallUtils._get_filtered_candidates(
                 self.current_class_name,
                 self.current_group_index,
                 self.current_group_filter,
                 self.current_gender_index,
                 self.current_gender_filter,
             )
-            if not candidates:
-                return selected_prizes
+            or []
+        )
 
-            show_random = readme_settings_async("lottery_settings", "show_random")
-            try:
-                show_random = int(show_random or 0)
-            except Exception:
-                show_random = 0
+        show_random = readme_settings_async("lottery_settings", "show_random")
+        try:
+            snapshot["show_random"] = int(show_random or 0)
+        except Exception:
+            snapshot["show_random"] = 0
 
-            from app.common.data.list import get_group_members
+        if snapshot["group_mode"] and snapshot["candidates"]:
+            group_members = {}
+            for student in get_student_list(self.current_class_name) or []:
+                group_members.setdefault(student.get("group", ""), []).append(student)
+            snapshot["group_members"] = group_members
+        return snapshot
 
-            prizes_with_students = []
+    def _build_random_items(self, rng, count, snapshot):
+        """
+        根据候选快照生成一帧随机项，只读取快照，可在后台补帧线程中调用
+
+        Args:
+            rng: 随机数生成器
+            count: 数量
+            snapshot: _snapshot_animation_candidates 返回的候选快照
+
+        Returns:
+            list: 附带 IPC 元数据的奖品字典列表
+        """
+        prizes = snapshot["prizes"]
+        if not prizes:
+            return []
+
+        # 允许重复用于动画效果
+        selected_prizes = [rng.choice(prizes) for _ in range(count)]
+
+        if not snapshot["assign_students"]:
+            prizes_with_meta = []
             for prize in selected_prizes:
                 prize_copy = dict(prize)
                 prize_name = prize_copy.get("name", "")
                 prize_copy["ipc_lottery_name"] = str(prize_name or "")
+                prize_copy["ipc_group_name"] = ""
+                prize_copy["ipc_student_name"] = ""
+                prize_copy["ipc_display_text"] = str(prize_name or "")
+                prizes_with_meta.append(prize_copy)
+            return prizes_with_meta
+
+        candidates = snapshot["candidates"]
+        if not candidates:
+            return selected_prizes
+
+        show_random = snapshot["show_random"]
+        group_members_map = snapshot["group_members"]
+        group_mode = snapshot["group_mode"]
+
+        prizes_with_students = []
+        for prize in selected_prizes:
+            prize_copy = dict(prize)
+            prize_name = prize_copy.get("name", "")
+            prize_copy["ipc_lottery_name"] = str(prize_name or "")
 
-                group_name = ""
-                student_name = ""
-                if self.current_group_index == 1:
-                    raw_group = system_random.choice(candidates).get("name", "")
-                    include_group = show_random in (0, 1, 2, 5, 6, 7, 8, 9)
-                    include_name = show_random in (0, 1, 2, 3, 4, 7, 8, 9, 10, 11)
+            group_name = ""
+            student_name = ""
+            if group_mode:
+                raw_group = rng.choice(candidates).get("name", "")
+                include_group = show_random in (0, 1, 2, 5, 6, 7, 8, 9)
+                include_name = show_random in (0, 1, 2, 3, 4, 7, 8, 9, 10, 11)
+
+                group_name = raw_group if include_group else ""
+
+                if include_name and raw_group:
+                    group_members = group_members_map.get(raw_group)
+                    if group_members:
+                        selected_member = rng.choice(group_members)
+                        student_name = (selected_member or {}).get("name", "")
+                    if not student_name:
+                        student_name = raw_group
+            else:
+                student_name = rng.choice(candidates).get("name", "")
 
-                    group_name = raw_group if include_group else ""
+            prize_copy["ipc_group_name"] = str(group_name or "")
+            prize_copy["ipc_student_name"] = str(student_name or "")
+            if group_name or student_name:
+                prize_copy["name"] = self._format_prize_student_text(
+                    prize_name, group_name, student_name, show_random
+                )
+            prize_copy["ipc_display_text"] = str(prize_copy.get("name", "") or "")
 
-                    if include_name and raw_group:
-                        group_members = get_group_members(
-                            self.current_class_name, raw_group
-                        )
-                        if group_members:
-                            selected_member = system_random.choice(group_members)
-                            student_name = (selected_member or {}).get("name", "")
-                        if not student_name:
-                            student_name = raw_group
-                else:
-                    student_name = system_random.choice(candidates).get("name", "")
+            prizes_with_students.append(prize_copy)
 
-                prize_copy["ipc_group_name"] = str(group_name or "")
-                prize_copy["ipc_student_name"] = str(student_name or "")
-                if group_name or student_name:
-                    prize_copy["name"] = self._format_prize_student_text(
-                        prize_name, group_name, student_name, show_random
-                    )
-                prize_copy["ipc_display_text"] = str(prize_copy.get("name", "") or "")
+        return prizes_with_students
 
-                prizes_with_students.append(prize_copy)
+    def start_animation_frames(self, count):
+        """
+        根据当前候选快照启动动画帧预计算流
 
-            return prizes_with_students
+        Args:
+            count: 每帧显示的数量
+        """
+        self.stop_animation_frames()
+        try:
+            count = int(count or 0)
         except Exception:
-            return []
+            count = 0
+        if count <= 0 or not self.prizes:
+            return None
+
+        try:
+            snapshot = self._snapshot_animation_candidates()
+        except Exception as e:
+            logger.exception(f"读取动画候选快照失败: {e}")
+            return None
+
+        def frame_factory(rng):
+            items = self._build_random_items(rng, count, snapshot)
+            return _build_animation_frame(items)
+
+        self._animation_frames = AnimationFrameStream(frame_factory, key=count).start()
+        return self._animation_frames
+
+    def next_animation_frame(self, count):
+        """
+        取出下一帧动画显示数据，数量变化时重建帧流
+
+        Returns:
+            tuple: (显示用的奖品元组列表, IPC 数据列表)
+        """
+        stream = self._animation_frames
+        if stream is None or stream.cancelled or stream.key != count:
+            stream = self.start_animation_frames(count)
+        if stream is None:
+            return [], []
+        return stream.next_frame()
+
+    def stop_animation_frames(self):
+        """取消动画帧预计算流"""
+        stream = self._animation_frames
+        self._animation_frames = None
+        if stream is not None:
+            stream.cancel()
 
     def draw_final_items(self, count):
         """
         执行最终抽取
+
+        奖品与中奖学生在同一个随机数会话中抽取，开启种子记录时可按种子复现；
+        耗时记录在抽取耗时统计中
         """
+        with (
+            draw_stage("lottery", "draw"),
+            draw_session("lottery", pool=self.current_pool_name, count=count),
+        ):
+            return self._draw_final_items(count)
+
+    def _draw_final_items(self, count):
         result = LotteryUtils.draw_random_prizes(self.current_pool_name, count)
         if not isinstance(result, dict):
             return {
@@ -555,7 +825,7 @@ class LotteryManager(QObject):
                             self.current_class_name, raw_group
                         )
                         if group_members:
-                            selected_member = system_random.choice(group_members)
+                            selected_member = get_display_random().choice(group_members)
                             student_name = (selected_member or {}).get("name", "")
                         if not student_name:
                             student_name = raw_group
@@ -604,17 +874,25 @@ class LotteryManager(QObject):
             gender_filter: 性别过滤器
             save_temp: 是否保存临时记录 (用于不重复/半重复模式)
         """
+        trace_save(
+            "lottery",
+            self.current_pool_name,
+            group_filter=group_filter,
+            gender_filter=gender_filter,
+            save_temp=save_temp,
+        )
         if save_temp:
             prize_names = [
                 item.get("name", "")
                 for item in (selected_items or [])
                 if isinstance(item, dict)
             ]
-            record_drawn_prize(self.current_pool_name, prize_names)
+            get_prize_inventory(self.current_pool_name).award(prize_names)
 
-        save_lottery_history(
-            self.current_pool_name, selected_items, group_filter, gender_filter
-        )
+        with draw_stage("lottery", "save_history"):
+            save_lottery_history(
+                self.current_pool_name, selected_items, group_filter, gender_filter
+            )
 
         if self.enable_student_assignment and self.current_class_name:
             student_dicts = []
@@ -698,6 +976,8 @@ def start_lottery_draw(widget):
     autoplay_count = plan.autoplay_count if plan else 0
     animation_interval = plan.animation_interval if plan else 0
     animation_music = plan.animation_music if plan else None
+    if animation in [0, 1]:
+        manager.start_animation_frames(_get_animation_display_count(widget))
 
     if animation == 0:
         if animation_music:
@@ -746,9 +1026,163 @@ def start_lottery_draw(widget):
         widget.start_button.clicked.connect(lambda: widget.start_draw())
 
 
+def start_batch_draw(widget, rounds, on_finished=None):
+    """
+    批量抽奖入口，与 start_draw 相同地处理非上课时间的限制
+
+    Args:
+        widget: 抽奖页面
+        rounds: 抽取轮数
+        on_finished: 完成后的回调，参数为 LotteryBatchResult
+    """
+    if _is_non_class_time():
+        if readme_settings_async("linkage_settings", "verification_required"):
+            logger.info("当前时间在非上课时间段内，需要密码验证")
+            require_and_run(
+                "lottery_start",
+                widget,
+                lambda: _run_batch_draw(widget, rounds, on_finished),
+            )
+        else:
+            logger.info("当前时间在非上课时间段内，禁止抽取")
+            return
+    else:
+        _run_batch_draw(widget, rounds, on_finished)
+
+
+def _run_batch_draw(widget, rounds, on_finished=None):
+    if getattr(widget, "is_animating", False):
+        logger.info("正在抽取中，忽略批量抽奖请求")
+        return None
+
+    manager = widget.manager
+    list_base_options = get_content_combo_name_async("lottery", "list_combobox")
+    context = manager.build_draw_context(
+        widget.pool_list_combobox.currentText(),
+        widget.list_combobox.currentText(),
+        widget.range_combobox.currentText(),
+        widget.gender_combobox.currentText(),
+        widget.range_combobox.currentIndex(),
+        widget.gender_combobox.currentIndex(),
+        invalid_class_options=list_base_options,
+    )
+    widget._draw_plan = manager.prepare_draw(
+        context,
+        invalid_class_options=list_base_options,
+        refresh_settings=True,
+        refresh_total_count=False,
+    )
+
+    batch = manager.draw_batch(
+        rounds,
+        widget.current_count,
+        group_filter=widget.range_combobox.currentText(),
+        gender_filter=widget.gender_combobox.currentText(),
+    )
+
+    update_many_count_label(widget)
+    if (
+        hasattr(widget, "remaining_list_page")
+        and widget.remaining_list_page is not None
+        and hasattr(widget.remaining_list_page, "count_changed")
+    ):
+        widget.remaining_list_page.count_changed.emit(widget.remaining_count)
+    QTimer.singleShot(APP_INIT_DELAY, widget._update_remaining_list_delayed)
+
+    if batch.rounds:
+        last = batch.rounds[-1]
+        widget.final_selected_students = last.get("selected_prizes")
+        widget.final_pool_name = batch.pool_name
+        widget.final_selected_students_dict = last.get("selected_prizes_dict")
+        widget.final_group_filter = widget.range_combobox.currentText()
+        widget.final_gender_filter = widget.gender_combobox.currentText()
+        if widget.final_selected_students:
+            display_result(
+                widget,
+                widget.final_selected_students,
+                widget.final_pool_name,
+                draw_count=len(widget.final_selected_students),
+            )
+
+    if on_finished is not None:
+        on_finished(batch)
+    return batch
+
+
+def replay_batch_results(
+    widget, batch, interval_ms=LOTTERY_BATCH_REPLAY_INTERVAL_MS, on_finished=None
+):
+    """
+    在抽奖页面上按顺序快速回放批量抽奖的每一轮结果
+
+    Args:
+        widget: 抽奖页面
+        batch: LotteryBatchResult
+        interval_ms: 每轮的显示间隔（毫秒）
+        on_finished: 回放结束后的回调
+    """
+    stop_batch_replay(widget)
+    rounds = list(batch.rounds)
+    if not rounds:
+        if on_finished is not None:
+            on_finished()
+        return
+
+    state = {"index": 0}
+    timer = QTimer(widget)
+
+    def show_next():
+        if state["index"] >= len(rounds):
+            stop_batch_replay(widget)
+            if on_finished is not None:
+                on_finished()
+            return
+        selected = rounds[state["index"]].get("selected_prizes") or []
+        state["index"] += 1
+        display_result(
+            widget, selected, batch.pool_name, draw_count=len(selected) or None
+        )
+
+    timer.timeout.connect(show_next)
+    widget._batch_replay_timer = timer
+    show_next()
+    timer.start(max(1, int(interval_ms)))
+
+
+def stop_batch_replay(widget):
+    timer = getattr(widget, "_batch_replay_timer", None)
+    widget._batch_replay_timer = None
+    if timer is not None:
+        timer.stop()
+        timer.deleteLater()
+
+
+def show_batch_draw_window(widget):
+    create_lottery_batch_window(widget)
+
+
 def init_file_watcher(widget):
-    widget.file_watcher = QFileSystemWatcher()
-    setup_file_watcher(widget)
+    list_dir = get_data_path("list", "lottery_list")
+    widget.file_subscriptions = [
+        # 外部程序通过 IPC 订阅奖池变化，不受窗口是否显示影响
+        subscribe_file_changes(
+            FILE_KIND_ROSTER,
+            lambda event: publish_event(
+                EVENT_LIST_CHANGED, {"kind": "lottery", "path": str(list_dir)}
+            ),
+            widget=widget,
+            directory=list_dir,
+            lazy=False,
+            name="lottery_list_ipc",
+        ),
+        subscribe_file_changes(
+            FILE_KIND_ROSTER,
+            widget.on_list_files_changed,
+            widget=widget,
+            directory=list_dir,
+            name="lottery_list",
+        ),
+    ]
 
 
 def init_long_press(widget):
@@ -881,6 +1315,12 @@ def reset_count(widget):
 
 
 def stop_animation(widget):
+    """结束动画并完成抽取，总耗时和各阶段耗时记录在抽取耗时统计中"""
+    with draw_stage("lottery", "finish"):
+        _stop_animation(widget)
+
+
+def _stop_animation(widget):
     if hasattr(widget, "animation_timer") and widget.animation_timer.isActive():
         widget.animation_timer.stop()
     widget.start_button.setText(
@@ -888,6 +1328,7 @@ def stop_animation(widget):
     )
     widget.start_button.setEnabled(True)
     widget.is_animating = False
+    widget.manager.stop_animation_frames()
     try:
         widget.start_button.clicked.disconnect()
     except Exception as e:
@@ -899,12 +1340,13 @@ def stop_animation(widget):
 
     music_player.stop_music(fade_out=True)
 
-    result = widget.manager.finalize_draw(
-        widget.current_count,
-        group_filter=widget.range_combobox.currentText(),
-        gender_filter=widget.gender_combobox.currentText(),
-        parent=widget,
-    )
+    with draw_stage("lottery", "finalize"):
+        result = widget.manager.finalize_draw(
+            widget.current_count,
+            group_filter=widget.range_combobox.currentText(),
+            gender_filter=widget.gender_combobox.currentText(),
+            parent=widget,
+        )
 
     if isinstance(result, dict) and result.get("reset_required"):
         update_many_count_label(widget)
@@ -956,12 +1398,13 @@ def stop_animation(widget):
         )
         if actual_draw_count <= 0:
             actual_draw_count = widget.current_count
-        display_result(
-            widget,
-            widget.final_selected_students,
-            widget.final_pool_name,
-            draw_count=actual_draw_count,
-        )
+        with draw_stage("lottery", "display"):
+            display_result(
+                widget,
+                widget.final_selected_students,
+                widget.final_pool_name,
+                draw_count=actual_draw_count,
+            )
 
         settings = widget.manager.get_notification_settings(refresh=True)
         if settings is not None:
@@ -1062,36 +1505,45 @@ def play_voice_result(widget):
         logger.exception(f"播放语音失败: {e}", exc_info=True)
 
 
+def _get_animation_display_count(widget):
+    display_count = widget.current_count
+    try:
+        remaining_count = int(getattr(widget, "remaining_count", 0) or 0)
+    except Exception:
+        remaining_count = 0
+    if remaining_count > 0:
+        display_count = min(display_count, remaining_count)
+    return display_count
+
+
+def _build_animation_frame(prizes):
+    """将随机项转换为 (显示用的奖品元组列表, IPC 数据列表)"""
+    ipc_selected_students = []
+    for p in prizes or []:
+        if not isinstance(p, dict):
+            continue
+        ipc_selected_students.append(
+            {
+                "student_id": 0,
+                "student_name": str(p.get("ipc_student_name", "") or ""),
+                "display_text": str(p.get("ipc_display_text", p.get("name", "")) or ""),
+                "exists": bool(p.get("exist", True)),
+                "group_name": str(p.get("ipc_group_name", "") or ""),
+                "lottery_name": str(p.get("ipc_lottery_name", p.get("name", "")) or ""),
+            }
+        )
+    selected_prizes = [(p["id"], p["name"], p.get("exist", True)) for p in prizes]
+    return selected_prizes, ipc_selected_students
+
+
 def draw_random(widget):
     if widget.is_animating:
-        display_count = widget.current_count
-        try:
-            remaining_count = int(getattr(widget, "remaining_count", 0) or 0)
-        except Exception:
-            remaining_count = 0
-        if remaining_count > 0:
-            display_count = min(display_count, remaining_count)
-
-        prizes = widget.manager.get_random_items(display_count)
-        ipc_selected_students = []
-        for p in prizes or []:
-            if not isinstance(p, dict):
-                continue
-            ipc_selected_students.append(
-                {
-                    "student_id": 0,
-                    "student_name": str(p.get("ipc_student_name", "") or ""),
-                    "display_text": str(
-                        p.get("ipc_display_text", p.get("name", "")) or ""
-                    ),
-                    "exists": bool(p.get("exist", True)),
-                    "group_name": str(p.get("ipc_group_name", "") or ""),
-                    "lottery_name": str(
-                        p.get("ipc_lottery_name", p.get("name", "")) or ""
-                    ),
-                }
-            )
-        selected_prizes = [(p["id"], p["name"], p.get("exist", True)) for p in prizes]
+        display_count = _get_animation_display_count(widget)
+
+        # 动画帧从预计算缓冲区中取出
+        selected_prizes, ipc_selected_students = widget.manager.next_animation_frame(
+            display_count
+        )
 
         display_result_animated(
             widget,
@@ -1106,7 +1558,8 @@ def display_result(widget, selected_students, pool_name, draw_count=None):
     render_settings = widget.manager.get_render_settings(refresh=True)
     if draw_count is None:
         draw_count = widget.current_count
-    student_labels = ResultDisplayUtils.create_student_label(
+    ResultDisplayUtils.render_student_labels(
+        widget.result_grid,
         pool_name,
         selected_students=selected_students,
         draw_count=draw_count,
@@ -1120,19 +1573,6 @@ def display_result(widget, selected_students, pool_name, draw_count=None):
         show_random=render_settings["show_random"],
         settings_group="lottery_settings",
     )
-    cached_widgets = ResultDisplayUtils.collect_grid_widgets(widget.result_grid)
-    if cached_widgets and len(cached_widgets) == len(student_labels):
-        updated = ResultDisplayUtils.update_grid_labels(
-            widget.result_grid, student_labels, cached_widgets
-        )
-        if updated:
-            ResultDisplayUtils.dispose_widgets(student_labels)
-        else:
-            ResultDisplayUtils.display_results_in_grid(
-                widget.result_grid, student_labels
-            )
-    else:
-        ResultDisplayUtils.display_results_in_grid(widget.result_grid, student_labels)
 
 
 def display_result_animated(
@@ -1142,7 +1582,8 @@ def display_result_animated(
     if draw_count is None:
         draw_count = widget.current_count
 
-    student_labels = ResultDisplayUtils.create_student_label(
+    ResultDisplayUtils.render_student_labels(
+        widget.result_grid,
         class_name=pool_name,
         selected_students=selected_students,
         draw_count=draw_count,
@@ -1156,19 +1597,6 @@ def display_result_animated(
         show_random=render_settings["show_random"],
         settings_group="lottery_settings",
     )
-    cached_widgets = ResultDisplayUtils.collect_grid_widgets(widget.result_grid)
-    if cached_widgets and len(cached_widgets) == len(student_labels):
-        updated = ResultDisplayUtils.update_grid_labels(
-            widget.result_grid, student_labels, cached_widgets
-        )
-        if updated:
-            ResultDisplayUtils.dispose_widgets(student_labels)
-        else:
-            ResultDisplayUtils.display_results_in_grid(
-                widget.result_grid, student_labels
-            )
-    else:
-        ResultDisplayUtils.display_results_in_grid(widget.result_grid, student_labels)
 
     settings = widget.manager.get_notification_settings(refresh=False)
     if settings is not None:
@@ -1341,37 +1769,19 @@ def show_remaining_list(widget):
     window.show()
 
 
-def setup_file_watcher(widget):
-    try:
-        list_dir = get_data_path("list", "lottery_list")
-
-        if not list_dir.exists():
-            list_dir.mkdir(parents=True, exist_ok=True)
-
-        widget.file_watcher.addPath(str(list_dir))
-
-        widget._sync_watcher_files()
-
-        widget.file_watcher.directoryChanged.connect(widget.on_directory_changed)
-        widget.file_watcher.fileChanged.connect(widget.on_file_changed)
-
-    except Exception as e:
-        logger.exception(f"设置文件监控器失败: {e}")
-
-
-def on_directory_changed(widget, path):
+def on_list_files_changed(widget, event):
+    """奖池文件变化：奖池有增删时重建奖池列表，否则只在当前奖池的名单变化时刷新"""
     try:
-        widget._sync_watcher_files()
-        QTimer.singleShot(500, widget.refresh_pool_list)
-    except Exception as e:
-        logger.exception(f"处理文件夹变化事件失败: {e}")
-
-
-def on_file_changed(widget, path):
-    try:
-        QTimer.singleShot(500, widget.refresh_pool_list)
+        if event.names_changed:
+            widget.refresh_pool_list()
+            return
+        pool_name = widget.pool_list_combobox.currentText()
+        if pool_name and event.touches(
+            get_data_path("list", "lottery_list", f"{pool_name}.json")
+        ):
+            widget.on_pool_changed()
     except Exception as e:
-        logger.exception(f"处理文件变化事件失败: {e}")
+        logger.exception(f"处理奖池文件变化失败: {e}")
 
 
 def populate_lists(widget):
@@ -1387,7 +1797,7 @@ def populate_lists(widget):
             if default_pool and default_pool in pool_list:
                 index = pool_list.index(default_pool)
                 widget.pool_list_combobox.setCurrentIndex(index)
-                logger.debug(f"应用默认抽取奖池: {default_pool}")
+                logger.debug("应用默认抽取奖池: {}", default_pool)
             else:
                 widget.pool_list_combobox.setCurrentIndex(0)
         widget.pool_list_combobox.blockSignals(False)
@@ -1,29 +1,31 @@
 # ==================================================
 # 抽奖工具类
 # ==================================================
-from random import SystemRandom
+from loguru import logger
 
 from app.common.data.list import (
     get_group_list,
     get_student_list,
     filter_students_data,
-    get_pool_list,
 )
 from app.common.roll_call.roll_call_utils import RollCallUtils
 from app.common.history import calculate_weight
 from app.common.behind_scenes.behind_scenes_utils import BehindScenesUtils
+from app.common.lottery.prize_inventory import (
+    get_prize_draw_threshold,
+    get_prize_inventory,
+)
 from app.tools.config import (
     calculate_remaining_count,
     read_drawn_record,
-    read_drawn_record_simple,
     reset_drawn_record,
 )
 from app.tools.settings_access import readme_settings_async, get_safe_font_size
+from app.tools.random_source import draw_session, get_random
+from app.tools.draw_trace import traced_draw
 
 from app.Language.obtain_language import get_any_position_value
 
-system_random = SystemRandom()
-
 
 class LotteryUtils:
     """抽奖工具类，提供通用的抽奖相关功能"""
@@ -140,6 +142,32 @@ class LotteryUtils:
         Returns:
             dict: 包含抽取结果的字典
         """
+        with draw_session("lottery_student", class_name=class_name, pool=pool_name):
+            return LotteryUtils._draw_random_students(
+                class_name,
+                group_index,
+                group_filter,
+                gender_index,
+                gender_filter,
+                current_count,
+                half_repeat,
+                pool_name,
+                prize_list,
+            )
+
+    @staticmethod
+    def _draw_random_students(
+        class_name,
+        group_index,
+        group_filter,
+        gender_index,
+        gender_filter,
+        current_count,
+        half_repeat,
+        pool_name=None,
+        prize_list=None,
+    ):
+        rng = get_random()
         data = get_student_list(class_name)
 
         students_data = filter_students_data(
@@ -187,7 +215,7 @@ class LotteryUtils:
                     for g in students_dict_list
                 ]
                 while len(selected_groups) < draw_count and all_groups:
-                    selected_groups.append(system_random.choice(all_groups))
+                    selected_groups.append(rng.choice(all_groups))
 
             return {
                 "selected_students": selected_groups,
@@ -306,11 +334,9 @@ class LotteryUtils:
                         break
                     total_weight = sum(pick_weights)
                     if total_weight <= 0:
-                        random_index = system_random.randint(
-                            0, len(pick_candidates) - 1
-                        )
+                        random_index = rng.randint(0, len(pick_candidates) - 1)
                     else:
-                        rand_value = system_random.uniform(0, total_weight)
+                        rand_value = rng.uniform(0, total_weight)
                         cumulative_weight = 0
                         random_index = 0
                         for i, weight in enumerate(pick_weights):
@@ -332,11 +358,9 @@ class LotteryUtils:
                         break
                     total_weight = sum(weights)
                     if total_weight <= 0:
-                        random_index = system_random.randint(
-                            0, len(students_with_weight) - 1
-                        )
+                        random_index = rng.randint(0, len(students_with_weight) - 1)
                     else:
-                        rand_value = system_random.uniform(0, total_weight)
+                        rand_value = rng.uniform(0, total_weight)
                         cumulative_weight = 0
                         random_index = 0
                         for i, weight in enumerate(weights):
@@ -367,10 +391,7 @@ class LotteryUtils:
     def get_prize_total_count(pool_name: str) -> int:
         """获取奖池奖品总数"""
         try:
-            from app.common.data.list import get_pool_list
-
-            items = get_pool_list(pool_name)
-            return len([item for item in items if item.get("exist", True)])
+            return get_prize_inventory(pool_name).total_count()
         except Exception:
             return 0
 
@@ -419,96 +440,19 @@ class LotteryUtils:
         return total_count, remaining_count, formatted_text
 
     @staticmethod
+    @traced_draw("lottery")
     def draw_random_prizes(pool_name: str, current_count: int):
         """按权重抽取奖品"""
-        try:
-            items = get_pool_list(pool_name)
-            if not items:
-                return {
-                    "selected_prizes": [],
-                    "pool_name": pool_name,
-                    "selected_prizes_dict": [],
-                }
-            # 非重复/半重复处理：根据 TEMP 记录过滤已达阈值的奖品（与 roll_call 一致）
-            threshold = LotteryUtils._get_prize_draw_threshold()
-            if threshold is not None:
-                drawn_records = read_drawn_record_simple(pool_name)
-                drawn_counts = {name: cnt for name, cnt in drawn_records}
-                available = []
-                for i in items:
-                    name = i.get("name", "")
-                    cnt = int(drawn_counts.get(name, 0))
-                    if cnt < threshold:
-                        available.append(i)
-                items = available
-                if not items:
-                    return {"reset_required": True}
-
-            # 应用内幕设置
-            items, behind_scenes_weights = (
-                BehindScenesUtils.apply_probability_weights_to_items(
-                    items, 1, pool_name
-                )
-            )
-
-            # 检查是否有必中奖品
-            guaranteed_items = BehindScenesUtils.ensure_guaranteed_selection(
-                items, behind_scenes_weights, pool_name
-            )
-            if guaranteed_items is not None:
-                # 存在必中奖品，直接返回
-                selected = []
-                selected_dict = []
-                for item in guaranteed_items:
-                    selected.append(
-                        (item.get("id"), item.get("name"), item.get("exist", True))
-                    )
-                    selected_dict.append(item)
+        with draw_session("lottery", pool=pool_name, count=current_count):
+            return LotteryUtils._draw_random_prizes(pool_name, current_count)
 
-                return {
-                    "selected_prizes": selected,
-                    "pool_name": pool_name,
-                    "selected_prizes_dict": selected_dict,
-                }
-
-            # 准备权重
-            weights = []
-            for i, item in enumerate(items):
-                base_weight = float(item.get("weight", 1))
-                behind_scenes_weight = behind_scenes_weights[i]
-                weights.append(base_weight * behind_scenes_weight)
-
-            draw = min(current_count, len(items))
-            selected = []
-            selected_dict = []
-            for _ in range(draw):
-                if not items:
-                    break
-                total_weight = sum(weights)
-                if total_weight <= 0:
-                    idx = system_random.randint(0, len(items) - 1)
-                else:
-                    rv = system_random.uniform(0, total_weight)
-                    cum = 0
-                    idx = 0
-                    for i, w in enumerate(weights):
-                        cum += w
-                        if rv <= cum:
-                            idx = i
-                            break
-                chosen = items[idx]
-                selected.append(
-                    (chosen.get("id"), chosen.get("name"), chosen.get("exist", True))
-                )
-                selected_dict.append(chosen)
-                items.pop(idx)
-                weights.pop(idx)
-            return {
-                "selected_prizes": selected,
-                "pool_name": pool_name,
-                "selected_prizes_dict": selected_dict,
-            }
-        except Exception:
+    @staticmethod
+    def _draw_random_prizes(pool_name: str, current_count: int):
+        try:
+            # 剩余次数、内幕权重都由奖池库存维护，抽取 k 个奖品为 O(k log n)
+            return get_prize_inventory(pool_name).sample(current_count, get_random())
+        except Exception as e:
+            logger.exception(f"抽取奖品失败: {e}")
             return {
                 "selected_prizes": [],
                 "pool_name": pool_name,
@@ -518,43 +462,13 @@ class LotteryUtils:
     @staticmethod
     def _get_prize_draw_threshold():
         """获取奖品抽取阈值：None 表示可重复；1 表示不重复；半重复返回次数阈值"""
-        try:
-            mode = readme_settings_async("lottery_settings", "draw_mode")
-            if mode == 1:
-                return 1
-            elif mode == 2:
-                hr = readme_settings_async("lottery_settings", "half_repeat")
-                try:
-                    return int(hr) if hr else 1
-                except Exception:
-                    return 1
-            else:
-                return None
-        except Exception:
-            return None
+        return get_prize_draw_threshold()
 
     @staticmethod
     def calculate_prize_remaining_count(pool_name: str) -> int:
         """计算剩余可抽奖品数量，考虑不重复/半重复设置"""
         try:
-            from app.common.data.list import get_pool_list
-
-            threshold = LotteryUtils._get_prize_draw_threshold()
-            items = [
-                item for item in get_pool_list(pool_name) if item.get("exist", True)
-            ]
-            total = len(items)
-            if threshold is None:
-                return total
-            drawn_records = read_drawn_record_simple(pool_name)
-            drawn_counts = {name: cnt for name, cnt in drawn_records}
-            remain = 0
-            for i in items:
-                name = i.get("name", "")
-                cnt = int(drawn_counts.get(name, 0))
-                if cnt < threshold:
-                    remain += 1
-            return remain
+            return get_prize_inventory(pool_name).remaining_count()
         except Exception:
             return 0
 
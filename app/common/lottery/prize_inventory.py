@@ -0,0 +1,452 @@
+# ====================== 1. 数据结构 ======================
+# - FenwickTree                  - 整数树状数组：单点修改、前缀和、按前缀和定位，均为 O(log n)
+
+# ====================== 2. 奖品库存 ======================
+# - get_prize_draw_threshold()   - 当前抽取模式下每个奖品可被抽取的次数
+# - PrizeInventory               - 单个奖池的内存库存：剩余次数、权重、按权重不放回抽样
+# - get_prize_inventory()        - 获取奖池的库存实例（按奖池缓存）
+# - clear_prize_inventories()    - 丢弃全部库存实例，下次使用时重新构建
+
+# ==================================================
+# 导入模块
+# ==================================================
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+from app.common.behind_scenes.behind_scenes_utils import BehindScenesUtils
+from app.common.data.list import get_pool_list
+from app.tools.config import (
+    get_drawn_prize_record_path,
+    read_drawn_record_simple,
+    write_drawn_prize_record,
+)
+from app.tools.json_store import discard_pending_write
+from app.tools.path_utils import get_data_path
+from app.tools.settings_access import readme_settings_async
+from app.tools.variable import PRIZE_GUARANTEED_WEIGHT, PRIZE_WEIGHT_SCALE
+
+FileSignature = Optional[Tuple[int, int]]
+
+
+# ==================================================
+# 数据结构
+# ==================================================
+class FenwickTree:
+    """整数树状数组
+
+    只保存整数，前缀和没有浮点误差，按前缀和定位的结果是精确的。
+    """
+
+    __slots__ = ("_size", "_tree", "_values", "_top")
+
+    def __init__(self, values: Iterable[int] = ()):
+        values = list(values)
+        self._size = len(values)
+        self._values = values
+        tree = [0] + values
+        for i in range(1, self._size + 1):
+            parent = i + (i & -i)
+            if parent <= self._size:
+                tree[parent] += tree[i]
+        self._tree = tree
+        top = 1
+        while top * 2 <= self._size:
+            top *= 2
+        self._top = top
+
+    def __len__(self) -> int:
+        return self._size
+
+    def get(self, index: int) -> int:
+        """获取单个位置的值"""
+        return self._values[index]
+
+    def set(self, index: int, value: int) -> None:
+        """把单个位置设为 value"""
+        delta = value - self._values[index]
+        if not delta:
+            return
+        self._values[index] = value
+        i = index + 1
+        while i <= self._size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def total(self) -> int:
+        """全部位置之和"""
+        return self.prefix_sum(self._size)
+
+    def prefix_sum(self, count: int) -> int:
+        """前 count 个位置之和"""
+        result = 0
+        i = count
+        while i > 0:
+            result += self._tree[i]
+            i -= i & -i
+        return result
+
+    def find(self, target: int) -> int:
+        """找到前缀和首次超过 target 的位置（0 <= target < total()）"""
+        pos = 0
+        step = self._top
+        while step:
+            nxt = pos + step
+            if nxt <= self._size and self._tree[nxt] <= target:
+                pos = nxt
+                target -= self._tree[nxt]
+            step //= 2
+        return pos
+
+
+# ==================================================
+# 奖品库存
+# ==================================================
+def _file_signature(path: Path) -> FileSignature:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_prize_draw_threshold() -> Optional[int]:
+    """奖品抽取阈值：None 表示可重复；1 表示不重复；半重复返回次数阈值"""
+    try:
+        mode = readme_settings_async("lottery_settings", "draw_mode")
+        if mode == 1:
+            return 1
+        if mode == 2:
+            half_repeat = readme_settings_async("lottery_settings", "half_repeat")
+            try:
+                return int(half_repeat) if half_repeat else 1
+            except Exception:
+                return 1
+        return None
+    except Exception:
+        return None
+
+
+def _scale_weight(value: float) -> int:
+    """把权重换算为定点整数，正权重至少为 1"""
+    if value <= 0:
+        return 0
+    return max(1, round(value * PRIZE_WEIGHT_SCALE))
+
+
+class PrizeInventory:
+    """单个奖池的内存库存
+
+    奖池文件和抽取记录只在发生变化时重新读取（按文件修改时间和大小判断）。
+    每个奖品的剩余次数 = 抽取阈值 - 已抽取次数（可重复模式下不限）；
+    可抽奖品的权重（奖品权重 × 内幕倍率）保存在树状数组中，抽取 k 个奖品为 O(k log n)。
+    发奖时在锁内扣减剩余次数并写入抽取记录，抽取记录是奖品发放的唯一持久化位置；
+    一次抽取在 transaction() 内完成抽样和发放，已抽完的奖品不会被超额发放。
+    """
+
+    def __init__(self, pool_name: str):
+        self.pool_name = pool_name
+        self._lock = threading.RLock()
+        self._pool_path = get_data_path("list/lottery_list") / f"{pool_name}.json"
+        self._record_path = get_drawn_prize_record_path(pool_name)
+        self._pool_signature: FileSignature = None
+        self._record_signature: FileSignature = None
+        self._threshold: Optional[int] = None
+        self._behind_scenes_source: Any = None
+        self._behind_scenes_key: Any = None
+        self._loaded = False
+
+        self._items: List[Dict[str, Any]] = []
+        self._index: Dict[str, int] = {}
+        self._base_weights: List[float] = []
+        self._multipliers: Dict[int, float] = {}
+        self._excluded: set[int] = set()
+        self._guaranteed: set[int] = set()
+        self._drawn_counts: Dict[str, int] = {}
+        self._stock: List[Optional[int]] = []
+        self._in_stock = 0
+        self._existing_in_stock = 0
+        self._weights = FenwickTree()
+        self._counts = FenwickTree()
+
+    # -------------------- 状态同步 --------------------
+
+    def _refresh(self) -> None:
+        """检查奖池文件、抽取记录和设置，有变化时更新库存（调用方持有锁）"""
+        pool_signature = _file_signature(self._pool_path)
+        record_signature = _file_signature(self._record_path)
+        threshold = get_prize_draw_threshold()
+
+        if record_signature is None and self._record_signature is not None:
+            # 抽取记录被外部删除（重置），丢弃可能尚未写出的旧记录，避免之后又被写回
+            discard_pending_write(self._record_path)
+
+        rebuild_items = not self._loaded or pool_signature != self._pool_signature
+        if rebuild_items:
+            self._load_items()
+            self._pool_signature = pool_signature
+        if rebuild_items or record_signature != self._record_signature:
+            self._drawn_counts = self._read_drawn_counts()
+            self._record_signature = record_signature
+            rebuild_items = True
+        behind_scenes_changed = self._refresh_behind_scenes()
+        if rebuild_items or behind_scenes_changed or threshold != self._threshold:
+            self._threshold = threshold
+            self._rebuild()
+        self._loaded = True
+
+    def _read_drawn_counts(self) -> Dict[str, int]:
+        drawn_counts = {}
+        for name, count in read_drawn_record_simple(self.pool_name):
+            try:
+                drawn_counts[name] = int(count)
+            except (TypeError, ValueError):
+                drawn_counts[name] = 1
+        return drawn_counts
+
+    def _load_items(self) -> None:
+        self._items = get_pool_list(self.pool_name)
+        self._index = {item.get("name", ""): i for i, item in enumerate(self._items)}
+        self._base_weights = []
+        for item in self._items:
+            try:
+                self._base_weights.append(float(item.get("weight", 1)))
+            except (TypeError, ValueError):
+                self._base_weights.append(1.0)
+        self._behind_scenes_source = None
+
+    def _refresh_behind_scenes(self) -> bool:
+        """按内幕设置更新奖品的权重倍率，设置没有变化时不做任何事
+
+        Returns:
+            bool: 倍率是否有变化
+        """
+        settings = BehindScenesUtils.get_behind_scenes_settings()
+        if settings is self._behind_scenes_source:
+            return False
+        self._behind_scenes_source = settings
+
+        multipliers: Dict[int, float] = {}
+        if isinstance(settings, dict) and settings.get("enabled_global", True):
+            for name, entry in settings.items():
+                index = self._index.get(name)
+                if index is None or not isinstance(entry, dict):
+                    continue
+                lottery_settings = entry.get("lottery", {})
+                if not isinstance(lottery_settings, dict):
+                    continue
+                prob_settings = lottery_settings.get(self.pool_name)
+                if not isinstance(prob_settings, dict):
+                    continue
+                if not prob_settings.get("enabled", False):
+                    continue
+                multipliers[index] = float(prob_settings.get("probability", 1.0))
+
+        key = tuple(sorted(multipliers.items()))
+        if key == self._behind_scenes_key:
+            return False
+        self._behind_scenes_key = key
+        self._multipliers = multipliers
+        self._excluded = {i for i, value in multipliers.items() if value == 0}
+        self._guaranteed = {
+            i for i, value in multipliers.items() if value >= PRIZE_GUARANTEED_WEIGHT
+        }
+        return True
+
+    def _effective_weight(self, index: int) -> int:
+        multiplier = self._multipliers.get(index, 1.0)
+        if multiplier >= PRIZE_GUARANTEED_WEIGHT:
+            multiplier = float(PRIZE_GUARANTEED_WEIGHT)
+        return _scale_weight(self._base_weights[index] * multiplier)
+
+    def _rebuild(self) -> None:
+        """按当前阈值和已抽取次数重建剩余次数和树状数组"""
+        threshold = self._threshold
+        self._stock = []
+        weights = []
+        counts = []
+        self._in_stock = 0
+        self._existing_in_stock = 0
+        for i, item in enumerate(self._items):
+            if threshold is None:
+                stock = None
+            else:
+                drawn = self._drawn_counts.get(item.get("name", ""), 0)
+                stock = max(0, threshold - drawn)
+            self._stock.append(stock)
+            has_stock = stock is None or stock > 0
+            if has_stock:
+                self._in_stock += 1
+                if item.get("exist", True):
+                    self._existing_in_stock += 1
+            drawable = has_stock and i not in self._excluded
+            weights.append(self._effective_weight(i) if drawable else 0)
+            counts.append(1 if drawable else 0)
+        self._weights = FenwickTree(weights)
+        self._counts = FenwickTree(counts)
+
+    def _set_drawable(self, index: int, drawable: bool) -> None:
+        self._weights.set(index, self._effective_weight(index) if drawable else 0)
+        self._counts.set(index, 1 if drawable else 0)
+
+    def invalidate(self) -> None:
+        """丢弃内存中的状态，下次使用时从奖池文件和抽取记录重新构建"""
+        with self._lock:
+            self._loaded = False
+            self._behind_scenes_source = None
+            self._behind_scenes_key = None
+
+    # -------------------- 查询 --------------------
+
+    def remaining_count(self) -> int:
+        """剩余可抽的（存在的）奖品数量"""
+        with self._lock:
+            self._refresh()
+            return self._existing_in_stock
+
+    def total_count(self) -> int:
+        """奖池中存在的奖品数量"""
+        with self._lock:
+            self._refresh()
+            return sum(1 for item in self._items if item.get("exist", True))
+
+    # -------------------- 抽取与发放 --------------------
+
+    def sample(self, count: int, rng) -> Dict[str, Any]:
+        """按权重不放回地抽取奖品，不改变库存
+
+        Args:
+            count: 抽取数量
+            rng: 随机数生成器
+
+        Returns:
+            dict: 与 LotteryUtils.draw_random_prizes 相同格式的结果；
+                有抽取阈值且全部奖品已抽完时返回 {"reset_required": True}
+        """
+        with self._lock:
+            self._refresh()
+            if not self._items:
+                return self._result([])
+            if self._threshold is not None and self._in_stock == 0:
+                return {"reset_required": True}
+
+            guaranteed = [i for i in sorted(self._guaranteed) if self._has_stock(i)]
+            if guaranteed:
+                return self._result(guaranteed)
+
+            picked: List[int] = []
+            try:
+                for _ in range(max(0, count)):
+                    total_weight = self._weights.total()
+                    if total_weight > 0:
+                        index = self._weights.find(rng.randrange(total_weight))
+                    else:
+                        available = self._counts.total()
+                        if available <= 0:
+                            break
+                        index = self._counts.find(rng.randrange(available))
+                    picked.append(index)
+                    self._set_drawable(index, False)
+            finally:
+                # 同一次抽取内不重复，抽完后恢复
+                for index in picked:
+                    self._set_drawable(index, True)
+            return self._result(picked)
+
+    def award(self, names: Iterable[str]) -> List[str]:
+        """发放奖品：在锁内重新检查剩余次数，扣减后写入抽取记录
+
+        剩余次数已经用完的奖品不会发放，也不会计入抽取记录。
+        抽样和发放之间应持有 transaction()，否则并发的抽取可能抽中同一份剩余库存。
+
+        Args:
+            names: 发放的奖品名称
+
+        Returns:
+            list: 剩余次数已经用完、没有发放的奖品名称
+        """
+        names = [name for name in names if name]
+        if not names:
+            return []
+        with self._lock:
+            self._refresh()
+            rejected = []
+            awarded = []
+            for name in names:
+                index = self._index.get(name)
+                stock = self._stock[index] if index is not None else None
+                if stock is not None and stock <= 0:
+                    rejected.append(name)
+                    continue
+                self._drawn_counts[name] = self._drawn_counts.get(name, 0) + 1
+                awarded.append(name)
+                if stock is None:
+                    continue
+                self._stock[index] = stock - 1
+                if stock == 1:
+                    self._in_stock -= 1
+                    if self._items[index].get("exist", True):
+                        self._existing_in_stock -= 1
+                    self._set_drawable(index, False)
+            if awarded:
+                write_drawn_prize_record(self.pool_name, self._drawn_counts, awarded)
+                self._record_signature = _file_signature(self._record_path)
+        if rejected:
+            logger.warning(f"奖池 {self.pool_name} 的奖品已抽完，未发放: {rejected}")
+        return rejected
+
+    @contextmanager
+    def transaction(self) -> Iterator["PrizeInventory"]:
+        """在一次抽取的抽样和发放之间持有库存锁（可重入）
+
+        sample() 和 award() 在同一个锁内完成，并发的抽取不会抽中同一份剩余库存。
+        """
+        with self._lock:
+            yield self
+
+    def _has_stock(self, index: int) -> bool:
+        stock = self._stock[index]
+        return stock is None or stock > 0
+
+    def _result(self, indices: List[int]) -> Dict[str, Any]:
+        selected = []
+        selected_dict = []
+        for index in indices:
+            item = self._items[index]
+            selected.append((item.get("id"), item.get("name"), item.get("exist", True)))
+            selected_dict.append(dict(item))
+        return {
+            "selected_prizes": selected,
+            "pool_name": self.pool_name,
+            "selected_prizes_dict": selected_dict,
+        }
+
+
+_inventories: Dict[str, PrizeInventory] = {}
+_inventories_lock = threading.Lock()
+
+
+def get_prize_inventory(pool_name: str) -> PrizeInventory:
+    """获取奖池的库存实例
+
+    Args:
+        pool_name: 奖池名称
+
+    Returns:
+        PrizeInventory: 库存实例
+    """
+    with _inventories_lock:
+        inventory = _inventories.get(pool_name)
+        if inventory is None:
+            inventory = PrizeInventory(pool_name)
+            _inventories[pool_name] = inventory
+        return inventory
+
+
+def clear_prize_inventories() -> None:
+    """丢弃全部库存实例，下次使用时重新构建"""
+    with _inventories_lock:
+        _inventories.clear()
@@ -5,20 +5,14 @@
 import threading
 import time
 from typing import Optional
-import numpy as np
 from loguru import logger
 
-try:
-    import sounddevice as sd
-except Exception as e:
-    sd = None
-    logger.warning(f"sounddevice 不可用: {e}")
+# 音频依赖延迟到首次播放时才导入，避免拖慢启动
+from app.tools.lazy_import import lazy_import, module_available
 
-try:
-    import soundfile as sf
-except Exception as e:
-    sf = None
-    logger.warning(f"soundfile 不可用: {e}")
+np = lazy_import("numpy")
+sd = lazy_import("sounddevice", optional=True)
+sf = lazy_import("soundfile", optional=True)
 
 from app.tools.path_utils import *
 from app.tools.settings_default import *
@@ -72,7 +66,7 @@ class MusicPlayer:
             logger.debug("音乐文件为空或选择无音乐，不播放")
             return False
 
-        if sd is None or sf is None:
+        if not (module_available(sd) and module_available(sf)):
             self._last_error = "Audio dependencies not available"
             logger.warning("音频播放依赖不可用，无法播放音乐")
             return False
@@ -0,0 +1,347 @@
+# ====================== 1. 发送队列 ======================
+# - OutboundNotification          - 一条待发送到 ClassIsland 的通知
+# - CircuitBreaker                - 熔断器（对端失联时快速失败，不再等待超时）
+# - ClassIslandSendQueue          - 有界、按显示模式合并的异步发送队列（独立工作线程）
+
+# ====================== 2. 全局队列 ======================
+# - get_classisland_send_queue()  - 获取通过 C# IPC 发送的全局队列
+
+# ==================================================
+# 导入模块
+# ==================================================
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from app.tools.variable import (
+    CLASSISLAND_BREAKER_COOLDOWN_S,
+    CLASSISLAND_BREAKER_FAILURE_THRESHOLD,
+    CLASSISLAND_SEND_MAX_RETRIES,
+    CLASSISLAND_SEND_QUEUE_CAPACITY,
+    CLASSISLAND_SEND_RETRY_BACKOFF_S,
+    CLASSISLAND_SEND_TIMEOUT_S,
+)
+
+
+# ==================================================
+# 发送队列
+# ==================================================
+@dataclass(slots=True)
+class OutboundNotification:
+    """一条待发送到 ClassIsland 的通知
+
+    同一显示模式（settings_group）只保留最新的一条，
+    on_failure 在最终发送失败或熔断时于工作线程中调用。
+    """
+
+    class_name: str
+    selected_students: List[Dict[str, Any]]
+    draw_count: int = 1
+    settings: Optional[Dict[str, Any]] = None
+    settings_group: Optional[str] = None
+    is_animating: bool = False
+    on_failure: Optional[Callable[["OutboundNotification"], None]] = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def key(self) -> str:
+        return self.settings_group or ""
+
+
+class CircuitBreaker:
+    """熔断器
+
+    连续失败达到阈值后进入熔断状态，冷却期内的发送直接判定失败；
+    冷却期结束后允许一次试探发送，成功则恢复，失败则重新熔断。
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = CLASSISLAND_BREAKER_FAILURE_THRESHOLD,
+        cooldown_s: float = CLASSISLAND_BREAKER_COOLDOWN_S,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._failure_threshold = max(1, int(failure_threshold))
+        self._cooldown_s = max(0.0, float(cooldown_s))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_until: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state_locked()
+
+    def _state_locked(self) -> str:
+        if self._opened_until is None:
+            return self.CLOSED
+        if self._clock() >= self._opened_until:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        """当前是否允许发送"""
+        with self._lock:
+            return self._state_locked() != self.OPEN
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_until is not None:
+                logger.info("ClassIsland 通知发送已恢复")
+            self._failures = 0
+            self._opened_until = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            half_open = self._state_locked() == self.HALF_OPEN
+            if half_open or self._failures >= self._failure_threshold:
+                if self._opened_until is None:
+                    logger.warning(
+                        f"ClassIsland 通知连续发送失败 {self._failures} 次，"
+                        f"熔断 {self._cooldown_s:.0f} 秒"
+                    )
+                self._opened_until = self._clock() + self._cooldown_s
+
+
+class ClassIslandSendQueue:
+    """有界、按显示模式合并的异步发送队列
+
+    调用方只需 enqueue() 后立即返回，发送在独立的工作线程中完成：
+
+    - 同一显示模式尚未发出的旧结果会被最新结果替换（动画过程中的中间结果不再逐条发送）；
+    - 队列已满时丢弃最早的一条；
+    - 发送出错或超时会按退避间隔重试，等待期间有同一模式的新结果入队则放弃重试；
+    - send 返回 False 表示对端明确不可用（未连接等），不重试；
+    - 熔断期间直接判定失败，不调用 send；
+    - 上一次调用仍未返回（对端卡死）时同样直接判定失败，不会堆积阻塞的调用。
+    """
+
+    def __init__(
+        self,
+        send: Callable[[OutboundNotification], bool],
+        capacity: int = CLASSISLAND_SEND_QUEUE_CAPACITY,
+        timeout_s: float = CLASSISLAND_SEND_TIMEOUT_S,
+        max_retries: int = CLASSISLAND_SEND_MAX_RETRIES,
+        retry_backoff_s: float = CLASSISLAND_SEND_RETRY_BACKOFF_S,
+        breaker: Optional[CircuitBreaker] = None,
+        name: str = "classisland-send",
+    ):
+        """
+        Args:
+            send: 实际发送函数，成功返回 True，对端不可用返回 False，出错时抛出异常
+            capacity: 最多保留的待发送通知数量
+            timeout_s: 单次发送的超时时间（秒）
+            max_retries: 出错或超时后的最大重试次数
+            retry_backoff_s: 重试退避的基础间隔（秒）
+            breaker: 熔断器，默认按配置新建
+            name: 工作线程名称
+        """
+        self._send = send
+        self._capacity = max(1, int(capacity))
+        self._timeout_s = max(0.001, float(timeout_s))
+        self._max_retries = max(0, int(max_retries))
+        self._retry_backoff_s = max(0.0, float(retry_backoff_s))
+        self.breaker = breaker or CircuitBreaker()
+        self._name = name
+
+        self._pending: "OrderedDict[str, OutboundNotification]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._stats: Counter = Counter()
+        self._worker: Optional[threading.Thread] = None
+        self._inflight: Optional[threading.Event] = None
+        self._idle = True
+        self._closed = False
+
+    # ---------------- 调用方接口 ----------------
+    def enqueue(self, item: OutboundNotification) -> bool:
+        """加入一条通知并立即返回
+
+        Returns:
+            bool: 队列已关闭时返回 False
+        """
+        with self._cond:
+            if self._closed:
+                return False
+            self._stats["enqueued"] += 1
+            if item.key in self._pending:
+                # 替换尚未发出的旧结果，保持其在队列中的位置
+                self._pending[item.key] = item
+                self._stats["coalesced"] += 1
+            else:
+                if len(self._pending) >= self._capacity:
+                    _, dropped = self._pending.popitem(last=False)
+                    self._stats["dropped"] += 1
+                    logger.debug(f"发送队列已满，丢弃 {dropped.key} 的通知")
+                self._pending[item.key] = item
+            self._ensure_worker()
+            self._cond.notify_all()
+        return True
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """等待队列清空且没有正在处理的通知（用于测试和退出前冲刷）"""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and self._idle, timeout=timeout
+            )
+
+    def close(self, timeout: float = 0.5) -> None:
+        """关闭队列，丢弃尚未发出的通知"""
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._cond.notify_all()
+            worker = self._worker
+        if worker is not None and worker is not threading.current_thread():
+            worker.join(timeout=timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取发送统计"""
+        with self._cond:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["pending"] = len(self._pending)
+        stats["breaker"] = self.breaker.state
+        return stats
+
+    # ---------------- 工作线程 ----------------
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._worker = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._idle = True
+                self._cond.notify_all()
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if self._closed:
+                    return
+                _, item = self._pending.popitem(last=False)
+                self._idle = False
+            try:
+                self._deliver(item)
+            except Exception as e:
+                logger.exception(f"处理 ClassIsland 通知失败: {e}")
+
+    def _deliver(self, item: OutboundNotification) -> None:
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                self._bump("short_circuited")
+                self._fail(item)
+                return
+
+            result = self._call(item)
+            if result is True:
+                self.breaker.record_success()
+                self._bump("sent")
+                latency_ms = (time.monotonic() - item.enqueued_at) * 1000
+                logger.debug(
+                    f"已发送通知到 ClassIsland（{item.key}），耗时 {latency_ms:.0f}ms"
+                )
+                return
+
+            self.breaker.record_failure()
+            if result is False or attempt >= self._max_retries:
+                self._bump("failed")
+                self._fail(item)
+                return
+
+            attempt += 1
+            with self._cond:
+                # 退避等待期间同一模式有了新结果，旧结果无需再发
+                self._cond.wait_for(
+                    lambda: item.key in self._pending or self._closed,
+                    timeout=self._retry_backoff_s * attempt,
+                )
+                if self._closed:
+                    return
+                if item.key in self._pending:
+                    self._stats["superseded"] += 1
+                    return
+                self._stats["retried"] += 1
+
+    def _call(self, item: OutboundNotification) -> Optional[bool]:
+        """在独立的守护线程中调用 send 并等待超时
+
+        Returns:
+            Optional[bool]: True 成功；False 对端不可用；None 出错、超时或上一次调用仍未返回
+        """
+        if self._inflight is not None and not self._inflight.is_set():
+            self._bump("busy")
+            return None
+
+        done = threading.Event()
+        outcome: Dict[str, Any] = {}
+
+        def target() -> None:
+            try:
+                outcome["result"] = bool(self._send(item))
+            except Exception as e:
+                outcome["error"] = e
+            finally:
+                done.set()
+
+        self._inflight = done
+        threading.Thread(target=target, name=f"{self._name}-call", daemon=True).start()
+        if not done.wait(self._timeout_s):
+            self._bump("timed_out")
+            logger.warning(f"发送通知到 ClassIsland 超时（{self._timeout_s:.1f} 秒）")
+            return None
+        if "error" in outcome:
+            self._bump("errors")
+            logger.warning(f"发送通知到 ClassIsland 出错: {outcome['error']}")
+            return None
+        return outcome["result"]
+
+    def _fail(self, item: OutboundNotification) -> None:
+        if item.on_failure is None:
+            return
+        try:
+            item.on_failure(item)
+        except Exception as e:
+            logger.exception(f"ClassIsland 通知失败回调执行出错: {e}")
+
+    def _bump(self, name: str) -> None:
+        with self._cond:
+            self._stats[name] += 1
+
+
+# ==================================================
+# 全局队列
+# ==================================================
+_send_queue: Optional[ClassIslandSendQueue] = None
+_send_queue_lock = threading.Lock()
+
+
+def _send_via_csharp_ipc(item: OutboundNotification) -> bool:
+    from app.common.IPC_URL.csharp_ipc_handler import CSharpIPCHandler
+
+    return CSharpIPCHandler.instance().send_notification(
+        item.class_name,
+        item.selected_students,
+        item.draw_count,
+        item.settings,
+        item.settings_group,
+        item.is_animating,
+    )
+
+
+def get_classisland_send_queue() -> ClassIslandSendQueue:
+    """获取通过 C# IPC 发送到 ClassIsland 的全局队列"""
+    global _send_queue
+    with _send_queue_lock:
+        if _send_queue is None:
+            _send_queue = ClassIslandSendQueue(_send_via_csharp_ipc)
+        return _send_queue
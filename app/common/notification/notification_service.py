@@ -2,16 +2,32 @@ from loguru import logger
 from random import SystemRandom
 
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QApplication
-from PySide6.QtCore import Qt, QPoint, QTimer, QPropertyAnimation, QEasingCurve, QRect
+from PySide6.QtCore import (
+    Qt,
+    QObject,
+    QPoint,
+    QTimer,
+    QPropertyAnimation,
+    QEasingCurve,
+    QRect,
+    Signal,
+)
 from PySide6.QtGui import QMouseEvent
 from qfluentwidgets import CardWidget, BodyLabel
 
 from app.page_building.page_template import PageTemplate
-from app.tools.variable import WINDOW_BOTTOM_POSITION_FACTOR
+from app.tools.variable import (
+    NOTIFICATION_PREWARM_CELL_COUNT,
+    NOTIFICATION_PREWARM_SETTINGS_GROUPS,
+    WINDOW_BOTTOM_POSITION_FACTOR,
+)
 from app.Language.obtain_language import get_any_position_value
 from app.tools.settings_access import readme_settings_async
 from app.common.IPC_URL.url_ipc_handler import URLIPCHandler
-from app.common.IPC_URL.csharp_ipc_handler import CSharpIPCHandler
+from app.common.notification.classisland_send_queue import (
+    OutboundNotification,
+    get_classisland_send_queue,
+)
 
 system_random = SystemRandom()
 
@@ -161,9 +177,6 @@ class FloatingNotificationWindow(CardWidget):
         # 关闭动画
         self.hide_animation = None
 
-        # 启动周期性置顶
-        self._start_periodic_topmost()
-
     def mousePressEvent(self, event: QMouseEvent):
         """鼠标按下事件处理，用于窗口拖拽"""
         if event.button() == Qt.LeftButton:
@@ -715,6 +728,16 @@ class FloatingNotificationWindow(CardWidget):
         # 更新倒计时显示
         self.update_countdown_display()
 
+    def showEvent(self, event):
+        """显示时启动周期性置顶（预建的隐藏窗口不产生任何唤醒）"""
+        super().showEvent(event)
+        self._start_periodic_topmost()
+
+    def hideEvent(self, event):
+        """隐藏时停止周期性置顶"""
+        self._periodic_topmost_timer.stop()
+        super().hideEvent(event)
+
     def _start_periodic_topmost(self):
         """启动周期性置顶定时器"""
         self._periodic_topmost_timer.start(self._periodic_topmost_interval)
@@ -753,6 +776,19 @@ class FloatingNotificationWindow(CardWidget):
         # 隐藏窗口
         self.hide()
 
+    def hide_immediately(self):
+        """立即隐藏窗口（不播放动画），用于切换到其他显示模式的通知窗口"""
+        self.auto_close_timer.stop()
+        self.countdown_timer.stop()
+        for name in ("geometry_animation", "opacity_animation", "hide_animation"):
+            animation = getattr(self, name, None)
+            if animation is not None:
+                try:
+                    animation.stop()
+                except RuntimeError:
+                    pass
+        self.hide()
+
     @property
     def current_theme_foreground(self):
         """获取当前主题下的前景色"""
@@ -881,6 +917,120 @@ class FloatingNotificationWindow(CardWidget):
         for label in student_labels:
             self.content_layout.addWidget(label)
 
+        self._present_content(window_width, window_height, settings, is_animating)
+
+    def prewarm(self, font_settings_group):
+        """预热隐藏的通知窗口
+
+        提前完成样式计算、创建原生窗口，并按当前图片设置向对象池放入结果单元格，
+        之后显示结果时只需重新绑定内容。窗口保持隐藏。
+
+        Args:
+            font_settings_group: 字体设置组名称（roll_call_settings 等）
+        """
+        from app.common.display.result_display import ResultDisplayUtils
+
+        self.ensurePolished()
+        self.winId()
+        try:
+            self._on_theme_changed()
+        except Exception as e:
+            logger.exception("预热时同步主题时出错（已忽略）: {}", e)
+
+        try:
+            show_image = bool(
+                readme_settings_async(font_settings_group, "student_image")
+            )
+        except Exception:
+            show_image = False
+        image_position_key = (
+            "lottery_image_position"
+            if font_settings_group == "lottery_settings"
+            else "student_image_position"
+        )
+        try:
+            image_position = int(
+                readme_settings_async(font_settings_group, image_position_key)
+            )
+        except Exception:
+            image_position = 0
+
+        # 签名与 render_student_labels 一致：(单人, 显示图片, 图片位置, 卡片样式)
+        signatures = [(True, show_image, image_position, False)]
+        signatures += [
+            (False, show_image, image_position, False)
+        ] * NOTIFICATION_PREWARM_CELL_COUNT
+        pool = ResultDisplayUtils.get_cell_pool(self.content_layout)
+        cells = [
+            pool.acquire(signature, self.content_layout.parentWidget())
+            for signature in signatures
+        ]
+        for cell in cells:
+            cell.ensurePolished()
+            cell.text_label.ensurePolished()
+        for cell in cells:
+            pool.release(cell)
+
+    def bind_results(
+        self,
+        class_name,
+        selected_students,
+        draw_count,
+        display_settings,
+        settings=None,
+        font_settings_group=None,
+        settings_group=None,
+        is_animating=False,
+        group_index=0,
+    ):
+        """把抽取结果绑定到窗口内的池化单元格并显示窗口
+
+        结果数量和结构不变时只更新已有单元格的文本和样式，
+        不创建也不销毁任何组件。
+
+        Args:
+            class_name: 班级名称
+            selected_students: 选中的学生列表 [(学号, 姓名, 是否存在), ...]
+            draw_count: 抽取的学生数量
+            display_settings: _get_display_settings 返回的显示设置
+            settings: 通知设置参数
+            font_settings_group: 字体设置组名称
+            settings_group: 通知设置组名称
+            is_animating: 是否在动画过程中
+
+        Returns:
+            list: 当前显示的单元格列表
+        """
+        from app.common.display.result_display import ResultDisplayUtils
+
+        if settings_group:
+            self.settings_group = settings_group
+
+        # 字体由 render_student_labels 按 font_settings_group 的设置写入样式表
+        cells = ResultDisplayUtils.render_student_labels(
+            self.content_layout,
+            class_name=class_name,
+            selected_students=selected_students,
+            draw_count=draw_count,
+            font_size=display_settings["font_size"],
+            animation_color=display_settings["animation_color"],
+            display_format=display_settings["display_format"],
+            display_style=0,
+            show_student_image=display_settings["show_student_image"],
+            image_position=display_settings.get("image_position"),
+            group_index=group_index,
+            show_random=display_settings.get("show_random", 0),
+            settings_group=font_settings_group or "roll_call_settings",
+        )
+        if not cells:
+            return cells
+
+        window_width, window_height = self._calculate_target_size(cells)
+        self._present_content(window_width, window_height, settings, is_animating)
+        return cells
+
+    def _present_content(self, window_width, window_height, settings, is_animating):
+        """内容就绪后调整窗口大小，并显示窗口或刷新倒计时"""
         # 设置窗口大小（动画过程中避免频繁调整导致闪烁）
         if not is_animating or not self.isVisible():
             self.setFixedSize(window_width, window_height)
@@ -921,6 +1071,22 @@ class FloatingNotificationWindow(CardWidget):
             self.start_show_animation(settings)
 
 
+class _MainThreadInvoker(QObject):
+    """把其他线程中的回调转到主线程执行"""
+
+    fallbackRequested = Signal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.fallbackRequested.connect(self._invoke)
+
+    def _invoke(self, callback):
+        try:
+            callback()
+        except Exception as e:
+            logger.exception("执行主线程回调时出错: {}", e)
+
+
 class FloatingNotificationManager:
     """管理浮动通知窗口"""
 
@@ -937,6 +1103,8 @@ class FloatingNotificationManager:
             self.notification_windows = {}
             # 初始化IPC处理器
             self.ipc_handler = URLIPCHandler("SecRandom", "secrandom")
+            # ClassIsland 发送失败时把回退通知转回主线程
+            self._fallback_bridge = _MainThreadInvoker()
             self._initialized = True
 
     def send_to_classisland(
@@ -1074,30 +1242,35 @@ class FloatingNotificationManager:
                         }
                     )
 
-            cs_ipc = CSharpIPCHandler.instance()
-            status = cs_ipc.send_notification(
-                class_name,
-                selected_students_for_ipc,
-                draw_count,
-                settings,
-                settings_group,
-                is_animating,
-            )
-            if status:
-                logger.info("成功发送通知到ClassIsland，结果未知")
-            else:
-                if fallback_on_error:
+            on_failure = None
+            if fallback_on_error:
+
+                def on_failure(item):
+                    # 在工作线程中调用，回到主线程显示内置通知
                     logger.info("因错误回退到SecRandom通知服务")
-                    self._show_secrandom_notification(
-                        class_name,
-                        selected_students,
-                        draw_count,
-                        settings,
-                        settings_group,
-                        is_animating,
+                    self._fallback_bridge.fallbackRequested.emit(
+                        lambda: self._show_secrandom_notification(
+                            class_name,
+                            selected_students,
+                            draw_count,
+                            settings,
+                            settings_group,
+                            is_animating,
+                        )
                     )
-                else:
-                    logger.warning("发送通知到ClassIsland失败")
+
+            # 只入队，由发送队列的工作线程完成发送，避免 ClassIsland 无响应时阻塞结果显示
+            get_classisland_send_queue().enqueue(
+                OutboundNotification(
+                    class_name=class_name,
+                    selected_students=selected_students_for_ipc,
+                    draw_count=draw_count,
+                    settings=dict(settings) if settings else settings,
+                    settings_group=settings_group,
+                    is_animating=is_animating,
+                    on_failure=on_failure,
+                )
+            )
         except Exception as e:
             logger.exception("发送通知到ClassIsland时出错: {}", e)
             # 如果发生异常，回退到SecRandom通知服务
@@ -1151,6 +1324,48 @@ class FloatingNotificationManager:
         font_settings_group = group_mapping.get(settings_group, settings_group)
         return settings_group, font_settings_group
 
+    def _get_window(self, settings_group):
+        """获取（必要时创建）显示模式对应的通知窗口"""
+        window = self.notification_windows.get(settings_group)
+        if window is None:
+            window = FloatingNotificationWindow()
+            self.notification_windows[settings_group] = window
+        return window
+
+    def _hide_other_windows(self, active_window):
+        """隐藏其他显示模式正在显示的通知窗口"""
+        for window in self.notification_windows.values():
+            if window is not active_window and window.isVisible():
+                window.hide_immediately()
+
+    def prewarm_windows(self, settings_groups=NOTIFICATION_PREWARM_SETTINGS_GROUPS):
+        """为启用了内置通知的显示模式预建隐藏的通知窗口
+
+        Args:
+            settings_groups: 通知设置组名称列表
+        """
+        for settings_group in settings_groups:
+            try:
+                if not readme_settings_async(
+                    settings_group, "call_notification_service"
+                ):
+                    continue
+                # 1 表示仅使用 ClassIsland 通知服务，不需要内置通知窗口
+                service_type = readme_settings_async(
+                    settings_group, "notification_service_type"
+                )
+                if service_type == 1:
+                    continue
+            except Exception as e:
+                logger.warning(f"读取 {settings_group} 通知设置失败，跳过预建: {e}")
+                continue
+            settings_group, font_settings_group = self._determine_font_settings_group(
+                settings_group
+            )
+            window = self._get_window(settings_group)
+            window.prewarm(font_settings_group)
+            logger.debug(f"已预建 {settings_group} 的通知窗口")
+
     def _show_secrandom_notification(
         self,
         class_name,
@@ -1173,9 +1388,6 @@ class FloatingNotificationManager:
         # 重新调用SecRandom通知服务，使用原始的show_roll_call_result逻辑
         display_settings = self._get_display_settings(settings)
 
-        # 使用ResultDisplayUtils创建学生标签（动态导入避免循环依赖）
-        from app.common.display.result_display import ResultDisplayUtils
-
         # 确定使用的设置组
         settings_group, font_settings_group = self._determine_font_settings_group(
             settings_group
@@ -1187,27 +1399,9 @@ class FloatingNotificationManager:
                 group_index = 1
                 break
 
-        student_labels = ResultDisplayUtils.create_student_label(
-            class_name=class_name,
-            selected_students=selected_students,
-            draw_count=draw_count,
-            font_size=display_settings["font_size"],
-            animation_color=display_settings["animation_color"],
-            display_format=display_settings["display_format"],
-            display_style=0,
-            show_student_image=display_settings["show_student_image"],
-            image_position=display_settings.get("image_position"),
-            group_index=group_index,
-            show_random=display_settings.get("show_random", 0),
-            settings_group=font_settings_group,
-            custom_font_family=font_settings_group,
-        )
-
-        # 创建或获取通知窗口
-        if "floating" not in self.notification_windows:
-            self.notification_windows["floating"] = FloatingNotificationWindow()
-
-        window = self.notification_windows["floating"]
+        # 获取该显示模式预建的通知窗口，同一时间只显示一个通知窗口
+        window = self._get_window(settings_group)
+        self._hide_other_windows(window)
         window.is_animation_enabled = display_settings["is_animation_enabled"]
         # 如果窗口已经存在并且有活动的自动关闭定时器，停止它以防止窗口被隐藏
         if window.auto_close_timer.isActive():
@@ -1226,8 +1420,16 @@ class FloatingNotificationManager:
                 {"auto_close_time": 5}, settings_group, is_animating
             )  # 默认5秒
 
-        window.update_content(
-            student_labels, settings, font_settings_group, settings_group, is_animating
+        window.bind_results(
+            class_name,
+            selected_students,
+            draw_count,
+            display_settings,
+            settings,
+            font_settings_group,
+            settings_group,
+            is_animating,
+            group_index,
         )
 
     def get_notification_title(self):
@@ -3,14 +3,12 @@ from PySide6.QtCore import (
     Signal,
     QTimer,
     QEasingCurve,
-    QFileSystemWatcher,
     QThreadPool,
     QRunnable,
 )
 from PySide6.QtGui import QFont
 from dataclasses import dataclass
 from loguru import logger
-from random import SystemRandom
 
 from app.common.data.list import (
     get_student_list,
@@ -20,6 +18,14 @@ from app.common.data.list import (
     get_class_name_list,
 )
 from app.common.display.result_display import ResultDisplayUtils
+from app.common.IPC_URL.event_stream import (
+    EVENT_DRAW_FINISHED,
+    EVENT_DRAW_STARTED,
+    EVENT_LIST_CHANGED,
+    publish_event,
+    result_entries,
+)
+from app.common.display.animation_frames import AnimationFrameStream
 from app.common.history import calculate_weight
 from app.common.roll_call.roll_call_utils import RollCallUtils
 from app.common.music.music_player import music_player
@@ -30,16 +36,16 @@ from app.common.safety.verify_ops import require_and_run
 from app.page_building.another_window import create_remaining_list_window
 from app.tools.config import remove_record
 from app.tools.settings_access import readme_settings_async, readme_settings
+from app.tools.draw_telemetry import draw_stage
 from app.tools.personalised import load_custom_font
 from app.Language.obtain_language import (
     get_content_pushbutton_name_async,
     get_content_combo_name_async,
 )
+from app.tools.file_change_service import FILE_KIND_ROSTER, subscribe_file_changes
 from app.tools.path_utils import get_data_path
 from app.tools.variable import APP_INIT_DELAY
 
-system_random = SystemRandom()
-
 
 @dataclass(frozen=True, slots=True)
 class RollCallDrawContext:
@@ -83,6 +89,7 @@ class RollCallManager(QObject):
         self._precomputed_result = None
         self._precompute_key = None
         self._precompute_running = False
+        self._animation_frames = None
 
     def build_draw_context(
         self,
@@ -116,6 +123,15 @@ class RollCallManager(QObject):
             context.gender_index,
             context.half_repeat,
         )
+        publish_event(
+            EVENT_DRAW_STARTED,
+            lambda: {
+                "kind": "roll_call",
+                "class_name": context.class_name,
+                "group_filter": context.group_filter,
+                "gender_filter": context.gender_filter,
+            },
+        )
 
         animation = readme_settings_async("roll_call_settings", "animation")
         autoplay_count = readme_settings_async("roll_call_settings", "autoplay_count")
@@ -162,6 +178,18 @@ class RollCallManager(QObject):
         selected_students = (result or {}).get("selected_students") or []
         selected_students_dict = (result or {}).get("selected_students_dict") or []
         self.save_result(selected_students, selected_students_dict)
+        publish_event(
+            EVENT_DRAW_FINISHED,
+            lambda: {
+                "kind": "roll_call",
+                "class_name": self.current_class_name,
+                "group_filter": self.current_group_filter,
+                "gender_filter": self.current_gender_filter,
+                "results": result_entries(
+                    (result or {}).get("ipc_selected_students") or selected_students
+                ),
+            },
+        )
 
         result = dict(result or {})
         result["should_update_remaining"] = bool(
@@ -190,6 +218,7 @@ class RollCallManager(QObject):
         加载学生数据
         """
         try:
+            self.stop_animation_frames()
             self._precomputed_result = None
             self._precompute_key = None
             self._precompute_running = False
@@ -211,7 +240,7 @@ class RollCallManager(QObject):
             # 计算权重
             self.weights = self._calculate_weights()
 
-            logger.info(f"加载 {len(self.students)} 个学生在这个班级 {class_name}")
+            logger.info("加载 {} 个学生在这个班级 {}", len(self.students), class_name)
             self.data_loaded.emit(True)
             return True
 
@@ -240,27 +269,74 @@ class RollCallManager(QObject):
 
         return weights
 
-    def get_random_students(self, count):
+    def start_animation_frames(self, count, show_random=0):
         """
-        获取随机学生列表（用于动画帧）
+        根据当前候选快照启动动画帧预计算流
+
+        Args:
+            count: 每帧显示的数量
+            show_random: 小组模式下随机成员的显示方式
         """
-        if not self.students:
-            return []
+        self.stop_animation_frames()
+        try:
+            count = int(count or 0)
+        except Exception:
+            count = 0
+        if count <= 0 or not self.students:
+            return None
 
-        # 如果需要抽取的数量大于学生总数，允许重复
-        allow_repeat = count > len(self.students)
+        students = list(self.students)
+        class_name = self.current_class_name
+        group_mode = self.current_group_index == 1
+        group_members_map = None
+        if group_mode:
+            group_members_map = {}
+            for student in get_student_list(class_name) or []:
+                group_members_map.setdefault(student.get("group", ""), []).append(
+                    student
+                )
 
-        selected = []
-        if allow_repeat:
-            # 简单的随机选择用于动画效果
-            selected = [system_random.choice(self.students) for _ in range(count)]
-        else:
-            # 简单的随机选择用于动画效果（无权重）
-            # 注意：权重采样(without replacement)比较复杂且对动画效果影响不大，
-            # 这里直接使用均匀分布采样以保证性能和避免重复
-            selected = system_random.sample(self.students, k=count)
+        def frame_factory(rng):
+            if count > len(students):
+                picked = rng.choices(students, k=count)
+            else:
+                picked = rng.sample(students, k=count)
+            frame = [(s[0], s[1], s[4] if len(s) > 4 else True) for s in picked]
+            if group_mode:
+                frame = RollCallUtils.render_group_display_students(
+                    class_name,
+                    frame,
+                    show_random,
+                    rng=rng,
+                    group_members_map=group_members_map,
+                )
+            return frame
+
+        self._animation_frames = AnimationFrameStream(
+            frame_factory, key=(count, show_random)
+        ).start()
+        return self._animation_frames
+
+    def next_animation_frame(self, count, show_random=0):
+        """
+        取出下一帧动画显示数据，参数变化时重建帧流
 
-        return selected
+        Returns:
+            list: 显示用的学生元组列表，无候选时返回空列表
+        """
+        stream = self._animation_frames
+        if stream is None or stream.cancelled or stream.key != (count, show_random):
+            stream = self.start_animation_frames(count, show_random)
+        if stream is None:
+            return []
+        return stream.next_frame()
+
+    def stop_animation_frames(self):
+        """取消动画帧预计算流"""
+        stream = self._animation_frames
+        self._animation_frames = None
+        if stream is not None:
+            stream.cancel()
 
     def draw_final_students(self, count):
         """
@@ -425,6 +501,10 @@ def start_roll_call_draw(widget):
     animation_music = plan.animation_music if plan else None
     if animation in [0, 1]:
         manager.start_precompute_final(widget.current_count)
+        manager.start_animation_frames(
+            _get_animation_display_count(widget),
+            readme_settings_async("roll_call_settings", "show_random"),
+        )
 
     if animation == 0:
         if animation_music:
@@ -470,8 +550,27 @@ def start_roll_call_draw(widget):
 
 
 def init_file_watcher(widget):
-    widget.file_watcher = QFileSystemWatcher()
-    setup_file_watcher(widget)
+    list_dir = get_data_path("list", "roll_call_list")
+    widget.file_subscriptions = [
+        # 外部程序通过 IPC 订阅名单变化，不受窗口是否显示影响
+        subscribe_file_changes(
+            FILE_KIND_ROSTER,
+            lambda event: publish_event(
+                EVENT_LIST_CHANGED, {"kind": "roll_call", "path": str(list_dir)}
+            ),
+            widget=widget,
+            directory=list_dir,
+            lazy=False,
+            name="roll_call_list_ipc",
+        ),
+        subscribe_file_changes(
+            FILE_KIND_ROSTER,
+            widget.on_list_files_changed,
+            widget=widget,
+            directory=list_dir,
+            name="roll_call_list",
+        ),
+    ]
 
 
 def init_long_press(widget):
@@ -541,6 +640,12 @@ def reset_count(widget):
 
 
 def stop_animation(widget):
+    """结束动画并完成抽取，总耗时和各阶段耗时记录在抽取耗时统计中"""
+    with draw_stage("roll_call", "finish"):
+        _stop_animation(widget)
+
+
+def _stop_animation(widget):
     is_quick_draw = hasattr(widget, "is_quick_draw") and widget.is_quick_draw
     if hasattr(widget, "animation_timer") and widget.animation_timer.isActive():
         widget.animation_timer.stop()
@@ -548,6 +653,7 @@ def stop_animation(widget):
         get_content_pushbutton_name_async("roll_call", "start_button")
     )
     widget.is_animating = False
+    widget.manager.stop_animation_frames()
     BehindScenesUtils.clear_cache()
     try:
         widget.start_button.clicked.disconnect()
@@ -558,7 +664,8 @@ def stop_animation(widget):
         )
     widget.start_button.clicked.connect(lambda: widget.start_draw())
 
-    result = widget.manager.finalize_draw(widget.current_count, parent=widget)
+    with draw_stage("roll_call", "finalize"):
+        result = widget.manager.finalize_draw(widget.current_count, parent=widget)
     if isinstance(result, dict) and result.get("reset_required"):
         update_many_count_label(widget)
         if (
@@ -606,34 +713,38 @@ def stop_animation(widget):
             )
             if actual_draw_count <= 0:
                 actual_draw_count = widget.current_count
-            display_result(
-                widget,
-                widget.final_selected_students,
-                widget.final_class_name,
-                draw_count=actual_draw_count,
-            )
-            RollCallUtils.show_notification_if_enabled(
-                class_name=widget.final_class_name,
-                selected_students=widget.final_selected_students,
-                draw_count=actual_draw_count,
-                settings_group="roll_call_notification_settings",
-                ipc_selected_students=getattr(
-                    widget, "final_ipc_selected_students", None
-                ),
-            )
-
-        play_voice_result(widget)
-        music_player.stop_music(fade_out=True)
+            with draw_stage("roll_call", "display"):
+                display_result(
+                    widget,
+                    widget.final_selected_students,
+                    widget.final_class_name,
+                    draw_count=actual_draw_count,
+                )
+            with draw_stage("roll_call", "notification"):
+                RollCallUtils.show_notification_if_enabled(
+                    class_name=widget.final_class_name,
+                    selected_students=widget.final_selected_students,
+                    draw_count=actual_draw_count,
+                    settings_group="roll_call_notification_settings",
+                    ipc_selected_students=getattr(
+                        widget, "final_ipc_selected_students", None
+                    ),
+                )
 
-        plan = widget._draw_plan
-        result_music = plan.result_music if plan else None
-        if result_music:
-            music_player.play_music(
-                music_file=result_music,
-                settings_group="roll_call_settings",
-                loop=False,
-                fade_in=True,
-            )
+        with draw_stage("roll_call", "voice"):
+            play_voice_result(widget)
+        with draw_stage("roll_call", "music"):
+            music_player.stop_music(fade_out=True)
+
+            plan = widget._draw_plan
+            result_music = plan.result_music if plan else None
+            if result_music:
+                music_player.play_music(
+                    music_file=result_music,
+                    settings_group="roll_call_settings",
+                    loop=False,
+                    fade_in=True,
+                )
 
 
 def play_voice_result(widget):
@@ -672,27 +783,34 @@ def play_voice_result(widget):
         logger.exception(f"播放语音失败: {e}", exc_info=True)
 
 
+def _get_animation_display_count(widget):
+    display_count = widget.current_count
+    try:
+        remaining_count = int(getattr(widget, "remaining_count", 0) or 0)
+    except Exception:
+        remaining_count = 0
+    if remaining_count > 0:
+        display_count = min(display_count, remaining_count)
+    return display_count
+
+
 def draw_random(widget):
     if widget.is_animating:
-        display_count = widget.current_count
-        try:
-            remaining_count = int(getattr(widget, "remaining_count", 0) or 0)
-        except Exception:
-            remaining_count = 0
-        if remaining_count > 0:
-            display_count = min(display_count, remaining_count)
+        display_count = _get_animation_display_count(widget)
+        display_dict = RollCallUtils.create_display_settings("roll_call_settings")
 
-        students = widget.manager.get_random_students(display_count)
-        selected_students = []
-        for s in students:
-            exist = s[4] if len(s) > 4 else True
-            selected_students.append((s[0], s[1], exist))
+        # 动画帧从预计算缓冲区中取出，小组模式的显示文本已在帧中渲染完成
+        selected_students = widget.manager.next_animation_frame(
+            display_count, display_dict.get("show_random", 0)
+        )
 
         display_result_animated(
             widget,
             selected_students,
             widget.manager.current_class_name,
             draw_count=display_count,
+            display_dict=display_dict,
+            prerendered=True,
         )
 
 
@@ -715,18 +833,31 @@ def display_result(
     )
 
 
-def display_result_animated(widget, selected_students, class_name, draw_count=None):
+def display_result_animated(
+    widget,
+    selected_students,
+    class_name,
+    draw_count=None,
+    display_dict=None,
+    prerendered=False,
+):
     group_index = widget.range_combobox.currentIndex()
-    display_dict = RollCallUtils.create_display_settings("roll_call_settings")
+    if display_dict is None:
+        display_dict = RollCallUtils.create_display_settings("roll_call_settings")
     if draw_count is None:
         draw_count = widget.current_count
 
+    show_random = display_dict["show_random"]
     if group_index == 1:
-        selected_students = RollCallUtils.render_group_display_students(
-            class_name, selected_students, display_dict.get("show_random", 0)
-        )
+        if not prerendered:
+            selected_students = RollCallUtils.render_group_display_students(
+                class_name, selected_students, display_dict.get("show_random", 0)
+            )
+        # 渲染后的文本已包含随机成员，不再重复读取小组成员
+        show_random = 0
 
-    student_labels = ResultDisplayUtils.create_student_label(
+    ResultDisplayUtils.render_student_labels(
+        widget.result_grid,
         class_name=class_name,
         selected_students=selected_students,
         draw_count=draw_count,
@@ -736,24 +867,10 @@ def display_result_animated(widget, selected_students, class_name, draw_count=No
         display_style=display_dict["display_style"],
         show_student_image=display_dict["show_student_image"],
         group_index=group_index,
-        show_random=display_dict["show_random"],
+        show_random=show_random,
         settings_group="roll_call_settings",
     )
 
-    cached_widgets = ResultDisplayUtils.collect_grid_widgets(widget.result_grid)
-    if cached_widgets and len(cached_widgets) == len(student_labels):
-        updated = ResultDisplayUtils.update_grid_labels(
-            widget.result_grid, student_labels, cached_widgets
-        )
-        if updated:
-            ResultDisplayUtils.dispose_widgets(student_labels)
-        else:
-            ResultDisplayUtils.display_results_in_grid(
-                widget.result_grid, student_labels
-            )
-    else:
-        ResultDisplayUtils.display_results_in_grid(widget.result_grid, student_labels)
-
     RollCallUtils.show_notification_if_enabled(
         class_name=class_name,
         selected_students=selected_students,
@@ -921,30 +1038,19 @@ def show_remaining_list(widget):
     window.show()
 
 
-def setup_file_watcher(widget):
+def on_list_files_changed(widget, event):
+    """名单文件变化：班级有增删时重建班级列表，否则只在当前班级的名单变化时刷新"""
     try:
-        list_dir = get_data_path("list", "roll_call_list")
-        if not list_dir.exists():
-            list_dir.mkdir(parents=True, exist_ok=True)
-        widget.file_watcher.addPath(str(list_dir))
-        widget.file_watcher.directoryChanged.connect(widget.on_directory_changed)
-        widget.file_watcher.fileChanged.connect(widget.on_file_changed)
-    except Exception as e:
-        logger.exception(f"设置文件监控器失败: {e}")
-
-
-def on_directory_changed(widget, path):
-    try:
-        QTimer.singleShot(500, lambda: refresh_class_list(widget))
-    except Exception as e:
-        logger.exception(f"处理文件夹变化事件失败: {e}")
-
-
-def on_file_changed(widget, path):
-    try:
-        QTimer.singleShot(500, lambda: refresh_class_list(widget))
+        if event.names_changed:
+            refresh_class_list(widget)
+            return
+        class_name = widget.list_combobox.currentText()
+        if class_name and event.touches(
+            get_data_path("list", "roll_call_list", f"{class_name}.json")
+        ):
+            on_class_changed(widget)
     except Exception as e:
-        logger.exception(f"处理文件变化事件失败: {e}")
+        logger.exception(f"处理名单文件变化失败: {e}")
 
 
 def refresh_class_list(widget):
@@ -989,7 +1095,7 @@ def _populate_class_list(widget):
         if default_class and default_class in class_list:
             index = class_list.index(default_class)
             widget.list_combobox.setCurrentIndex(index)
-            logger.debug(f"应用默认抽取名单: {default_class}")
+            logger.debug("应用默认抽取名单: {}", default_class)
         else:
             widget.list_combobox.setCurrentIndex(0)
     widget.list_combobox.blockSignals(False)
@@ -1,8 +1,6 @@
 # ==================================================
 # 点名工具类
 # ==================================================
-from random import SystemRandom
-
 from app.common.data.list import get_group_list, get_student_list, filter_students_data
 from app.common.history import calculate_weight
 from app.common.fair_draw.avg_gap_protection import apply_avg_gap_protection
@@ -14,6 +12,9 @@ from app.tools.config import (
     record_drawn_student,
 )
 from app.tools.settings_access import readme_settings_async, get_safe_font_size
+from app.tools.random_source import draw_session, get_random
+from app.tools.draw_telemetry import draw_stage
+from app.tools.draw_trace import trace_save, traced_draw
 from app.common.display.result_display import ResultDisplayUtils
 from app.common.history import save_roll_call_history
 from app.common.extraction.extract import (
@@ -24,8 +25,6 @@ from app.common.extraction.extract import (
 
 from app.Language.obtain_language import get_any_position_value
 
-system_random = SystemRandom()
-
 
 class RollCallUtils:
     """点名工具类，提供通用的点名相关功能"""
@@ -224,6 +223,7 @@ class RollCallUtils:
 
         # If weights are provided, ensure they match the candidates length
         current_weights = list(weights) if weights else [1.0] * len(candidates)
+        rng = get_random()
 
         for _ in range(draw_count):
             if not candidates:
@@ -231,9 +231,9 @@ class RollCallUtils:
 
             total_weight = sum(current_weights)
             if total_weight <= 0:
-                random_index = system_random.randint(0, len(candidates) - 1)
+                random_index = rng.randint(0, len(candidates) - 1)
             else:
-                rand_value = system_random.uniform(0, total_weight)
+                rand_value = rng.uniform(0, total_weight)
                 cumulative_weight = 0
                 random_index = 0
                 for i, weight in enumerate(current_weights):
@@ -260,6 +260,7 @@ class RollCallUtils:
         return selected_candidates, selected_candidates_dict
 
     @staticmethod
+    @traced_draw("roll_call")
     def draw_random_students(
         class_name,
         group_index,
@@ -271,32 +272,62 @@ class RollCallUtils:
     ):
         """
         抽取随机学生
+
+        整个抽取过程在同一个随机数会话中进行，开启种子记录时可按种子复现；
+        总耗时和各阶段耗时记录在抽取耗时统计中
         """
+        with (
+            draw_stage("roll_call", "draw"),
+            draw_session("roll_call", class_name=class_name, count=current_count),
+        ):
+            return RollCallUtils._draw_random_students(
+                class_name,
+                group_index,
+                group_filter,
+                gender_index,
+                gender_filter,
+                current_count,
+                half_repeat,
+            )
+
+    @staticmethod
+    def _draw_random_students(
+        class_name,
+        group_index,
+        group_filter,
+        gender_index,
+        gender_filter,
+        current_count,
+        half_repeat,
+    ):
         # 1. 获取候选人
-        students_dict_list = RollCallUtils._get_filtered_candidates(
-            class_name, group_index, group_filter, gender_index, gender_filter
-        )
+        with draw_stage("roll_call", "candidates"):
+            students_dict_list = RollCallUtils._get_filtered_candidates(
+                class_name, group_index, group_filter, gender_index, gender_filter
+            )
 
         # 2. 应用历史记录过滤
-        students_dict_list = RollCallUtils._apply_history_filter(
-            students_dict_list, half_repeat, class_name, gender_filter, group_filter
-        )
+        with draw_stage("roll_call", "half_repeat"):
+            students_dict_list = RollCallUtils._apply_history_filter(
+                students_dict_list, half_repeat, class_name, gender_filter, group_filter
+            )
 
         if not students_dict_list:
             return {"reset_required": True}
 
         # 3. 如果是小组模式，直接抽取小组
         if group_index == 1:
-            draw_type = readme_settings_async("roll_call_settings", "draw_type")
-            selected_groups = RollCallUtils.draw_random_groups(
-                students_dict_list, current_count, draw_type
-            )
-            show_random = readme_settings_async("roll_call_settings", "show_random")
-            selected_groups, ipc_selected_students = (
-                RollCallUtils.render_group_display_students_and_ipc(
-                    class_name, selected_groups, show_random
+            with draw_stage("roll_call", "group"):
+                draw_type = readme_settings_async("roll_call_settings", "draw_type")
+                selected_groups = RollCallUtils.draw_random_groups(
+                    students_dict_list, current_count, draw_type
+                )
+                show_random = readme_settings_async("roll_call_settings", "show_random")
+                selected_groups, ipc_selected_students = (
+                    RollCallUtils.render_group_display_students_and_ipc(
+                        class_name, selected_groups, show_random
+                    )
                 )
-            )
             return {
                 "selected_students": selected_groups,
                 "class_name": class_name,
@@ -307,82 +338,95 @@ class RollCallUtils:
             }
 
         # 4. 获取当前课程信息（用于科目过滤）
-        current_class_info = None
-        subject_history_filter_enabled = (
-            readme_settings_async("linkage_settings", "subject_history_filter_enabled")
-            or False
-        )
+        with draw_stage("roll_call", "subject"):
+            current_class_info = None
+            subject_history_filter_enabled = (
+                readme_settings_async(
+                    "linkage_settings", "subject_history_filter_enabled"
+                )
+                or False
+            )
 
-        if subject_history_filter_enabled:
-            data_source = readme_settings_async("linkage_settings", "data_source")
-            if data_source == 2:
-                from app.common.IPC_URL.csharp_ipc_handler import CSharpIPCHandler
+            if subject_history_filter_enabled:
+                data_source = readme_settings_async("linkage_settings", "data_source")
+                if data_source == 2:
+                    from app.common.IPC_URL.csharp_ipc_handler import CSharpIPCHandler
 
-                current_class_info = (
-                    CSharpIPCHandler.instance().get_current_class_info()
-                )
-            elif data_source == 1:
-                current_class_info = _get_current_class_info()
+                    current_class_info = (
+                        CSharpIPCHandler.instance().get_current_class_info()
+                    )
+                elif data_source == 1:
+                    current_class_info = _get_current_class_info()
 
-            if not current_class_info and _is_non_class_time():
-                current_class_info = _get_break_assignment_class_info()
+                if not current_class_info and _is_non_class_time():
+                    current_class_info = _get_break_assignment_class_info()
 
-        subject_filter = (
-            current_class_info.get("name", "") if current_class_info else ""
-        )
+            subject_filter = (
+                current_class_info.get("name", "") if current_class_info else ""
+            )
 
         # 5. 应用平均间隔保护
-        students_dict_list = apply_avg_gap_protection(
-            students_dict_list, current_count, class_name, "roll_call", subject_filter
-        )
+        with draw_stage("roll_call", "avg_gap"):
+            students_dict_list = apply_avg_gap_protection(
+                students_dict_list,
+                current_count,
+                class_name,
+                "roll_call",
+                subject_filter,
+            )
 
-        # 6. 应用内幕权重
-        students_dict_list, behind_scenes_weights = (
-            BehindScenesUtils.apply_probability_weights(
-                students_dict_list, 0, class_name
+        # 6-8. 计算权重（必中人员直接返回）
+        with draw_stage("roll_call", "weights"):
+            # 6. 应用内幕权重
+            students_dict_list, behind_scenes_weights = (
+                BehindScenesUtils.apply_probability_weights(
+                    students_dict_list, 0, class_name
+                )
             )
-        )
 
-        # 7. 检查必中人员
-        guaranteed_students = BehindScenesUtils.ensure_guaranteed_selection(
-            students_dict_list, behind_scenes_weights, class_name
-        )
-        if guaranteed_students is not None:
-            selected_students = [
-                (s.get("id", ""), s.get("name", ""), s.get("exist", True))
-                for s in guaranteed_students
-            ]
-            return {
-                "selected_students": selected_students,
-                "class_name": class_name,
-                "selected_students_dict": guaranteed_students,
-                "group_filter": group_filter,
-                "gender_filter": gender_filter,
-            }
+            # 7. 检查必中人员
+            guaranteed_students = BehindScenesUtils.ensure_guaranteed_selection(
+                students_dict_list, behind_scenes_weights, class_name
+            )
+            if guaranteed_students is not None:
+                selected_students = [
+                    (s.get("id", ""), s.get("name", ""), s.get("exist", True))
+                    for s in guaranteed_students
+                ]
+                return {
+                    "selected_students": selected_students,
+                    "class_name": class_name,
+                    "selected_students_dict": guaranteed_students,
+                    "group_filter": group_filter,
+                    "gender_filter": gender_filter,
+                }
 
-        # 8. 计算最终权重
-        draw_type = readme_settings_async("roll_call_settings", "draw_type")
-        weights = []
-        if draw_type == 1:
-            students_with_weight = calculate_weight(
-                students_dict_list, class_name, subject_filter
-            )
-            # 重新对齐权重列表（students_with_weight 和 behind_scenes_weights 应该是一一对应的）
-            for i, student in enumerate(students_with_weight):
-                base_weight = student.get("weight", 1.0)
-                bs_weight = (
-                    behind_scenes_weights[i] if i < len(behind_scenes_weights) else 1.0
+            # 8. 计算最终权重
+            draw_type = readme_settings_async("roll_call_settings", "draw_type")
+            weights = []
+            if draw_type == 1:
+                students_with_weight = calculate_weight(
+                    students_dict_list, class_name, subject_filter
                 )
-                weights.append(base_weight * bs_weight)
-            candidates = students_with_weight
-        else:
-            candidates = students_dict_list
-            weights = behind_scenes_weights
+                # 重新对齐权重列表（students_with_weight 和 behind_scenes_weights 应该是一一对应的）
+                for i, student in enumerate(students_with_weight):
+                    base_weight = student.get("weight", 1.0)
+                    bs_weight = (
+                        behind_scenes_weights[i]
+                        if i < len(behind_scenes_weights)
+                        else 1.0
+                    )
+                    weights.append(base_weight * bs_weight)
+                candidates = students_with_weight
+            else:
+                candidates = students_dict_list
+                weights = behind_scenes_weights
 
         # 9. 执行抽取
-        selected_students, selected_students_dict = (
-            RollCallUtils._perform_weighted_draw(candidates, current_count, weights)
-        )
+        with draw_stage("roll_call", "sample"):
+            selected_students, selected_students_dict = (
+                RollCallUtils._perform_weighted_draw(candidates, current_count, weights)
+            )
 
         return {
             "selected_students": selected_students,
@@ -413,20 +457,35 @@ class RollCallUtils:
         return selected_groups
 
     @staticmethod
-    def render_group_display_students(class_name, selected_students, show_random):
+    def render_group_display_students(
+        class_name, selected_students, show_random, rng=None, group_members_map=None
+    ):
         rendered, _ = RollCallUtils.render_group_display_students_and_ipc(
-            class_name, selected_students, show_random
+            class_name,
+            selected_students,
+            show_random,
+            rng=rng,
+            group_members_map=group_members_map,
         )
         return rendered
 
     @staticmethod
     def render_group_display_students_and_ipc(
-        class_name, selected_students, show_random
+        class_name, selected_students, show_random, rng=None, group_members_map=None
     ):
+        """
+        渲染小组模式的显示文本和 IPC 数据
+
+        Args:
+            rng: 随机数生成器，默认为 get_random()（动画帧可传入快速 PRNG）
+            group_members_map: 预先读取的 {小组名: 成员列表}，提供时不再读取名单文件
+        """
         try:
             show_random = int(show_random or 0)
         except Exception:
             show_random = 0
+        if rng is None:
+            rng = get_random()
 
         try:
             from app.common.data.list import get_group_members
@@ -466,13 +525,16 @@ class RollCallUtils:
                 and group_name
             ):
                 try:
-                    group_members = get_group_members(class_name, group_name) or []
+                    if group_members_map is not None:
+                        group_members = group_members_map.get(group_name) or []
+                    else:
+                        group_members = get_group_members(class_name, group_name) or []
                 except Exception:
                     group_members = []
 
                 if group_members:
                     try:
-                        selected_member = system_random.choice(group_members)
+                        selected_member = rng.choice(group_members)
                     except Exception:
                         selected_member = None
                     selected_name = str(
@@ -679,7 +741,8 @@ class RollCallUtils:
             settings_group, display_settings
         )
 
-        student_labels = ResultDisplayUtils.create_student_label(
+        ResultDisplayUtils.render_student_labels(
+            result_grid,
             class_name=class_name,
             selected_students=selected_students,
             draw_count=draw_count,
@@ -693,17 +756,6 @@ class RollCallUtils:
             show_random=display_dict["show_random"],
             settings_group=settings_group,
         )
-        cached_widgets = ResultDisplayUtils.collect_grid_widgets(result_grid)
-        if cached_widgets and len(cached_widgets) == len(student_labels):
-            updated = ResultDisplayUtils.update_grid_labels(
-                result_grid, student_labels, cached_widgets
-            )
-            if updated:
-                ResultDisplayUtils.dispose_widgets(student_labels)
-            else:
-                ResultDisplayUtils.display_results_in_grid(result_grid, student_labels)
-        else:
-            ResultDisplayUtils.display_results_in_grid(result_grid, student_labels)
 
     @staticmethod
     def record_drawn_students(
@@ -725,6 +777,13 @@ class RollCallUtils:
             group_filter: 小组过滤器
             half_repeat: 半重复设置
         """
+        trace_save(
+            "roll_call",
+            class_name,
+            gender_filter=gender_filter,
+            group_filter=group_filter,
+            half_repeat=half_repeat,
+        )
         if half_repeat > 0:
             record_drawn_student(
                 class_name=class_name,
@@ -737,12 +796,13 @@ class RollCallUtils:
                 del RollCallUtils._drawn_record_cache[record_key]
 
         if selected_students_dict:
-            save_roll_call_history(
-                class_name=class_name,
-                selected_students=selected_students_dict,
-                group_filter=group_filter,
-                gender_filter=gender_filter,
-            )
+            with draw_stage("roll_call", "save_history"):
+                save_roll_call_history(
+                    class_name=class_name,
+                    selected_students=selected_students_dict,
+                    group_filter=group_filter,
+                    gender_filter=gender_filter,
+                )
 
     @staticmethod
     def prepare_notification_settings_by_group(
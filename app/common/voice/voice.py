@@ -5,9 +5,10 @@
 """
 
 # --------- 标准库 ---------
+from __future__ import annotations
+
 import asyncio
 import concurrent.futures
-import json
 import os
 import platform
 import queue
@@ -18,29 +19,23 @@ from queue import Queue, Empty
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 # --------- 第三方库 ---------
-import edge_tts
-import numpy as np
-import psutil
-import pyttsx3
 from loguru import logger
-
-try:
-    import sounddevice as sd
-except Exception as e:
-    sd = None
-    logger.warning(f"sounddevice 不可用: {e}")
-
-try:
-    import soundfile as sf
-except Exception as e:
-    sf = None
-    logger.warning(f"soundfile 不可用: {e}")
 from PySide6.QtCore import *
 from PySide6.QtWidgets import *
 
-from edge_tts.exceptions import NoAudioReceived, WebSocketError
+# 重型依赖延迟到首次真正播报时才导入，避免拖慢启动
+from app.tools.lazy_import import lazy_import, module_available
+
+edge_tts = lazy_import("edge_tts")
+edge_tts_exceptions = lazy_import("edge_tts.exceptions")
+np = lazy_import("numpy")
+psutil = lazy_import("psutil")
+pyttsx3 = lazy_import("pyttsx3")
+sd = lazy_import("sounddevice", optional=True)
+sf = lazy_import("soundfile", optional=True)
 
 # --------- 项目内部 ---------
+from app.tools.json_store import read_json
 from app.tools.path_utils import ensure_dir, get_audio_path
 from app.tools.settings_access import readme_settings_async
 from app.tools.config import restore_volume
@@ -147,7 +142,7 @@ class VoicePlaybackSystem:
         """流式播放音频文件（低内存占用）"""
         stream = None
         sf_file = None
-        if sd is None or sf is None:
+        if not (module_available(sd) and module_available(sf)):
             logger.warning("音频播放依赖不可用，无法播放音频")
             return
         try:
@@ -219,7 +214,7 @@ class VoicePlaybackSystem:
     def _safe_play_memory(self, data: np.ndarray, fs: int) -> None:
         """安全播放内存数据实现"""
         stream = None
-        if sd is None:
+        if not module_available(sd):
             logger.warning("sounddevice 不可用，无法播放音频")
             return
         try:
@@ -402,14 +397,14 @@ class VoiceCacheManager:
                 await communicate.save(file_path)
                 logger.debug(f"成功生成语音并保存至: {file_path}")
                 return
-            except NoAudioReceived as e:
+            except edge_tts_exceptions.NoAudioReceived as e:
                 retry_count += 1
                 logger.warning(
                     f"生成语音失败，未接收到音频数据，重试{retry_count}/{max_retries}: {type(e).__name__} {e}"
                 )
                 if retry_count < max_retries:
                     await asyncio.sleep(1)
-            except WebSocketError as e:
+            except edge_tts_exceptions.WebSocketError as e:
                 retry_count += 1
                 logger.warning(
                     f"生成语音失败，WebSocket通信错误，重试{retry_count}/{max_retries}: {type(e).__name__} {e}"
@@ -739,8 +734,7 @@ class TTSHandler:
             if class_name:
                 audio_file = get_audio_path(f"{class_name}.json")
                 if audio_file.exists():
-                    with open(str(audio_file), "r", encoding="utf-8") as f:
-                        audio_settings = json.load(f)
+                    audio_settings = read_json(str(audio_file))
 
             # 应用TTS别名、前缀和后缀
             processed_names = []
@@ -0,0 +1,598 @@
+# ====================== 1. 前台窗口信息 ======================
+# - ForegroundInfo             - 前台窗口信息（标题、进程名、PID、窗口ID）
+# - get_process_name()         - 获取进程名（带缓存）
+# - query_foreground_info()    - 同步查询当前前台窗口（Windows）
+
+# ====================== 2. 前台窗口监听 ======================
+# - ForegroundWatcher          - 前台窗口变化监听器（系统事件优先，退避轮询兜底）
+# - get_foreground_watcher()   - 获取全局监听器
+
+# ==================================================
+# 导入模块
+# ==================================================
+import ctypes
+import os
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from loguru import logger
+from PySide6.QtCore import QObject, QSocketNotifier, QTimer
+from PySide6.QtGui import QGuiApplication
+
+from app.tools.event_scheduler import (
+    EventSubscription,
+    record_wakeup,
+    subscribe_backoff,
+)
+from app.tools.lazy_import import lazy_import, module_available
+from app.tools.variable import (
+    FOREGROUND_EVENT_COALESCE_MS,
+    FOREGROUND_POLL_MAX_INTERVAL_MS,
+    FOREGROUND_POLL_MIN_INTERVAL_MS,
+    PROCESS_NAME_CACHE_SIZE,
+)
+
+psutil = lazy_import("psutil", optional=True)
+xlib_display = lazy_import("Xlib.display", optional=True)
+xlib_x = lazy_import("Xlib.X", optional=True)
+
+if os.name == "nt":
+    from ctypes import wintypes
+
+    _WinEventProc = ctypes.WINFUNCTYPE(
+        None,
+        wintypes.HANDLE,
+        wintypes.DWORD,
+        wintypes.HWND,
+        wintypes.LONG,
+        wintypes.LONG,
+        wintypes.DWORD,
+        wintypes.DWORD,
+    )
+else:
+    _WinEventProc = None
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_SYSTEM_MINIMIZEEND = 0x0017
+EVENT_OBJECT_NAMECHANGE = 0x800C
+WINEVENT_OUTOFCONTEXT = 0x0000
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+
+
+# ==================================================
+# 前台窗口信息
+# ==================================================
+@dataclass(frozen=True, slots=True)
+class ForegroundInfo:
+    """前台窗口信息"""
+
+    title: str = ""
+    process_name: str = ""
+    pid: int = 0
+    window_id: int = 0
+
+
+ForegroundCallback = Callable[[ForegroundInfo], None]
+
+_process_name_cache: "OrderedDict[Tuple[int, int], str]" = OrderedDict()
+
+
+def get_process_name(pid: int, window_id: int = 0) -> str:
+    """获取进程名
+
+    以 (PID, 窗口ID) 为键缓存结果：同一窗口的标题变化不再重复查询进程，
+    PID 被复用时窗口ID 也会变化，不会拿到旧进程的名称。
+
+    Args:
+        pid: 进程ID
+        window_id: 窗口ID
+
+    Returns:
+        str: 进程名，获取失败时返回空字符串
+    """
+    if not pid or pid == os.getpid():
+        return ""
+    key = (int(pid), int(window_id))
+    name = _process_name_cache.get(key)
+    if name is not None:
+        _process_name_cache.move_to_end(key)
+        return name
+
+    name = ""
+    try:
+        if module_available(psutil):
+            name = str(psutil.Process(pid).name() or "")
+        elif sys.platform.startswith("linux"):
+            with open(f"/proc/{pid}/comm", encoding="utf-8") as f:
+                name = f.read().strip()
+    except Exception:
+        name = ""
+
+    _process_name_cache[key] = name
+    while len(_process_name_cache) > PROCESS_NAME_CACHE_SIZE:
+        _process_name_cache.popitem(last=False)
+    return name
+
+
+def query_foreground_info() -> ForegroundInfo:
+    """同步查询当前前台窗口（仅 Windows，其他平台返回空信息）"""
+    if os.name != "nt":
+        return ForegroundInfo()
+    try:
+        user32 = ctypes.WinDLL("user32", use_last_error=True)
+        hwnd = user32.GetForegroundWindow()
+        if not hwnd:
+            return ForegroundInfo()
+
+        length = int(user32.GetWindowTextLengthW(hwnd) or 0)
+        buf = ctypes.create_unicode_buffer(length + 1)
+        user32.GetWindowTextW(hwnd, buf, length + 1)
+        title = str(buf.value or "")
+
+        pid = ctypes.c_ulong(0)
+        user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+        pid_int = int(pid.value or 0)
+
+        return ForegroundInfo(
+            title=title,
+            process_name=get_process_name(pid_int, int(hwnd)),
+            pid=pid_int,
+            window_id=int(hwnd),
+        )
+    except Exception:
+        return ForegroundInfo()
+
+
+# ==================================================
+# 系统事件源
+# ==================================================
+class _WinEventBackend:
+    """Windows：通过 SetWinEventHook 接收前台窗口切换和标题变化事件
+
+    使用 WINEVENT_OUTOFCONTEXT 钩子，回调由当前线程（GUI 线程）的消息循环分发，
+    空闲时不产生任何唤醒。
+    """
+
+    name = "win_event"
+
+    def __init__(self, on_event: Callable[[], None]):
+        self._on_event = on_event
+        self._user32 = None
+        self._proc = None
+        self._hooks = []
+        self._name_hook = None
+        self._name_hook_pid = 0
+        self._foreground_hwnd = 0
+        self._watch_titles = False
+
+    @staticmethod
+    def available() -> bool:
+        return os.name == "nt" and _WinEventProc is not None
+
+    def start(self) -> bool:
+        user32 = ctypes.WinDLL("user32", use_last_error=True)
+        user32.SetWinEventHook.argtypes = [
+            wintypes.DWORD,
+            wintypes.DWORD,
+            wintypes.HMODULE,
+            _WinEventProc,
+            wintypes.DWORD,
+            wintypes.DWORD,
+            wintypes.DWORD,
+        ]
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+        user32.UnhookWinEvent.restype = wintypes.BOOL
+        self._user32 = user32
+        # 回调对象必须保持引用，否则会被回收导致崩溃
+        self._proc = _WinEventProc(self._callback)
+
+        for event in (EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_MINIMIZEEND):
+            hook = user32.SetWinEventHook(
+                event, event, None, self._proc, 0, 0, WINEVENT_OUTOFCONTEXT
+            )
+            if not hook:
+                self.stop()
+                return False
+            self._hooks.append(hook)
+        return True
+
+    def stop(self) -> None:
+        self._unhook_name_changes()
+        for hook in self._hooks:
+            try:
+                self._user32.UnhookWinEvent(hook)
+            except Exception:
+                pass
+        self._hooks = []
+
+    def query(self) -> ForegroundInfo:
+        return query_foreground_info()
+
+    def set_watch_titles(self, enabled: bool) -> None:
+        self._watch_titles = bool(enabled)
+        if not self._watch_titles:
+            self._unhook_name_changes()
+
+    def follow(self, info: ForegroundInfo) -> None:
+        """前台窗口变化后，只监听该窗口所属进程的标题变化"""
+        self._foreground_hwnd = int(info.window_id or 0)
+        if not self._watch_titles or not info.pid:
+            self._unhook_name_changes()
+            return
+        if info.pid == self._name_hook_pid and self._name_hook:
+            return
+        self._unhook_name_changes()
+        hook = self._user32.SetWinEventHook(
+            EVENT_OBJECT_NAMECHANGE,
+            EVENT_OBJECT_NAMECHANGE,
+            None,
+            self._proc,
+            info.pid,
+            0,
+            WINEVENT_OUTOFCONTEXT,
+        )
+        if hook:
+            self._name_hook = hook
+            self._name_hook_pid = info.pid
+
+    def _unhook_name_changes(self) -> None:
+        if self._name_hook:
+            try:
+                self._user32.UnhookWinEvent(self._name_hook)
+            except Exception:
+                pass
+        self._name_hook = None
+        self._name_hook_pid = 0
+
+    def _callback(self, hook, event, hwnd, id_object, id_child, thread, time_ms):
+        try:
+            if event == EVENT_OBJECT_NAMECHANGE and (
+                id_object != OBJID_WINDOW
+                or id_child != CHILDID_SELF
+                or int(hwnd or 0) != self._foreground_hwnd
+            ):
+                return
+            record_wakeup("foreground_event")
+            self._on_event()
+        except Exception:
+            pass
+
+
+class _X11Backend:
+    """Linux X11：监听根窗口的 _NET_ACTIVE_WINDOW 属性变化
+
+    通过 QSocketNotifier 监视 X 连接的文件描述符，只有属性真正变化时才会被唤醒。
+    需要标题时额外监听当前活动窗口的 _NET_WM_NAME / WM_NAME 属性。
+    """
+
+    name = "x11"
+
+    def __init__(self, on_event: Callable[[], None]):
+        self._on_event = on_event
+        self._display = None
+        self._root = None
+        self._notifier: Optional[QSocketNotifier] = None
+        self._active_window = None
+        self._watch_titles = False
+
+    @staticmethod
+    def available() -> bool:
+        if not sys.platform.startswith("linux") or not os.environ.get("DISPLAY"):
+            return False
+        try:
+            if QGuiApplication.platformName() != "xcb":
+                return False
+        except Exception:
+            return False
+        return module_available(xlib_display)
+
+    def start(self) -> bool:
+        display = xlib_display.Display()
+        self._display = display
+        self._root = display.screen().root
+        self._atom_active = display.intern_atom("_NET_ACTIVE_WINDOW")
+        self._atom_name = display.intern_atom("_NET_WM_NAME")
+        self._atom_legacy_name = display.intern_atom("WM_NAME")
+        self._atom_pid = display.intern_atom("_NET_WM_PID")
+        self._atom_utf8 = display.intern_atom("UTF8_STRING")
+        self._root.change_attributes(event_mask=xlib_x.PropertyChangeMask)
+        display.flush()
+
+        self._notifier = QSocketNotifier(display.fileno(), QSocketNotifier.Read)
+        self._notifier.activated.connect(self._drain)
+        return True
+
+    def stop(self) -> None:
+        if self._notifier is not None:
+            self._notifier.setEnabled(False)
+            self._notifier.deleteLater()
+            self._notifier = None
+        if self._display is not None:
+            try:
+                self._display.close()
+            except Exception:
+                pass
+            self._display = None
+        self._active_window = None
+
+    def set_watch_titles(self, enabled: bool) -> None:
+        self._watch_titles = bool(enabled)
+        self._select_active_window(self._active_window)
+
+    def follow(self, info: ForegroundInfo) -> None:
+        return None
+
+    def query(self) -> ForegroundInfo:
+        display = self._display
+        if display is None:
+            return ForegroundInfo()
+        try:
+            prop = self._root.get_full_property(
+                self._atom_active, xlib_x.AnyPropertyType
+            )
+            window_id = int(prop.value[0]) if prop and len(prop.value) else 0
+            if not window_id:
+                self._select_active_window(None)
+                return ForegroundInfo()
+
+            window = display.create_resource_object("window", window_id)
+            if self._active_window is None or self._active_window.id != window_id:
+                self._select_active_window(window)
+
+            title = ""
+            name_prop = window.get_full_property(self._atom_name, self._atom_utf8)
+            if name_prop and name_prop.value:
+                title = bytes(name_prop.value).decode("utf-8", "replace")
+            else:
+                title = str(window.get_wm_name() or "")
+
+            pid = 0
+            pid_prop = window.get_full_property(self._atom_pid, xlib_x.AnyPropertyType)
+            if pid_prop and len(pid_prop.value):
+                pid = int(pid_prop.value[0])
+
+            return ForegroundInfo(
+                title=title,
+                process_name=get_process_name(pid, window_id),
+                pid=pid,
+                window_id=window_id,
+            )
+        except Exception:
+            return ForegroundInfo()
+        finally:
+            # 查询期间读到的事件已进入 Xlib 队列，套接字不会再次可读
+            try:
+                if self._display is not None and self._display.pending_events():
+                    QTimer.singleShot(0, self._drain)
+            except Exception:
+                pass
+
+    def _select_active_window(self, window) -> None:
+        previous = self._active_window
+        self._active_window = window
+        if previous is not None and (window is None or previous.id != window.id):
+            previous.change_attributes(event_mask=0, onerror=lambda *args: None)
+        if window is not None:
+            mask = xlib_x.PropertyChangeMask if self._watch_titles else 0
+            window.change_attributes(event_mask=mask, onerror=lambda *args: None)
+        if self._display is not None:
+            self._display.flush()
+
+    def _drain(self, *args) -> None:
+        display = self._display
+        if display is None:
+            return
+        changed = False
+        try:
+            while display.pending_events():
+                event = display.next_event()
+                if event.type != xlib_x.PropertyNotify:
+                    continue
+                window_id = event.window.id
+                if window_id == self._root.id and event.atom == self._atom_active:
+                    changed = True
+                elif (
+                    self._watch_titles
+                    and self._active_window is not None
+                    and window_id == self._active_window.id
+                    and event.atom in (self._atom_name, self._atom_legacy_name)
+                ):
+                    changed = True
+        except Exception as e:
+            logger.warning(f"读取 X11 事件失败: {e}")
+        if changed:
+            record_wakeup("foreground_event")
+            self._on_event()
+
+
+# ==================================================
+# 前台窗口监听
+# ==================================================
+class ForegroundWatcher(QObject):
+    """前台窗口变化监听器
+
+    按平台选择事件源：Windows 使用 SetWinEventHook，X11 使用 _NET_ACTIVE_WINDOW
+    属性事件；都不可用时在 Windows 上退回自适应退避轮询。
+    有订阅时才启动事件源，最后一个订阅取消后立即停止。
+    """
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._subscribers: Dict[int, Tuple[ForegroundCallback, bool]] = {}
+        self._next_id = 0
+        self._backend = None
+        self._poll_subscription: Optional[EventSubscription] = None
+        self._current = ForegroundInfo()
+        self._coalesce_timer = QTimer(self)
+        self._coalesce_timer.setSingleShot(True)
+        self._coalesce_timer.setInterval(FOREGROUND_EVENT_COALESCE_MS)
+        self._coalesce_timer.timeout.connect(self._refresh)
+
+    @property
+    def backend_name(self) -> str:
+        """当前使用的事件源名称（未启动时为空字符串）"""
+        if self._backend is not None:
+            return self._backend.name
+        if self._poll_subscription is not None:
+            return "polling"
+        return ""
+
+    def current(self) -> ForegroundInfo:
+        """获取最近一次得到的前台窗口信息"""
+        return self._current
+
+    def subscribe(
+        self,
+        callback: ForegroundCallback,
+        name: str = "foreground",
+        watch_titles: bool = False,
+    ) -> EventSubscription:
+        """订阅前台窗口变化
+
+        订阅后会在下一次事件循环中以当前前台窗口调用一次回调。
+
+        Args:
+            callback: 前台窗口变化时调用，参数为 ForegroundInfo
+            name: 订阅名称
+            watch_titles: 同一窗口标题变化时是否也通知
+
+        Returns:
+            EventSubscription: 订阅对象
+        """
+        sub_id = self._next_id
+        self._next_id += 1
+        self._subscribers[sub_id] = (callback, bool(watch_titles))
+        subscription = EventSubscription(name, lambda: self._unsubscribe(sub_id))
+
+        if not self._is_running():
+            self._start()
+        self._apply_watch_titles()
+        self._current = self._query()
+        self._follow(self._current)
+
+        def deliver():
+            if subscription.active:
+                self._notify(callback, self._current)
+
+        QTimer.singleShot(0, self, deliver)
+        return subscription
+
+    def _unsubscribe(self, sub_id: int) -> None:
+        self._subscribers.pop(sub_id, None)
+        if not self._subscribers:
+            self._stop()
+        else:
+            self._apply_watch_titles()
+
+    def _is_running(self) -> bool:
+        return self._backend is not None or self._poll_subscription is not None
+
+    def _start(self) -> None:
+        for backend_cls in (_WinEventBackend, _X11Backend):
+            if not backend_cls.available():
+                continue
+            backend = backend_cls(self._schedule_refresh)
+            try:
+                if backend.start():
+                    self._backend = backend
+                    logger.debug(f"前台窗口监听使用事件源: {backend.name}")
+                    return
+            except Exception as e:
+                logger.warning(f"前台窗口事件源 {backend.name} 启动失败: {e}")
+            try:
+                backend.stop()
+            except Exception:
+                pass
+
+        if os.name == "nt":
+            self._poll_subscription = subscribe_backoff(
+                "foreground_poll",
+                self._refresh,
+                FOREGROUND_POLL_MIN_INTERVAL_MS,
+                FOREGROUND_POLL_MAX_INTERVAL_MS,
+                self,
+            )
+            logger.debug("前台窗口监听使用退避轮询")
+        else:
+            logger.debug("当前平台没有可用的前台窗口事件源")
+
+    def _stop(self) -> None:
+        self._coalesce_timer.stop()
+        if self._backend is not None:
+            try:
+                self._backend.stop()
+            except Exception as e:
+                logger.warning(f"停止前台窗口事件源失败: {e}")
+            self._backend = None
+        if self._poll_subscription is not None:
+            self._poll_subscription.cancel()
+            self._poll_subscription = None
+        self._current = ForegroundInfo()
+
+    def _apply_watch_titles(self) -> None:
+        if self._backend is None:
+            return
+        watch = any(w for _, w in self._subscribers.values())
+        try:
+            self._backend.set_watch_titles(watch)
+        except Exception as e:
+            logger.warning(f"切换窗口标题监听失败: {e}")
+
+    def _query(self) -> ForegroundInfo:
+        if self._backend is not None:
+            return self._backend.query()
+        return query_foreground_info()
+
+    def _follow(self, info: ForegroundInfo) -> None:
+        if self._backend is None:
+            return
+        try:
+            self._backend.follow(info)
+        except Exception as e:
+            logger.warning(f"更新前台窗口监听目标失败: {e}")
+
+    def _schedule_refresh(self) -> None:
+        """合并短时间内连续的系统事件，只查询一次前台窗口"""
+        if not self._coalesce_timer.isActive():
+            self._coalesce_timer.start()
+
+    def _refresh(self) -> bool:
+        info = self._query()
+        if info == self._current:
+            return False
+        previous = self._current
+        self._current = info
+        if info.window_id != previous.window_id or info.pid != previous.pid:
+            self._follow(info)
+        title_only = (
+            info.window_id == previous.window_id
+            and info.pid == previous.pid
+            and info.process_name == previous.process_name
+        )
+        for callback, watch_titles in list(self._subscribers.values()):
+            if title_only and not watch_titles:
+                continue
+            self._notify(callback, info)
+        return True
+
+    @staticmethod
+    def _notify(callback: ForegroundCallback, info: ForegroundInfo) -> None:
+        try:
+            callback(info)
+        except Exception as e:
+            logger.exception(f"前台窗口变化回调执行失败: {e}")
+
+
+_foreground_watcher: Optional[ForegroundWatcher] = None
+
+
+def get_foreground_watcher() -> ForegroundWatcher:
+    """获取全局前台窗口监听器（需在 GUI 线程中调用）"""
+    global _foreground_watcher
+    if _foreground_watcher is None:
+        _foreground_watcher = ForegroundWatcher()
+    return _foreground_watcher
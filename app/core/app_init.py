@@ -119,6 +119,11 @@ class AppInitializer:
         )
 
     def _warmup_face_detector_devices(self) -> None:
+        from app.tools.lazy_import import is_camera_preview_enabled
+
+        # 摄像头预览页面未启用时不预热，OpenCV 推迟到首次真正使用时加载
+        if not is_camera_preview_enabled():
+            return
         guide_completed = readme_settings_async("basic_settings", "guide_completed")
         init_delay = 1500 if not guide_completed else APP_INIT_DELAY + 1500
         QTimer.singleShot(
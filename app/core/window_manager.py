@@ -193,6 +193,9 @@ class WindowManager:
         global pending_uiaccess_restart_after_show
         global _pending_uiaccess_restart_consumed
 
+        self._schedule_heavy_module_prewarm()
+        self._schedule_notification_prewarm()
+
         if not bool(pending_uiaccess_restart_after_show):
             return
         if bool(_pending_uiaccess_restart_consumed):
@@ -222,6 +225,41 @@ class WindowManager:
         except Exception as e:
             logger.debug("主窗口显示后触发 UIAccess 重启失败（已忽略）: {}", e)
 
+    def _schedule_heavy_module_prewarm(self) -> None:
+        """主窗口显示后审计启动导入，并在空闲时预热已启用子系统的重型依赖"""
+        from app.tools.lazy_import import (
+            audit_startup_imports,
+            prewarm_heavy_modules_async,
+        )
+        from app.tools.variable import HEAVY_MODULE_PREWARM_DELAY_MS
+
+        leaked = audit_startup_imports()
+        if leaked:
+            logger.warning(f"关键启动路径中导入了重型依赖: {', '.join(leaked)}")
+
+        QTimer.singleShot(
+            HEAVY_MODULE_PREWARM_DELAY_MS,
+            lambda: safe_execute(
+                prewarm_heavy_modules_async, error_message="预热重型依赖失败"
+            ),
+        )
+
+    def _schedule_notification_prewarm(self) -> None:
+        """主窗口显示后空闲时预建各显示模式的隐藏通知窗口"""
+        from app.tools.variable import NOTIFICATION_PREWARM_DELAY_MS
+
+        def prewarm() -> None:
+            from app.common.notification.notification_service import (
+                FloatingNotificationManager,
+            )
+
+            FloatingNotificationManager().prewarm_windows()
+
+        QTimer.singleShot(
+            NOTIFICATION_PREWARM_DELAY_MS,
+            lambda: safe_execute(prewarm, error_message="预建通知窗口失败"),
+        )
+
     def _connect_url_handler_signals(self) -> None:
         """连接URL处理器信号"""
         if not self.url_handler:
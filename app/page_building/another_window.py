@@ -13,9 +13,11 @@ from app.view.another_window.prize.import_prize_name import ImportPrizeNameWindo
 from app.view.another_window.prize.set_pool_name import SetPoolNameWindow
 from app.view.another_window.prize.prize_name_setting import PrizeNameSettingWindow
 from app.view.another_window.prize.prize_weight_setting import PrizeWeightSettingWindow
+from app.view.another_window.prize.lottery_batch import LotteryBatchWindow
 from app.view.another_window.remaining_list import RemainingListPage
 from app.view.another_window.current_config_viewer import CurrentConfigViewerWindow
 from app.view.another_window.log_viewer import LogViewerWindow
+from app.view.another_window.draw_telemetry import DrawTelemetryWindow
 from app.view.another_window.backup_manager import BackupManagerWindow
 from app.view.another_window.countdown_timer import CountdownTimerPage
 from app.Language.obtain_language import *
@@ -459,6 +461,45 @@ def create_prize_weight_setting_window(list_name=None):
     return
 
 
+# ==================================================
+# 批量抽奖窗口
+# ==================================================
+class lottery_batch_window_template(PageTemplate):
+    """批量抽奖窗口类
+    使用PageTemplate创建批量抽奖页面"""
+
+    def __init__(self, parent=None):
+        super().__init__(content_widget_class=LotteryBatchWindow, parent=parent)
+
+
+def create_lottery_batch_window(lottery_widget):
+    """
+    创建批量抽奖窗口
+
+    Args:
+        lottery_widget: 抽奖页面，批量抽取使用它当前的奖池和筛选条件
+
+    Returns:
+        创建的窗口实例
+    """
+    window, created = _create_reusable_window(
+        "lottery_batch",
+        ("lottery_batch", "title"),
+        lottery_batch_window_template,
+        800,
+        600,
+    )
+
+    def on_ready(page):
+        if hasattr(page, "bind_lottery_widget"):
+            page.bind_lottery_widget(lottery_widget)
+        if created:
+            window.windowClosed.connect(page.stop_replay)
+
+    _create_page_loader(window, "lottery_batch", on_ready)
+    return window
+
+
 # ==================================================
 # 贡献者窗口
 # ==================================================
@@ -675,6 +716,34 @@ def create_log_viewer_window():
     return
 
 
+# ==================================================
+# 抽取耗时窗口
+# ==================================================
+class draw_telemetry_window_template(PageTemplate):
+    """抽取耗时窗口类
+    使用PageTemplate创建抽取耗时页面"""
+
+    def __init__(self, parent=None):
+        super().__init__(content_widget_class=DrawTelemetryWindow, parent=parent)
+
+
+def create_draw_telemetry_window():
+    """
+    创建抽取耗时窗口
+
+    Returns:
+        创建的窗口实例
+    """
+    window, _ = _create_reusable_window(
+        "draw_telemetry",
+        ("draw_telemetry", "name"),
+        draw_telemetry_window_template,
+        900,
+        500,
+    )
+    return window
+
+
 # ==================================================
 # 备份管理窗口
 # ==================================================
@@ -0,0 +1,552 @@
+# ====================== 1. 页面访问统计 ======================
+# - PageUsageStats         - 页面访问频率与内存占用统计，持久化到 TEMP 目录
+# - get_page_usage_stats() - 获取全局页面访问统计
+# ====================== 2. 预加载规划 ======================
+# - PreloadPlanner         - 按访问频率选择下一个要构建的页面，按 LRU 选择要卸载的页面
+# ====================== 3. 预加载器 ======================
+# - PagePreloader          - 在空闲时逐个构建页面，测量内存占用，超出预算时卸载
+# - current_rss_kb()       - 当前进程常驻内存（KB），无法获取时返回 None
+
+# ==================================================
+# 导入模块
+# ==================================================
+import os
+import sys
+import time
+from collections import OrderedDict
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional
+
+from loguru import logger
+from PySide6.QtCore import QEvent, QObject, QTimer
+from PySide6.QtWidgets import QApplication, QWidget
+
+from app.tools.json_store import read_json, write_json
+from app.tools.lazy_import import lazy_import, module_available
+from app.tools.path_utils import get_data_path
+from app.tools.variable import (
+    SETTINGS_PRELOAD_DEFAULT_PAGE_COST_KB,
+    SETTINGS_PRELOAD_COST_OUTLIER_RATIO,
+    SETTINGS_PRELOAD_IDLE_MS,
+    SETTINGS_PRELOAD_MIN_SCORE,
+    SETTINGS_PRELOAD_STEP_INTERVAL_MS,
+    SETTINGS_PRELOAD_USAGE_DECAY,
+    SETTINGS_PRELOAD_WIDGET_COST_KB,
+)
+
+# psutil 只用于测量页面的内存占用，不可用时按控件数量估算
+psutil = lazy_import("psutil", optional=True)
+
+_INPUT_EVENTS = {
+    QEvent.Type.MouseButtonPress,
+    QEvent.Type.MouseButtonRelease,
+    QEvent.Type.MouseMove,
+    QEvent.Type.Wheel,
+    QEvent.Type.KeyPress,
+    QEvent.Type.KeyRelease,
+    QEvent.Type.TouchBegin,
+    QEvent.Type.TouchUpdate,
+}
+
+
+# ==================================================
+# 页面访问统计
+# ==================================================
+class PageUsageStats:
+    """页面访问频率与内存占用统计
+
+    访问分数每次访问加 1，其它页面的分数按 SETTINGS_PRELOAD_USAGE_DECAY 衰减，
+    近期常用的页面排在前面；内存占用按指数平均记录，用于预加载前判断是否放得下。
+    """
+
+    def __init__(self, file_path=None):
+        self._file_path = file_path
+        self._scores: Dict[str, float] = {}
+        self._costs: Dict[str, float] = {}
+        self._loaded = False
+        self._dirty = False
+
+    def _path(self):
+        if self._file_path is None:
+            self._file_path = get_data_path("TEMP", "settings_page_usage.json")
+        return self._file_path
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            path = self._path()
+            if not path.exists():
+                return
+            data = read_json(path)
+            self._scores = {
+                str(k): float(v) for k, v in (data.get("scores") or {}).items()
+            }
+            self._costs = {
+                str(k): float(v) for k, v in (data.get("cost_kb") or {}).items()
+            }
+        except Exception as e:
+            logger.warning(f"读取页面访问统计失败，将重新统计: {e}")
+            self._scores = {}
+            self._costs = {}
+
+    def record_visit(self, key: str) -> None:
+        """记录一次页面访问"""
+        self._ensure_loaded()
+        for other in self._scores:
+            self._scores[other] *= SETTINGS_PRELOAD_USAGE_DECAY
+        self._scores[key] = self._scores.get(key, 0.0) + 1.0
+        self._dirty = True
+
+    def score(self, key: str) -> float:
+        """页面的访问分数，未访问过为 0"""
+        self._ensure_loaded()
+        return self._scores.get(key, 0.0)
+
+    def record_cost(self, key: str, cost_kb: float) -> None:
+        """记录一次测得的页面内存占用（KB）"""
+        self._ensure_loaded()
+        previous = self._costs.get(key)
+        if previous is None:
+            self._costs[key] = float(cost_kb)
+        else:
+            self._costs[key] = previous * 0.5 + float(cost_kb) * 0.5
+        self._dirty = True
+
+    def record_measurement(self, key: str, delta_kb: float) -> Optional[float]:
+        """记录一次常驻内存增量测量，丢弃或截断异常值
+
+        增量不为正（测量期间别处释放了内存）时丢弃；与之前的记录相差超过
+        SETTINGS_PRELOAD_COST_OUTLIER_RATIO 倍时截断后再计入平均。
+
+        Returns:
+            float | None: 计入平均的内存占用（KB），丢弃时为 None
+        """
+        if delta_kb <= 0:
+            return None
+        cost = float(delta_kb)
+        previous = self.cost_kb(key)
+        if previous is not None:
+            ratio = SETTINGS_PRELOAD_COST_OUTLIER_RATIO
+            cost = min(max(cost, previous / ratio), previous * ratio)
+        self.record_cost(key, cost)
+        return cost
+
+    def cost_kb(self, key: str) -> Optional[float]:
+        """页面的内存占用估计（KB），未测量过为 None"""
+        self._ensure_loaded()
+        return self._costs.get(key)
+
+    def save(self) -> None:
+        """有变化时写入统计文件"""
+        if not self._dirty:
+            return
+        try:
+            path = self._path()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            data = {
+                "scores": {k: round(v, 4) for k, v in self._scores.items()},
+                "cost_kb": {k: round(v, 1) for k, v in self._costs.items()},
+            }
+            write_json(path, data, indent=2)
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"保存页面访问统计失败: {e}")
+
+
+_page_usage_stats: Optional[PageUsageStats] = None
+
+
+def get_page_usage_stats() -> PageUsageStats:
+    """获取全局页面访问统计"""
+    global _page_usage_stats
+    if _page_usage_stats is None:
+        _page_usage_stats = PageUsageStats()
+    return _page_usage_stats
+
+
+# ==================================================
+# 预加载规划
+# ==================================================
+class PreloadPlanner:
+    """预加载决策（不涉及界面，便于单独检查）
+
+    loaded 按最近访问顺序保存已构建的页面及其内存占用，最早访问的在前。
+    """
+
+    def __init__(self, stats: PageUsageStats, budget_kb: float):
+        self.stats = stats
+        self.budget_kb = max(0.0, float(budget_kb))
+        self.loaded: "OrderedDict[str, float]" = OrderedDict()
+
+    def estimated_cost(self, key: str) -> float:
+        cost = self.stats.cost_kb(key)
+        return SETTINGS_PRELOAD_DEFAULT_PAGE_COST_KB if cost is None else cost
+
+    def used_kb(self) -> float:
+        return sum(self.loaded.values())
+
+    def touch(self, key: str) -> None:
+        """页面被访问：记录访问并移到 LRU 末尾"""
+        self.stats.record_visit(key)
+        if key in self.loaded:
+            self.loaded.move_to_end(key)
+
+    def mark_loaded(self, key: str, cost_kb: Optional[float] = None) -> None:
+        if cost_kb is None:
+            cost_kb = self.estimated_cost(key)
+        self.loaded[key] = float(cost_kb)
+
+    def mark_unloaded(self, key: str) -> None:
+        self.loaded.pop(key, None)
+
+    def add_cost(self, key: str, cost_kb: float) -> None:
+        """把子页面的内存占用计入已构建的所属页面"""
+        if key in self.loaded:
+            self.loaded[key] += float(cost_kb)
+
+    def fits(self, cost_kb: float) -> bool:
+        """不卸载任何页面时能否放入 cost_kb"""
+        return self.used_kb() + cost_kb <= self.budget_kb
+
+    def evictions_for(
+        self, cost_kb: float, protected: Iterable[str] = (), below_score=None
+    ) -> Optional[List[str]]:
+        """为放入 cost_kb 的页面需要卸载的页面（LRU 顺序）
+
+        Args:
+            cost_kb: 要放入的内存占用
+            protected: 不允许卸载的页面（如当前显示的页面）
+            below_score: 只卸载访问分数低于该值的页面，None 表示不限
+
+        Returns:
+            list | None: 要卸载的页面；即使全部卸载也放不下时返回 None
+        """
+        protected = set(protected)
+        free = self.budget_kb - self.used_kb()
+        evict: List[str] = []
+        for key, cost in self.loaded.items():
+            if free >= cost_kb:
+                break
+            if key in protected:
+                continue
+            if below_score is not None and self.stats.score(key) >= below_score:
+                continue
+            evict.append(key)
+            free += cost
+        return evict if free >= cost_kb else None
+
+    def over_budget(self, protected: Iterable[str] = ()) -> List[str]:
+        """超出预算时应卸载的页面（LRU 顺序）"""
+        protected = set(protected)
+        excess = self.used_kb() - self.budget_kb
+        evict: List[str] = []
+        for key, cost in self.loaded.items():
+            if excess <= 0:
+                break
+            if key in protected:
+                continue
+            evict.append(key)
+            excess -= cost
+        return evict
+
+    def next_candidate(self, available: Iterable[str], protected: Iterable[str] = ()):
+        """选择下一个要预加载的页面
+
+        Args:
+            available: 尚未构建的页面
+            protected: 不允许卸载的页面
+
+        Returns:
+            tuple | None: (页面, 需要先卸载的页面列表)，没有合适的页面时为 None
+        """
+        ranked = sorted(
+            (key for key in available if key not in self.loaded),
+            key=lambda key: self.stats.score(key),
+            reverse=True,
+        )
+        for key in ranked:
+            score = self.stats.score(key)
+            if score < SETTINGS_PRELOAD_MIN_SCORE:
+                break
+            evict = self.evictions_for(
+                self.estimated_cost(key), protected, below_score=score
+            )
+            if evict is not None:
+                return key, evict
+        return None
+
+
+# ==================================================
+# 预加载器
+# ==================================================
+def current_rss_kb() -> Optional[float]:
+    """当前进程常驻内存（KB），无法获取时返回 None"""
+    if module_available(psutil):
+        try:
+            return psutil.Process().memory_info().rss / 1024
+        except Exception:
+            return None
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/statm", "r") as f:
+                pages = int(f.read().split()[1])
+            return pages * os.sysconf("SC_PAGE_SIZE") / 1024
+        except Exception:
+            return None
+    return None
+
+
+class _Entry:
+    __slots__ = ("build", "unload", "widget")
+
+    def __init__(self, build, unload):
+        self.build = build
+        self.unload = unload
+        self.widget = None
+
+
+class PagePreloader(QObject):
+    """按内存预算在空闲时预加载页面
+
+    - 只在一段时间没有鼠标、键盘或触摸输入后构建页面，每次只构建一个，
+      两次构建之间回到事件循环，输入事件总是优先处理；
+    - 构建顺序来自 PageUsageStats 的访问分数，从未访问过的页面不预加载；
+    - 每个页面构建前后立即读取常驻内存，以增量作为内存占用（不可用时按控件数量估算），
+      已构建页面的内存占用之和超过预算时按最近最少访问顺序卸载；
+    - Pivot 页面的子页面同样在空闲时逐个预加载并测量，内存占用计入所属页面，
+      放不下时不预加载子页面。
+    """
+
+    def __init__(self, parent=None, budget_mb: float = 0, stats=None):
+        super().__init__(parent)
+        self.stats = stats or get_page_usage_stats()
+        self.planner = PreloadPlanner(self.stats, float(budget_mb) * 1024)
+        self._entries: Dict[str, _Entry] = {}
+        self._protected: set = set()
+        self._followups: List[tuple] = []
+        self._last_input = 0.0
+        self._running = False
+        self._filter_installed = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._tick)
+
+    @property
+    def enabled(self) -> bool:
+        return self.planner.budget_kb > 0
+
+    def register(
+        self,
+        key: str,
+        build: Callable[[], Optional[QWidget]],
+        unload: Callable[[], None],
+    ) -> None:
+        """注册一个可预加载的页面
+
+        Args:
+            key: 页面标识
+            build: 构建页面并返回页面组件，失败时返回 None
+            unload: 卸载页面
+        """
+        self._entries[key] = _Entry(build, unload)
+
+    def start(self) -> None:
+        """开始空闲预加载"""
+        if not self.enabled or self._running:
+            return
+        self._running = True
+        app = QApplication.instance()
+        if app is not None and not self._filter_installed:
+            app.installEventFilter(self)
+            self._filter_installed = True
+        self._timer.start(SETTINGS_PRELOAD_IDLE_MS)
+
+    def stop(self) -> None:
+        """停止预加载并保存统计"""
+        self._running = False
+        self._timer.stop()
+        self._followups = []
+        app = QApplication.instance()
+        if app is not None and self._filter_installed:
+            app.removeEventFilter(self)
+            self._filter_installed = False
+        self.stats.save()
+
+    def eventFilter(self, obj, event):
+        if event.type() in _INPUT_EVENTS:
+            self._last_input = time.monotonic()
+        return False
+
+    def build(self, key: str, factory: Callable[[], Optional[QWidget]]):
+        """构建页面并测量内存占用（按需构建和预加载共用）
+
+        Args:
+            key: 页面标识
+            factory: 构建函数
+
+        Returns:
+            QWidget | None: 构建的页面
+        """
+        rss_before = current_rss_kb()
+        start = time.perf_counter()
+        widget = factory()
+        # 构建是同步的，紧接着读取常驻内存，增量中只有这个页面的分配
+        rss_after = current_rss_kb()
+        if widget is None:
+            return None
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.widget = widget
+        # Pivot 页面在空闲时再预加载其中最常用的子页面
+        followup = getattr(widget, "preload_frequent_page", None)
+        if callable(followup):
+            self._followups.append((key, followup))
+        logger.debug(
+            f"构建页面 {key} 耗时 {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+        self._record_cost(key, widget, rss_before, rss_after)
+        # 调用方还要使用刚构建的页面，回到事件循环后再按预算卸载
+        QTimer.singleShot(0, self._enforce_budget)
+        return widget
+
+    def page_shown(self, key: str) -> None:
+        """页面被显示：记录访问，必要时卸载其它页面"""
+        self._protected = {key}
+        self.planner.touch(key)
+        self._enforce_budget()
+        if self._running and not self._timer.isActive():
+            self._timer.start(SETTINGS_PRELOAD_IDLE_MS)
+
+    def page_unloaded(self, key: str) -> None:
+        """页面已被其它途径卸载"""
+        self.planner.mark_unloaded(key)
+        self._followups = [f for f in self._followups if f[0] != key]
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.widget = None
+
+    def _unload(self, key: str) -> None:
+        entry = self._entries.get(key)
+        self.planner.mark_unloaded(key)
+        self._followups = [f for f in self._followups if f[0] != key]
+        if entry is None:
+            return
+        entry.widget = None
+        try:
+            entry.unload()
+        except Exception as e:
+            logger.exception(f"卸载页面 {key} 失败: {e}")
+
+    def _enforce_budget(self) -> None:
+        for key in self.planner.over_budget(self._protected):
+            logger.debug(f"页面内存超出预算，卸载 {key}")
+            self._unload(key)
+
+    def _build_subpage(
+        self,
+        key: str,
+        sub_key: str,
+        factory: Callable[[], Optional[QWidget]],
+    ) -> Optional[QWidget]:
+        """构建 Pivot 页面的子页面，测得的内存占用计入所属页面
+
+        子页面之后被 Pivot 页面按数量上限卸载时不会扣除，
+        这部分占用一直计入所属页面，直到所属页面被卸载或重新构建。
+
+        Args:
+            key: 所属页面标识
+            sub_key: 子页面标识
+            factory: 构建函数
+
+        Returns:
+            QWidget | None: 构建的子页面，所属页面已卸载或放不下时为 None
+        """
+        if key not in self.planner.loaded:
+            return None
+        if not self.planner.fits(self.planner.estimated_cost(sub_key)):
+            logger.debug(f"内存预算不足，不预加载子页面 {sub_key}")
+            return None
+        rss_before = current_rss_kb()
+        widget = factory()
+        rss_after = current_rss_kb()
+        if widget is None:
+            return None
+        cost = self._measure_cost(sub_key, widget, rss_before, rss_after)
+        self.planner.add_cost(key, cost)
+        logger.debug(
+            f"子页面 {sub_key} 内存占用约 {cost / 1024:.1f}MB，计入 {key}，"
+            f"已构建页面共 {self.planner.used_kb() / 1024:.1f}MB"
+        )
+        self._enforce_budget()
+        return widget
+
+    def _measure_cost(self, key: str, widget, rss_before, rss_after) -> float:
+        """按构建前后常驻内存的增量记录页面的内存占用
+
+        测量被丢弃时沿用之前的记录；无法读取常驻内存时按控件数量估算。
+        """
+        if rss_before is None or rss_after is None:
+            cost = (
+                len(widget.findChildren(QWidget)) + 1
+            ) * SETTINGS_PRELOAD_WIDGET_COST_KB
+            self.stats.record_cost(key, cost)
+            return cost
+        cost = self.stats.record_measurement(key, rss_after - rss_before)
+        if cost is None:
+            cost = self.planner.estimated_cost(key)
+        return cost
+
+    def _record_cost(self, key: str, widget, rss_before, rss_after) -> None:
+        """记录页面的内存占用并计入已构建页面"""
+        cost = self._measure_cost(key, widget, rss_before, rss_after)
+        self.planner.mark_loaded(key, cost)
+        logger.debug(
+            f"页面 {key} 内存占用约 {cost / 1024:.1f}MB，"
+            f"已构建页面共 {self.planner.used_kb() / 1024:.1f}MB"
+        )
+
+    def _tick(self) -> None:
+        if not self._running:
+            return
+        idle_ms = (time.monotonic() - self._last_input) * 1000
+        if idle_ms < SETTINGS_PRELOAD_IDLE_MS:
+            self._timer.start(int(SETTINGS_PRELOAD_IDLE_MS - idle_ms) + 1)
+            return
+
+        if self._followups:
+            key, followup = self._followups.pop(0)
+            try:
+                followup(partial(self._build_subpage, key))
+            except RuntimeError:
+                # 页面已被卸载
+                pass
+            except Exception as e:
+                logger.exception(f"预加载子页面失败: {e}")
+            self._timer.start(SETTINGS_PRELOAD_STEP_INTERVAL_MS)
+            return
+
+        available = [
+            key for key, entry in self._entries.items() if entry.widget is None
+        ]
+        choice = self.planner.next_candidate(available, self._protected)
+        if choice is None:
+            # 没有可预加载的页面，等下一次页面访问再检查
+            logger.debug(
+                f"页面预加载空闲，已构建 {len(self.planner.loaded)} 个页面，"
+                f"共 {self.planner.used_kb() / 1024:.1f}MB"
+            )
+            return
+
+        key, evict = choice
+        for other in evict:
+            self._unload(other)
+        entry = self._entries[key]
+        try:
+            self.build(key, entry.build)
+        except Exception as e:
+            logger.exception(f"预加载页面 {key} 失败: {e}")
+            self.planner.mark_unloaded(key)
+            self._entries.pop(key, None)
+        self._timer.start(SETTINGS_PRELOAD_STEP_INTERVAL_MS)
@@ -16,6 +16,7 @@ from qfluentwidgets import *
 from app.tools.variable import *
 from app.tools.path_utils import *
 from app.tools.personalised import *
+from app.page_building.page_preloader import get_page_usage_stats
 
 
 class PageTemplate(QFrame):
@@ -427,7 +428,7 @@ class PivotPageTemplate(QFrame):
         self.pivot.addItem(
             routeKey=page_name,
             text=display_name,
-            onClick=lambda: self.switch_to_page(page_name),
+            onClick=lambda: self._on_page_clicked(page_name),
         )
 
         # 存储滑动区域引用
@@ -454,6 +455,9 @@ class PivotPageTemplate(QFrame):
             display_name: 在 Pivot 中显示的名称
             scroll_area: 滑动区域
             inner_layout: 内部布局
+
+        Returns:
+            QWidget | None: 加载的页面组件，加载失败时为 None
         """
         try:
             # 动态导入页面组件
@@ -497,6 +501,8 @@ class PivotPageTemplate(QFrame):
             if self.current_page == page_name:
                 self.stacked_widget.setCurrentWidget(scroll_area)
 
+            return widget
+
         except (ImportError, AttributeError) as e:
             logger.exception(f"无法导入页面组件 {page_name}: {e}")
 
@@ -541,6 +547,40 @@ class PivotPageTemplate(QFrame):
             if self.current_page == page_name:
                 self.stacked_widget.setCurrentWidget(scroll_area)
 
+    def _on_page_clicked(self, page_name: str):
+        """用户点击 Pivot 切换页面，记录访问后切换"""
+        get_page_usage_stats().record_visit(f"{self.base_path}.{page_name}")
+        self.switch_to_page(page_name)
+
+    def preload_frequent_page(self, build):
+        """预加载访问最多的未加载子页面（不切换），由页面预加载器在空闲时调用
+
+        Args:
+            build: 预加载器提供的 build(子页面标识, 构建函数)，
+                负责检查内存预算并测量子页面的内存占用
+        """
+        if not self.ui_created:
+            return
+        stats = get_page_usage_stats()
+        candidates = [
+            (stats.score(f"{self.base_path}.{name}"), name)
+            for name, info in self.page_infos.items()
+            if not info.get("loaded") and name != self.current_page
+        ]
+        if not candidates:
+            return
+        score, page_name = max(candidates)
+        if score < SETTINGS_PRELOAD_MIN_SCORE:
+            return
+        info = self.page_infos[page_name]
+        logger.debug(f"预加载常用子页面 {self.base_path}.{page_name}")
+        build(
+            f"{self.base_path}.{page_name}",
+            lambda: self._load_page_content(
+                page_name, info["display"], info["scroll"], info["layout"]
+            ),
+        )
+
     def switch_to_page(self, page_name: str):
         """切换到指定页面，并卸载不活动的页面以释放内存"""
         if page_name in self.pages:
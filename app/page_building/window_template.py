@@ -19,6 +19,13 @@ from app.tools.settings_access import *
 from app.tools.path_utils import *
 from app.tools.personalised import *
 from app.Language.obtain_language import *
+from app.common.display.background_render import (
+    AnimatedBackground,
+    BackgroundRenderKey,
+    background_size_bucket,
+    get_background_render_cache,
+    source_digest,
+)
 
 
 class BackgroundLayer(QWidget):
@@ -36,10 +43,12 @@ class BackgroundLayer(QWidget):
         self._blur_enable = False
         self._blur_radius = 0
         self._image_valid = False
-        self._movie: QMovie | None = None
-        self._movie_path = ""
-        self._pixmap_cache_key = None
-        self._pixmap_cache = QPixmap()
+        self._animation: AnimatedBackground | None = None
+        self._animation_fps = BACKGROUND_ANIMATION_MAX_FPS
+        self._source_key = None
+        self._render_key = None
+        self._render_cache = get_background_render_cache()
+        self._render_cache.imageReady.connect(self._on_background_rendered)
         self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
         self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, False)
         self.setStyleSheet("background: transparent;")
@@ -76,6 +85,9 @@ class BackgroundLayer(QWidget):
         blur_radius = readme_settings_async(
             "background_management", f"{prefix}blur_radius"
         )
+        animation_fps = readme_settings_async(
+            "background_management", "animation_max_fps"
+        )
 
         try:
             self._mode = int(mode) if mode is not None else 0
@@ -148,170 +160,130 @@ class BackgroundLayer(QWidget):
             self._blur_radius = 0
         self._blur_radius = max(0, min(40, self._blur_radius))
 
-        if self._blur_enable and self._blur_radius > 0:
-            effect = self.graphicsEffect()
-            if not isinstance(effect, QGraphicsBlurEffect):
-                effect = QGraphicsBlurEffect(self)
-                self.setGraphicsEffect(effect)
-            try:
-                effect.setBlurRadius(self._blur_radius)
-            except Exception:
-                pass
-        else:
-            self.setGraphicsEffect(None)
+        try:
+            self._animation_fps = max(1, int(animation_fps))
+        except Exception:
+            self._animation_fps = BACKGROUND_ANIMATION_MAX_FPS
+
+        # 亮度和模糊在渲染背景图片时合成（见 background_render），不再对整个图层使用
+        # QGraphicsBlurEffect，避免每次重绘都重新模糊
+        self.setGraphicsEffect(None)
 
         self._image_valid = False
+        self._source_key = None
         if self._mode == 2:
             path = str(self._image_path or "")
             if path and os.path.exists(path) and path.lower().endswith(".gif"):
-                self._ensure_movie(path)
-                self._image_valid = self._movie is not None
+                self._ensure_animation(path)
+                self._image_valid = self._animation is not None
             else:
-                self._stop_movie()
+                self._stop_animation()
                 if path and os.path.exists(path):
-                    try:
-                        self._image_valid = not QPixmap(path).isNull()
-                    except Exception:
-                        self._image_valid = False
-                else:
-                    self._image_valid = False
+                    # 只读取文件头判断格式，解码和缩放在后台线程中进行
+                    self._source_key = source_digest(path)
+                    self._image_valid = (
+                        self._source_key is not None and QImageReader(path).canRead()
+                    )
         else:
-            self._stop_movie()
+            self._stop_animation()
 
         if self._mode == 0 or (self._mode == 2 and not self._image_valid):
             self.hide()
         else:
             self.show()
-        self._invalidate_pixmap_cache()
         self.update()
 
     def handleSettingChanged(self, group: str, key: str):
         if group != "background_management":
             return
-        if not str(key or "").startswith(f"{self._target}_background_"):
+        key = str(key or "")
+        if not key.startswith(f"{self._target}_background_") and (
+            key != "animation_max_fps"
+        ):
             return
         self.applyFromSettings()
 
-    def _invalidate_pixmap_cache(self):
-        cache_key = (self._image_path, self._brightness)
-        if cache_key != self._pixmap_cache_key:
-            self._pixmap_cache_key = cache_key
-            self._pixmap_cache = QPixmap()
-
-    def _stop_movie(self):
-        movie = getattr(self, "_movie", None)
-        if movie is None:
-            self._movie_path = ""
+    def _stop_animation(self):
+        animation = self._animation
+        if animation is None:
             return
+        self._animation = None
         try:
-            movie.frameChanged.disconnect(self._on_movie_frame_changed)
-        except Exception:
-            pass
-        try:
-            movie.stop()
+            animation.frameChanged.disconnect(self.update)
         except Exception:
             pass
-        self._movie = None
-        self._movie_path = ""
-
-    def _ensure_movie(self, path: str):
-        path = str(path or "")
-        if not path:
-            self._stop_movie()
-            return
-        if getattr(self, "_movie", None) is not None and self._movie_path == path:
-            if (
-                self._movie is not None
-                and self._movie.state() != QMovie.MovieState.Running
-            ):
-                try:
-                    self._movie.start()
-                except Exception:
-                    pass
+        animation.stop()
+        animation.deleteLater()
+
+    def _ensure_animation(self, path: str):
+        animation = self._animation
+        if animation is not None and animation.path == path:
+            animation.max_fps = self._animation_fps
+            animation.start()
             return
 
-        self._stop_movie()
-        movie = QMovie(path)
-        movie.setCacheMode(QMovie.CacheMode.CacheNone)
-        movie.frameChanged.connect(self._on_movie_frame_changed)
-        self._movie = movie
-        self._movie_path = path
-        try:
-            movie.start()
-        except Exception:
-            self._stop_movie()
+        self._stop_animation()
+        animation = AnimatedBackground(path, self, max_fps=self._animation_fps)
+        if not animation.is_valid():
+            animation.deleteLater()
             return
+        animation.frameChanged.connect(self.update)
+        animation.start()
+        self._animation = animation
 
-        try:
-            if not movie.jumpToFrame(0) or movie.currentPixmap().isNull():
-                self._stop_movie()
-        except Exception:
-            self._stop_movie()
-
-    def _on_movie_frame_changed(self, _frame: int):
-        self.update()
-
-    def _get_pixmap(self) -> QPixmap:
-        if self._pixmap_cache_key != (self._image_path, self._brightness):
-            self._invalidate_pixmap_cache()
-
-        if not self._pixmap_cache.isNull():
-            return self._pixmap_cache
-
-        if not self._image_path:
-            return QPixmap()
+    def _on_background_rendered(self, key):
+        if key == self._render_key:
+            self.update()
 
-        if str(self._image_path or "").lower().endswith(".gif"):
-            return QPixmap()
-
-        try:
-            pixmap = QPixmap(self._image_path)
-        except Exception:
-            pixmap = QPixmap()
-
-        if pixmap.isNull():
-            return QPixmap()
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._animation is not None:
+            self._animation.start()
 
-        self._pixmap_cache = pixmap
-        return pixmap
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        if self._animation is not None:
+            self._animation.stop()
 
-    def _draw_scaled_cover(self, painter: QPainter, pixmap: QPixmap):
-        if pixmap.isNull():
-            return
+    def _background_image(self) -> QImage:
+        """当前尺寸下已合成亮度和模糊的背景；精确尺寸还在渲染时返回最接近的尺寸"""
         w = self.width()
         h = self.height()
         if w <= 0 or h <= 0:
+            return QImage()
+        dpr = round(float(self.devicePixelRatioF()), 2)
+        bw, bh = background_size_bucket(w, h, dpr)
+        blur = int(round(self._blur_radius * dpr)) if self._blur_enable else 0
+        if self._animation is not None:
+            return self._animation.current_image(bw, bh, self._brightness, blur)
+        if not self._source_key:
+            return QImage()
+        key = BackgroundRenderKey(self._source_key, bw, bh, dpr, self._brightness, blur)
+        self._render_key = key
+        image, _ = self._render_cache.lookup(key, self._image_path)
+        return image
+
+    def _draw_cover(self, painter: QPainter, image: QImage):
+        w = self.width()
+        h = self.height()
+        iw = image.width()
+        ih = image.height()
+        if w <= 0 or h <= 0 or iw <= 0 or ih <= 0:
             return
-        pw = pixmap.width()
-        ph = pixmap.height()
-        if pw <= 0 or ph <= 0:
-            return
-
-        ratio = max(w / pw, h / ph)
-        sw = int(pw * ratio)
-        sh = int(ph * ratio)
-        scaled = pixmap.scaled(
-            sw,
-            sh,
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation,
-        )
-        x = (sw - w) // 2
-        y = (sh - h) // 2
-        cropped = scaled.copy(x, y, w, h)
-        painter.drawPixmap(0, 0, cropped)
-
-    def _apply_brightness_overlay(self, painter: QPainter, opacity: float):
-        if self._brightness == 100:
-            return
-        if self._brightness > 100:
-            alpha = int((self._brightness - 100) / 100 * 180)
-            alpha = max(0, min(180, alpha))
-            painter.fillRect(self.rect(), QColor(255, 255, 255, int(alpha * opacity)))
+        dpr = float(self.devicePixelRatioF())
+        pw = w * dpr
+        ph = h * dpr
+        step = BACKGROUND_RENDER_SIZE_STEP
+        if pw <= iw < pw + step and ph <= ih < ph + step:
+            # 按取整尺寸渲染的背景：居中裁剪，按物理像素直接绘制，不需要缩放
+            source = QRectF((iw - pw) / 2, (ih - ph) / 2, pw, ph)
         else:
-            alpha = int((100 - self._brightness) / 100 * 180)
-            alpha = max(0, min(180, alpha))
-            painter.fillRect(self.rect(), QColor(0, 0, 0, int(alpha * opacity)))
+            ratio = max(w / iw, h / ih)
+            sw = w / ratio
+            sh = h / ratio
+            source = QRectF((iw - sw) / 2, (ih - sh) / 2, sw, sh)
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
+        painter.drawImage(QRectF(0, 0, w, h), image, source)
 
     def paintEvent(self, event):
         if self._mode == 0:
@@ -371,17 +343,10 @@ class BackgroundLayer(QWidget):
             painter.fillRect(self.rect(), c)
             painter.save()
             painter.setOpacity(opacity)
-            pixmap = QPixmap()
-            movie = getattr(self, "_movie", None)
-            if movie is not None:
-                pixmap = movie.currentPixmap()
-            else:
-                pixmap = self._get_pixmap()
-            if not pixmap.isNull():
-                self._draw_scaled_cover(painter, pixmap)
+            image = self._background_image()
+            if not image.isNull():
+                self._draw_cover(painter, image)
             painter.restore()
-            if not pixmap.isNull():
-                self._apply_brightness_overlay(painter, opacity)
             return
 
 
@@ -9,6 +9,7 @@ from typing import Optional
 
 from loguru import logger
 
+from app.tools.json_store import flush_json_writes
 from app.tools.path_utils import ensure_dir, get_data_path, get_path
 from app.tools.settings_access import readme_settings_async, update_settings
 from app.tools.variable import LOG_DIR, SPECIAL_VERSION
@@ -94,6 +95,7 @@ def _write_version_info(zipf: zipfile.ZipFile) -> None:
 
 def export_all_data_to_zip(target_zip_path: Path) -> int:
     target_zip_path.parent.mkdir(parents=True, exist_ok=True)
+    flush_json_writes()
 
     exported_count = 0
     with zipfile.ZipFile(target_zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
@@ -10,10 +10,9 @@ from datetime import datetime
 import platform
 import sys
 import time
-import psutil
 
 from PySide6.QtWidgets import QWidget, QFileDialog
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QObject, Qt, Signal
 from qfluentwidgets import InfoBar, InfoBarPosition, FluentIcon, InfoBarIcon, MessageBox
 
 if sys.platform.startswith("linux"):
@@ -22,6 +21,21 @@ if sys.platform.startswith("linux"):
     except ImportError:
         pulsectl = None
 
+from app.tools.json_store import (
+    discard_pending_write,
+    flush_json_writes,
+    read_json,
+    write_json,
+)
+from app.tools.draw_telemetry import get_draw_telemetry
+from app.tools.lazy_import import lazy_import
+from app.tools.memory_monitor import get_memory_monitor
+from app.tools.log_control import (
+    add_queued_file_sink,
+    add_queued_stream_sink,
+    configured_log_level,
+    set_log_level,
+)
 from app.tools.path_utils import (
     get_app_root,
     get_audio_path,
@@ -45,36 +59,44 @@ from app.Language.obtain_language import (
     get_any_position_value_async,
 )
 
+# psutil 仅用于导出诊断信息，延迟到首次使用时导入
+psutil = lazy_import("psutil")
+
 
 # ==================== 日志配置模块 ====================
 
 
 def configure_logging():
-    """配置日志系统"""
+    """配置日志系统
+
+    文件和控制台都通过有界队列在后台线程写出，界面线程只负责格式化和入队。
+    日志等级默认为 DEBUG，可用环境变量 SECRANDOM_LOG_LEVEL 覆盖。
+    """
     log_dir = get_path(LOG_DIR)
     log_dir.mkdir(exist_ok=True)
 
-    log_level = "DEBUG"
+    log_level = configured_log_level()
+    set_log_level(log_level)
 
-    logger.add(
+    add_queued_file_sink(
         log_dir / LOG_FILENAME_FORMAT,
+        log_level,
         rotation=LOG_ROTATION_SIZE,
         retention=LOG_RETENTION_DAYS,
         compression=None,
         backtrace=True,
         diagnose=True,
-        level=log_level,
     )
 
     if sys.stdout is not None:
-        logger.add(
+        add_queued_stream_sink(
             sys.stdout,
+            log_level,
             format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-            level=log_level,
             colorize=True,
         )
 
-    logger.debug(f"日志系统已配置，当前日志等级: {log_level}")
+    logger.debug("日志系统已配置，当前日志等级: {}", log_level)
 
 
 # ==================== 通知模块 ====================
@@ -654,6 +676,7 @@ def export_settings(parent: Optional[QWidget] = None) -> None:
         )
 
         if file_path:
+            flush_json_writes()
             Path(file_path).write_text(
                 Path(settings_path).read_text(encoding="utf-8"), encoding="utf-8"
             )
@@ -762,9 +785,8 @@ def import_settings(parent: Optional[QWidget] = None) -> None:
             )
 
             if dialog.exec():
-                settings_path = get_settings_path()
-                with open(settings_path, "w", encoding="utf-8") as f:
-                    json.dump(imported_settings, f, ensure_ascii=False, indent=4)
+                # 覆盖尚未写出的修改，并立即写入（随后通常会重启应用）
+                write_json(get_settings_path(), imported_settings, delay_ms=0)
 
                 success_dialog = MessageBox(
                     get_any_position_value_async(
@@ -944,6 +966,7 @@ def _export_diagnostic_files(file_path: str, app_dir: Path) -> int:
     Returns:
         导出的文件数量
     """
+    flush_json_writes()
     export_folders = [
         get_path("config"),
         get_data_path("list"),
@@ -1092,6 +1115,8 @@ def _collect_system_info(
     _add_process_info(system_info)
     _add_boot_time_info(system_info)
     _add_users_info(system_info)
+    _add_draw_telemetry_info(system_info)
+    _add_memory_monitor_info(system_info)
 
     return system_info
 
@@ -1224,6 +1249,34 @@ def _add_users_info(system_info: dict) -> None:
         logger.warning(f"获取用户信息失败: {e}")
 
 
+def _add_draw_telemetry_info(system_info: dict) -> None:
+    """添加抽取耗时统计（本次运行中各抽取阶段的耗时）"""
+    try:
+        telemetry = get_draw_telemetry()
+        system_info["draw_telemetry"] = {
+            "window": telemetry.window,
+            "stages": telemetry.snapshot(),
+        }
+    except Exception as e:
+        logger.warning("获取抽取耗时统计失败: {}", e)
+
+
+def _add_memory_monitor_info(system_info: dict) -> None:
+    """添加内存监控报告（仅在开启了内存监控时）"""
+    monitor = get_memory_monitor()
+    if monitor is None:
+        return
+    try:
+        # 导出时先采样一次，报告中包含导出时刻的状态
+        monitor.sample()
+        system_info["memory_monitor"] = {
+            "interval_s": monitor.interval_s,
+            "reports": monitor.reports(),
+        }
+    except Exception as e:
+        logger.warning("获取内存监控报告失败: {}", e)
+
+
 def _write_diagnostic_info(file_path: str, system_info: dict) -> None:
     """写入诊断信息文件"""
     try:
@@ -1286,6 +1339,7 @@ def export_all_data(parent: Optional[QWidget] = None) -> None:
         if not file_path.endswith(".zip"):
             file_path += ".zip"
 
+        flush_json_writes()
         dirs_to_backup = [
             ("config", get_path("config")),
             ("list", get_data_path("list")),
@@ -1662,6 +1716,8 @@ def _extract_data_files(file_path: str) -> list:
 
     skipped_files = []
     logs_root = get_path(LOG_DIR).resolve()
+    # 先写出尚未写出的修改，避免它们随后覆盖导入的文件
+    flush_json_writes()
 
     with zipfile.ZipFile(file_path, "r") as zipf:
         for member in zipf.namelist():
@@ -1782,6 +1838,48 @@ def _get_roll_call_record_file_path(class_name: str, gender: str, group: str):
     )
 
 
+def get_drawn_record_path(class_name: str, gender: str, group: str) -> Path:
+    """获取点名已抽取记录文件路径"""
+    return _get_roll_call_record_file_path(class_name, gender, group)
+
+
+class DrawnRecordSignals(QObject):
+    """已抽取记录变化信号
+
+    记录键为记录文件名，可通过 get_drawn_record_key() 计算。
+    """
+
+    recordUpdated = Signal(str, object)  # (记录键, {名称: 最新次数})
+    recordCleared = Signal(str)  # 记录键，为空表示全部记录被清除
+
+
+_drawn_record_signals = DrawnRecordSignals()
+
+
+def get_drawn_record_signals() -> DrawnRecordSignals:
+    """获取已抽取记录变化信号实例"""
+    return _drawn_record_signals
+
+
+def get_drawn_record_key(
+    source: str, class_name: str, gender: str = "", group: str = ""
+) -> str:
+    """获取已抽取记录的记录键
+
+    Args:
+        source: 来源，"roll_call" 或 "lottery"
+        class_name: 班级名称（抽奖时为奖池名称）
+        gender: 性别（仅点名）
+        group: 分组（仅点名）
+
+    Returns:
+        str: 记录键
+    """
+    if source == "lottery":
+        return _build_record_file_name("lottery_prize_record", class_name)
+    return _build_record_file_name("roll_call_record", class_name, gender, group)
+
+
 def record_drawn_student(
     class_name: str, gender: str, group: str, student_name
 ) -> None:
@@ -1811,6 +1909,9 @@ def record_drawn_student(
     if updated_students:
         _save_drawn_records(file_path, drawn_records)
         logger.debug(f"已记录学生/小组: {', '.join(updated_students)}")
+        _drawn_record_signals.recordUpdated.emit(
+            file_path.name, {name: drawn_records[name] for name in students_to_add}
+        )
     else:
         logger.debug("没有新的学生需要记录")
 
@@ -1824,12 +1925,8 @@ def _load_drawn_records(file_path: str) -> dict:
     Returns:
         已抽取的学生记录字典，键为学生名称，值为抽取次数
     """
-    if not os.path.exists(file_path):
-        return {}
-
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            data = json.load(file)
+        data = read_json(file_path, default={})
 
         drawn_records = {}
 
@@ -1890,16 +1987,18 @@ def _extract_student_names(student_name) -> list:
     return []
 
 
-def _save_drawn_records(file_path: str, drawn_records: dict) -> None:
+def _save_drawn_records(
+    file_path: str, drawn_records: dict, delay_ms: Optional[float] = None
+) -> None:
     """保存已抽取的学生记录到文件
 
     Args:
         file_path: 记录文件路径
         drawn_records: 已抽取的学生记录字典
+        delay_ms: 合并写入的时间窗口，None 使用默认值，0 表示立即写入
     """
     try:
-        with open(file_path, "w", encoding="utf-8") as file:
-            json.dump(drawn_records, file, ensure_ascii=False, indent=2)
+        write_json(file_path, drawn_records, indent=2, delay_ms=delay_ms)
     except IOError as e:
         logger.exception(f"保存已抽取记录失败: {e}")
 
@@ -1954,9 +2053,11 @@ def remove_record(class_name: str, gender: str, group: str, _prefix: str = "0")
 
     try:
         for file_path in file_paths:
+            discard_pending_write(file_path)
             if file_path.exists() and file_path.is_file():
                 file_path.unlink(missing_ok=True)
                 logger.info(f"已删除记录文件: {file_path.name}")
+                _drawn_record_signals.recordCleared.emit(file_path.name)
     except OSError as e:
         logger.exception(f"删除记录文件失败: {e}")
 
@@ -2008,6 +2109,7 @@ def clear_temp_draw_records() -> int:
     deleted_count = 0
     for file_path in file_paths:
         try:
+            discard_pending_write(file_path)
             if file_path.exists() and file_path.is_file():
                 file_path.unlink(missing_ok=True)
                 deleted_count += 1
@@ -2015,6 +2117,7 @@ def clear_temp_draw_records() -> int:
             logger.exception(f"删除记录文件失败: {e}")
     if deleted_count:
         logger.info(f"已清除 {deleted_count} 个抽取临时记录文件")
+        _drawn_record_signals.recordCleared.emit("")
     return deleted_count
 
 
@@ -2087,23 +2190,29 @@ def _get_lottery_prize_record_file_path(pool_name: str):
     )
 
 
-def record_drawn_prize(pool_name: str, prize_names) -> None:
-    """记录已抽取的奖品
+def write_drawn_prize_record(pool_name: str, drawn_counts: dict, names) -> None:
+    """用内存中的完整次数覆盖写入奖品记录（不重新读取记录文件）
+
+    立即写入磁盘，调用方随后可以用文件修改时间和大小判断记录是否被外部修改。
 
     Args:
         pool_name: 奖池名称
-        prize_names: 奖品名称或奖品列表
+        drawn_counts: 全部奖品的已抽取次数 {名称: 次数}
+        names: 本次更新的奖品名称，用于发出记录更新信号
     """
     file_path = _get_lottery_prize_record_file_path(pool_name)
     file_path.parent.mkdir(parents=True, exist_ok=True)
-    drawn_records = _load_drawn_records(file_path)
-    names = _extract_student_names(prize_names)
-    for name in names:
-        if name in drawn_records:
-            drawn_records[name] += 1
-        else:
-            drawn_records[name] = 1
-    _save_drawn_records(file_path, drawn_records)
+    _save_drawn_records(file_path, dict(drawn_counts), delay_ms=0)
+    names = [name for name in names if name in drawn_counts]
+    if names:
+        _drawn_record_signals.recordUpdated.emit(
+            file_path.name, {name: drawn_counts[name] for name in names}
+        )
+
+
+def get_drawn_prize_record_path(pool_name: str) -> Path:
+    """获取奖池抽取记录文件路径"""
+    return _get_lottery_prize_record_file_path(pool_name)
 
 
 def read_drawn_record_simple(pool_name: str) -> list:
@@ -2116,23 +2225,21 @@ def read_drawn_record_simple(pool_name: str) -> list:
         已抽取记录列表，每个元素为(名称, 次数)元组
     """
     file_path = _get_lottery_prize_record_file_path(pool_name)
-    if file_path.exists():
-        try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                data = json.load(file)
-            if isinstance(data, dict):
-                return [(name, count) for name, count in data.items()]
-            if isinstance(data, list):
-                res = []
-                for item in data:
-                    if isinstance(item, str):
-                        res.append((item, 1))
-                    elif isinstance(item, dict) and "name" in item:
-                        res.append((item["name"], int(item.get("count", 1))))
-                return res
-        except Exception as e:
-            logger.exception(f"读取奖池已抽取记录失败: {e}")
-            return []
+    try:
+        data = read_json(file_path, default={})
+        if isinstance(data, dict):
+            return [(name, count) for name, count in data.items()]
+        if isinstance(data, list):
+            res = []
+            for item in data:
+                if isinstance(item, str):
+                    res.append((item, 1))
+                elif isinstance(item, dict) and "name" in item:
+                    res.append((item["name"], int(item.get("count", 1))))
+            return res
+    except Exception as e:
+        logger.exception(f"读取奖池已抽取记录失败: {e}")
+        return []
     return []
 
 
@@ -2147,11 +2254,14 @@ def delete_drawn_prize_record_files(pool_name: str) -> bool:
     """
     try:
         file_path = _get_lottery_prize_record_file_path(pool_name)
+        discard_pending_write(file_path)
         if file_path.exists() and file_path.is_file():
             try:
                 file_path.unlink(missing_ok=True)
             except OSError as e:
                 logger.error(f"删除文件{file_path}失败: {e}")
+            else:
+                _drawn_record_signals.recordCleared.emit(file_path.name)
         return True
     except Exception as e:
         logger.exception(f"重置奖池抽取记录失败: {e}")
@@ -0,0 +1,186 @@
+# ====================== 1. 阶段统计 ======================
+# - StageStats               - 一个阶段最近若干次的耗时和内存块变化
+# ====================== 2. 抽取耗时统计 ======================
+# - DrawTelemetry            - 按抽取类型和阶段汇总耗时（最近 N 次的 p50/p95/最大值）
+# - get_draw_telemetry()     - 获取全局实例
+# - draw_stage()             - 记录一个阶段的耗时（上下文管理器）
+# - collect_draw_stages()    - 收集当前线程一次抽取中各阶段的耗时（抽取轨迹使用）
+# - format_draw_telemetry()  - 文本报告（诊断数据和复制到剪贴板使用）
+
+# ==================================================
+# 导入模块
+# ==================================================
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+from app.tools.variable import DRAW_TELEMETRY_WINDOW
+
+
+# ==================================================
+# 阶段统计
+# ==================================================
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """最近秩法百分位数，sorted_values 不能为空"""
+    index = max(0, min(len(sorted_values) - 1, int(len(sorted_values) * fraction)))
+    return sorted_values[index]
+
+
+class StageStats:
+    """一个阶段最近 window 次的耗时和内存块变化
+
+    内存块变化为阶段结束与开始时 sys.getallocatedblocks() 之差，
+    开销只有一次函数调用，用于发现某个阶段是否在大量创建对象。
+    """
+
+    def __init__(self, window: int = DRAW_TELEMETRY_WINDOW):
+        self.count = 0  # 累计次数（不受窗口限制）
+        self.last_ms = 0.0
+        self._durations: deque = deque(maxlen=window)
+        self._blocks: deque = deque(maxlen=window)
+
+    def add(self, elapsed_ms: float, blocks: int) -> None:
+        self.count += 1
+        self.last_ms = elapsed_ms
+        self._durations.append(elapsed_ms)
+        self._blocks.append(blocks)
+
+    def summary(self) -> Dict[str, Any]:
+        """最近 window 次的统计"""
+        durations = sorted(self._durations)
+        blocks = sorted(self._blocks)
+        if not durations:
+            return {"count": self.count}
+        return {
+            "count": self.count,
+            "window": len(durations),
+            "last_ms": round(self.last_ms, 3),
+            "p50_ms": round(_percentile(durations, 0.5), 3),
+            "p95_ms": round(_percentile(durations, 0.95), 3),
+            "max_ms": round(durations[-1], 3),
+            "blocks_p50": _percentile(blocks, 0.5),
+            "blocks_max": blocks[-1],
+        }
+
+
+# ==================================================
+# 抽取耗时统计
+# ==================================================
+class DrawTelemetry:
+    """按抽取类型和阶段汇总的耗时统计
+
+    只保存在内存中，每个阶段保留最近 DRAW_TELEMETRY_WINDOW 次。
+    抽取可能在线程池中预先计算，记录和读取都加锁。
+    """
+
+    def __init__(self, window: int = DRAW_TELEMETRY_WINDOW):
+        self.window = window
+        self._stages: Dict[str, Dict[str, StageStats]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, stage: str, elapsed_ms: float, blocks: int) -> None:
+        """记录一次阶段耗时
+
+        Args:
+            kind: 抽取类型，如 "roll_call"
+            stage: 阶段名称
+            elapsed_ms: 耗时（毫秒）
+            blocks: 阶段内内存块数量的变化
+        """
+        with self._lock:
+            stages = self._stages.setdefault(kind, {})
+            stats = stages.get(stage)
+            if stats is None:
+                stats = stages[stage] = StageStats(self.window)
+            stats.add(elapsed_ms, blocks)
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """当前统计，按抽取类型和阶段首次出现的顺序排列"""
+        with self._lock:
+            return {
+                kind: {stage: stats.summary() for stage, stats in stages.items()}
+                for kind, stages in self._stages.items()
+            }
+
+    def reset(self) -> None:
+        """清空全部统计"""
+        with self._lock:
+            self._stages.clear()
+
+
+_telemetry = DrawTelemetry()
+_local = threading.local()
+
+
+def get_draw_telemetry() -> DrawTelemetry:
+    """获取全局抽取耗时统计"""
+    return _telemetry
+
+
+@contextmanager
+def draw_stage(kind: str, stage: str) -> Iterator[None]:
+    """记录一个阶段的耗时和内存块变化
+
+    阶段内抛出异常时同样记录，异常照常向外传递。
+
+    Args:
+        kind: 抽取类型，如 "roll_call"
+        stage: 阶段名称
+    """
+    blocks = sys.getallocatedblocks()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        _telemetry.record(kind, stage, elapsed_ms, sys.getallocatedblocks() - blocks)
+        stages = getattr(_local, "stages", None)
+        if stages is not None:
+            stages[stage] = stages.get(stage, 0.0) + elapsed_ms
+
+
+@contextmanager
+def collect_draw_stages() -> Iterator[Dict[str, float]]:
+    """收集当前线程中各阶段的耗时
+
+    上下文内每个 draw_stage() 结束时把耗时累加到产出的字典中（阶段名 → 毫秒），
+    用于抽取轨迹逐次记录各阶段耗时；不在上下文内时 draw_stage() 只多一次属性读取。
+    嵌套使用时沿用外层的字典。
+
+    Yields:
+        Dict[str, float]: 阶段名到累计耗时（毫秒）的字典
+    """
+    outer = getattr(_local, "stages", None)
+    if outer is not None:
+        yield outer
+        return
+    stages: Dict[str, float] = {}
+    _local.stages = stages
+    try:
+        yield stages
+    finally:
+        _local.stages = None
+
+
+def format_draw_telemetry(snapshot: Dict[str, Dict[str, Dict[str, Any]]]) -> str:
+    """把统计格式化为文本表格"""
+    lines = []
+    for kind, stages in snapshot.items():
+        lines.append(f"[{kind}]")
+        lines.append(
+            f"{'stage':<16}{'count':>7}{'last':>10}{'p50':>10}{'p95':>10}"
+            f"{'max':>10}{'blocks p50':>12}"
+        )
+        for stage, summary in stages.items():
+            if "p50_ms" not in summary:
+                continue
+            lines.append(
+                f"{stage:<16}{summary['count']:>7}{summary['last_ms']:>10.2f}"
+                f"{summary['p50_ms']:>10.2f}{summary['p95_ms']:>10.2f}"
+                f"{summary['max_ms']:>10.2f}{summary['blocks_p50']:>12}"
+            )
+        lines.append("")
+    return "\n".join(lines)
@@ -0,0 +1,485 @@
+# ====================== 1. 匿名化 ======================
+# - TraceAnonymizer            - 用随机盐把名称替换为不可逆的短标记，保留数据结构
+# ====================== 2. 抽取轨迹 ======================
+# - draw_trace_data_path()     - 轨迹中一份数据快照对应的数据文件路径（记录和回放共用）
+# - DrawTraceRecorder          - 把抽取参数、数据快照和耗时追加写入 JSONL 文件
+# - draw_trace_enabled()       - 环境变量中是否开启抽取轨迹
+# - get_draw_trace_recorder()  - 获取全局记录器，未开启时为 None
+# - traced_draw()              - 装饰抽取函数，开启时记录每次调用
+# - trace_save()               - 记录一次抽取结果的保存
+# ====================== 3. 读取 ======================
+# - read_draw_trace()          - 读取并检查轨迹文件
+
+# ==================================================
+# 导入模块
+# ==================================================
+import functools
+import hashlib
+import inspect
+import json
+import os
+import platform
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from app.common.history.file_utils import get_history_file_path
+from app.tools.config import get_drawn_prize_record_path, get_drawn_record_path
+from app.tools.draw_telemetry import collect_draw_stages
+from app.tools.json_store import read_json
+from app.tools.path_utils import get_data_path, get_path, get_settings_path
+from app.tools.variable import (
+    DRAW_TRACE_DIR,
+    DRAW_TRACE_ENV,
+    DRAW_TRACE_FORMAT,
+    DRAW_TRACE_SETTINGS_GROUPS,
+    DRAW_TRACE_TOKEN_LENGTH,
+    LOG_DIR,
+    SPECIAL_VERSION,
+)
+
+# 名单、奖池、已抽取记录和历史记录中的字段名，原样保留；其余的键一律替换为标记
+_SCHEMA_KEYS = frozenset(
+    {
+        # 名单、奖池和已抽取记录
+        "id",
+        "name",
+        "gender",
+        "group",
+        "exist",
+        "weight",
+        "count",
+        "drawn_names",
+        # 历史记录
+        "students",
+        "lotterys",
+        "group_stats",
+        "gender_stats",
+        "subject_stats",
+        "total_rounds",
+        "total_stats",
+        "total_count",
+        "group_gender_count",
+        "last_drawn_time",
+        "rounds_missed",
+        "history",
+        "draw_method",
+        "draw_time",
+        "draw_people_numbers",
+        "draw_lottery_numbers",
+        "draw_group",
+        "draw_gender",
+        "class_name",
+    }
+)
+
+# 值为“名称 → 数据”的字段，其中的键（学生、奖品、小组、性别、科目）无论内容如何都替换为标记
+_NAME_MAP_KEYS = frozenset(
+    {"students", "lotterys", "group_stats", "gender_stats", "subject_stats"}
+)
+
+# 值为名称的字段，无论内容如何都替换为标记
+_NAME_FIELDS = frozenset(
+    {"name", "gender", "group", "draw_group", "draw_gender", "class_name"}
+)
+
+# 原样保留的值（数字、日期时间），其余文本都替换为标记
+_PLAIN_VALUE = re.compile(r"[\d\s:.+\-/TZ]*")
+
+# 抽取参数中表示名称的字段，无论内容如何都替换为标记
+_NAME_ARGS = ("class_name", "pool_name", "group_filter", "gender_filter")
+
+
+# ==================================================
+# 匿名化
+# ==================================================
+class TraceAnonymizer:
+    """把名称替换为不可逆的短标记
+
+    标记为加盐 SHA-256 的前 DRAW_TRACE_TOKEN_LENGTH 位十六进制，同一份轨迹中
+    同一名称的标记相同，名单、历史记录、已抽取记录和抽取参数之间的对应关系不变，
+    回放时可以直接用标记作为班级、奖池、学生和小组名称。
+    盐在每份轨迹创建时随机生成且不写入文件，无法用常见姓名反查。
+    """
+
+    def __init__(
+        self, salt: Optional[bytes] = None, length: int = DRAW_TRACE_TOKEN_LENGTH
+    ):
+        self._salt = salt or os.urandom(16)
+        self._length = length
+        self._tokens: Dict[str, str] = {}
+
+    def token(self, text: Any) -> str:
+        """名称对应的标记，空名称保持为空"""
+        text = "" if text is None else str(text)
+        if not text:
+            return text
+        token = self._tokens.get(text)
+        if token is None:
+            digest = hashlib.sha256(self._salt + text.encode("utf-8")).hexdigest()
+            token = self._tokens[text] = "n" + digest[: self._length]
+        return token
+
+    def names(self, data: Any) -> Any:
+        """名单、奖池和已抽取记录：键为名称，值中的姓名、性别和小组也是名称"""
+        if isinstance(data, dict):
+            if isinstance(data.get("drawn_names"), list):
+                return {"drawn_names": self.names(data["drawn_names"])}
+            return {self.token(name): self.value(info) for name, info in data.items()}
+        if isinstance(data, list):
+            # 旧版已抽取记录：名称列表或 {"name": 名称, "count": 次数} 列表
+            return [
+                self.token(item) if isinstance(item, str) else self.value(item)
+                for item in data
+            ]
+        return self.value(data)
+
+    def value(self, value: Any) -> Any:
+        """递归处理任意 JSON 数据
+
+        已出现过的名称一律替换；字典的键只有 _SCHEMA_KEYS 中的字段名原样保留，
+        名称映射（_NAME_MAP_KEYS）的键和名称字段（_NAME_FIELDS）的值无论内容如何都替换；
+        其余文本中数字、日期时间原样保留，其他内容（备注等）同样替换为标记。
+        """
+        if isinstance(value, str):
+            return self._text(value)
+        if isinstance(value, dict):
+            result = {}
+            for key, item in value.items():
+                key = str(key)
+                if key in _NAME_MAP_KEYS and isinstance(item, dict):
+                    item = self.names(item)
+                elif key in _NAME_FIELDS and isinstance(item, str):
+                    item = self.token(item)
+                else:
+                    item = self.value(item)
+                result[key if key in _SCHEMA_KEYS else self.token(key)] = item
+            return result
+        if isinstance(value, (list, tuple)):
+            return [self.value(item) for item in value]
+        return value
+
+    def _text(self, text: str) -> str:
+        if text not in self._tokens and _PLAIN_VALUE.fullmatch(text):
+            return text
+        return self.token(text)
+
+
+# ==================================================
+# 抽取轨迹
+# ==================================================
+def draw_trace_data_path(
+    role: str, kind: str, name: str, gender: str = "", group: str = ""
+) -> Path:
+    """轨迹中一份数据快照对应的数据文件路径
+
+    Args:
+        role: "list"（名单或奖池）、"history"（历史记录）或 "drawn_record"（已抽取记录）
+        kind: 抽取类型，"roll_call" 或 "lottery"
+        name: 班级或奖池名称
+        gender: 性别过滤器（仅点名的已抽取记录）
+        group: 小组过滤器（仅点名的已抽取记录）
+
+    Returns:
+        Path: 数据文件路径
+    """
+    if role == "list":
+        folder = "roll_call_list" if kind == "roll_call" else "lottery_list"
+        return get_data_path(f"list/{folder}") / f"{name}.json"
+    if role == "history":
+        return get_history_file_path(kind, name)
+    if kind == "roll_call":
+        return get_drawn_record_path(name, gender, group)
+    return get_drawn_prize_record_path(name)
+
+
+def _result_size(result: Any) -> int:
+    if not isinstance(result, dict):
+        return 0
+    selected = result.get("selected_students") or result.get("selected_prizes") or []
+    return len(selected)
+
+
+class DrawTraceRecorder:
+    """抽取轨迹记录器
+
+    每次抽取追加一行 JSON：抽取参数（名称已匿名化）、总耗时和各阶段耗时；
+    某个班级或奖池第一次被抽取前，先写入其名单、历史记录和已抽取记录的匿名快照，
+    设置有变化时写入相关分组的快照（只保留数字和布尔值）。
+    scripts/replay_draw_trace.py 根据这些内容重建数据目录并按顺序重新抽取。
+
+    快照和设置的读取不计入抽取耗时；写入失败只记录警告，不影响抽取。
+    """
+
+    def __init__(self, path: Path, anonymizer: Optional[TraceAnonymizer] = None):
+        self.path = Path(path)
+        self.anonymizer = anonymizer or TraceAnonymizer()
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._captured: set = set()
+        self._settings: Optional[Dict[str, Any]] = None
+        self._last_draw: Optional[Tuple[str, str, int]] = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._write(
+            {
+                "type": "header",
+                "format": DRAW_TRACE_FORMAT,
+                "version": SPECIAL_VERSION,
+                "python": platform.python_version(),
+                "platform": platform.system(),
+                "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+        )
+
+    def record_draw(self, kind: str, func: Callable, arguments: Dict[str, Any]) -> Any:
+        """执行一次抽取并记录
+
+        Args:
+            kind: 抽取类型
+            func: 抽取函数
+            arguments: 按参数名绑定的调用参数
+
+        Returns:
+            Any: 抽取函数的返回值
+        """
+        with self._lock:
+            seq = self._next_seq()
+            try:
+                self._capture(kind, arguments)
+                args = self._anonymize_args(arguments)
+            except Exception as e:
+                logger.warning("记录抽取轨迹快照失败: {}", e)
+                args = None
+
+        event: Dict[str, Any] = {"type": "draw", "seq": seq, "kind": kind}
+        with collect_draw_stages() as stages:
+            start = time.perf_counter()
+            try:
+                result = func(**arguments)
+            except Exception as e:
+                event["error"] = type(e).__name__
+                raise
+            else:
+                event["result_size"] = _result_size(result)
+                event["reset_required"] = bool(
+                    isinstance(result, dict) and result.get("reset_required")
+                )
+                return result
+            finally:
+                event["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+                event["stages"] = {stage: round(ms, 3) for stage, ms in stages.items()}
+                if args is not None:
+                    event["args"] = args
+                    self._finish_draw(kind, event)
+
+    def _finish_draw(self, kind: str, event: Dict[str, Any]) -> None:
+        args = event["args"]
+        name = args.get("class_name") or args.get("pool_name") or ""
+        with self._lock:
+            self._last_draw = (kind, name, event["seq"])
+            try:
+                self._write(event)
+            except Exception as e:
+                logger.warning("记录抽取轨迹失败: {}", e)
+
+    def record_save(self, kind: str, name: str, arguments: Dict[str, Any]) -> None:
+        """记录一次抽取结果的保存
+
+        保存引用同一类型、同一班级或奖池最近一次抽取的序号，回放时保存那次抽取的结果。
+        """
+        with self._lock:
+            try:
+                token = self.anonymizer.token(name)
+                last = self._last_draw
+                draw = last[2] if last and last[:2] == (kind, token) else None
+                self._write(
+                    {
+                        "type": "save",
+                        "seq": self._next_seq(),
+                        "kind": kind,
+                        "draw": draw,
+                        "args": self._anonymize_args(arguments),
+                    }
+                )
+            except Exception as e:
+                logger.warning("记录抽取轨迹失败: {}", e)
+
+    def _next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
+    def _anonymize_args(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            key: self.anonymizer.token(value)
+            if key in _NAME_ARGS
+            else self.anonymizer.value(value)
+            for key, value in arguments.items()
+        }
+
+    def _capture(self, kind: str, arguments: Dict[str, Any]) -> None:
+        """写入设置变化和首次出现的数据快照（调用方持有锁）"""
+        settings = self._settings_snapshot()
+        if settings != self._settings:
+            self._settings = settings
+            self._write({"type": "settings", "settings": settings})
+
+        if kind == "roll_call":
+            name = arguments.get("class_name") or ""
+            gender = arguments.get("gender_filter") or ""
+            group = arguments.get("group_filter") or ""
+        else:
+            name = arguments.get("pool_name") or ""
+            gender = group = ""
+        token = self.anonymizer.token(name)
+        for role in ("list", "drawn_record", "history"):
+            if role == "drawn_record":
+                key = (role, kind, name, gender, group)
+            else:
+                key = (role, kind, name, "", "")
+            if key in self._captured:
+                continue
+            self._captured.add(key)
+            data = read_json(draw_trace_data_path(*key), default=None)
+            if data is None:
+                continue
+            event = {"type": "data", "role": role, "kind": kind, "name": token}
+            if role == "drawn_record" and kind == "roll_call":
+                event["gender"] = self.anonymizer.token(gender)
+                event["group"] = self.anonymizer.token(group)
+            if role == "history":
+                event["data"] = self.anonymizer.value(data)
+            else:
+                event["data"] = self.anonymizer.names(data)
+            self._write(event)
+
+    @staticmethod
+    def _settings_snapshot() -> Dict[str, Dict[str, Any]]:
+        settings = read_json(get_settings_path(), default={}) or {}
+        snapshot = {}
+        for group in DRAW_TRACE_SETTINGS_GROUPS:
+            values = settings.get(group)
+            if not isinstance(values, dict):
+                continue
+            snapshot[group] = {
+                key: value
+                for key, value in values.items()
+                if isinstance(value, (bool, int, float))
+            }
+        return snapshot
+
+    def _write(self, event: Dict[str, Any]) -> None:
+        line = json.dumps(event, ensure_ascii=False, separators=(",", ":"))
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def draw_trace_enabled() -> bool:
+    """环境变量 SECRANDOM_DRAW_TRACE 是否开启抽取轨迹"""
+    value = os.environ.get(DRAW_TRACE_ENV, "").strip()
+    return bool(value) and value.lower() not in ("0", "false", "off", "no")
+
+
+_recorder: Optional[DrawTraceRecorder] = None
+_recorder_checked = False
+_recorder_lock = threading.Lock()
+
+
+def get_draw_trace_recorder() -> Optional[DrawTraceRecorder]:
+    """获取全局记录器，首次调用时按环境变量决定是否创建
+
+    每次运行写入日志目录下 draw_traces 中的一个新文件，导出诊断数据时一并打包。
+
+    Returns:
+        Optional[DrawTraceRecorder]: 未开启或创建失败时为 None
+    """
+    global _recorder, _recorder_checked
+    if _recorder_checked:
+        return _recorder
+    with _recorder_lock:
+        if not _recorder_checked:
+            if draw_trace_enabled():
+                file_name = (
+                    f"draw_trace_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}.jsonl"
+                )
+                try:
+                    _recorder = DrawTraceRecorder(
+                        get_path(LOG_DIR) / DRAW_TRACE_DIR / file_name
+                    )
+                    logger.info("抽取轨迹写入: {}", _recorder.path)
+                except OSError as e:
+                    logger.warning("创建抽取轨迹文件失败: {}", e)
+            _recorder_checked = True
+    return _recorder
+
+
+def traced_draw(kind: str) -> Callable[[Callable], Callable]:
+    """装饰抽取函数：开启抽取轨迹时记录每次调用的参数、快照和耗时
+
+    未开启时只多一次函数调用和判断。
+
+    Args:
+        kind: 抽取类型，"roll_call" 或 "lottery"
+    """
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = get_draw_trace_recorder()
+            if recorder is None:
+                return func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return recorder.record_draw(kind, func, dict(bound.arguments))
+
+        return wrapper
+
+    return decorator
+
+
+def trace_save(kind: str, name: str, **arguments: Any) -> None:
+    """开启抽取轨迹时记录一次抽取结果的保存
+
+    Args:
+        kind: 抽取类型
+        name: 班级或奖池名称
+        **arguments: 保存时的过滤器、半重复设置等参数
+    """
+    recorder = get_draw_trace_recorder()
+    if recorder is not None:
+        recorder.record_save(kind, name, arguments)
+
+
+# ==================================================
+# 读取
+# ==================================================
+def read_draw_trace(path: Path) -> List[Dict[str, Any]]:
+    """读取轨迹文件
+
+    Args:
+        path: 轨迹文件路径
+
+    Returns:
+        List[Dict[str, Any]]: 全部事件，第一个为文件头
+
+    Raises:
+        ValueError: 不是抽取轨迹文件或格式版本不支持
+    """
+    events = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                events.append(json.loads(line))
+    if not events or events[0].get("type") != "header":
+        raise ValueError(f"不是抽取轨迹文件: {path}")
+    if events[0].get("format") != DRAW_TRACE_FORMAT:
+        raise ValueError(
+            f"轨迹格式版本 {events[0].get('format')} 不受支持（当前为 {DRAW_TRACE_FORMAT}）"
+        )
+    return events
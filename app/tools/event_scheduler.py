@@ -0,0 +1,252 @@
+# ====================== 1. 订阅 ======================
+# - EventSubscription        - 一次事件订阅（cancel() 取消）
+
+# ====================== 2. 调度 ======================
+# - subscribe_boundary()     - 在预先计算的时间边界触发回调（替代固定间隔轮询）
+# - subscribe_backoff()      - 自适应退避轮询（无事件源时的兜底）
+
+# ====================== 3. 唤醒统计 ======================
+# - record_wakeup()          - 记录一次唤醒
+# - get_wakeup_stats()       - 获取各订阅的唤醒次数
+# - reset_wakeup_stats()     - 清空唤醒统计
+
+# ==================================================
+# 导入模块
+# ==================================================
+import threading
+from collections import Counter
+from typing import Callable, Dict, Optional
+
+from loguru import logger
+from PySide6.QtCore import QObject, Qt, QTimer
+
+from app.tools.variable import (
+    BOUNDARY_TIMER_MARGIN_MS,
+    BOUNDARY_TIMER_MAX_INTERVAL_MS,
+)
+
+_wakeup_counter: Counter = Counter()
+_wakeup_lock = threading.Lock()
+
+
+# ==================================================
+# 唤醒统计
+# ==================================================
+def record_wakeup(name: str) -> None:
+    """记录一次唤醒（定时器触发、系统事件回调等）
+
+    Args:
+        name: 订阅名称
+    """
+    with _wakeup_lock:
+        _wakeup_counter[name] += 1
+
+
+def get_wakeup_stats() -> Dict[str, int]:
+    """获取各订阅的唤醒次数"""
+    with _wakeup_lock:
+        return dict(_wakeup_counter)
+
+
+def reset_wakeup_stats() -> None:
+    """清空唤醒统计"""
+    with _wakeup_lock:
+        _wakeup_counter.clear()
+
+
+# ==================================================
+# 订阅
+# ==================================================
+class EventSubscription:
+    """一次事件订阅
+
+    由订阅方持有，不再需要时调用 cancel()。取消后回调不会再被调用，
+    重复取消是安全的。
+    """
+
+    def __init__(self, name: str, on_cancel: Optional[Callable[[], None]] = None):
+        self.name = name
+        self._on_cancel = on_cancel
+        self._active = True
+
+    @property
+    def active(self) -> bool:
+        return self._active
+
+    def cancel(self) -> None:
+        if not self._active:
+            return
+        self._active = False
+        on_cancel, self._on_cancel = self._on_cancel, None
+        if on_cancel is not None:
+            try:
+                on_cancel()
+            except Exception as e:
+                logger.exception(f"取消订阅 {self.name} 失败: {e}")
+
+    def __repr__(self) -> str:
+        state = "active" if self._active else "cancelled"
+        return f"<EventSubscription '{self.name}' ({state})>"
+
+
+class _BoundaryTimer(QObject):
+    """在下一个时间边界触发的单次定时器，触发后重新计算下一个边界"""
+
+    def __init__(
+        self,
+        name: str,
+        next_delay: Callable[[], Optional[float]],
+        callback: Callable[[], None],
+        parent: Optional[QObject] = None,
+    ):
+        super().__init__(parent)
+        self._name = name
+        self._next_delay = next_delay
+        self._callback = callback
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._fire)
+
+    def arm(self) -> None:
+        """计算下一个边界并启动定时器"""
+        try:
+            delay = self._next_delay()
+        except Exception as e:
+            logger.exception(f"计算 {self._name} 的下一个时间边界失败: {e}")
+            delay = None
+        if delay is None or delay <= 0:
+            interval = BOUNDARY_TIMER_MAX_INTERVAL_MS
+        else:
+            interval = min(
+                int(delay * 1000) + BOUNDARY_TIMER_MARGIN_MS,
+                BOUNDARY_TIMER_MAX_INTERVAL_MS,
+            )
+        self._timer.start(interval)
+        logger.debug(f"{self._name} 下一次检查在 {interval / 1000:.1f} 秒后")
+
+    def start(self, immediate: bool) -> None:
+        """启动定时器；immediate 为 True 时先在下一次事件循环中检查一次"""
+        if immediate:
+            self._timer.start(0)
+        else:
+            self.arm()
+
+    def stop(self) -> None:
+        try:
+            self._timer.stop()
+            self.deleteLater()
+        except RuntimeError:
+            # 父对象已销毁，定时器随之销毁
+            pass
+
+    def _fire(self) -> None:
+        record_wakeup(self._name)
+        try:
+            self._callback()
+        except Exception as e:
+            logger.exception(f"{self._name} 回调执行失败: {e}")
+        self.arm()
+
+
+class _BackoffPoller(QObject):
+    """自适应退避轮询：结果不变时间隔逐步加倍，变化时恢复最小间隔"""
+
+    def __init__(
+        self,
+        name: str,
+        poll: Callable[[], bool],
+        min_interval_ms: int,
+        max_interval_ms: int,
+        parent: Optional[QObject] = None,
+    ):
+        super().__init__(parent)
+        self._name = name
+        self._poll = poll
+        self._min_interval = max(1, int(min_interval_ms))
+        self._max_interval = max(self._min_interval, int(max_interval_ms))
+        self._interval = self._min_interval
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._fire)
+
+    def start(self) -> None:
+        self._interval = self._min_interval
+        self._timer.start(self._interval)
+
+    def stop(self) -> None:
+        try:
+            self._timer.stop()
+            self.deleteLater()
+        except RuntimeError:
+            # 父对象已销毁，定时器随之销毁
+            pass
+
+    def _fire(self) -> None:
+        record_wakeup(self._name)
+        changed = False
+        try:
+            changed = bool(self._poll())
+        except Exception as e:
+            logger.exception(f"{self._name} 轮询失败: {e}")
+        if changed:
+            self._interval = self._min_interval
+        else:
+            self._interval = min(self._interval * 2, self._max_interval)
+        self._timer.start(self._interval)
+
+
+# ==================================================
+# 调度
+# ==================================================
+def subscribe_boundary(
+    name: str,
+    next_delay: Callable[[], Optional[float]],
+    callback: Callable[[], None],
+    parent: Optional[QObject] = None,
+    immediate: bool = True,
+) -> EventSubscription:
+    """在预先计算的时间边界触发回调
+
+    每次触发后调用 next_delay 计算距下一个边界的秒数并重新挂起单次定时器，
+    两个边界之间没有任何唤醒。无法确定下一个边界（返回 None 或非正数）时
+    退回 BOUNDARY_TIMER_MAX_INTERVAL_MS；间隔同样以该值为上限，
+    用于兜底系统休眠、修改系统时间等无法预知的情况。
+
+    Args:
+        name: 订阅名称（用于日志和唤醒统计）
+        next_delay: 返回距下一个边界秒数的函数
+        callback: 到达边界时调用的函数
+        parent: 定时器的父对象，父对象销毁时定时器随之销毁
+        immediate: 是否在订阅后立即（下一次事件循环）调用一次回调
+
+    Returns:
+        EventSubscription: 订阅对象
+    """
+    timer = _BoundaryTimer(name, next_delay, callback, parent)
+    timer.start(immediate)
+    return EventSubscription(name, timer.stop)
+
+
+def subscribe_backoff(
+    name: str,
+    poll: Callable[[], bool],
+    min_interval_ms: int,
+    max_interval_ms: int,
+    parent: Optional[QObject] = None,
+) -> EventSubscription:
+    """自适应退避轮询，仅在没有可用事件源时使用
+
+    Args:
+        name: 订阅名称（用于日志和唤醒统计）
+        poll: 轮询函数，返回 True 表示状态发生了变化
+        min_interval_ms: 最小轮询间隔（毫秒）
+        max_interval_ms: 最大轮询间隔（毫秒）
+        parent: 定时器的父对象
+
+    Returns:
+        EventSubscription: 订阅对象
+    """
+    poller = _BackoffPoller(name, poll, min_interval_ms, max_interval_ms, parent)
+    poller.start()
+    return EventSubscription(name, poller.stop)
@@ -0,0 +1,496 @@
+# ====================== 1. 文件变化事件 ======================
+# - FILE_KIND_*                - 数据类型：名单、历史记录、设置、抽取记录
+# - FileChangeEvent            - 分发给订阅方的一次变化（新增、修改、删除的文件）
+# - make_write_origin()        - 生成写入来源标识（写入和订阅时使用同一个）
+# ====================== 2. 变化检测 ======================
+# - scan_directory()           - 获取目录中 JSON 文件的修改时间和大小
+# - FileChangeTracker          - 比较目录快照，标记由本应用写入引起的变化
+# - is_own_change()            - 变化是否完全由指定来源的写入引起
+# ====================== 3. 文件变化通知服务 ======================
+# - FileChangeService          - 统一监视数据目录，按订阅方防抖、过滤后分发变化
+# - get_file_change_service()  - 获取全局文件变化通知服务
+# - subscribe_file_changes()   - 订阅某类数据文件的变化
+
+# ==================================================
+# 导入模块
+# ==================================================
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from loguru import logger
+from PySide6.QtCore import QEvent, QFileSystemWatcher, QObject, QTimer
+
+from app.tools.event_scheduler import EventSubscription, record_wakeup
+from app.tools.json_store import get_json_store
+from app.tools.path_utils import get_data_path, get_settings_path, get_temp_path
+from app.tools.variable import FILE_CHANGE_DEBOUNCE_MS, FILE_CHANGE_SCAN_DELAY_MS
+
+PathLike = Union[str, Path]
+Signature = Tuple[int, int]  # (修改时间 ns, 文件大小)
+Origins = FrozenSet[Optional[str]]  # 写入来源，None 表示未注明来源的写入
+
+FILE_KIND_ROSTER = "roster"  # 点名名单、奖池名单
+FILE_KIND_HISTORY = "history"  # 点名、抽奖历史记录
+FILE_KIND_SETTINGS = "settings"  # 设置文件
+FILE_KIND_RECORDS = "records"  # 已抽取记录等临时数据
+
+ADDED = "added"
+MODIFIED = "modified"
+REMOVED = "removed"
+
+
+def _key(path: PathLike) -> str:
+    return os.path.normcase(os.path.abspath(str(path)))
+
+
+def kind_directories(kind: str) -> List[Path]:
+    """数据类型对应的目录"""
+    if kind == FILE_KIND_ROSTER:
+        return [
+            get_data_path("list", "roll_call_list"),
+            get_data_path("list", "lottery_list"),
+        ]
+    if kind == FILE_KIND_HISTORY:
+        return [
+            get_data_path("history", "roll_call_history"),
+            get_data_path("history", "lottery_history"),
+        ]
+    if kind == FILE_KIND_SETTINGS:
+        return [get_settings_path().parent]
+    if kind == FILE_KIND_RECORDS:
+        return [get_temp_path()]
+    raise ValueError(f"未知的数据类型: {kind}")
+
+
+# ==================================================
+# 文件变化事件
+# ==================================================
+class FileChangeEvent(NamedTuple):
+    """分发给订阅方的一次变化，防抖期间的多次变化已合并"""
+
+    kind: str
+    added: Tuple[Path, ...]
+    modified: Tuple[Path, ...]
+    removed: Tuple[Path, ...]
+
+    @property
+    def names_changed(self) -> bool:
+        """是否有文件新增或删除（名单、历史记录的下拉框需要重建）"""
+        return bool(self.added or self.removed)
+
+    def touches(self, path: PathLike) -> bool:
+        """指定文件是否有变化"""
+        key = _key(path)
+        return any(_key(p) == key for p in self.added + self.modified + self.removed)
+
+
+def make_write_origin(owner: Any) -> str:
+    """生成写入来源标识
+
+    写入时传给 write_json(origin=...)，订阅时传给 subscribe_file_changes(origin=...)，
+    该订阅就不会收到这些写入引起的变化。
+    """
+    return f"{type(owner).__name__}@{id(owner):x}"
+
+
+# ==================================================
+# 变化检测
+# ==================================================
+class FileChange(NamedTuple):
+    """比较目录快照得到的一个文件的变化"""
+
+    action: str  # ADDED / MODIFIED / REMOVED
+    path: Path
+    directory: str  # 所在目录（_key 形式）
+    origins: Origins  # 引起变化的本应用写入来源，为空表示不是本应用写入的
+
+
+def scan_directory(directory: PathLike) -> Dict[str, Signature]:
+    """获取目录中 JSON 文件的修改时间和大小（写入服务的临时文件不计入）"""
+    result = {}
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                result[entry.name] = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        pass
+    return result
+
+
+def is_own_change(origins: Origins, origin: Optional[str]) -> bool:
+    """变化是否完全由来源为 origin 的写入引起"""
+    return origin is not None and bool(origins) and origins <= {origin}
+
+
+class FileChangeTracker:
+    """比较目录快照，标记由本应用写入引起的变化
+
+    JSON 写入服务每写出一个文件就调用 note_write()，记录写出后文件的修改时间和大小；
+    之后比较快照时文件仍是这个状态，说明变化就是这次写入引起的。
+    note_write() 可能在后台写入线程中调用。
+    """
+
+    def __init__(self):
+        self._snapshots: Dict[str, Dict[str, Signature]] = {}
+        self._own_writes: Dict[str, Tuple[Signature, Origins]] = {}
+        self._lock = threading.Lock()
+
+    def note_write(self, path: PathLike, origins: Origins) -> None:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        with self._lock:
+            self._own_writes[_key(path)] = (
+                (stat.st_mtime_ns, stat.st_size),
+                frozenset(origins),
+            )
+
+    def reset(self, directory: PathLike) -> None:
+        """记录目录当前的快照，作为之后比较的基准"""
+        self._snapshots[_key(directory)] = scan_directory(directory)
+
+    def rescan(self, directory: PathLike) -> List[FileChange]:
+        """重新获取目录快照，返回与上一次相比有变化的文件"""
+        directory = Path(directory)
+        key = _key(directory)
+        old = self._snapshots.get(key, {})
+        new = scan_directory(directory)
+        self._snapshots[key] = new
+        changes = []
+        for name, signature in new.items():
+            before = old.get(name)
+            if before == signature:
+                continue
+            path = directory / name
+            action = ADDED if before is None else MODIFIED
+            changes.append(
+                FileChange(action, path, key, self._origins(path, signature))
+            )
+        for name in old:
+            if name not in new:
+                path = directory / name
+                with self._lock:
+                    self._own_writes.pop(_key(path), None)
+                changes.append(FileChange(REMOVED, path, key, frozenset()))
+        return changes
+
+    def _origins(self, path: Path, signature: Signature) -> Origins:
+        with self._lock:
+            entry = self._own_writes.get(_key(path))
+        if entry is None or entry[0] != signature:
+            return frozenset()
+        return entry[1]
+
+
+class _PendingChanges:
+    """订阅方防抖期间累积的变化，同一文件的多次变化合并为最终结果"""
+
+    def __init__(self):
+        self.added: Dict[str, Path] = {}
+        self.modified: Dict[str, Path] = {}
+        self.removed: Dict[str, Path] = {}
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.modified or self.removed)
+
+    def add(self, change: FileChange) -> None:
+        key = _key(change.path)
+        if change.action == REMOVED:
+            self.modified.pop(key, None)
+            if self.added.pop(key, None) is None:
+                self.removed[key] = change.path
+        elif change.action == ADDED:
+            if self.removed.pop(key, None) is not None:
+                self.modified[key] = change.path
+            else:
+                self.added[key] = change.path
+        elif key not in self.added:
+            self.modified[key] = change.path
+
+    def take(self, kind: str) -> FileChangeEvent:
+        event = FileChangeEvent(
+            kind,
+            tuple(self.added.values()),
+            tuple(self.modified.values()),
+            tuple(self.removed.values()),
+        )
+        self.added.clear()
+        self.modified.clear()
+        self.removed.clear()
+        return event
+
+
+# ==================================================
+# 文件变化通知服务
+# ==================================================
+class _FileChangeSubscriber(QObject):
+    """一个订阅方：过滤、防抖，组件隐藏时推迟到下次显示再分发"""
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        callback: Callable[[FileChangeEvent], None],
+        directory: Optional[PathLike],
+        origin: Optional[str],
+        delay_ms: int,
+        widget: Optional[QObject],
+        lazy: bool,
+        parent: Optional[QObject],
+    ):
+        super().__init__(parent)
+        self.name = name
+        self.kind = kind
+        self._callback = callback
+        self._directory = _key(directory) if directory is not None else None
+        self._origin = origin
+        self._delay_ms = max(0, int(delay_ms))
+        self._widget = widget if lazy else None
+        self._pending = _PendingChanges()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._fire)
+        if self._widget is not None:
+            self._widget.installEventFilter(self)
+
+    def offer(self, changes: List[FileChange]) -> int:
+        """接收一批变化，返回因是自己的写入而跳过的数量"""
+        suppressed = 0
+        accepted = False
+        for change in changes:
+            if self._directory is not None and change.directory != self._directory:
+                continue
+            if is_own_change(change.origins, self._origin):
+                suppressed += 1
+                continue
+            self._pending.add(change)
+            accepted = True
+        if accepted:
+            self._timer.start(self._delay_ms)
+        return suppressed
+
+    def _fire(self) -> None:
+        if self._pending.is_empty():
+            return
+        if self._widget is not None and not self._widget.isVisible():
+            # 组件隐藏时不刷新，保留变化等下次显示时再分发
+            return
+        event = self._pending.take(self.kind)
+        record_wakeup(self.name)
+        try:
+            self._callback(event)
+        except Exception as e:
+            logger.exception(f"{self.name} 处理文件变化失败: {e}")
+
+    def eventFilter(self, watched, event) -> bool:
+        if event.type() == QEvent.Type.Show and not self._pending.is_empty():
+            self._timer.start(0)
+        return False
+
+    def stop(self) -> None:
+        try:
+            self._timer.stop()
+            if self._widget is not None:
+                self._widget.removeEventFilter(self)
+            self.deleteLater()
+        except RuntimeError:
+            # 父对象已销毁，订阅随之销毁
+            pass
+
+
+class FileChangeService(QObject):
+    """文件变化通知服务
+
+    - 每个数据目录只由一个 QFileSystemWatcher 监视，目录中的 JSON 文件也逐个监视
+      （部分平台上目录监视不报告文件内容的修改）；
+    - 收到通知后等待 FILE_CHANGE_SCAN_DELAY_MS 合并同一批通知，再比较目录中各文件的
+      修改时间和大小，得到真正新增、修改、删除的文件；
+    - 订阅方可以只关心某个目录，并用写入来源跳过自己的写入引起的变化；
+    - 每个订阅方单独防抖；绑定了组件的订阅在组件隐藏时不分发，下次显示时再分发。
+    """
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.tracker = FileChangeTracker()
+        self.stats: Counter = Counter()
+        self._directories: Dict[str, Tuple[str, Path]] = {}  # 目录 -> (数据类型, 路径)
+        self._dirty: Set[str] = set()
+        self._subscribers: Dict[int, _FileChangeSubscriber] = {}
+        self._next_id = 0
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_path_changed)
+        self._watcher.fileChanged.connect(self._on_path_changed)
+        self._scan_timer = QTimer(self)
+        self._scan_timer.setSingleShot(True)
+        self._scan_timer.setInterval(FILE_CHANGE_SCAN_DELAY_MS)
+        self._scan_timer.timeout.connect(self.scan)
+        get_json_store().add_write_listener(self.tracker.note_write)
+
+    def watch_kind(self, kind: str) -> None:
+        """开始监视数据类型对应的目录（目录不存在时创建）"""
+        for directory in kind_directories(kind):
+            key = _key(directory)
+            if key in self._directories:
+                continue
+            try:
+                directory.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                logger.warning(f"无法创建监视的目录 {directory}: {e}")
+                continue
+            self._directories[key] = (kind, directory)
+            self.tracker.reset(directory)
+            self._watcher.addPath(str(directory))
+            self._watch_files(directory)
+
+    def subscribe(
+        self,
+        kind: str,
+        callback: Callable[[FileChangeEvent], None],
+        name: str,
+        widget: Optional[QObject] = None,
+        directory: Optional[PathLike] = None,
+        origin: Optional[str] = None,
+        delay_ms: int = FILE_CHANGE_DEBOUNCE_MS,
+        lazy: bool = True,
+    ) -> EventSubscription:
+        """订阅数据文件的变化（参数见 subscribe_file_changes）"""
+        self.watch_kind(kind)
+        sub_id = self._next_id
+        self._next_id += 1
+        subscriber = _FileChangeSubscriber(
+            name, kind, callback, directory, origin, delay_ms, widget, lazy, widget
+        )
+        self._subscribers[sub_id] = subscriber
+        subscriber.destroyed.connect(lambda *_: self._subscribers.pop(sub_id, None))
+
+        def cancel():
+            removed = self._subscribers.pop(sub_id, None)
+            if removed is not None:
+                removed.stop()
+
+        return EventSubscription(name, cancel)
+
+    def check_now(self, kind: Optional[str] = None) -> None:
+        """立即比较目录快照并分发变化（kind 为 None 时检查全部目录）"""
+        for key, (dir_kind, _) in self._directories.items():
+            if kind is None or dir_kind == kind:
+                self._dirty.add(key)
+        self.scan()
+
+    def _on_path_changed(self, path: str) -> None:
+        key = _key(path)
+        if key not in self._directories:
+            key = _key(Path(path).parent)
+        if key not in self._directories:
+            return
+        self._dirty.add(key)
+        if not self._scan_timer.isActive():
+            self._scan_timer.start()
+
+    def scan(self) -> None:
+        """比较有通知的目录的快照，把变化交给订阅方"""
+        self._scan_timer.stop()
+        dirty, self._dirty = self._dirty, set()
+        changes: Dict[str, List[FileChange]] = {}
+        for key in dirty:
+            kind, directory = self._directories[key]
+            record_wakeup(f"file_change:{kind}")
+            self.stats["scans"] += 1
+            found = self.tracker.rescan(directory)
+            if found:
+                changes.setdefault(kind, []).extend(found)
+            # 原子写入替换文件后原来的文件监视失效，需要重新添加
+            self._watch_files(directory)
+        for subscriber in list(self._subscribers.values()):
+            found = changes.get(subscriber.kind)
+            if not found:
+                continue
+            try:
+                self.stats["suppressed"] += subscriber.offer(found)
+            except RuntimeError:
+                # 订阅方已随父对象销毁
+                continue
+
+    def _watch_files(self, directory: Path) -> None:
+        watched = set(self._watcher.files())
+        files = [
+            str(directory / name)
+            for name in scan_directory(directory)
+            if str(directory / name) not in watched
+        ]
+        if files:
+            self._watcher.addPaths(files)
+
+
+_file_change_service: Optional[FileChangeService] = None
+
+
+def get_file_change_service() -> FileChangeService:
+    """获取全局文件变化通知服务（须在主线程中调用）"""
+    global _file_change_service
+    if _file_change_service is None:
+        _file_change_service = FileChangeService()
+    return _file_change_service
+
+
+def subscribe_file_changes(
+    kind: str,
+    callback: Callable[[FileChangeEvent], None],
+    widget: Optional[QObject] = None,
+    directory: Optional[PathLike] = None,
+    origin: Optional[str] = None,
+    delay_ms: int = FILE_CHANGE_DEBOUNCE_MS,
+    lazy: bool = True,
+    name: Optional[str] = None,
+) -> EventSubscription:
+    """订阅某类数据文件的变化
+
+    Args:
+        kind: 数据类型（FILE_KIND_*）
+        callback: 回调函数 callback(FileChangeEvent)，在主线程中调用
+        widget: 订阅所属的组件，组件销毁时订阅随之取消
+        directory: 只关心该目录中的文件，None 表示该类型的全部目录
+        origin: 写入来源，完全由该来源的写入引起的变化不会分发给这个订阅
+        delay_ms: 防抖时间（毫秒），最后一次变化后等待该时间再分发
+        lazy: 为 True 且指定了 widget 时，组件隐藏期间的变化推迟到下次显示时分发
+        name: 订阅名称（用于日志和唤醒统计），默认使用 widget 的类名
+
+    Returns:
+        EventSubscription: 订阅对象
+    """
+    if name is None:
+        owner = type(widget).__name__ if widget is not None else "callback"
+        name = f"file_change:{kind}:{owner}"
+    return get_file_change_service().subscribe(
+        kind,
+        callback,
+        name,
+        widget=widget,
+        directory=directory,
+        origin=origin,
+        delay_ms=delay_ms,
+        lazy=lazy,
+    )
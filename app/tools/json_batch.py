@@ -0,0 +1,119 @@
+# ====================== 1. JSON 批量写入 ======================
+# - json_write_batch()     - 合并一段代码中的 JSON 文件写入，退出时每个文件只写一次
+# - read_pending()         - 读取当前线程批量中尚未写出的文件内容
+# - defer_write()          - 批量进行中时把写入暂存，由批量结束时统一写出
+# - in_write_batch()       - 当前线程是否处于批量写入中
+
+# ==================================================
+# 导入模块
+# ==================================================
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Tuple, Union
+
+from loguru import logger
+
+PathLike = Union[str, Path]
+Writer = Callable[[Any, Any], Any]
+
+
+# ==================================================
+# JSON 批量写入
+# ==================================================
+class _BatchState(threading.local):
+    def __init__(self):
+        self.depth = 0
+        self.pending: Dict[str, Tuple[Any, str, Writer]] = {}
+
+
+_state = _BatchState()
+
+
+def _key(path: PathLike) -> str:
+    return os.path.normcase(os.path.abspath(str(path)))
+
+
+def in_write_batch() -> bool:
+    """当前线程是否处于批量写入中"""
+    return _state.depth > 0
+
+
+def read_pending(path: PathLike, object_pairs_hook=None) -> Tuple[bool, Any]:
+    """读取当前线程批量中尚未写出的文件内容
+
+    每次都从暂存的 JSON 文本重新解析，修改返回的对象不影响暂存内容，修改后应再次写入。
+
+    Args:
+        path: 文件路径
+        object_pairs_hook: 传给 json.loads
+
+    Returns:
+        tuple: (是否有暂存内容, 暂存内容)
+    """
+    if not _state.depth:
+        return False, None
+    entry = _state.pending.get(_key(path))
+    if entry is None:
+        return False, None
+    return True, json.loads(entry[1], object_pairs_hook=object_pairs_hook)
+
+
+def defer_write(path: PathLike, data: Any, writer: Writer) -> bool:
+    """批量进行中时暂存一次写入
+
+    与 JsonStore.write 一样立即序列化，之后修改 data 不影响写入的内容。
+
+    Args:
+        path: 文件路径
+        data: 要写入的数据
+        writer: 实际写入函数 writer(path, data)，批量结束时调用
+
+    Returns:
+        bool: 已暂存返回True；不在批量中返回False，调用方应直接写入
+
+    Raises:
+        TypeError/ValueError: 数据无法序列化为 JSON
+    """
+    if not _state.depth:
+        return False
+    text = json.dumps(data, ensure_ascii=False)
+    _state.pending[_key(path)] = (path, text, writer)
+    return True
+
+
+@contextmanager
+def json_write_batch() -> Iterator[None]:
+    """合并一段代码中的 JSON 文件写入
+
+    批量中通过 read_pending() / defer_write() 接入的读写只作用于内存：读取得到最近一次
+    暂存的内容，写入只替换暂存内容。正常退出时每个文件按首次写入的顺序只写一次；
+    发生异常时丢弃全部暂存内容（所有文件保持批量开始前的状态）。
+    批量只对当前线程生效，可以嵌套，最外层退出时写出。
+    """
+    _state.depth += 1
+    committed = False
+    try:
+        yield
+        committed = True
+    finally:
+        _state.depth -= 1
+        if not _state.depth:
+            pending = _state.pending
+            _state.pending = {}
+            if committed:
+                _flush(pending)
+            elif pending:
+                logger.warning(
+                    f"批量写入中发生异常，已丢弃 {len(pending)} 个文件的修改"
+                )
+
+
+def _flush(pending: Dict[str, Tuple[Any, str, Writer]]) -> None:
+    for path, text, writer in pending.values():
+        try:
+            writer(path, json.loads(text))
+        except Exception as e:
+            logger.exception(f"批量写入文件失败 {path}: {e}")
@@ -0,0 +1,369 @@
+# ====================== 1. 原子写入 ======================
+# - atomic_write_text()          - 写临时文件、fsync 后重命名为目标文件
+# - recover_interrupted_writes() - 处理上次异常退出时遗留的临时文件
+# ====================== 2. JSON 写入服务 ======================
+# - JsonStore                    - 合并同一文件短时间内的多次写入，在后台线程中写出
+# - WriteListener                - 文件写出后的回调 (path, origins)
+# - get_json_store()             - 获取全局 JSON 写入服务
+# - write_json()                 - 写入 JSON 文件（经过批量写入和写入服务）
+# - read_json()                  - 读取 JSON 文件（优先返回尚未写出的内容）
+# - discard_pending_write()      - 丢弃尚未写出的内容（删除或重命名文件前调用）
+# - flush_json_writes()          - 立即写出全部待写内容（退出前和检查脚本使用）
+
+# ==================================================
+# 导入模块
+# ==================================================
+import atexit
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Union
+
+from loguru import logger
+
+from app.tools.json_batch import defer_write, read_pending
+from app.tools.path_utils import get_app_root
+from app.tools.variable import JSON_WRITE_COALESCE_MS, JSON_WRITE_TEMP_SUFFIX
+
+PathLike = Union[str, Path]
+# 文件写出后的回调：(文件路径, 写入来源)，来源中的 None 表示未注明来源的写入
+WriteListener = Callable[[Path, FrozenSet[Optional[str]]], None]
+
+
+# ==================================================
+# 原子写入
+# ==================================================
+def _temp_path(path: Path) -> Path:
+    return path.with_name(path.name + JSON_WRITE_TEMP_SUFFIX)
+
+
+def atomic_write_text(path: PathLike, text: str) -> None:
+    """原子地写入文本文件
+
+    先写入同目录下的临时文件并 fsync，再用 os.replace 替换目标文件。
+    写入过程中断电或进程被结束时，目标文件保持旧内容，不会被截断。
+
+    Args:
+        path: 目标文件路径
+        text: 文件内容
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = _temp_path(path)
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    if os.name == "posix":
+        # 重命名本身也要落盘
+        try:
+            dir_fd = os.open(str(path.parent), os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+
+
+def recover_interrupted_writes(directories: Optional[Iterable[PathLike]] = None) -> int:
+    """处理上次异常退出时遗留的临时文件
+
+    临时文件是完整的 JSON 且目标文件缺失或已损坏时，用临时文件恢复目标文件；
+    其它情况下目标文件才是最后一次完整写入的内容，直接删除临时文件。
+
+    Args:
+        directories: 要检查的目录，默认为应用的 config 和 data 目录
+
+    Returns:
+        int: 恢复的文件数量
+    """
+    if directories is None:
+        root = get_app_root()
+        directories = (root / "config", root / "data")
+    recovered = 0
+    for directory in directories:
+        if not os.path.isdir(directory):
+            continue
+        for dir_path, _, file_names in os.walk(directory):
+            for name in file_names:
+                if not name.endswith(JSON_WRITE_TEMP_SUFFIX):
+                    continue
+                temp_path = Path(dir_path) / name
+                target = temp_path.with_name(name[: -len(JSON_WRITE_TEMP_SUFFIX)])
+                try:
+                    if not _is_valid_json(target) and _is_valid_json(temp_path):
+                        os.replace(temp_path, target)
+                        recovered += 1
+                        logger.warning(f"已从未完成的写入中恢复文件: {target}")
+                    else:
+                        temp_path.unlink()
+                except OSError as e:
+                    logger.warning(f"处理遗留的临时文件失败 {temp_path}: {e}")
+    return recovered
+
+
+def _is_valid_json(path: Path) -> bool:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            json.load(f)
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+# ==================================================
+# JSON 写入服务
+# ==================================================
+class _PendingWrite:
+    __slots__ = ("path", "text", "deadline", "origins")
+
+    def __init__(
+        self,
+        path: Path,
+        text: str,
+        deadline: float,
+        origins: FrozenSet[Optional[str]],
+    ):
+        self.path = path
+        self.text = text
+        self.deadline = deadline
+        self.origins = origins
+
+
+def _key(path: PathLike) -> str:
+    return os.path.normcase(os.path.abspath(str(path)))
+
+
+class JsonStore:
+    """JSON 文件写入服务
+
+    - 每次写入先序列化为文本，放入待写队列；同一文件在 JSON_WRITE_COALESCE_MS 内的
+      多次写入合并为一次（以第一次写入的时间计算，连续写入时也不会无限推迟）；
+    - 后台线程到期后用 atomic_write_text 写出，同一时刻只写一个文件，保证写入顺序；
+    - 目标文件还不存在时立即写入，其它代码随后列目录或检查文件是否存在时能看到它；
+    - 尚未写出的内容可以通过 pending_text() 读取，read_json() 会优先使用它；
+    - 每次写出后通知 add_write_listener() 注册的回调，并带上合并进这次写出的
+      全部写入来源（origin），文件变化通知服务据此跳过写入方自己引起的变化。
+    """
+
+    def __init__(self, coalesce_ms: float = JSON_WRITE_COALESCE_MS):
+        self.coalesce_ms = max(0.0, float(coalesce_ms))
+        self._pending: Dict[str, _PendingWrite] = {}
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[WriteListener] = []
+        self.write_count = 0
+
+    def add_write_listener(self, listener: WriteListener) -> None:
+        """注册文件写出后的回调，回调可能在后台写入线程中调用"""
+        with self._cond:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def remove_write_listener(self, listener: WriteListener) -> None:
+        with self._cond:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def write(
+        self,
+        path: PathLike,
+        data: Any,
+        indent: Optional[int] = 4,
+        delay_ms: Optional[float] = None,
+        origin: Optional[str] = None,
+    ) -> None:
+        """写入 JSON 文件
+
+        Args:
+            path: 文件路径
+            data: 要写入的数据（立即序列化，之后修改 data 不影响写入的内容）
+            indent: 缩进
+            delay_ms: 合并写入的时间窗口，None 使用默认值，0 表示立即写入
+            origin: 写入来源，订阅文件变化时使用相同来源可以跳过自己引起的变化
+
+        Raises:
+            TypeError/ValueError: 数据无法序列化为 JSON
+            OSError: 立即写入时写文件失败
+        """
+        path = Path(path)
+        text = json.dumps(data, ensure_ascii=False, indent=indent)
+        key = _key(path)
+        delay = self.coalesce_ms if delay_ms is None else max(0.0, float(delay_ms))
+        now = time.monotonic()
+        with self._cond:
+            existing = self._pending.get(key)
+            if existing is None and not path.exists():
+                delay = 0.0
+            deadline = now + delay / 1000
+            origins = frozenset((origin,))
+            if existing is not None:
+                deadline = min(deadline, existing.deadline)
+                origins |= existing.origins
+            self._pending[key] = _PendingWrite(path, text, deadline, origins)
+            if delay > 0:
+                self._ensure_thread()
+                self._cond.notify()
+                return
+        self._write_entries([key], raise_errors=True)
+
+    def pending_text(self, path: PathLike) -> Optional[str]:
+        """尚未写出的文件内容，没有时返回 None"""
+        with self._cond:
+            entry = self._pending.get(_key(path))
+            return entry.text if entry is not None else None
+
+    def discard(self, path: PathLike) -> bool:
+        """丢弃尚未写出的内容
+
+        Returns:
+            bool: 是否有被丢弃的内容
+        """
+        with self._io_lock:
+            with self._cond:
+                return self._pending.pop(_key(path), None) is not None
+
+    def flush(self, path: Optional[PathLike] = None) -> None:
+        """立即写出待写内容（指定 path 时只写出该文件），返回时已写入磁盘"""
+        with self._cond:
+            if path is None:
+                keys = list(self._pending)
+            else:
+                keys = [_key(path)]
+        self._write_entries(keys)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="JsonStoreWriter", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                now = time.monotonic()
+                due = [k for k, e in self._pending.items() if e.deadline <= now]
+                if not due:
+                    wait = min(e.deadline for e in self._pending.values()) - now
+                    self._cond.wait(max(0.001, wait))
+                    continue
+            self._write_entries(due)
+
+    def _write_entries(self, keys, raise_errors: bool = False) -> None:
+        with self._io_lock:
+            for key in keys:
+                with self._cond:
+                    entry = self._pending.get(key)
+                if entry is None:
+                    continue
+                try:
+                    atomic_write_text(entry.path, entry.text)
+                    self.write_count += 1
+                except OSError as e:
+                    if raise_errors:
+                        with self._cond:
+                            if self._pending.get(key) is entry:
+                                del self._pending[key]
+                        raise
+                    logger.exception(f"写入文件失败 {entry.path}: {e}")
+                else:
+                    self._notify_listeners(entry)
+                with self._cond:
+                    # 写入期间可能又有新的内容，留给下一次写出
+                    if self._pending.get(key) is entry:
+                        del self._pending[key]
+
+    def _notify_listeners(self, entry: _PendingWrite) -> None:
+        with self._cond:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(entry.path, entry.origins)
+            except Exception as e:
+                logger.exception(f"写入回调执行失败 {entry.path}: {e}")
+
+
+_json_store: Optional[JsonStore] = None
+_json_store_lock = threading.Lock()
+
+
+def get_json_store() -> JsonStore:
+    """获取全局 JSON 写入服务，首次调用时注册退出时的写出"""
+    global _json_store
+    if _json_store is None:
+        with _json_store_lock:
+            if _json_store is None:
+                _json_store = JsonStore()
+                atexit.register(flush_json_writes)
+    return _json_store
+
+
+def write_json(
+    path: PathLike,
+    data: Any,
+    indent: Optional[int] = 4,
+    delay_ms: Optional[float] = None,
+    origin: Optional[str] = None,
+) -> None:
+    """写入 JSON 文件
+
+    在 json_write_batch() 中时暂存到批量，批量结束时再交给写入服务；
+    否则交给写入服务合并写出（参数见 JsonStore.write）。
+    """
+
+    def writer(p, d):
+        get_json_store().write(p, d, indent=indent, delay_ms=delay_ms, origin=origin)
+
+    if defer_write(path, data, writer):
+        return
+    writer(path, data)
+
+
+def read_json(path: PathLike, default: Any = None, object_pairs_hook=None) -> Any:
+    """读取 JSON 文件
+
+    依次使用当前线程批量中暂存的内容、写入服务中尚未写出的内容和文件内容。
+
+    Args:
+        path: 文件路径
+        default: 文件不存在时的返回值
+        object_pairs_hook: 传给 json.loads
+
+    Returns:
+        Any: 文件内容
+
+    Raises:
+        ValueError: 文件内容不是有效的 JSON
+        OSError: 读取文件失败
+    """
+    found, data = read_pending(path, object_pairs_hook=object_pairs_hook)
+    if found:
+        return data
+    text = get_json_store().pending_text(path)
+    if text is None:
+        if not os.path.exists(path):
+            return default
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+    return json.loads(text, object_pairs_hook=object_pairs_hook)
+
+
+def discard_pending_write(path: PathLike) -> None:
+    """丢弃尚未写出的内容，删除或重命名文件前调用，避免之后又被写回"""
+    if _json_store is not None:
+        _json_store.discard(path)
+
+
+def flush_json_writes() -> None:
+    """立即写出全部待写内容"""
+    if _json_store is not None:
+        _json_store.flush()
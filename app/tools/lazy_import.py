@@ -0,0 +1,274 @@
+# ====================== 1. 延迟导入 ======================
+# - lazy_import()          - 获取延迟导入的模块代理
+# - module_available()     - 检查（并按需加载）可选模块是否可用
+# - is_module_loaded()     - 检查模块是否已被真正导入
+
+# ====================== 2. 预热与审计 ======================
+# - preload_modules()               - 同步导入模块并记录耗时
+# - get_enabled_heavy_groups()      - 根据设置获取需要预热的子系统
+# - is_camera_preview_enabled()     - 摄像头预览页面是否启用
+# - prewarm_heavy_modules_async()   - 在后台线程中空闲预热重型子系统
+# - audit_startup_imports()         - 检查关键启动路径中是否导入了重型依赖
+
+# ==================================================
+# 导入模块
+# ==================================================
+import importlib
+import sys
+import threading
+import time
+import types
+from typing import Dict, Iterable, List, Optional
+
+from loguru import logger
+
+from app.tools.variable import (
+    HEAVY_MODULE_GROUPS,
+    STARTUP_FORBIDDEN_MODULES,
+)
+
+
+# ==================================================
+# 延迟导入模块代理
+# ==================================================
+class LazyModule(types.ModuleType):
+    """延迟导入的模块代理
+
+    首次访问属性时才真正导入目标模块，之后所有属性访问都直接转发给真实模块。
+    optional=True 时导入失败不会抛出异常，而是记录警告并标记为不可用，
+    与原先 ``try: import xxx except Exception: xxx = None`` 的写法等价。
+    """
+
+    def __init__(self, name: str, optional: bool = False):
+        super().__init__(name)
+        object.__setattr__(self, "_lazy_name", name)
+        object.__setattr__(self, "_lazy_optional", bool(optional))
+        object.__setattr__(self, "_lazy_module", None)
+        object.__setattr__(self, "_lazy_failed", False)
+        object.__setattr__(self, "_lazy_lock", threading.RLock())
+
+    def _lazy_load(self) -> Optional[types.ModuleType]:
+        """导入真实模块，失败时按 optional 决定是否抛出异常"""
+        module = object.__getattribute__(self, "_lazy_module")
+        if module is not None:
+            return module
+        if object.__getattribute__(self, "_lazy_failed"):
+            return None
+
+        with object.__getattribute__(self, "_lazy_lock"):
+            module = object.__getattribute__(self, "_lazy_module")
+            if module is not None:
+                return module
+            name = object.__getattribute__(self, "_lazy_name")
+            start = time.perf_counter()
+            try:
+                module = importlib.import_module(name)
+            except Exception as e:
+                if not object.__getattribute__(self, "_lazy_optional"):
+                    raise
+                object.__setattr__(self, "_lazy_failed", True)
+                logger.warning(f"{name} 不可用: {e}")
+                return None
+            object.__setattr__(self, "_lazy_module", module)
+            logger.debug(
+                f"延迟导入模块 {name} 完成，耗时 {(time.perf_counter() - start) * 1000:.1f}ms"
+            )
+            return module
+
+    def __getattr__(self, attr: str):
+        module = self._lazy_load()
+        if module is None:
+            name = object.__getattribute__(self, "_lazy_name")
+            raise ImportError(f"模块 {name} 不可用，无法访问属性 {attr}")
+        return getattr(module, attr)
+
+    def __setattr__(self, attr: str, value) -> None:
+        module = self._lazy_load()
+        if module is None:
+            object.__setattr__(self, attr, value)
+            return
+        setattr(module, attr, value)
+
+    def __dir__(self) -> List[str]:
+        module = self._lazy_load()
+        return dir(module) if module is not None else []
+
+    def __repr__(self) -> str:
+        name = object.__getattribute__(self, "_lazy_name")
+        module = object.__getattribute__(self, "_lazy_module")
+        state = "loaded" if module is not None else "pending"
+        return f"<LazyModule '{name}' ({state})>"
+
+
+_lazy_modules: Dict[str, LazyModule] = {}
+_lazy_modules_lock = threading.Lock()
+
+
+def lazy_import(name: str, optional: bool = False) -> LazyModule:
+    """获取延迟导入的模块代理
+
+    Args:
+        name: 模块完整名称，如 "numpy"、"edge_tts.exceptions"
+        optional: 导入失败时是否视为可选依赖（不抛出异常）
+
+    Returns:
+        LazyModule: 模块代理，同名模块共享同一个代理实例
+    """
+    with _lazy_modules_lock:
+        proxy = _lazy_modules.get(name)
+        if proxy is None:
+            proxy = LazyModule(name, optional=optional)
+            _lazy_modules[name] = proxy
+        return proxy
+
+
+def module_available(module) -> bool:
+    """检查可选模块是否可用
+
+    对延迟导入的代理会触发真实导入；对 None 返回 False。
+
+    Args:
+        module: 模块对象、LazyModule 代理或 None
+
+    Returns:
+        bool: 模块是否可用
+    """
+    if module is None:
+        return False
+    if isinstance(module, LazyModule):
+        return module._lazy_load() is not None
+    return True
+
+
+def is_module_loaded(name: str) -> bool:
+    """检查模块是否已被真正导入（存在于 sys.modules 中）
+
+    Args:
+        name: 模块名称
+
+    Returns:
+        bool: 是否已导入
+    """
+    return name in sys.modules
+
+
+# ==================================================
+# 预热与审计
+# ==================================================
+def preload_modules(names: Iterable[str]) -> Dict[str, float]:
+    """同步导入一组模块并记录每个模块的耗时
+
+    Args:
+        names: 模块名称列表
+
+    Returns:
+        Dict[str, float]: 模块名到导入耗时（毫秒）的映射，已导入的模块耗时为 0
+    """
+    timings: Dict[str, float] = {}
+    for name in names:
+        if is_module_loaded(name):
+            timings[name] = 0.0
+            continue
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            logger.debug(f"预热模块 {name} 失败: {e}")
+            continue
+        timings[name] = (time.perf_counter() - start) * 1000
+    return timings
+
+
+def get_enabled_heavy_groups() -> List[str]:
+    """根据当前设置获取需要空闲预热的重型子系统
+
+    Returns:
+        List[str]: 子系统名称列表（HEAVY_MODULE_GROUPS 的键）
+    """
+    from app.tools.settings_access import readme_settings_async
+
+    groups: List[str] = []
+    try:
+        if readme_settings_async("basic_voice_settings", "voice_enable"):
+            groups.append("voice")
+    except Exception:
+        pass
+    if is_camera_preview_enabled():
+        groups.append("camera")
+    return groups
+
+
+def is_camera_preview_enabled() -> bool:
+    """摄像头预览页面是否在侧边栏中启用（位置为 2 表示隐藏）
+
+    Returns:
+        bool: 是否启用
+    """
+    from app.tools.settings_access import readme_settings_async
+
+    try:
+        position = readme_settings_async(
+            "sidebar_management_window", "camera_preview_sidebar_position"
+        )
+    except Exception:
+        return True
+    return position is None or position != 2
+
+
+_prewarm_thread: Optional[threading.Thread] = None
+
+
+def prewarm_heavy_modules_async(groups: Optional[Iterable[str]] = None) -> bool:
+    """在后台线程中预热重型子系统的依赖
+
+    应在主窗口显示后的空闲时间调用，只预热已启用的子系统，
+    未启用的子系统仍在首次真正使用时才加载。
+
+    Args:
+        groups: 需要预热的子系统名称，为 None 时根据设置自动判断
+
+    Returns:
+        bool: 是否启动了预热线程
+    """
+    global _prewarm_thread
+
+    if _prewarm_thread is not None and _prewarm_thread.is_alive():
+        return False
+
+    if groups is None:
+        groups = get_enabled_heavy_groups()
+
+    names: List[str] = []
+    for group in groups:
+        for name in HEAVY_MODULE_GROUPS.get(group, ()):
+            if name not in names and not is_module_loaded(name):
+                names.append(name)
+    if not names:
+        return False
+
+    def worker() -> None:
+        timings = preload_modules(names)
+        total = sum(timings.values())
+        logger.debug(f"重型依赖空闲预热完成，共 {len(timings)} 个，耗时 {total:.1f}ms")
+
+    _prewarm_thread = threading.Thread(
+        target=worker, daemon=True, name="HeavyModulePrewarm"
+    )
+    _prewarm_thread.start()
+    return True
+
+
+def audit_startup_imports(
+    forbidden: Optional[Iterable[str]] = None,
+) -> List[str]:
+    """检查当前进程中是否已导入禁止出现在关键启动路径上的重型依赖
+
+    Args:
+        forbidden: 禁止的顶层包名列表，默认为 STARTUP_FORBIDDEN_MODULES
+
+    Returns:
+        List[str]: 已被导入的禁止包名，为空表示审计通过
+    """
+    if forbidden is None:
+        forbidden = STARTUP_FORBIDDEN_MODULES
+    return [name for name in forbidden if is_module_loaded(name)]
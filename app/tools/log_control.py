@@ -0,0 +1,360 @@
+# ====================== 1. 日志等级 ======================
+# - configured_log_level()   - 当前配置的日志等级（可用环境变量覆盖）
+# - set_log_level()          - 记录已配置的最低日志等级
+# - log_enabled()            - 某个等级的日志是否会被写出（热点路径先判断再拼接）
+# ====================== 2. 高频日志采样 ======================
+# - LogSampler               - 同一类日志在一段时间内只记录一次，其余只计数
+# - log_sampled()            - 使用全局采样器记录日志
+# ====================== 3. 后台写日志 ======================
+# - QueuedLogSink            - 有界队列 + 后台线程写出的 loguru 输出目标
+# - add_queued_file_sink()   - 添加在后台线程写入的日志文件
+# - add_queued_stream_sink() - 添加在后台线程写入的输出流（控制台）
+# - flush_log_queues()       - 等待所有后台日志写完（退出前调用）
+# - get_queued_sinks()       - 当前所有后台写日志的输出目标（诊断和基准使用）
+
+# ==================================================
+# 导入模块
+# ==================================================
+import copy
+import os
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from loguru import logger
+
+from app.tools.variable import (
+    DEFAULT_LOG_LEVEL,
+    LOG_LEVEL_ENV,
+    LOG_QUEUE_FLUSH_TIMEOUT_S,
+    LOG_QUEUE_MAX_MESSAGES,
+    LOG_SAMPLE_INTERVAL_S,
+)
+
+# 日志文件中每行的格式，与 loguru 文件输出的默认格式一致（日志查看窗口按此解析等级）
+LOG_FILE_FORMAT = (
+    "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | "
+    "{name}:{function}:{line} - {message}"
+)
+
+# 队列已满时，不低于该等级的日志挤掉最早的一条，低于该等级的直接丢弃
+_KEEP_LEVEL_NO = 30  # WARNING
+
+# 在 configure_logging() 之前不过滤任何等级
+_min_level_no = 0
+_level_nos: Dict[str, int] = {}
+
+
+# ==================================================
+# 日志等级
+# ==================================================
+def configured_log_level() -> str:
+    """当前配置的日志等级，设置了 SECRANDOM_LOG_LEVEL 时使用该值"""
+    level = os.environ.get(LOG_LEVEL_ENV, "").strip().upper()
+    if not level:
+        return DEFAULT_LOG_LEVEL
+    try:
+        logger.level(level)
+    except ValueError:
+        return DEFAULT_LOG_LEVEL
+    return level
+
+
+def set_log_level(level: str) -> None:
+    """记录已配置的最低日志等级，供 log_enabled() 判断"""
+    global _min_level_no
+    _min_level_no = logger.level(level).no
+
+
+def log_enabled(level: str = "DEBUG") -> bool:
+    """某个等级的日志是否会被写出
+
+    loguru 在没有输出目标接受该等级时不会格式化消息，但 f-string 在调用前就已拼接。
+    抽取、IPC 等热点路径中需要额外计算的日志应先用本函数判断，
+    其余日志使用 logger.debug("... {}", value) 的写法延迟格式化。
+    """
+    level_no = _level_nos.get(level)
+    if level_no is None:
+        level_no = _level_nos[level] = logger.level(level).no
+    return level_no >= _min_level_no
+
+
+# ==================================================
+# 高频日志采样
+# ==================================================
+class LogSampler:
+    """同一类日志在 interval_s 秒内只记录一次，其余只计数
+
+    用于摄像头每帧、IPC 轮询等可能持续出现的日志：第一次立即记录，
+    之后每个间隔记录一次，并附上期间省略的条数。
+    """
+
+    def __init__(self, interval_s: float = LOG_SAMPLE_INTERVAL_S):
+        self.interval_s = interval_s
+        self.stats: Counter = Counter()  # 每类日志被省略的总条数
+        self._last: Dict[str, float] = {}
+        self._suppressed: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def log(
+        self,
+        key: str,
+        level: str,
+        message: str,
+        *args,
+        exception: bool = False,
+        depth: int = 0,
+    ) -> bool:
+        """记录一条采样日志
+
+        Args:
+            key: 日志类别，同一类别共享间隔和计数
+            level: 日志等级
+            message: 消息，使用 {} 占位
+            *args: 占位参数
+            exception: 是否附带当前异常的堆栈
+            depth: 记录调用位置时额外跳过的栈帧数
+
+        Returns:
+            bool: 本次是否写出了日志
+        """
+        if not log_enabled(level):
+            return False
+        now = time.monotonic()
+        with self._lock:
+            last = self._last.get(key)
+            if last is not None and now - last < self.interval_s:
+                self._suppressed[key] += 1
+                self.stats[key] += 1
+                return False
+            self._last[key] = now
+            suppressed = self._suppressed.pop(key, 0)
+        if suppressed:
+            message = f"{message}（此前省略 {{}} 条）"
+            args = (*args, suppressed)
+        logger.opt(exception=exception, depth=depth + 1).log(level, message, *args)
+        return True
+
+    def reset(self, key: str) -> None:
+        """清除某类日志的状态，下一次立即记录"""
+        with self._lock:
+            self._last.pop(key, None)
+            self._suppressed.pop(key, None)
+
+
+_sampler = LogSampler()
+
+
+def log_sampled(key: str, level: str, message: str, *args, exception=False) -> bool:
+    """使用全局采样器记录日志，参数同 LogSampler.log()"""
+    return _sampler.log(key, level, message, *args, exception=exception, depth=1)
+
+
+def get_log_sampler() -> LogSampler:
+    """获取全局日志采样器"""
+    return _sampler
+
+
+# ==================================================
+# 后台写日志
+# ==================================================
+class QueuedLogSink:
+    """有界队列 + 后台线程写出的 loguru 输出目标
+
+    loguru 在调用方线程中格式化消息后交给 write()，这里只放入队列就返回，
+    文件和控制台的写入在后台线程完成，不阻塞界面线程。
+    队列最多缓存 max_messages 条：已满时 WARNING 以下的新日志直接丢弃，
+    WARNING 及以上的日志挤掉最早的一条；丢弃的条数会在之后写出一条汇总。
+    """
+
+    def __init__(
+        self,
+        write: Callable[[str], None],
+        close: Optional[Callable[[], None]] = None,
+        name: str = "log",
+        max_messages: int = LOG_QUEUE_MAX_MESSAGES,
+    ):
+        """
+        Args:
+            write: 在后台线程中写出已格式化的日志（可能是多条合并后的文本）
+            close: 停止时调用，用于关闭文件
+            name: 后台线程名称
+            max_messages: 队列最多缓存的条数
+        """
+        self.name = name
+        self.max_messages = max_messages
+        self.stats: Counter = Counter()
+        self._write = write
+        self._close = close
+        self._queue: deque = deque()
+        self._dropped = 0
+        self._busy = False
+        self._stopping = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name=f"{name}-writer", daemon=True
+        )
+        self._thread.start()
+        _queued_sinks.append(self)
+
+    def write(self, message) -> None:
+        """loguru 调用：把格式化后的日志放入队列"""
+        with self._cond:
+            if self._stopping:
+                return
+            if len(self._queue) >= self.max_messages:
+                if message.record["level"].no < _KEEP_LEVEL_NO:
+                    self._dropped += 1
+                    self.stats["dropped"] += 1
+                    return
+                self._queue.popleft()
+                self._dropped += 1
+                self.stats["dropped"] += 1
+            self._queue.append(str(message))
+            self.stats["queued"] += 1
+            if len(self._queue) == 1:
+                # 队列原本为空时后台线程可能在等待，之后的日志由同一批写出
+                self._cond.notify_all()
+
+    def pending(self) -> int:
+        """尚未写出的条数"""
+        with self._cond:
+            return len(self._queue) + (1 if self._busy else 0)
+
+    def drain(self, timeout: float = LOG_QUEUE_FLUSH_TIMEOUT_S) -> bool:
+        """等待队列中的日志全部写出
+
+        Returns:
+            bool: 是否在超时前写完
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self) -> None:
+        """loguru 移除输出目标时调用：写完队列中的日志后结束后台线程"""
+        with self._cond:
+            if self._stopping:
+                return
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join(LOG_QUEUE_FLUSH_TIMEOUT_S)
+        if self in _queued_sinks:
+            _queued_sinks.remove(self)
+        if self._close is not None:
+            try:
+                self._close()
+            except Exception:
+                pass
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopping:
+                    self._cond.wait()
+                if not self._queue and self._stopping:
+                    return
+                batch = list(self._queue)
+                self._queue.clear()
+                dropped, self._dropped = self._dropped, 0
+                self._busy = True
+            if dropped:
+                batch.insert(0, _dropped_summary(dropped))
+            try:
+                # 一批日志合并为一次写入，减少后台线程占用 GIL 的时间
+                self._write("".join(batch))
+                self.stats["written"] += len(batch)
+            except Exception:
+                # 写日志失败时不能再通过 logger 报告，只计数
+                self.stats["write_errors"] += 1
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+
+_queued_sinks: List[QueuedLogSink] = []
+
+
+def _dropped_summary(count: int) -> str:
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    return (
+        f"{now} | WARNING  | {__name__}:_run:0 - 日志队列已满，丢弃了 {count} 条日志\n"
+    )
+
+
+def add_queued_file_sink(
+    path, level: str, rotation=None, retention=None, compression=None, **options
+) -> int:
+    """添加在后台线程写入的日志文件
+
+    文件的轮转、保留仍由 loguru 完成：后台线程使用一个独立的 logger 副本，
+    以原样输出的方式写入已格式化的日志。必须在添加其它输出目标之前调用
+    （loguru 只能复制没有输出目标的 logger）。
+
+    Args:
+        path: 日志文件路径，可包含 loguru 的时间占位符
+        level: 日志等级
+        rotation: 轮转条件
+        retention: 保留条件
+        compression: 压缩格式
+        **options: 其余传给 logger.add() 的选项（backtrace、diagnose 等）
+
+    Returns:
+        int: 输出目标 ID
+    """
+    file_logger = copy.deepcopy(logger)
+    file_logger.remove()
+    file_logger.add(
+        path,
+        format=LOG_FILE_FORMAT,
+        level=0,
+        rotation=rotation,
+        retention=retention,
+        compression=compression,
+    )
+    raw = file_logger.opt(raw=True)
+    sink = QueuedLogSink(
+        lambda message: raw.log(level, message),
+        close=file_logger.remove,
+        name="log-file",
+    )
+    return logger.add(sink, format=LOG_FILE_FORMAT, level=level, **options)
+
+
+def add_queued_stream_sink(stream, level: str, **options) -> int:
+    """添加在后台线程写入的输出流（控制台）
+
+    Returns:
+        int: 输出目标 ID
+    """
+
+    def write(message):
+        stream.write(message)
+        stream.flush()
+
+    return logger.add(QueuedLogSink(write, name="log-stream"), level=level, **options)
+
+
+def flush_log_queues(timeout: float = LOG_QUEUE_FLUSH_TIMEOUT_S) -> bool:
+    """等待所有后台日志写完（os._exit 不会等待后台线程，退出前调用）
+
+    Returns:
+        bool: 是否在超时前全部写完
+    """
+    deadline = time.monotonic() + timeout
+    done = True
+    for sink in list(_queued_sinks):
+        done = sink.drain(max(0.0, deadline - time.monotonic())) and done
+    return done
+
+
+def get_queued_sinks() -> List[QueuedLogSink]:
+    """当前所有后台写日志的输出目标（诊断和基准使用）"""
+    return list(_queued_sinks)
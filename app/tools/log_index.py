@@ -0,0 +1,232 @@
+# ====================== 1. 日志行解析 ======================
+# - LOG_LEVEL_VALUES          - 日志等级及其数值（越大越严重）
+# - log_line_level()          - 获取一行日志的等级
+# - is_log_line_visible()     - 一行日志在当前过滤条件下是否显示
+# ====================== 2. 行索引 ======================
+# - LogScanCancelled          - 建立索引或过滤被取消
+# - scan_line_ends()          - 用内存映射为文件的新增内容建立行索引
+# - filter_log_lines()        - 按等级和隐藏关键词过滤已建立索引的行
+# - read_log_lines()          - 按行范围读取日志内容
+# - read_log_tail()           - 直接读取文件末尾的若干行（索引建立前先显示）
+
+# ==================================================
+# 导入模块
+# ==================================================
+import mmap
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, compress, repeat
+from operator import add
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from app.tools.variable import LOG_INDEX_CHUNK_BYTES
+
+PathLike = Union[str, Path]
+
+# 日志等级及其数值
+LOG_LEVEL_VALUES = {"DEBUG": 0, "INFO": 1, "WARNING": 2, "ERROR": 3, "CRITICAL": 4}
+# 日志查看窗口中不显示包含这些关键词的行（英文不区分大小写）
+HIDDEN_LOG_KEYWORDS = ("内幕", "behind")
+
+# 日志格式：时间戳 | 等级(8字符左对齐) | 模块:函数:行号 - 消息
+_LEVEL_TEXT = re.compile(r" \| (DEBUG|INFO|WARNING|ERROR|CRITICAL) +\| ")
+_LEVEL_BYTES = re.compile(rb" \| (DEBUG|INFO|WARNING|ERROR|CRITICAL) +\| ")
+_HIDDEN_TEXT = re.compile(
+    "|".join(re.escape(k) for k in HIDDEN_LOG_KEYWORDS), re.IGNORECASE
+)
+_HIDDEN_BYTES = re.compile(
+    b"|".join(re.escape(k.encode("utf-8")) for k in HIDDEN_LOG_KEYWORDS),
+    re.IGNORECASE,
+)
+_LEVEL_BYTE_VALUES = {k.encode(): v for k, v in LOG_LEVEL_VALUES.items()}
+
+
+# ==================================================
+# 日志行解析
+# ==================================================
+def log_line_level(line: str) -> Optional[str]:
+    """获取一行日志的等级，没有等级标记（如异常堆栈的后续行）时返回 None"""
+    match = _LEVEL_TEXT.search(line)
+    return match.group(1) if match else None
+
+
+def is_log_line_visible(line: str, min_level: int = 0) -> bool:
+    """一行日志在当前过滤条件下是否显示
+
+    包含隐藏关键词的行不显示；等级低于 min_level 的行不显示；
+    没有等级标记的行总是显示。
+    """
+    if _HIDDEN_TEXT.search(line):
+        return False
+    if min_level <= 0:
+        return True
+    level = log_line_level(line)
+    return level is None or LOG_LEVEL_VALUES[level] >= min_level
+
+
+def _decode(data: bytes) -> str:
+    return data.decode("utf-8", errors="replace").rstrip("\r\n")
+
+
+# ==================================================
+# 行索引
+# ==================================================
+class LogScanCancelled(Exception):
+    """建立索引或过滤被取消"""
+
+
+def _check_cancel(cancel: Optional[threading.Event]) -> None:
+    if cancel is not None and cancel.is_set():
+        raise LogScanCancelled()
+
+
+def scan_line_ends(
+    path: PathLike, start: int = 0, cancel: Optional[threading.Event] = None
+) -> array:
+    """为文件从 start 开始的新增内容建立行索引
+
+    按 LOG_INDEX_CHUNK_BYTES 分段处理内存映射的内容，每段之间检查是否取消。
+    映射只在本次调用期间打开，不影响日志轮转和清空日志。
+
+    Args:
+        path: 日志文件路径
+        start: 起始位置，应为上一次建立索引的最后一个行尾
+        cancel: 取消标志
+
+    Returns:
+        array: 每个完整行的结束位置（换行符之后），末尾没有换行符的行不计入
+
+    Raises:
+        LogScanCancelled: 已取消
+        ValueError: 文件比 start 短（被清空或轮转）
+    """
+    ends = array("Q")
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < start:
+            raise ValueError(f"日志文件已被截断: {path}")
+        if size == start:
+            return ends
+        with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+            pos = start
+            while pos < size:
+                _check_cancel(cancel)
+                chunk_end = min(pos + LOG_INDEX_CHUNK_BYTES, size)
+                parts = mm[pos:chunk_end].split(b"\n")
+                # 各行长度加换行符累加得到行尾位置，全部在 C 层完成
+                chunk_ends = accumulate(
+                    map(add, map(len, parts[:-1]), repeat(1)), initial=pos
+                )
+                next(chunk_ends)
+                ends.extend(chunk_ends)
+                pos = chunk_end
+    return ends
+
+
+def _line_chunks(bounds: Sequence[int]) -> Iterator[Tuple[int, int]]:
+    """把行分为约 LOG_INDEX_CHUNK_BYTES 字节的若干段，每段从行首开始"""
+    count = len(bounds) - 1
+    first = 0
+    while first < count:
+        target = bounds[first] + LOG_INDEX_CHUNK_BYTES
+        last = max(first + 1, min(count, bisect_right(bounds, target) - 1))
+        yield first, last
+        first = last
+
+
+def filter_log_lines(
+    path: PathLike,
+    bounds: Sequence[int],
+    first_line: int = 0,
+    min_level: int = 0,
+    cancel: Optional[threading.Event] = None,
+) -> array:
+    """按等级和隐藏关键词过滤已建立索引的行，规则同 is_log_line_visible()
+
+    用正则在内存映射的内容上查找隐藏关键词和等级标记，再按行尾位置定位到行，
+    不需要逐行解码。
+
+    Args:
+        path: 日志文件路径
+        bounds: 行边界，第 first_line + k 行为 bounds[k] 到 bounds[k + 1]
+        first_line: bounds 中第一行的行号
+        min_level: 最低显示等级（LOG_LEVEL_VALUES 中的值）
+        cancel: 取消标志
+
+    Returns:
+        array: 显示的行号
+
+    Raises:
+        LogScanCancelled: 已取消
+    """
+    count = len(bounds) - 1
+    if count <= 0:
+        return array("I")
+    keep = bytearray(b"\x01") * count
+    with (
+        open(path, "rb") as f,
+        mmap.mmap(f.fileno(), bounds[-1], access=mmap.ACCESS_READ) as mm,
+    ):
+        for first, last in _line_chunks(bounds):
+            _check_cancel(cancel)
+            begin, end = bounds[first], bounds[last]
+            for match in _HIDDEN_BYTES.finditer(mm, begin, end):
+                keep[bisect_right(bounds, match.start(), first, last + 1) - 1] = 0
+            if min_level <= 0:
+                continue
+            previous = -1
+            for match in _LEVEL_BYTES.finditer(mm, begin, end):
+                line = bisect_right(bounds, match.start(), first, last + 1) - 1
+                if line == previous:
+                    # 每行只看第一个等级标记
+                    continue
+                previous = line
+                if _LEVEL_BYTE_VALUES[match.group(1)] < min_level:
+                    keep[line] = 0
+    return array("I", compress(range(first_line, first_line + count), keep))
+
+
+def read_log_lines(path: PathLike, spans: Iterable[Tuple[int, int]]) -> List[str]:
+    """按字节范围读取日志行（视图只读取当前需要显示的行）
+
+    Args:
+        path: 日志文件路径
+        spans: 每行的 (起始位置, 结束位置)
+
+    Returns:
+        list: 解码后的行（去掉换行符）
+    """
+    lines = []
+    with open(path, "rb") as f:
+        for begin, end in spans:
+            f.seek(begin)
+            lines.append(_decode(f.read(end - begin)))
+    return lines
+
+
+def read_log_tail(path: PathLike, max_bytes: int) -> Tuple[List[str], int]:
+    """直接读取文件末尾的若干行，用于在索引建立完成前先显示
+
+    Args:
+        path: 日志文件路径
+        max_bytes: 最多读取的字节数
+
+    Returns:
+        tuple: (末尾的完整行, 文件大小)
+    """
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        start = max(0, size - max_bytes)
+        f.seek(start)
+        data = f.read(size - start)
+    if start > 0:
+        # 丢弃被截断的第一行
+        data = data[data.find(b"\n") + 1 :] if b"\n" in data else b""
+    lines = data.split(b"\n")
+    if lines and not lines[-1]:
+        lines.pop()
+    return [_decode(line) for line in lines], size
@@ -0,0 +1,380 @@
+# ====================== 1. 快照 ======================
+# - MemorySnapshot            - 某一时刻的内存状态
+# - count_qt_objects()        - 按类名统计存活的窗口部件和 QObject
+# - collect_cache_sizes()     - 结果显示、背景、图标等缓存的条目数
+# - take_memory_snapshot()    - 采集一次快照
+# ====================== 2. 增长报告 ======================
+# - compare_snapshots()       - 两次快照之间增长最多的分配位置和对象类型
+# - format_memory_report()    - 文本报告
+# ====================== 3. 定时监控 ======================
+# - MemoryMonitor             - 按间隔采集快照并记录增长
+# - memory_monitor_interval() - 环境变量中配置的采样间隔，未开启时为 0
+# - start_memory_monitor()    - 开启时启动全局监控（主程序启动时调用）
+# - get_memory_monitor()      - 获取全局监控，未开启时为 None
+
+# ==================================================
+# 导入模块
+# ==================================================
+import gc
+import linecache
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from PySide6.QtCore import QObject, QTimer
+from PySide6.QtWidgets import QApplication
+
+from app.tools.path_utils import get_app_root
+from app.tools.variable import (
+    MEMORY_MONITOR_ENV,
+    MEMORY_MONITOR_HISTORY,
+    MEMORY_MONITOR_INTERVAL_S,
+    MEMORY_MONITOR_TOP_N,
+    MEMORY_MONITOR_TRACE_FRAMES,
+)
+
+# 不计入增长报告的分配位置（tracemalloc、输出报告时读取的源码行和导入机制本身）
+_TRACE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, linecache.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+# ==================================================
+# 快照
+# ==================================================
+@dataclass(slots=True)
+class MemorySnapshot:
+    """某一时刻的内存状态"""
+
+    taken_at: float  # time.monotonic()
+    rss: Optional[int]  # 进程常驻内存（字节），无法获取时为 None
+    traced: int  # tracemalloc 统计的 Python 分配（字节），未开启时为 0
+    python_objects: int  # 垃圾回收器跟踪的对象数
+    widgets: Counter = field(default_factory=Counter)
+    qobjects: Counter = field(default_factory=Counter)
+    caches: Dict[str, int] = field(default_factory=dict)
+    trace: Optional[tracemalloc.Snapshot] = None
+
+
+def count_qt_objects() -> tuple:
+    """按类名统计存活的窗口部件和 QObject（需要在 GUI 线程中调用）
+
+    窗口部件取自 QApplication.allWidgets()，包括已隐藏但没有销毁的部件；
+    QObject 为应用和各顶层窗口的对象树中的全部对象（定时器、动画、布局等）。
+
+    Returns:
+        tuple: (窗口部件计数, QObject 计数)
+    """
+    app = QApplication.instance()
+    if app is None:
+        return Counter(), Counter()
+    widgets = Counter(type(w).__name__ for w in QApplication.allWidgets())
+    qobjects = Counter()
+    for root in (app, *QApplication.topLevelWidgets()):
+        qobjects[type(root).__name__] += 1
+        qobjects.update(type(obj).__name__ for obj in root.findChildren(QObject))
+    return widgets, qobjects
+
+
+def collect_cache_sizes() -> Dict[str, int]:
+    """结果显示、背景、图标等缓存的条目数
+
+    只读取已经导入的模块，不会为了统计而导入界面模块。
+    """
+    sizes = {}
+    result_display = sys.modules.get("app.common.display.result_display")
+    if result_display is not None:
+        utils = result_display.ResultDisplayUtils
+        pools = list(utils._cell_pools)
+        sizes["avatar_images"] = len(utils._avatar_cache)
+        sizes["result_colors"] = len(utils._color_cache)
+        sizes["result_cells_idle"] = sum(pool._idle_count for pool in pools)
+        sizes["result_cells_active"] = sum(len(pool.active) for pool in pools)
+        sizes["result_cells_created"] = sum(pool.created_count for pool in pools)
+    background_render = sys.modules.get("app.common.display.background_render")
+    if background_render is not None:
+        cache = background_render._background_render_cache
+        sizes["background_images"] = len(cache._items) if cache is not None else 0
+    personalised = sys.modules.get("app.tools.personalised")
+    if personalised is not None:
+        sizes["icons"] = len(personalised._icon_cache)
+    return sizes
+
+
+def _process_rss() -> Optional[int]:
+    try:
+        import psutil
+
+        return psutil.Process(os.getpid()).memory_info().rss
+    except Exception:
+        return None
+
+
+def take_memory_snapshot(
+    collect: bool = True, include_trace: bool = True
+) -> MemorySnapshot:
+    """采集一次快照（需要在 GUI 线程中调用）
+
+    Args:
+        collect: 采集前是否先执行一次垃圾回收，避免把尚未回收的对象计为增长
+        include_trace: tracemalloc 已开启时是否保存分配位置（用于增长报告），
+            保存时 traced 只统计没有被过滤掉的分配
+
+    Returns:
+        MemorySnapshot: 快照
+    """
+    if collect:
+        gc.collect()
+    widgets, qobjects = count_qt_objects()
+    # 先读取 RSS：首次读取时导入 psutil 的分配要落在本次快照中，而不是计入下一次的增长
+    rss = _process_rss()
+    trace = None
+    traced = 0
+    if tracemalloc.is_tracing():
+        if include_trace:
+            trace = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+            traced = sum(stat.size for stat in trace.statistics("filename"))
+        else:
+            traced = tracemalloc.get_traced_memory()[0]
+    return MemorySnapshot(
+        taken_at=time.monotonic(),
+        rss=rss,
+        traced=traced,
+        python_objects=len(gc.get_objects()),
+        widgets=widgets,
+        qobjects=qobjects,
+        caches=collect_cache_sizes(),
+        trace=trace,
+    )
+
+
+# ==================================================
+# 增长报告
+# ==================================================
+def _short_path(filename: str) -> str:
+    root = str(get_app_root())
+    if filename.startswith(root):
+        return os.path.relpath(filename, root)
+    marker = os.sep + "site-packages" + os.sep
+    index = filename.rfind(marker)
+    return filename[index + len(marker) :] if index >= 0 else filename
+
+
+def _counter_growth(before: Counter, after: Counter, top: int) -> Dict[str, int]:
+    growth = after.copy()
+    growth.subtract(before)
+    return {name: n for name, n in growth.most_common(top) if n > 0}
+
+
+def compare_snapshots(
+    before: MemorySnapshot, after: MemorySnapshot, top: int = MEMORY_MONITOR_TOP_N
+) -> Dict[str, Any]:
+    """两次快照之间的增长
+
+    Args:
+        before: 较早的快照
+        after: 较晚的快照
+        top: 列出增长最多的分配位置和对象类型的数量
+
+    Returns:
+        dict: 可以直接写入 JSON 的报告
+    """
+    report = {
+        "elapsed_s": round(after.taken_at - before.taken_at, 1),
+        "rss": after.rss,
+        "rss_delta": (
+            after.rss - before.rss
+            if after.rss is not None and before.rss is not None
+            else None
+        ),
+        "traced": after.traced,
+        "traced_delta": after.traced - before.traced,
+        "python_objects": after.python_objects,
+        "python_objects_delta": after.python_objects - before.python_objects,
+        "widgets": sum(after.widgets.values()),
+        "widgets_delta": sum(after.widgets.values()) - sum(before.widgets.values()),
+        "qobjects": sum(after.qobjects.values()),
+        "qobjects_delta": sum(after.qobjects.values()) - sum(before.qobjects.values()),
+        "widget_growth": _counter_growth(before.widgets, after.widgets, top),
+        "qobject_growth": _counter_growth(before.qobjects, after.qobjects, top),
+        "caches": {
+            name: {"size": size, "delta": size - before.caches.get(name, 0)}
+            for name, size in after.caches.items()
+        },
+        "top_allocations": [],
+    }
+    if before.trace is not None and after.trace is not None:
+        for stat in after.trace.compare_to(before.trace, "lineno")[:top]:
+            if stat.size_diff <= 0:
+                continue
+            frame = stat.traceback[0]
+            report["top_allocations"].append(
+                {
+                    "site": f"{_short_path(frame.filename)}:{frame.lineno}",
+                    "size_delta": stat.size_diff,
+                    "count_delta": stat.count_diff,
+                }
+            )
+    return report
+
+
+def _format_bytes(value: Optional[int]) -> str:
+    if value is None:
+        return "-"
+    return f"{value / 1024 / 1024:+.2f}MB" if value else "0"
+
+
+def format_memory_report(report: Dict[str, Any]) -> str:
+    """把增长报告格式化为文本"""
+    summary = f"内存增长（{report['elapsed_s']}s）: "
+    if report["rss"] is not None:
+        summary += (
+            f"RSS {report['rss'] / 1024 / 1024:.1f}MB "
+            f"({_format_bytes(report['rss_delta'])})，"
+        )
+    summary += (
+        f"Python 分配 {_format_bytes(report['traced_delta'])}，"
+        f"对象 {report['python_objects_delta']:+d}，"
+        f"窗口部件 {report['widgets']} ({report['widgets_delta']:+d})，"
+        f"QObject {report['qobjects']} ({report['qobjects_delta']:+d})"
+    )
+    lines = [summary]
+    if report["widget_growth"]:
+        growth = ", ".join(f"{k}+{v}" for k, v in report["widget_growth"].items())
+        lines.append(f"  窗口部件增长: {growth}")
+    if report["qobject_growth"]:
+        growth = ", ".join(f"{k}+{v}" for k, v in report["qobject_growth"].items())
+        lines.append(f"  QObject 增长: {growth}")
+    caches = ", ".join(
+        f"{name}={item['size']}({item['delta']:+d})"
+        for name, item in report["caches"].items()
+    )
+    if caches:
+        lines.append(f"  缓存: {caches}")
+    for item in report["top_allocations"]:
+        lines.append(
+            f"  {item['site']}: {item['size_delta'] / 1024:+.1f}KB "
+            f"({item['count_delta']:+d} 块)"
+        )
+    return "\n".join(lines)
+
+
+# ==================================================
+# 定时监控
+# ==================================================
+class MemoryMonitor(QObject):
+    """按间隔采集快照，记录与上一次相比增长最多的分配位置和对象类型
+
+    启动时开启 tracemalloc（之后所有 Python 分配都会变慢），因此只在
+    设置了 SECRANDOM_MEMORY_MONITOR 时使用。报告写入日志，并保留最近
+    MEMORY_MONITOR_HISTORY 份，导出诊断数据时附带。
+    """
+
+    def __init__(
+        self,
+        interval_s: float = MEMORY_MONITOR_INTERVAL_S,
+        top: int = MEMORY_MONITOR_TOP_N,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.interval_s = interval_s
+        self.top = top
+        self._reports: deque = deque(maxlen=MEMORY_MONITOR_HISTORY)
+        self._baseline: Optional[MemorySnapshot] = None
+        self._previous: Optional[MemorySnapshot] = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(int(interval_s * 1000))
+        self._timer.timeout.connect(self.sample)
+
+    def start(self) -> None:
+        """开启 tracemalloc，采集基准快照并开始定时采样"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(MEMORY_MONITOR_TRACE_FRAMES)
+        self._previous = take_memory_snapshot()
+        self._baseline = self._previous
+        self._timer.start()
+        logger.info("内存监控已开启，每 {} 秒采样一次", self.interval_s)
+
+    def stop(self) -> None:
+        """停止定时采样（不关闭 tracemalloc）"""
+        self._timer.stop()
+
+    def sample(self) -> Dict[str, Any]:
+        """采集一次快照并记录与上一次相比的增长
+
+        Returns:
+            dict: 本次的增长报告，另含 since_start（与基准快照相比的总量变化）
+        """
+        snapshot = take_memory_snapshot()
+        if self._previous is None:
+            self._previous = self._baseline = snapshot
+        report = compare_snapshots(self._previous, snapshot, self.top)
+        baseline = self._baseline
+        report["time"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        report["since_start"] = {
+            "elapsed_s": round(snapshot.taken_at - baseline.taken_at, 1),
+            "rss_delta": (
+                snapshot.rss - baseline.rss
+                if snapshot.rss is not None and baseline.rss is not None
+                else None
+            ),
+            "traced_delta": snapshot.traced - baseline.traced,
+            "widgets_delta": sum(snapshot.widgets.values())
+            - sum(baseline.widgets.values()),
+            "qobjects_delta": sum(snapshot.qobjects.values())
+            - sum(baseline.qobjects.values()),
+        }
+        # 分配位置只用于和下一次比较，比较完即释放（包括基准快照），避免长期占用内存
+        self._previous.trace = None
+        self._previous = snapshot
+        self._reports.append(report)
+        logger.info("{}", format_memory_report(report))
+        return report
+
+    def reports(self) -> List[Dict[str, Any]]:
+        """最近的增长报告（从早到晚）"""
+        return list(self._reports)
+
+
+_monitor: Optional[MemoryMonitor] = None
+
+
+def memory_monitor_interval() -> float:
+    """环境变量中配置的采样间隔（秒），未开启时为 0"""
+    value = os.environ.get(MEMORY_MONITOR_ENV, "").strip()
+    if not value or value.lower() in ("0", "false", "off", "no"):
+        return 0.0
+    try:
+        interval = float(value)
+    except ValueError:
+        return float(MEMORY_MONITOR_INTERVAL_S)
+    return interval if interval > 0 else 0.0
+
+
+def start_memory_monitor() -> Optional[MemoryMonitor]:
+    """设置了 SECRANDOM_MEMORY_MONITOR 时启动全局内存监控（在 GUI 线程中调用）
+
+    Returns:
+        Optional[MemoryMonitor]: 未开启时为 None
+    """
+    global _monitor
+    interval = memory_monitor_interval()
+    if interval <= 0 or _monitor is not None:
+        return _monitor
+    _monitor = MemoryMonitor(interval)
+    _monitor.start()
+    return _monitor
+
+
+def get_memory_monitor() -> Optional[MemoryMonitor]:
+    """获取全局内存监控，未开启时为 None"""
+    return _monitor
@@ -11,6 +11,7 @@ from loguru import logger
 from app.tools.variable import *
 from app.tools.path_utils import *
 from app.tools.settings_access import *
+from app.tools.json_store import read_json
 from app.core.font_manager import get_font_weight_file, FONT_FAMILY_DEFAULT
 
 
@@ -63,10 +64,9 @@ def _get_font_family_setting(settings_path) -> str:
         return ""
 
     try:
-        with open_file(settings_path, "r", encoding="utf-8") as f:
-            settings = json.load(f)
-            personal_settings = settings.get("personal", {})
-            return personal_settings.get("font_family", "")
+        settings = read_json(settings_path)
+        personal_settings = settings.get("personal", {})
+        return personal_settings.get("font_family", "")
     except Exception as e:
         logger.exception(f"读取字体设置失败: {e}")
         return ""
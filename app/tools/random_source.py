@@ -0,0 +1,331 @@
+# ====================== 1. 随机源 ======================
+# - BufferedSystemRandom   - 按块读取系统熵并缓冲的 CSPRNG
+# - SeededRandom           - 由种子确定的 CSPRNG（BLAKE2b 计数器模式）
+
+# ====================== 2. 随机数服务 ======================
+# - get_random()                  - 获取当前应使用的随机数生成器
+# - get_display_random()          - 获取仅用于显示效果的随机数生成器
+# - draw_session()                - 为一次抽取建立随机数会话（可记录种子）
+# - set_deterministic_seed()      - 切换到确定性随机源（测试/基准/模拟）
+# - is_deterministic()            - 当前是否为确定性模式
+# - set_draw_seed_logging()       - 开关抽取种子记录
+# - get_draw_seed_log()           - 获取最近的抽取种子记录
+
+# ==================================================
+# 导入模块
+# ==================================================
+import hashlib
+import os
+import random
+import struct
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from loguru import logger
+
+from app.tools.variable import (
+    DRAW_SEED_LOG_ENV,
+    DRAW_SEED_LOG_SIZE,
+    RANDOM_ENTROPY_BLOCK_SIZE,
+    RANDOM_SEED_BYTES,
+    RANDOM_SEED_ENV,
+)
+
+SeedType = Union[int, str, bytes]
+
+_RECIP_BPF = 2.0**-53
+_BLAKE2B_BLOCK_SIZE = 64
+
+
+# ==================================================
+# 随机源
+# ==================================================
+class BufferedSystemRandom(random.Random):
+    """按块读取系统熵并缓冲的 CSPRNG
+
+    与 SystemRandom 一样，所有随机数都直接来自操作系统的 CSPRNG（os.urandom），
+    区别在于每次读取 RANDOM_ENTROPY_BLOCK_SIZE 字节并预先解码为 64 位整数，
+    避免每生成一个随机数都进行一次系统调用。缓冲区中的每个字只使用一次，
+    取字操作依赖列表迭代器在 GIL 下的原子性，多线程共享时无需加锁。
+    """
+
+    def __init__(self, block_size: int = RANDOM_ENTROPY_BLOCK_SIZE):
+        block_size = max(_BLAKE2B_BLOCK_SIZE, int(block_size))
+        self._block_words = (block_size + 7) // 8
+        self._words: Iterator[int] = iter(())
+        self._lock = threading.Lock()
+        super().__init__()
+
+    def _refill(self, size: int) -> bytes:
+        """读取至少 size 字节的新随机字节"""
+        return os.urandom(size)
+
+    def _refill_words(self, exhausted: Iterator[int]) -> None:
+        with self._lock:
+            if self._words is not exhausted:
+                return
+            size = self._block_words * 8
+            data = self._refill(size)[:size]
+            self._words = iter(struct.unpack(f"<{self._block_words}Q", data))
+
+    def _next_word(self) -> int:
+        while True:
+            words = self._words
+            try:
+                return next(words)
+            except StopIteration:
+                self._refill_words(words)
+
+    def reset_buffer(self) -> None:
+        """丢弃已缓冲的随机数（fork 后子进程必须调用，避免与父进程复用）"""
+        with self._lock:
+            self._words = iter(())
+
+    def random(self) -> float:
+        return (self._next_word() >> 11) * _RECIP_BPF
+
+    def getrandbits(self, k: int) -> int:
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        if k == 0:
+            return 0
+        if k <= 64:
+            return self._next_word() >> (64 - k)
+        numwords = (k + 63) // 64
+        x = 0
+        for _ in range(numwords):
+            x = (x << 64) | self._next_word()
+        return x >> (numwords * 64 - k)
+
+    def randbytes(self, n: int) -> bytes:
+        numwords = (n + 7) // 8
+        data = b"".join(
+            self._next_word().to_bytes(8, "little") for _ in range(numwords)
+        )
+        return data[:n]
+
+    def seed(self, *args, **kwds) -> None:
+        """系统熵源无需播种，与 SystemRandom 一致忽略该调用"""
+        return None
+
+    def _notimplemented(self, *args, **kwds):
+        raise NotImplementedError("Entropy source does not have state.")
+
+    getstate = setstate = _notimplemented
+
+
+class SeededRandom(BufferedSystemRandom):
+    """由种子确定的 CSPRNG
+
+    以种子作为 BLAKE2b 的密钥，对递增计数器求摘要生成随机字节流。
+    相同种子总是产生相同的序列，可用于复现某次抽取；
+    种子本身来自系统熵源时，输出仍具有密码学强度。
+    """
+
+    def __init__(self, seed: SeedType, block_size: int = RANDOM_ENTROPY_BLOCK_SIZE):
+        self._key = _normalize_seed(seed)
+        self._counter = 0
+        super().__init__(block_size)
+
+    @property
+    def seed_hex(self) -> str:
+        return self._key.hex()
+
+    def _refill(self, size: int) -> bytes:
+        blocks = []
+        for _ in range((size + _BLAKE2B_BLOCK_SIZE - 1) // _BLAKE2B_BLOCK_SIZE):
+            blocks.append(
+                hashlib.blake2b(
+                    self._counter.to_bytes(16, "big"),
+                    key=self._key,
+                    digest_size=_BLAKE2B_BLOCK_SIZE,
+                ).digest()
+            )
+            self._counter += 1
+        return b"".join(blocks)
+
+    def reset_buffer(self) -> None:
+        """确定性随机源的序列由种子和计数器决定，fork 后无需丢弃"""
+        return None
+
+
+def _normalize_seed(seed: SeedType) -> bytes:
+    """将种子统一转换为 BLAKE2b 可用的密钥（1~64 字节）
+
+    十六进制字符串按字节解析（与种子记录中的格式一致），其他字符串按 UTF-8 编码。
+    """
+    if isinstance(seed, bool):
+        seed = int(seed)
+    if isinstance(seed, int):
+        if seed < 0:
+            raise ValueError("seed must be non-negative")
+        key = seed.to_bytes(max(1, (seed.bit_length() + 7) // 8), "big")
+    elif isinstance(seed, str):
+        text = seed.strip()
+        try:
+            key = bytes.fromhex(text) if len(text) % 2 == 0 else b""
+        except ValueError:
+            key = b""
+        if not key:
+            key = text.encode("utf-8")
+    elif isinstance(seed, (bytes, bytearray)):
+        key = bytes(seed)
+    else:
+        raise TypeError(f"不支持的种子类型: {type(seed).__name__}")
+
+    if not key:
+        key = b"\x00"
+    if len(key) > _BLAKE2B_BLOCK_SIZE:
+        key = hashlib.blake2b(key, digest_size=_BLAKE2B_BLOCK_SIZE).digest()
+    return key
+
+
+# ==================================================
+# 随机数服务
+# ==================================================
+@dataclass(frozen=True, slots=True)
+class DrawSeedRecord:
+    """一次抽取使用的随机种子"""
+
+    kind: str
+    seed: str
+    timestamp: float
+    context: Dict[str, Any] = field(default_factory=dict)
+
+
+_production_source = BufferedSystemRandom()
+_deterministic_source: Optional[SeededRandom] = None
+_seed_log_enabled = False
+_seed_log: deque = deque(maxlen=DRAW_SEED_LOG_SIZE)
+_state_lock = threading.Lock()
+_local = threading.local()
+
+
+def get_random() -> random.Random:
+    """获取当前应使用的随机数生成器
+
+    在 draw_session 内返回本次抽取的生成器；否则在确定性模式下返回种子随机源，
+    生产环境返回缓冲的系统 CSPRNG。
+
+    Returns:
+        random.Random: 随机数生成器
+    """
+    rng = getattr(_local, "draw_rng", None)
+    if rng is not None:
+        return rng
+    source = _deterministic_source
+    return source if source is not None else _production_source
+
+
+def get_display_random() -> random.Random:
+    """获取仅用于显示效果的随机数生成器
+
+    用于不影响抽取结果的随机选择（如小组模式下显示的随机成员），始终返回
+    缓冲的系统 CSPRNG，不消耗确定性模式或抽取会话的种子序列，
+    因此是否显示结果不会改变之后抽取的复现结果。
+
+    Returns:
+        random.Random: 随机数生成器
+    """
+    return _production_source
+
+
+@contextmanager
+def draw_session(
+    kind: str, seed: Optional[SeedType] = None, **context: Any
+) -> Iterator[random.Random]:
+    """为一次抽取建立随机数会话
+
+    会话内（同一线程）所有通过 get_random() 获取的随机数都来自同一个生成器。
+    开启种子记录、处于确定性模式或显式传入 seed 时，本次抽取使用独立种子的
+    SeededRandom，并记录种子；之后传入同一种子即可完全复现这次抽取。
+    嵌套调用时沿用外层会话的生成器。
+
+    Args:
+        kind: 抽取类型，如 "roll_call"、"lottery"
+        seed: 指定种子（用于复现），为 None 时自动生成
+        **context: 记录到种子日志中的附加信息
+
+    Yields:
+        random.Random: 本次抽取使用的随机数生成器
+    """
+    outer = getattr(_local, "draw_rng", None)
+    if outer is not None:
+        yield outer
+        return
+
+    if seed is None and not _seed_log_enabled and _deterministic_source is None:
+        rng: random.Random = _production_source
+    else:
+        if seed is None:
+            seed = get_random().randbytes(RANDOM_SEED_BYTES)
+        rng = SeededRandom(seed)
+        record = DrawSeedRecord(
+            kind=kind, seed=rng.seed_hex, timestamp=time.time(), context=context
+        )
+        _seed_log.append(record)
+        if _seed_log_enabled:
+            logger.info(f"抽取随机种子 [{kind}] {record.seed} {context}")
+
+    _local.draw_rng = rng
+    try:
+        yield rng
+    finally:
+        _local.draw_rng = None
+
+
+def set_deterministic_seed(seed: Optional[SeedType]) -> None:
+    """切换到确定性随机源，seed 为 None 时恢复系统 CSPRNG
+
+    仅用于测试、基准测试和模拟，正式抽取不应启用。
+
+    Args:
+        seed: 主种子
+    """
+    global _deterministic_source
+    with _state_lock:
+        _deterministic_source = SeededRandom(seed) if seed is not None else None
+    if seed is not None:
+        logger.warning(f"已启用确定性随机源，主种子: {_deterministic_source.seed_hex}")
+
+
+def is_deterministic() -> bool:
+    """当前是否为确定性模式"""
+    return _deterministic_source is not None
+
+
+def set_draw_seed_logging(enabled: bool) -> None:
+    """开关抽取种子记录
+
+    Args:
+        enabled: 是否为每次抽取生成独立种子并记录到日志
+    """
+    global _seed_log_enabled
+    _seed_log_enabled = bool(enabled)
+
+
+def get_draw_seed_log() -> List[DrawSeedRecord]:
+    """获取最近的抽取种子记录（旧记录在前）"""
+    return list(_seed_log)
+
+
+def _reset_after_fork() -> None:
+    _production_source.reset_buffer()
+
+
+def _init_from_environment() -> None:
+    seed = os.environ.get(RANDOM_SEED_ENV, "").strip()
+    if seed:
+        set_deterministic_seed(seed)
+    if os.environ.get(DRAW_SEED_LOG_ENV, "").strip() in ("1", "true", "True"):
+        set_draw_seed_logging(True)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+_init_from_environment()
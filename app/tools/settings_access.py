@@ -16,6 +16,7 @@ from typing import Any
 from app.tools.variable import *
 from app.tools.path_utils import *
 from app.tools.settings_default import *
+from app.tools.json_store import get_json_store, read_json, write_json
 
 
 # ==================================================
@@ -45,19 +46,15 @@ class SettingsReaderWorker(QObject):
     def _read_setting_value(self):
         """从设置文件或默认设置中读取值"""
         settings_path = get_settings_path()
-        if file_exists(settings_path):
-            try:
-                with open_file(settings_path, "r", encoding="utf-8") as f:
-                    settings_data = json.load(f)
-                    if (
-                        self.first_level_key in settings_data
-                        and self.second_level_key in settings_data[self.first_level_key]
-                    ):
-                        return settings_data[self.first_level_key][
-                            self.second_level_key
-                        ]
-            except (json.JSONDecodeError, KeyError):
-                pass
+        try:
+            settings_data = read_json(settings_path, default={})
+            if (
+                self.first_level_key in settings_data
+                and self.second_level_key in settings_data[self.first_level_key]
+            ):
+                return settings_data[self.first_level_key][self.second_level_key]
+        except (json.JSONDecodeError, KeyError):
+            pass
         return self._get_default_value()
 
     def _get_default_value(self):
@@ -144,20 +141,24 @@ def readme_settings(first_level_key: str, second_level_key: str):
     """
     try:
         settings_path = get_settings_path()
-        if file_exists(settings_path):
-            with open_file(settings_path, "r", encoding="utf-8") as f:
-                content = f.read()
-                if not content or not content.strip():
-                    logger.warning(f"设置文件为空: {settings_path}")
-                else:
-                    settings_data = json.loads(content)
-                    if (
-                        first_level_key in settings_data
-                        and second_level_key in settings_data[first_level_key]
-                    ):
-                        value = settings_data[first_level_key][second_level_key]
-                        # logger.debug(f"从设置文件读取: {first_level_key}.{second_level_key} = {value}")
-                        return value
+        pending_text = get_json_store().pending_text(settings_path)
+        if pending_text is not None or file_exists(settings_path):
+            if pending_text is not None:
+                content = pending_text
+            else:
+                with open_file(settings_path, "r", encoding="utf-8") as f:
+                    content = f.read()
+            if not content or not content.strip():
+                logger.warning(f"设置文件为空: {settings_path}")
+            else:
+                settings_data = json.loads(content)
+                if (
+                    first_level_key in settings_data
+                    and second_level_key in settings_data[first_level_key]
+                ):
+                    value = settings_data[first_level_key][second_level_key]
+                    # logger.debug(f"从设置文件读取: {first_level_key}.{second_level_key} = {value}")
+                    return value
 
         default_setting = _get_default_setting(first_level_key, second_level_key)
         if isinstance(default_setting, dict) and "default_value" in default_setting:
@@ -227,11 +228,8 @@ def update_settings(first_level_key: str, second_level_key: str, value: Any):
         # 确保设置目录存在
         ensure_dir(settings_path.parent)
 
-        # 读取现有设置
-        settings_data = {}
-        if file_exists(settings_path):
-            with open_file(settings_path, "r", encoding="utf-8") as f:
-                settings_data = json.load(f)
+        # 读取现有设置（包括尚未写出的修改）
+        settings_data = read_json(settings_path, default={})
 
         # 更新设置
         if first_level_key not in settings_data:
@@ -240,9 +238,8 @@ def update_settings(first_level_key: str, second_level_key: str, value: Any):
         # 直接保存值，不保存嵌套结构
         settings_data[first_level_key][second_level_key] = value
 
-        # 写入设置文件
-        with open_file(settings_path, "w", encoding="utf-8") as f:
-            json.dump(settings_data, f, ensure_ascii=False, indent=4)
+        # 写入设置文件（短时间内的多次修改合并为一次写入）
+        write_json(settings_path, settings_data)
 
         if (
             not first_level_key == "user_info"
@@ -256,6 +253,11 @@ def update_settings(first_level_key: str, second_level_key: str, value: Any):
         get_settings_signals().settingChanged.emit(
             first_level_key, second_level_key, value
         )
+
+        # 推送给 IPC 事件订阅者（没有订阅者时直接返回）
+        from app.common.IPC_URL.event_stream import publish_setting_changed
+
+        publish_setting_changed(first_level_key, second_level_key, value)
     except Exception as e:
         logger.exception(f"设置更新失败: {e}")
 
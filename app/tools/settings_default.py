@@ -6,13 +6,13 @@
 使用层级结构组织设置项，第一层为分类，第二层为具体设置项
 """
 
-import json
 import platform
 import ctypes
 from loguru import logger
 
 from app.tools.variable import *
 from app.tools.path_utils import *
+from app.tools.json_store import read_json, write_json
 from app.tools.settings_default_storage import *
 
 Language = DEFAULT_LANGUAGE
@@ -85,13 +85,11 @@ def manage_settings_file():
                             second_level_value["default_value"]
                         )
 
-            with open_file(settings_file, "w", encoding="utf-8") as f:
-                json.dump(flat_settings, f, indent=4, ensure_ascii=False)
+            write_json(settings_file, flat_settings)
             return
 
         try:
-            with open_file(settings_file, "r", encoding="utf-8") as f:
-                current_settings = json.load(f)
+            current_settings = read_json(settings_file)
         except Exception as e:
             logger.exception(f"读取设置文件失败: {e}，将重新创建默认设置文件")
             flat_settings = {}
@@ -104,8 +102,7 @@ def manage_settings_file():
                             second_level_value["default_value"]
                         )
 
-            with open_file(settings_file, "w", encoding="utf-8") as f:
-                json.dump(flat_settings, f, indent=4, ensure_ascii=False)
+            write_json(settings_file, flat_settings)
             return
 
         # 检查并更新设置文件
@@ -177,8 +174,7 @@ def manage_settings_file():
 
         if settings_updated:
             # logger.debug("设置文件已更新")
-            with open_file(settings_file, "w", encoding="utf-8") as f:
-                json.dump(updated_settings, f, indent=4, ensure_ascii=False)
+            write_json(settings_file, updated_settings)
         else:
             # logger.debug("设置文件已是最新，无需更新")
             pass
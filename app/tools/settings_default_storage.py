@@ -17,6 +17,9 @@ DEFAULT_SETTINGS = {
         "is_maximized": {"default_value": False},
         "pre_maximized_width": {"default_value": 800},
         "pre_maximized_height": {"default_value": 600},
+        "preload_memory_budget_mb": {
+            "default_value": SETTINGS_PRELOAD_MEMORY_BUDGET_MB
+        },
     },
     "float_position": {
         "height": {"default_value": "screen_height_half"},
@@ -353,6 +356,7 @@ DEFAULT_SETTINGS = {
         "notification_floating_window_background_brightness": {"default_value": 10},
         "notification_floating_window_background_blur_enable": {"default_value": False},
         "notification_floating_window_background_blur_radius": {"default_value": 15},
+        "animation_max_fps": {"default_value": BACKGROUND_ANIMATION_MAX_FPS},
     },
     "history_management": {
         "show_roll_call_history": {"default_value": True},
@@ -144,6 +144,9 @@ class URLHandler(QObject):
             self.url_ipc_handler.register_message_handler(
                 "url", self._handle_ipc_url_message
             )
+            self.url_ipc_handler.register_message_handler(
+                "batch", self._handle_ipc_batch_message
+            )
             return True
         if self._probe_existing_ipc_server():
             logger.debug("检测到IPC服务器已存在，跳过启动")
@@ -278,6 +281,19 @@ class URLHandler(QObject):
         else:
             return {"success": False, "error": "缺少URL参数"}
 
+    def _handle_ipc_batch_message(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        处理IPC批量命令消息
+
+        payload 格式: {"commands": [...], "atomic": bool, "stop_on_error": bool}
+        """
+        commands = payload.get("commands") or []
+        return self.command_handler.handle_batch(
+            commands,
+            atomic=bool(payload.get("atomic", False)),
+            stop_on_error=bool(payload.get("stop_on_error", False)),
+        )
+
     def send_url_to_existing_instance(self, url: str) -> bool:
         """
         发送URL到已存在的实例
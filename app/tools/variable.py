@@ -219,6 +219,11 @@ DEFAULT_NAME_FORMAT = (
 # -------------------- 日志模块配置 --------------------
 LOG_ROTATION_SIZE = "1 MB"  # 日志文件轮转大小
 LOG_RETENTION_DAYS = "30 days"  # 日志保留天数
+LOG_LEVEL_ENV = "SECRANDOM_LOG_LEVEL"  # 设置后覆盖默认的日志等级（如 INFO）
+DEFAULT_LOG_LEVEL = "DEBUG"  # 默认日志等级
+LOG_QUEUE_MAX_MESSAGES = 10000  # 后台写日志队列最多缓存的条数，满后按等级丢弃
+LOG_QUEUE_FLUSH_TIMEOUT_S = 2.0  # 退出前等待后台写完日志的最长时间（秒）
+LOG_SAMPLE_INTERVAL_S = 10.0  # 高频日志在该时间内只记录一次，其余只计数（秒）
 
 # -------------------- 语言模块配置 --------------------
 LANGUAGE_ZH_CN = "ZH_CN"  # 中文
@@ -229,6 +234,13 @@ LANGUAGE_MODULE_DIR = "app/Language/modules"  # 模块化语言文件路径
 # -------------------- 共享内存配置 --------------------
 SHARED_MEMORY_KEY = "SecRandomSharedMemory"  # 共享内存键名
 
+# -------------------- 随机数模块配置 --------------------
+RANDOM_ENTROPY_BLOCK_SIZE = 4096  # 每次从系统熵源读取的字节数
+RANDOM_SEED_BYTES = 32  # 单次抽取随机种子的字节数
+DRAW_SEED_LOG_SIZE = 256  # 内存中保留的抽取种子记录条数
+RANDOM_SEED_ENV = "SECRANDOM_RANDOM_SEED"  # 设置后使用确定性随机源（测试/基准/模拟）
+DRAW_SEED_LOG_ENV = "SECRANDOM_LOG_DRAW_SEEDS"  # 设为 1 时记录每次抽取的随机种子
+
 
 # ==================================================
 # 页面与组件配置
@@ -276,11 +288,25 @@ SUPPORTED_IMAGE_EXTENSIONS = [
     ".webp",
     ".gif",
 ]  # 支持的图片扩展名
+AVATAR_PIXMAP_CACHE_SIZE = 128  # 已缩放头像图片 LRU 缓存的最大条目数
+
+# 对象池相关
+RESULT_CELL_POOL_MAX_IDLE = 64  # 每个结果网格最多保留的空闲单元格数量
+RESULT_CELL_POOL_TRIM_IDLE = 16  # 内存清理后每个结果网格保留的空闲单元格数量
+
+# 动画帧相关
+ANIMATION_FRAME_BUFFER_SIZE = 64  # 预计算动画帧环形缓冲区容量
+ANIMATION_FRAME_REFILL_THRESHOLD = 16  # 剩余帧数低于该值时在后台补充
 
 # 格式化相关
 STUDENT_ID_FORMAT = "{num:02}"  # 学号格式化字符串
 NAME_SPACING = "    "  # 姓名之间的间距
 
+# -------------------- 计时器页面配置 --------------------
+COUNTDOWN_WARNING_MS = 10_000  # 倒计时剩余多少毫秒时进入警告状态
+COUNTDOWN_SMOOTH_INTERVAL_MS = 33  # 警告阶段、秒表毫秒等平滑刷新的帧间隔（毫秒）
+CLOCK_BOUNDARY_MARGIN_MS = 5  # 时钟模式在整秒之后多等待的时间（毫秒）
+
 # -------------------- 贡献者页面配置 --------------------
 CONTRIBUTOR_CARD_MIN_WIDTH = 250  # 贡献者卡片最小宽度
 CONTRIBUTOR_MAX_COLUMNS = 12  # 贡献者页面最大列数限制
@@ -297,6 +323,9 @@ STUDENT_MAX_COLUMNS = 8  # 学生页面最大列数限制
 STUDENT_CARD_SPACING = 15  # 学生卡片间距
 STUDENT_CARD_MARGIN = 12  # 学生卡片内边距
 STUDENT_AVATAR_RADIUS = 50  # 学生头像半径
+STUDENT_GROUP_CARD_HEIGHT = 150  # 小组卡片固定高度
+STUDENT_CARD_RADIUS = 8  # 学生卡片圆角半径
+REMAINING_LIST_BATCH_SIZE = 100  # 剩余名单分批布局时每批的条目数
 
 
 # ==================================================
@@ -310,15 +339,164 @@ FONT_APPLY_DELAY = 0  # 字体应用延迟时间(毫秒)
 APPLY_DELAY = 0  # 应用延迟时间(毫秒)
 EXIT_CODE_RESTART = 1000  # 重启应用程序的退出代码
 
+# -------------------- 延迟导入配置 --------------------
+# 各重型子系统依赖的第三方包，首次真正使用或主窗口显示后空闲预热时才加载
+HEAVY_MODULE_GROUPS = {
+    "voice": (
+        "numpy",
+        "psutil",
+        "sounddevice",
+        "soundfile",
+        "pyttsx3",
+        "edge_tts",
+    ),
+    "camera": ("numpy", "cv2"),
+    "import": ("pandas",),
+}
+# 禁止在关键启动路径（主窗口显示前）导入的第三方包
+# （不含 numpy：qfluentwidgets.common.image_utils 在导入时就会加载它）
+STARTUP_FORBIDDEN_MODULES = (
+    "edge_tts",
+    "psutil",
+    "pyttsx3",
+    "sounddevice",
+    "soundfile",
+    "cv2",
+    "pandas",
+)
+HEAVY_MODULE_PREWARM_DELAY_MS = 3000  # 主窗口显示后空闲预热重型依赖的延迟（毫秒）
+
 # -------------------- 设置页面预热配置 --------------------
 SETTINGS_WARMUP_INTERVAL_MS = 800  # 后台预热设置页面的默认时间间隔（毫秒）
 SETTINGS_WARMUP_MAX_PRELOAD = 1  # 后台预热设置页面的默认最大预热页数
+SETTINGS_PRELOAD_MEMORY_BUDGET_MB = 64  # 已构建页面的内存预算（MB），0 为不预加载
+SETTINGS_PRELOAD_IDLE_MS = 1500  # 没有输入多久后才在后台构建下一个页面（毫秒）
+SETTINGS_PRELOAD_STEP_INTERVAL_MS = 200  # 两次后台构建之间的间隔（毫秒）
+SETTINGS_PRELOAD_COST_OUTLIER_RATIO = 4  # 单次测量与历史平均值最多相差的倍数
+SETTINGS_PRELOAD_DEFAULT_PAGE_COST_KB = 8 * 1024  # 未测量过的页面的内存占用估计（KB）
+SETTINGS_PRELOAD_WIDGET_COST_KB = 24  # 无法读取进程内存时每个控件的内存占用估计（KB）
+SETTINGS_PRELOAD_USAGE_DECAY = 0.97  # 每次页面访问时其它页面访问分数的衰减系数
+SETTINGS_PRELOAD_MIN_SCORE = 0.5  # 访问分数低于该值的页面不预加载
 
 # -------------------- 窗口管理配置 --------------------
 PRE_CLASS_RESET_INTERVAL_MS = 1000  # 课前重置定时器间隔（毫秒）
 RESIZE_TIMER_DELAY_MS = 500  # 窗口大小变化保存延迟（毫秒）
 MAXIMIZE_RESTORE_DELAY_MS = 100  # 最大化恢复延迟（毫秒）
 
+# -------------------- 事件调度配置 --------------------
+BOUNDARY_TIMER_MARGIN_MS = 500  # 时间边界定时器在边界之后多等待的时间（毫秒）
+BOUNDARY_TIMER_MAX_INTERVAL_MS = 10 * 60 * 1000  # 时间边界定时器最长间隔（毫秒）
+CLASSISLAND_BOUNDARY_FALLBACK_S = 30  # ClassIsland 数据源无法预知边界时的检查间隔（秒）
+FOREGROUND_EVENT_COALESCE_MS = 50  # 合并短时间内连续的前台窗口事件（毫秒）
+FOREGROUND_POLL_MIN_INTERVAL_MS = 250  # 前台窗口退避轮询的最小间隔（毫秒）
+FOREGROUND_POLL_MAX_INTERVAL_MS = 4000  # 前台窗口退避轮询的最大间隔（毫秒）
+PROCESS_NAME_CACHE_SIZE = 64  # 进程名缓存的最大条目数
+
+# -------------------- 通知窗口预热配置 --------------------
+NOTIFICATION_PREWARM_DELAY_MS = 5000  # 主窗口显示后预建隐藏通知窗口的延迟（毫秒）
+NOTIFICATION_PREWARM_SETTINGS_GROUPS = (
+    "roll_call_notification_settings",
+    "quick_draw_notification_settings",
+    "lottery_notification_settings",
+)  # 需要预建通知窗口的显示模式（通知设置组）
+NOTIFICATION_PREWARM_CELL_COUNT = 4  # 每个通知窗口预先放入对象池的多人结果单元格数量
+
+# -------------------- ClassIsland 通知发送配置 --------------------
+CLASSISLAND_SEND_QUEUE_CAPACITY = 8  # 最多保留的待发送通知数量（按显示模式合并）
+CLASSISLAND_SEND_TIMEOUT_S = 3.0  # 单次发送的超时时间（秒）
+CLASSISLAND_SEND_MAX_RETRIES = 2  # 发送出错或超时后的最大重试次数
+CLASSISLAND_SEND_RETRY_BACKOFF_S = 0.25  # 重试退避的基础间隔（秒），按重试次数线性增加
+CLASSISLAND_BREAKER_FAILURE_THRESHOLD = 3  # 连续失败多少次后熔断
+CLASSISLAND_BREAKER_COOLDOWN_S = 15.0  # 熔断后多久允许一次试探发送（秒）
+
+# -------------------- IPC 服务器配置 --------------------
+IPC_LISTEN_BACKLOG = 32  # IPC 监听队列长度，过小时并发连接会被拒绝（EAGAIN）
+
+# -------------------- IPC 安全验证配置 --------------------
+KDF_CACHE_MAX_ENTRIES = 8  # 派生密钥缓存的最大条目数（仅保存在内存中）
+KDF_CACHE_IDLE_S = 600  # 派生密钥缓存条目的空闲失效时间（秒）
+IPC_SESSION_TTL_S = 3600  # IPC 会话令牌的最长有效期（秒）
+IPC_SESSION_IDLE_S = 600  # IPC 会话令牌的空闲失效时间（秒）
+IPC_SESSION_MAX_COUNT = 16  # 同时有效的 IPC 会话令牌数量上限
+IPC_SESSION_CLOCK_SKEW_S = 30  # 会话请求时间戳允许的最大偏差（秒），同时决定防重放窗口
+
+# -------------------- IPC 批量命令配置 --------------------
+IPC_BATCH_MAX_COMMANDS = 64  # 单个批量请求最多包含的命令数
+IPC_BATCH_TIMEOUT_S = 10.0  # 等待主线程执行批量命令的超时（秒），未开始则整批取消
+
+# -------------------- IPC 事件订阅配置 --------------------
+IPC_EVENT_BUFFER_DEFAULT = 256  # 每个订阅者默认缓冲的事件数，写不出去时丢弃最早的事件
+IPC_EVENT_BUFFER_MAX = 4096  # 订阅者可申请的最大缓冲事件数
+IPC_EVENT_MAX_SUBSCRIBERS = 8  # 同时保持的事件订阅连接数上限
+IPC_EVENT_HEARTBEAT_S = 15.0  # 没有事件时发送心跳的间隔（秒），用于发现已断开的订阅者
+IPC_EVENT_REDACTED_SETTING_GROUPS = (
+    "basic_safety_settings",
+)  # 设置变更事件中不附带取值的设置分组
+IPC_EVENT_IGNORED_SETTING_GROUPS = (
+    "user_info",
+)  # 不产生设置变更事件的设置分组（运行时长等统计信息）
+
+# -------------------- 奖品库存配置 --------------------
+PRIZE_WEIGHT_SCALE = 1_000_000  # 奖品权重换算为整数时的倍数（精确到百万分之一）
+PRIZE_GUARANTEED_WEIGHT = 1000  # 内幕权重达到该值视为必中（与内幕设置一致）
+
+# -------------------- 批量抽奖配置 --------------------
+LOTTERY_BATCH_MAX_ROUNDS = 10000  # 一次批量抽奖最多的轮数
+LOTTERY_BATCH_DEFAULT_ROUNDS = 100  # 批量抽奖窗口中默认的轮数
+LOTTERY_BATCH_REPLAY_INTERVAL_MS = 120  # 快速回放时每轮结果的显示间隔（毫秒）
+
+# -------------------- 背景渲染缓存配置 --------------------
+BACKGROUND_RENDER_SIZE_STEP = 64  # 背景渲染尺寸（物理像素）向上取整的步长
+BACKGROUND_RENDER_MEMORY_CACHE_SIZE = 6  # 内存中保留的已渲染背景数量
+BACKGROUND_RENDER_DISK_CACHE_MB = 200  # 磁盘背景缓存的大小上限（MB）
+BACKGROUND_RENDER_DISK_CACHE_DIR = "background_cache"  # 磁盘背景缓存目录（TEMP 下）
+BACKGROUND_ANIMATION_MAX_FPS = 15  # 动画背景默认的最高刷新率
+BACKGROUND_ANIMATION_PRERENDER_MB = 96  # 预渲染动画背景全部帧的内存上限（MB）
+
+# -------------------- JSON 写入配置 --------------------
+JSON_WRITE_COALESCE_MS = 300  # 同一文件在该时间内的多次写入合并为一次（毫秒）
+JSON_WRITE_TEMP_SUFFIX = ".writing"  # 原子写入时临时文件的后缀
+
+# -------------------- 名单编辑配置 --------------------
+LIST_TABLE_SAVE_DELAY_MS = 800  # 名单表格最后一次编辑后等待该时间再统一保存（毫秒）
+LIST_TABLE_WATCH_DELAY_MS = 1000  # 名单文件夹变化后等待该时间再同步（毫秒）
+
+# -------------------- 文件变化通知配置 --------------------
+FILE_CHANGE_SCAN_DELAY_MS = 100  # 收到文件系统通知后等待该时间再比较目录快照（毫秒）
+FILE_CHANGE_DEBOUNCE_MS = 500  # 默认防抖时间，最后一次变化后等待该时间再分发（毫秒）
+
+# -------------------- 日志查看配置 --------------------
+LOG_VIEWER_TAIL_BYTES = 256 * 1024  # 打开日志时先直接读取并显示的末尾字节数
+LOG_VIEWER_TAIL_DELAY_MS = 200  # 日志文件变化后等待该时间再读取新增内容（毫秒）
+LOG_VIEWER_CACHE_LINES = 2048  # 日志视图缓存的已解码行数
+LOG_INDEX_CHUNK_BYTES = 8 * 1024 * 1024  # 建立行索引和过滤时每段处理的字节数
+
+# -------------------- 抽取耗时统计配置 --------------------
+DRAW_TELEMETRY_WINDOW = 200  # 每个抽取阶段保留最近多少次的耗时用于统计
+DRAW_TELEMETRY_REFRESH_MS = 1000  # 抽取耗时窗口的刷新间隔（毫秒）
+
+# -------------------- 内存监控配置 --------------------
+MEMORY_MONITOR_ENV = (
+    "SECRANDOM_MEMORY_MONITOR"  # 设置后开启内存监控，值为采样间隔（秒）
+)
+MEMORY_MONITOR_INTERVAL_S = 600  # 环境变量不是数字时使用的采样间隔（秒）
+MEMORY_MONITOR_TRACE_FRAMES = 1  # tracemalloc 记录的调用栈深度，越深开销越大
+MEMORY_MONITOR_TOP_N = 10  # 每次报告列出增长最多的分配位置和对象类型数量
+MEMORY_MONITOR_HISTORY = 48  # 内存中保留的报告数量（诊断数据导出时附带）
+
+# -------------------- 抽取轨迹配置 --------------------
+DRAW_TRACE_ENV = "SECRANDOM_DRAW_TRACE"  # 设置为 1 时记录每次抽取的匿名轨迹
+DRAW_TRACE_DIR = "draw_traces"  # 轨迹文件在日志目录下的子目录名
+DRAW_TRACE_FORMAT = 1  # 轨迹文件格式版本，回放时检查
+DRAW_TRACE_TOKEN_LENGTH = 12  # 匿名标记的十六进制位数
+DRAW_TRACE_SETTINGS_GROUPS = (  # 轨迹中快照的设置分组（内幕设置单独存放，不会记录）
+    "roll_call_settings",
+    "lottery_settings",
+    "fair_draw_settings",
+    "linkage_settings",
+    "advanced_settings",
+)
+
 # -------------------- 设置窗口配置 --------------------
 SETTINGS_WINDOW_DEFAULT_WIDTH = 800  # 设置窗口默认宽度
 SETTINGS_WINDOW_DEFAULT_HEIGHT = 600  # 设置窗口默认高度
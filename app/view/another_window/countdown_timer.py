@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
+from typing import Callable
 
 from loguru import logger
 from PySide6.QtCore import (
@@ -20,8 +22,9 @@ from PySide6.QtCore import (
     Signal,
     QElapsedTimer,
     QDateTime,
+    QTime,
 )
-from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPixmap
 from PySide6.QtWidgets import (
     QApplication,
     QAbstractItemView,
@@ -54,6 +57,11 @@ from app.Language.obtain_language import (
     get_content_pushbutton_name_async,
 )
 from app.tools.personalised import get_theme_icon, load_custom_font
+from app.tools.variable import (
+    CLOCK_BOUNDARY_MARGIN_MS,
+    COUNTDOWN_SMOOTH_INTERVAL_MS,
+    COUNTDOWN_WARNING_MS,
+)
 
 
 @dataclass(frozen=True)
@@ -81,6 +89,9 @@ class _ProgressRing(QWidget):
         self._warning_anim = QPropertyAnimation(self, b"warningLevel", self)
         self._warning_anim.setDuration(220)
         self._warning_anim.setEasingCurve(QEasingCurve.OutCubic)
+        # 背景圆环不随进度变化，缓存为位图
+        self._static_layer: QPixmap | None = None
+        self._static_layer_key = None
 
     def _get_progress(self) -> float:
         return float(self._progress)
@@ -90,8 +101,10 @@ class _ProgressRing(QWidget):
         value = max(0.0, min(1.0, value))
         if abs(self._progress - value) < 1e-6:
             return
+        previous = self._progress
         self._progress = value
-        self.update()
+        # 只重绘进度端点移动经过的区域
+        self.update(self._arc_dirty_rect(previous, value))
 
     progress = Property(float, _get_progress, _set_progress)
 
@@ -121,14 +134,14 @@ class _ProgressRing(QWidget):
 
     opacity = Property(float, _get_opacity, _set_opacity)
 
-    def set_progress(self, value: float):
+    def set_progress(self, value: float, animate: bool = True):
         value = 0.0 if value is None else float(value)
         value = max(0.0, min(1.0, value))
         current = float(self._progress)
         if abs(current - value) < 1e-6:
             return
 
-        if value < current and (current - value) > 0.65:
+        if not animate or (value < current and (current - value) > 0.65):
             try:
                 self._progress_anim.stop()
             except Exception:
@@ -146,13 +159,19 @@ class _ProgressRing(QWidget):
 
     def set_warning(self, warning: bool):
         warning = bool(warning)
+        target = 1.0 if warning else 0.0
+        if warning == self._warning and (
+            self._warning_anim.state() == QPropertyAnimation.Running
+            or abs(self._warning_level - target) < 1e-6
+        ):
+            return
         self._warning = warning
         try:
             self._warning_anim.stop()
         except Exception:
             pass
         self._warning_anim.setStartValue(float(self._warning_level))
-        self._warning_anim.setEndValue(1.0 if warning else 0.0)
+        self._warning_anim.setEndValue(target)
         self._warning_anim.start()
 
     @staticmethod
@@ -165,36 +184,90 @@ class _ProgressRing(QWidget):
             int(a.alpha() + (b.alpha() - a.alpha()) * t),
         )
 
+    def _ring_rect(self) -> QRectF:
+        return QRectF(
+            self._ring_width / 2,
+            self._ring_width / 2,
+            self.width() - self._ring_width,
+            self.height() - self._ring_width,
+        )
+
+    def _arc_dirty_rect(self, a: float, b: float) -> QRect:
+        """进度从 a 变为 b 时需要重绘的区域（圆弧端点扫过的范围加上笔宽）"""
+        lo, hi = sorted((float(a), float(b)))
+        if hi - lo > 0.25:
+            return self.rect()
+        rect = self._ring_rect()
+        cx, cy = rect.center().x(), rect.center().y()
+        rx, ry = rect.width() / 2, rect.height() / 2
+        steps = max(1, int(math.ceil((hi - lo) * 64)))
+        xs, ys = [], []
+        for i in range(steps + 1):
+            theta = math.radians(90.0 - 360.0 * (lo + (hi - lo) * i / steps))
+            xs.append(cx + rx * math.cos(theta))
+            ys.append(cy - ry * math.sin(theta))
+        pad = self._ring_width + 2
+        return QRectF(
+            min(xs) - pad,
+            min(ys) - pad,
+            max(xs) - min(xs) + pad * 2,
+            max(ys) - min(ys) + pad * 2,
+        ).toAlignedRect()
+
+    def _get_static_layer(self, opacity: float) -> QPixmap:
+        """获取缓存的背景圆环位图，尺寸、缩放或透明度变化时重新绘制"""
+        dpr = float(self.devicePixelRatioF())
+        key = (
+            self.width(),
+            self.height(),
+            dpr,
+            self._ring_width,
+            self._bg_color.rgba(),
+            round(opacity, 3),
+        )
+        if self._static_layer is not None and self._static_layer_key == key:
+            return self._static_layer
+
+        layer = QPixmap(
+            max(1, int(math.ceil(self.width() * dpr))),
+            max(1, int(math.ceil(self.height() * dpr))),
+        )
+        layer.setDevicePixelRatio(dpr)
+        layer.fill(Qt.transparent)
+        painter = QPainter(layer)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        bg = QColor(self._bg_color)
+        bg.setAlpha(int(bg.alpha() * opacity))
+        pen_bg = painter.pen()
+        pen_bg.setWidth(self._ring_width)
+        pen_bg.setColor(bg)
+        painter.setPen(pen_bg)
+        painter.drawArc(self._ring_rect(), 0, 360 * 16)
+        painter.end()
+
+        self._static_layer = layer
+        self._static_layer_key = key
+        return layer
+
     def paintEvent(self, event):
         painter = QPainter(self)
         if not painter.isActive():
             return
         painter.setRenderHint(QPainter.Antialiasing, True)
 
-        rect = QRectF(
-            self._ring_width / 2,
-            self._ring_width / 2,
-            self.width() - self._ring_width,
-            self.height() - self._ring_width,
-        )
+        rect = self._ring_rect()
 
         opacity = max(0.0, min(1.0, float(self._opacity)))
         if opacity <= 0.001:
             return
 
-        bg = QColor(self._bg_color)
-        bg.setAlpha(int(bg.alpha() * opacity))
+        painter.drawPixmap(0, 0, self._get_static_layer(opacity))
+
         fg = self._lerp_color(
             self._fg_color, self._warn_color, float(self._warning_level)
         )
         fg.setAlpha(int(fg.alpha() * opacity))
 
-        pen_bg = painter.pen()
-        pen_bg.setWidth(self._ring_width)
-        pen_bg.setColor(bg)
-        painter.setPen(pen_bg)
-        painter.drawArc(rect, 0, 360 * 16)
-
         pen_fg = painter.pen()
         pen_fg.setWidth(self._ring_width)
         pen_fg.setCapStyle(Qt.RoundCap)
@@ -206,20 +279,51 @@ class _ProgressRing(QWidget):
         painter.drawArc(rect, start_angle, span_angle)
 
 
+def _next_render_delay_ms(mode: str, current_ms: int, warning: bool) -> int:
+    """计算距离下一次需要刷新显示的时间（毫秒）
+
+    倒计时显示的秒数为 ceil(剩余毫秒 / 1000)，只在剩余时间跨过整秒时变化，
+    因此非警告阶段直接等到下一个整秒边界；警告阶段需要平滑动画，按帧间隔刷新。
+    秒表显示毫秒，只能按帧间隔刷新。
+
+    Args:
+        mode: 计时模式（countdown / stopwatch）
+        current_ms: 倒计时剩余毫秒数或秒表已计时毫秒数
+        warning: 是否处于警告阶段
+
+    Returns:
+        int: 距离下一次刷新的毫秒数
+    """
+    if mode == "countdown" and not warning:
+        return max(1, (int(current_ms) - 1) % 1000 + 1)
+    return COUNTDOWN_SMOOTH_INTERVAL_MS
+
+
 class _TimerEngine(QObject):
     updated = Signal()
     finished = Signal()
     stateChanged = Signal()
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, clock: Callable[[], int] | None = None):
+        """初始化计时引擎
+
+        Args:
+            parent: 父对象
+            clock: 返回单调递增毫秒数的时钟函数，默认使用 QElapsedTimer；
+                可传入假时钟以验证计时和刷新时机
+        """
         super().__init__(parent)
-        self._clock = QElapsedTimer()
-        self._clock.start()
+        if clock is None:
+            self._elapsed_timer = QElapsedTimer()
+            self._elapsed_timer.start()
+            clock = self._elapsed_timer.elapsed
+        self._now_ms = clock
 
+        # 单次定时器，每次触发后按下一个显示边界重新计算间隔
         self._tick = QTimer(self)
+        self._tick.setSingleShot(True)
         self._tick.timeout.connect(self._on_tick)
         self._tick.setTimerType(Qt.PreciseTimer)
-        self._tick_interval_ms = 33
 
         self._mode = "countdown"
         self._running = False
@@ -267,6 +371,14 @@ class _TimerEngine(QObject):
     def warning(self) -> bool:
         return bool(self._warning)
 
+    def next_tick_delay_ms(self) -> int:
+        """距离下一次刷新显示的毫秒数"""
+        return _next_render_delay_ms(self._mode, self.current_ms(), self._warning)
+
+    def _schedule_tick(self):
+        if self._running and not self._paused:
+            self._tick.start(self.next_tick_delay_ms())
+
     def set_total_seconds(self, seconds: int):
         seconds = int(seconds)
         seconds = max(0, seconds)
@@ -294,11 +406,16 @@ class _TimerEngine(QObject):
             self._remaining_ms = new_ms
             self._total_ms = max(self._total_ms, self._remaining_ms)
             if self._running and not self._paused:
-                self._deadline_ms = self._clock.elapsed() + self._remaining_ms
+                self._deadline_ms = self._now_ms() + self._remaining_ms
+                self._warning = (
+                    self._remaining_ms <= COUNTDOWN_WARNING_MS and self._total_ms > 0
+                )
+                # 剩余时间变化后显示边界也随之变化
+                self._schedule_tick()
         else:
             self._elapsed_acc_ms = max(0, self._elapsed_acc_ms + delta_seconds * 1000)
             if self._running and not self._paused:
-                self._elapsed_base_ms = self._clock.elapsed()
+                self._elapsed_base_ms = self._now_ms()
         self.updated.emit()
 
     def start(self):
@@ -309,15 +426,15 @@ class _TimerEngine(QObject):
         if self._mode == "countdown":
             if self._remaining_ms <= 0:
                 return
-            self._deadline_ms = self._clock.elapsed() + self._remaining_ms
+            self._deadline_ms = self._now_ms() + self._remaining_ms
             self._warning = False
         else:
-            self._elapsed_base_ms = self._clock.elapsed()
+            self._elapsed_base_ms = self._now_ms()
             self._warning = False
 
         self._running = True
         self._paused = False
-        self._tick.start(self._tick_interval_ms)
+        self._schedule_tick()
         self.updated.emit()
         self.stateChanged.emit()
 
@@ -327,10 +444,10 @@ class _TimerEngine(QObject):
         if self._mode == "clock":
             return
         if self._mode == "countdown":
-            self._remaining_ms = max(0, self._deadline_ms - self._clock.elapsed())
+            self._remaining_ms = max(0, self._deadline_ms - self._now_ms())
         else:
             self._elapsed_acc_ms = self._elapsed_acc_ms + max(
-                0, self._clock.elapsed() - self._elapsed_base_ms
+                0, self._now_ms() - self._elapsed_base_ms
             )
         self._paused = True
         self._tick.stop()
@@ -345,11 +462,11 @@ class _TimerEngine(QObject):
         if self._mode == "countdown":
             if self._remaining_ms <= 0:
                 return
-            self._deadline_ms = self._clock.elapsed() + self._remaining_ms
+            self._deadline_ms = self._now_ms() + self._remaining_ms
         else:
-            self._elapsed_base_ms = self._clock.elapsed()
+            self._elapsed_base_ms = self._now_ms()
         self._paused = False
-        self._tick.start(self._tick_interval_ms)
+        self._schedule_tick()
         self.updated.emit()
         self.stateChanged.emit()
 
@@ -380,8 +497,10 @@ class _TimerEngine(QObject):
         if not self._running or self._paused:
             return
         if self._mode == "countdown":
-            self._remaining_ms = max(0, self._deadline_ms - self._clock.elapsed())
-            self._warning = self._remaining_ms <= 10_000 and self._total_ms > 0
+            self._remaining_ms = max(0, self._deadline_ms - self._now_ms())
+            self._warning = (
+                self._remaining_ms <= COUNTDOWN_WARNING_MS and self._total_ms > 0
+            )
             self.updated.emit()
             if self._remaining_ms <= 0:
                 self._tick.stop()
@@ -391,12 +510,14 @@ class _TimerEngine(QObject):
                 self.updated.emit()
                 self.stateChanged.emit()
                 self.finished.emit()
+                return
         else:
             self._elapsed_acc_ms = self._elapsed_acc_ms + max(
-                0, self._clock.elapsed() - self._elapsed_base_ms
+                0, self._now_ms() - self._elapsed_base_ms
             )
-            self._elapsed_base_ms = self._clock.elapsed()
+            self._elapsed_base_ms = self._now_ms()
             self.updated.emit()
+        self._schedule_tick()
 
 
 class CountdownTimerPage(QWidget):
@@ -434,9 +555,10 @@ class CountdownTimerPage(QWidget):
         self._engine.stateChanged.connect(self._sync_controls_state)
         self._engine.finished.connect(self._on_finished)
 
+        # 时钟模式只在整秒时刷新，每次触发后按当前时间重新对齐
         self._clock_timer = QTimer(self)
         self._clock_timer.setTimerType(Qt.PreciseTimer)
-        self._clock_timer.setInterval(33)
+        self._clock_timer.setSingleShot(True)
         self._clock_timer.timeout.connect(self._on_clock_tick)
 
         self._flash_timer = QTimer(self)
@@ -1770,7 +1892,7 @@ class CountdownTimerPage(QWidget):
             self._engine.set_mode(target_mode)
             if target_mode == "clock":
                 self._sync_clock_ui()
-                self._clock_timer.start()
+                self._schedule_clock_tick()
             else:
                 self._clock_timer.stop()
 
@@ -1810,7 +1932,13 @@ class CountdownTimerPage(QWidget):
             self._set_clock_date_visible(False)
             seconds = max(0, int((ms + 999) // 1000))
             prog = float(ms) / float(total_ms) if total_ms > 0 else 0.0
-            self.ring.set_progress(prog)
+            # 运行中只在警告阶段使用平滑动画，其余时间每秒直接更新一次
+            animate = (
+                self._engine.warning()
+                or not self._engine.is_running()
+                or self._engine.is_paused()
+            )
+            self.ring.set_progress(prog, animate=animate)
             self.ring.set_warning(self._engine.warning())
             self._sync_digits_from_seconds(seconds)
         elif mode == "stopwatch":
@@ -1822,7 +1950,8 @@ class CountdownTimerPage(QWidget):
             self._set_clock_date_visible(False)
             seconds = max(0, int(ms // 1000))
             within_min = (ms % 60_000) / 60_000.0
-            self.ring.set_progress(within_min)
+            # 秒表按帧刷新，进度本身已足够平滑
+            self.ring.set_progress(within_min, animate=not self._engine.is_running())
             self.ring.set_warning(False)
             self._sync_digits_from_seconds(seconds)
         else:
@@ -1839,6 +1968,11 @@ class CountdownTimerPage(QWidget):
         if self._engine.mode() != "clock":
             return
         self._sync_clock_ui()
+        self._schedule_clock_tick()
+
+    def _schedule_clock_tick(self):
+        msec = int(QTime.currentTime().msec())
+        self._clock_timer.start(1000 - msec + CLOCK_BOUNDARY_MARGIN_MS)
 
     def _sync_clock_ui(self):
         dt = QDateTime.currentDateTime()
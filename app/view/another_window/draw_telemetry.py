@@ -0,0 +1,155 @@
+# ==================================================
+# 导入库
+# ==================================================
+from PySide6.QtWidgets import *
+from PySide6.QtGui import *
+from PySide6.QtCore import *
+from qfluentwidgets import *
+
+from app.tools.variable import *
+from app.Language.obtain_language import *
+from app.tools.config import NotificationConfig, NotificationType, show_notification
+from app.tools.draw_telemetry import format_draw_telemetry, get_draw_telemetry
+
+
+class DrawTelemetryWindow(QWidget):
+    """抽取耗时窗口
+
+    显示本次运行中点名、抽奖各阶段最近若干次的耗时统计，窗口可见时定时刷新。
+    老师反馈“抽取很慢”时，可以在这里查看或复制报告，诊断数据中也包含同样的统计。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._last_snapshot = None
+        self.init_ui()
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(DRAW_TELEMETRY_REFRESH_MS)
+        self._refresh_timer.timeout.connect(self.refresh)
+
+    def init_ui(self):
+        """初始化UI"""
+        self.main_layout = QVBoxLayout(self)
+        self.main_layout.setContentsMargins(20, 20, 20, 20)
+        self.main_layout.setSpacing(15)
+
+        # 控制区域
+        control_layout = QHBoxLayout()
+        control_layout.setSpacing(10)
+
+        self.summary_label = BodyLabel(
+            get_content_name_async("draw_telemetry", "summary").format(
+                window=get_draw_telemetry().window,
+                seconds=f"{DRAW_TELEMETRY_REFRESH_MS / 1000:g}",
+            )
+        )
+        control_layout.addWidget(self.summary_label)
+        control_layout.addStretch()
+
+        self.reset_button = PushButton(
+            get_content_name_async("draw_telemetry", "reset_button")
+        )
+        self.reset_button.clicked.connect(self.reset_statistics)
+        control_layout.addWidget(self.reset_button)
+
+        self.copy_button = PrimaryPushButton(
+            get_content_name_async("draw_telemetry", "copy_button")
+        )
+        self.copy_button.clicked.connect(self.copy_report)
+        control_layout.addWidget(self.copy_button)
+
+        self.main_layout.addLayout(control_layout)
+
+        # 统计表格
+        self.stats_table = TableWidget()
+        self.stats_table.setWordWrap(False)
+        self.stats_table.verticalHeader().setVisible(False)
+        self.stats_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        header_keys = (
+            "header_kind",
+            "header_stage",
+            "header_count",
+            "header_last",
+            "header_p50",
+            "header_p95",
+            "header_max",
+            "header_blocks",
+        )
+        headers = [get_content_name_async("draw_telemetry", key) for key in header_keys]
+        self.stats_table.setColumnCount(len(headers))
+        self.stats_table.setHorizontalHeaderLabels(headers)
+        self.stats_table.horizontalHeader().setStretchLastSection(True)
+        self.main_layout.addWidget(self.stats_table)
+
+        # 状态栏
+        self.status_label = BodyLabel(get_content_name_async("draw_telemetry", "empty"))
+        self.main_layout.addWidget(self.status_label)
+
+        self.kind_names = get_any_position_value_async("draw_telemetry", "kind_names")
+        self.stage_names = get_any_position_value_async("draw_telemetry", "stage_names")
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self._refresh_timer.start()
+
+    def hideEvent(self, event):
+        self._refresh_timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        """重新读取统计，没有变化时不更新表格"""
+        snapshot = get_draw_telemetry().snapshot()
+        if snapshot == self._last_snapshot:
+            return
+        self._last_snapshot = snapshot
+        self.status_label.setVisible(not snapshot)
+        self.fill_table(snapshot)
+
+    def fill_table(self, snapshot):
+        rows = []
+        for kind, stages in snapshot.items():
+            for stage, summary in stages.items():
+                if "p50_ms" not in summary:
+                    continue
+                rows.append(
+                    (
+                        self.kind_names.get(kind, kind),
+                        self.stage_names.get(stage, stage),
+                        summary["count"],
+                        f"{summary['last_ms']:.2f}",
+                        f"{summary['p50_ms']:.2f}",
+                        f"{summary['p95_ms']:.2f}",
+                        f"{summary['max_ms']:.2f}",
+                        summary["blocks_p50"],
+                    )
+                )
+
+        self.stats_table.setUpdatesEnabled(False)
+        try:
+            self.stats_table.setRowCount(len(rows))
+            for i, values in enumerate(rows):
+                for j, value in enumerate(values):
+                    self.stats_table.setItem(i, j, QTableWidgetItem(str(value)))
+            self.stats_table.resizeColumnsToContents()
+        finally:
+            self.stats_table.setUpdatesEnabled(True)
+
+    def reset_statistics(self):
+        """清空统计"""
+        get_draw_telemetry().reset()
+        self.refresh()
+
+    def copy_report(self):
+        """复制文本报告到剪贴板"""
+        report = format_draw_telemetry(get_draw_telemetry().snapshot())
+        QApplication.clipboard().setText(report)
+        show_notification(
+            NotificationType.SUCCESS,
+            NotificationConfig(
+                title=get_content_name_async("draw_telemetry", "name"),
+                content=get_content_name_async("draw_telemetry", "copy_success"),
+            ),
+            parent=self.window(),
+        )
@@ -2,6 +2,10 @@
 # 导入库
 # ==================================================
 import os
+import threading
+from array import array
+from collections import OrderedDict
+
 from loguru import logger
 from PySide6.QtWidgets import *
 from PySide6.QtGui import *
@@ -11,9 +15,188 @@ from qfluentwidgets import *
 from app.tools.variable import *
 from app.tools.path_utils import get_path
 from app.tools.personalised import *
+from app.tools.log_index import (
+    LOG_LEVEL_VALUES,
+    LogScanCancelled,
+    filter_log_lines,
+    is_log_line_visible,
+    log_line_level,
+    read_log_lines,
+    read_log_tail,
+    scan_line_ends,
+)
 from app.Language.obtain_language import *
 
 
+# ==================================================
+# 后台建立索引和过滤
+# ==================================================
+class LogScanWorker(QThread):
+    """为日志文件的新增内容建立行索引，并过滤从 first_line 开始的行"""
+
+    scanned = Signal(int, int, object, object)  # 批次, 起始行号, 行边界, 显示的行号
+
+    def __init__(self, generation, file_path, bounds, first_line, min_level):
+        super().__init__()
+        self.generation = generation
+        self.file_path = file_path
+        self.bounds = bounds
+        self.first_line = first_line
+        self.min_level = min_level
+        self.cancel_event = threading.Event()
+
+    def run(self):
+        """在后台线程中建立索引并过滤"""
+        try:
+            self.bounds.extend(
+                scan_line_ends(self.file_path, self.bounds[-1], self.cancel_event)
+            )
+            rows = filter_log_lines(
+                self.file_path,
+                self.bounds,
+                self.first_line,
+                self.min_level,
+                self.cancel_event,
+            )
+            self.scanned.emit(self.generation, self.first_line, self.bounds, rows)
+        except LogScanCancelled:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取日志文件失败 {self.file_path}: {e}")
+            self.scanned.emit(self.generation, self.first_line, None, None)
+
+
+# ==================================================
+# 日志行模型
+# ==================================================
+class LogLineModel(QAbstractListModel):
+    """日志行模型
+
+    只保存行边界和过滤后显示的行号，视图请求某一行时才按页读取、解码并缓存，
+    打开很大的日志文件时也只格式化可见的行。索引建立完成前显示文件末尾的预览。
+    """
+
+    PAGE_LINES = 256  # 每次读取的行数
+
+    def __init__(self, level_colors, parent=None):
+        super().__init__(parent)
+        self._colors = {level: QColor(color) for level, color in level_colors.items()}
+        self._file_path = None
+        self._bounds = array("Q", [0])
+        self._rows = array("I")
+        self._preview = []
+        self._is_preview = True
+        self._cache = OrderedDict()
+
+    @property
+    def is_preview(self):
+        """是否仍在显示索引建立前的预览"""
+        return self._is_preview
+
+    @property
+    def line_count(self):
+        """已建立索引的行数"""
+        return len(self._bounds) - 1
+
+    @property
+    def indexed_size(self):
+        """已建立索引的字节数"""
+        return self._bounds[-1]
+
+    def bounds_from(self, line):
+        """从第 line 行开始的行边界（副本，交给后台线程使用）"""
+        return self._bounds[line:]
+
+    def rowCount(self, parent=None):
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self._preview) if self._is_preview else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < self.rowCount():
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return self.line_text(index.row())
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self._colors.get(log_line_level(self.line_text(index.row())))
+        return None
+
+    def line_text(self, row):
+        """第 row 个显示行的内容"""
+        if self._is_preview:
+            return self._preview[row]
+        text = self._cache.get(row)
+        if text is None:
+            self._load_page(row)
+            return self._cache.get(row, "")
+        self._cache.move_to_end(row)
+        return text
+
+    def _load_page(self, row):
+        start = row - row % self.PAGE_LINES
+        rows = range(start, min(start + self.PAGE_LINES, len(self._rows)))
+        spans = [
+            (self._bounds[self._rows[r]], self._bounds[self._rows[r] + 1]) for r in rows
+        ]
+        try:
+            texts = read_log_lines(self._file_path, spans)
+        except OSError as e:
+            logger.warning(f"读取日志行失败: {e}")
+            texts = [""] * len(spans)
+        self._cache.update(zip(rows, texts, strict=True))
+        while len(self._cache) > max(LOG_VIEWER_CACHE_LINES, self.PAGE_LINES):
+            self._cache.popitem(last=False)
+
+    def show_preview(self, lines):
+        """显示索引建立前的预览行"""
+        self.beginResetModel()
+        self._preview = list(lines)
+        self._is_preview = True
+        self._cache.clear()
+        self.endResetModel()
+
+    def set_index(self, file_path, bounds, rows):
+        """使用完整的行索引和过滤结果"""
+        self.beginResetModel()
+        self._file_path = file_path
+        self._bounds = bounds
+        self._rows = rows
+        self._preview = []
+        self._is_preview = False
+        self._cache.clear()
+        self.endResetModel()
+
+    def append(self, bounds, rows):
+        """追加新增内容的索引和过滤结果，bounds[0] 为当前最后一个行尾"""
+        self._bounds.extend(bounds[1:])
+        if not rows:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def clear(self):
+        self.set_index(None, array("Q", [0]), array("I"))
+
+
+class LogListView(QListView):
+    """日志列表视图，支持复制选中的行"""
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.StandardKey.Copy):
+            rows = sorted(index.row() for index in self.selectedIndexes())
+            if rows:
+                QApplication.clipboard().setText(
+                    "\n".join(self.model().line_text(row) for row in rows)
+                )
+            return
+        super().keyPressEvent(event)
+
+
+# ==================================================
+# 日志查看窗口
+# ==================================================
 class LogViewerWindow(QWidget):
     """日志查看窗口"""
 
@@ -22,7 +205,7 @@ class LogViewerWindow(QWidget):
         super().__init__(parent)
         self._closing = False
         self.current_log_file = None
-        self.hidden_keywords = ("内幕", "behind")
+        self.log_files = []
         self.log_level_colors = {
             "DEBUG": "#999999",
             "INFO": "#0099CC",
@@ -30,7 +213,24 @@ class LogViewerWindow(QWidget):
             "ERROR": "#FF0000",
             "CRITICAL": "#8B0000",
         }
+        self._preview_lines = []
+        self._generation = 0
+        self._scan_worker = None
+        self._workers = set()
+        self._tail_pending = False
+
         self.file_watcher = QFileSystemWatcher(self)
+        self.file_watcher.directoryChanged.connect(self.on_directory_changed)
+        self.file_watcher.fileChanged.connect(self.on_file_changed)
+        self._tail_timer = QTimer(self)
+        self._tail_timer.setSingleShot(True)
+        self._tail_timer.setInterval(LOG_VIEWER_TAIL_DELAY_MS)
+        self._tail_timer.timeout.connect(self.tail_current_log)
+        self._dir_timer = QTimer(self)
+        self._dir_timer.setSingleShot(True)
+        self._dir_timer.setInterval(LOG_VIEWER_TAIL_DELAY_MS)
+        self._dir_timer.timeout.connect(self.load_log_files)
+
         self.init_ui()
         self._load_timer = QTimer(self)
         self._load_timer.setSingleShot(True)
@@ -93,28 +293,38 @@ class LogViewerWindow(QWidget):
         # 添加控制区域到主布局
         self.main_layout.addLayout(control_layout)
 
-        # 创建日志显示文本框
-        self.log_text = TextEdit()
-        self.log_text.setReadOnly(True)
-        self.log_text.setPlaceholderText(
-            get_content_name_async("log_viewer", "placeholder")
+        # 创建日志列表视图，只格式化可见的行
+        self.log_model = LogLineModel(self.log_level_colors, self)
+        self.log_view = LogListView()
+        self.log_view.setModel(self.log_model)
+        self.log_view.setUniformItemSizes(True)
+        self.log_view.setWordWrap(False)
+        self.log_view.setTextElideMode(Qt.TextElideMode.ElideRight)
+        self.log_view.setSelectionMode(
+            QAbstractItemView.SelectionMode.ExtendedSelection
+        )
+        self.log_view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        custom_font = load_custom_font()
+        font = QFont(custom_font if custom_font else "Consolas")
+        font.setStyleHint(QFont.StyleHint.Monospace)
+        font.setPixelSize(12)
+        self.log_view.setFont(font)
+        self.log_view.setStyleSheet(
+            "QListView { background-color: #1e1e1e; color: #d4d4d4; "
+            "border: none; padding: 10px; }"
         )
-        self.log_text.setLineWrapMode(QTextBrowser.LineWrapMode.NoWrap)
-
-        # 创建平滑滚动区域
-        scroll_area = SmoothScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setWidget(self.log_text)
 
         # 添加到主布局
-        self.main_layout.addWidget(scroll_area)
+        self.main_layout.addWidget(self.log_view)
 
         # 创建状态栏
-        self.status_label = BodyLabel("")
+        self.status_label = BodyLabel(
+            get_content_name_async("log_viewer", "placeholder")
+        )
         self.main_layout.addWidget(self.status_label)
 
     def load_log_files(self):
-        """加载日志文件列表"""
+        """加载日志文件列表，当前查看的文件仍存在时保持不变"""
         try:
             if self._closing:
                 return
@@ -129,7 +339,6 @@ class LogViewerWindow(QWidget):
             # 添加文件夹监听
             if str(log_dir) not in self.file_watcher.directories():
                 self.file_watcher.addPath(str(log_dir))
-                self.file_watcher.directoryChanged.connect(self.on_directory_changed)
 
             # 获取所有日志文件
             log_files = []
@@ -143,20 +352,29 @@ class LogViewerWindow(QWidget):
 
             # 保存文件列表
             self.log_files = log_files
+            paths = [file_path for _, file_path in log_files]
 
             # 更新下拉框
             self.log_file_combo.blockSignals(True)
             self.log_file_combo.clear()
             for file_name, _ in log_files:
                 self.log_file_combo.addItem(file_name)
+            if self.current_log_file in paths:
+                self.log_file_combo.setCurrentIndex(paths.index(self.current_log_file))
             self.log_file_combo.blockSignals(False)
 
+            if self.current_log_file in paths:
+                # 当前文件仍存在，新增内容由文件监听增量读取
+                return
+
             # 如果有日志文件，加载最新的
             if log_files:
                 self.log_file_combo.setCurrentIndex(0)
                 self.load_log_content(log_files[0][1])
             else:
-                self.log_text.clear()
+                self._cancel_scan()
+                self.current_log_file = None
+                self.log_model.clear()
                 self.status_label.setText(
                     get_content_name_async("log_viewer", "no_log_files")
                 )
@@ -171,7 +389,7 @@ class LogViewerWindow(QWidget):
         """文件夹变化时的处理"""
         if self._closing:
             return
-        QTimer.singleShot(100, self.load_log_files)
+        self._dir_timer.start()
 
     def on_log_file_changed(self, index):
         """日志文件改变时的处理"""
@@ -179,31 +397,27 @@ class LogViewerWindow(QWidget):
             self.load_log_content(self.log_files[index][1])
 
     def load_log_content(self, file_path):
-        """加载日志内容"""
+        """加载日志内容
+
+        先直接读取文件末尾显示，再在后台为整个文件建立行索引并过滤，
+        完成后切换为完整的日志。
+        """
         try:
             if self._closing:
                 return
             self.current_log_file = file_path
+            self._watch_current_file()
 
-            # 添加文件监听
-            if str(file_path) not in self.file_watcher.files():
-                self.file_watcher.addPath(str(file_path))
-                self.file_watcher.fileChanged.connect(self.on_file_changed)
-
-            # 读取日志文件
-            with open(file_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-
-            # 应用过滤并显示
-            self.filter_logs(lines)
-
-            # 更新状态栏
-            file_size = os.path.getsize(file_path)
+            self._preview_lines, file_size = read_log_tail(
+                file_path, LOG_VIEWER_TAIL_BYTES
+            )
+            self._show_preview()
             self.status_label.setText(
-                get_content_name_async("log_viewer", "status").format(
+                get_content_name_async("log_viewer", "status_indexing").format(
                     os.path.basename(file_path), file_size
                 )
             )
+            self._start_scan(0, array("Q", [0]))
 
         except Exception as e:
             logger.exception(f"加载日志内容失败: {e}")
@@ -216,109 +430,123 @@ class LogViewerWindow(QWidget):
         if self._closing:
             return
         if file_path == self.current_log_file:
-            QTimer.singleShot(100, lambda: self.load_log_content(file_path))
-
-    def filter_logs(self, lines=None):
-        """过滤日志"""
-        try:
-            if self._closing:
-                return
-            # 如果没有提供 lines，则从文件读取
-            if lines is None:
-                if not self.current_log_file or not os.path.exists(
-                    self.current_log_file
-                ):
-                    return
-                with open(self.current_log_file, "r", encoding="utf-8") as f:
-                    lines = f.readlines()
-
-            lines = [
-                line
-                for line in lines
-                if "内幕" not in line and "behind" not in line.lower()
-            ]
-
-            # 获取选择的日志等级
-            level_index = self.log_level_combo.currentIndex()
-            log_levels_dict = get_any_position_value_async("log_viewer", "log_levels")
-            log_levels = log_levels_dict.get("combo_items", [])
-            selected_level = (
-                log_levels[level_index] if level_index < len(log_levels) else "DEBUG"
-            )
-
-            # 如果选择"全部"，显示所有日志
-            if level_index == 0:
-                self.display_colored_logs(lines)
-                return
-
-            # 等级映射（值越大，等级越高）
-            level_map = {
-                "DEBUG": 0,
-                "INFO": 1,
-                "WARNING": 2,
-                "ERROR": 3,
-                "CRITICAL": 4,
-            }
-            min_level = level_map.get(selected_level, 0)
-
-            # 过滤日志行
-            filtered_lines = []
-            for line in lines:
-                # 检查日志等级
-                found_level = False
-                for level, level_value in level_map.items():
-                    # 日志格式：时间戳 | 等级(8字符左对齐) | 模块:函数:行号 - 消息
-                    # 匹配模式： | DEBUG    | （等级左对齐）
-                    if f" | {level:<8} | " in line:
-                        # 只显示等级 >= min_level 的日志
-                        if level_value >= min_level:
-                            filtered_lines.append(line)
-                        found_level = True
-                        break
-
-                # 如果没有找到等级标记，保留该行
-                if not found_level:
-                    filtered_lines.append(line)
-
-            # 显示过滤后的日志
-            self.display_colored_logs(filtered_lines)
+            self._tail_timer.start()
 
-        except Exception as e:
-            logger.exception(f"过滤日志失败: {e}")
-
-    def display_colored_logs(self, lines):
-        """显示带颜色的日志"""
+    def tail_current_log(self):
+        """增量读取当前日志文件的新增内容"""
+        file_path = self.current_log_file
+        if self._closing or not file_path:
+            return
+        # 文件被替换后原来的监听失效，需要重新添加
+        self._watch_current_file()
+        if self._scan_worker is not None:
+            # 正在建立索引或过滤，完成后再读取
+            self._tail_pending = True
+            return
         try:
-            # 获取当前设置的字体
-            custom_font = load_custom_font()
-            font_family = custom_font if custom_font else "Consolas, monospace"
-
-            html_content = f"<html><body style='font-family: {font_family}, monospace; font-size: 12px; background-color: #1e1e1e; color: #d4d4d4; margin: 0; padding: 10px;'>"
-
-            for line in lines:
-                # 转义 HTML 特殊字符
-                escaped_line = (
-                    line.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-                )
+            file_size = os.path.getsize(file_path)
+        except OSError:
+            return
+        if file_size < self.log_model.indexed_size:
+            # 日志被清空或轮转，重新加载
+            self.load_log_content(file_path)
+            return
+        if file_size == self.log_model.indexed_size:
+            return
+        first_line = self.log_model.line_count
+        self._start_scan(first_line, self.log_model.bounds_from(first_line))
 
-                # 检查日志等级并应用颜色
-                colored_line = escaped_line
-                for level, color in self.log_level_colors.items():
-                    # 匹配日志等级（8字符左对齐）
-                    if f" | {level:<8} | " in escaped_line:
-                        # 为整行应用颜色
-                        colored_line = (
-                            f"<span style='color: {color};'>{escaped_line}</span>"
-                        )
-                        break
+    def filter_logs(self):
+        """按选择的日志等级重新过滤（在后台进行，新的过滤会取消尚未完成的过滤）"""
+        if self._closing or not self.current_log_file:
+            return
+        if self.log_model.is_preview:
+            self._show_preview()
+            self._start_scan(0, array("Q", [0]))
+        else:
+            self._start_scan(0, self.log_model.bounds_from(0))
+
+    def _min_level(self):
+        """当前选择的最低显示等级"""
+        level_index = self.log_level_combo.currentIndex()
+        # 如果选择"全部"，显示所有日志
+        if level_index <= 0:
+            return 0
+        log_levels_dict = get_any_position_value_async("log_viewer", "log_levels")
+        log_levels = log_levels_dict.get("combo_items", [])
+        selected_level = (
+            log_levels[level_index] if level_index < len(log_levels) else "DEBUG"
+        )
+        return LOG_LEVEL_VALUES.get(selected_level, 0)
 
-                html_content += colored_line + "<br>"
+    def _show_preview(self):
+        min_level = self._min_level()
+        lines = self._preview_lines
+        self.log_model.show_preview(
+            [line for line in lines if is_log_line_visible(line, min_level)]
+        )
+        self.log_view.scrollToBottom()
+
+    def _watch_current_file(self):
+        files = list(self.file_watcher.files())
+        stale = [path for path in files if path != self.current_log_file]
+        if stale:
+            self.file_watcher.removePaths(stale)
+        if self.current_log_file and self.current_log_file not in files:
+            self.file_watcher.addPath(str(self.current_log_file))
+
+    def _start_scan(self, first_line, bounds):
+        """启动后台索引和过滤，取消尚未完成的上一次"""
+        self._cancel_scan()
+        self._generation += 1
+        worker = LogScanWorker(
+            self._generation,
+            self.current_log_file,
+            bounds,
+            first_line,
+            self._min_level(),
+        )
+        worker.scanned.connect(self._on_scanned)
+        worker.finished.connect(lambda: self._workers.discard(worker))
+        worker.finished.connect(worker.deleteLater)
+        self._workers.add(worker)
+        self._scan_worker = worker
+        worker.start()
+
+    def _cancel_scan(self):
+        if self._scan_worker is not None:
+            self._scan_worker.cancel_event.set()
+            self._scan_worker = None
+
+    def _on_scanned(self, generation, first_line, bounds, rows):
+        """后台索引和过滤完成"""
+        if self._closing or generation != self._generation:
+            return
+        self._scan_worker = None
+        file_path = self.current_log_file
+        if bounds is None:
+            if first_line > 0:
+                # 读取新增内容时文件被清空或轮转，重新加载
+                self.load_log_content(file_path)
+            return
 
-            html_content += "</body></html>"
-            self.log_text.setHtml(html_content)
+        scroll_bar = self.log_view.verticalScrollBar()
+        at_bottom = scroll_bar.value() >= scroll_bar.maximum()
+        if first_line == 0:
+            self.log_model.set_index(file_path, bounds, rows)
+        else:
+            self.log_model.append(bounds, rows)
+        if at_bottom:
+            self.log_view.scrollToBottom()
+        self.status_label.setText(
+            get_content_name_async("log_viewer", "status").format(
+                os.path.basename(file_path), self.log_model.indexed_size
+            )
+        )
 
-        except Exception as e:
-            logger.exception(f"显示带颜色日志失败: {e}")
+        if self._tail_pending:
+            self._tail_pending = False
+            self.tail_current_log()
 
     def clear_current_log(self):
         """清空当前日志文件"""
@@ -433,19 +661,15 @@ class LogViewerWindow(QWidget):
     def closeEvent(self, event):
         """处理窗口关闭事件"""
         self._closing = True
-        try:
-            if hasattr(self, "_load_timer") and self._load_timer.isActive():
-                self._load_timer.stop()
-        except Exception:
-            pass
-        try:
-            self.file_watcher.directoryChanged.disconnect(self.on_directory_changed)
-        except Exception:
-            pass
-        try:
-            self.file_watcher.fileChanged.disconnect(self.on_file_changed)
-        except Exception:
-            pass
+        for timer in (self._load_timer, self._tail_timer, self._dir_timer):
+            try:
+                timer.stop()
+            except Exception:
+                pass
+        self._cancel_scan()
+        for worker in list(self._workers):
+            worker.cancel_event.set()
+            worker.wait()
         try:
             paths = list(self.file_watcher.files()) + list(
                 self.file_watcher.directories()
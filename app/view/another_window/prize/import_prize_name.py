@@ -2,7 +2,6 @@
 # 导入库
 # ==================================================
 import os
-import json
 from typing import Dict, List, Any
 from concurrent.futures import ThreadPoolExecutor
 
@@ -19,6 +18,7 @@ from app.tools.settings_default import *
 from app.tools.settings_access import *
 from app.Language.obtain_language import *
 from app.tools.config import *
+from app.tools.json_store import read_json, write_json
 
 
 class ImportPrizeNameWindow(QWidget):
@@ -651,8 +651,7 @@ class ImportPrizeNameWindow(QWidget):
         # 如果文件已存在，读取现有数据
         existing_data = {}
         if pool_file.exists():
-            with open_file(pool_file, "r", encoding="utf-8") as f:
-                existing_data = json.load(f)
+            existing_data = read_json(pool_file)
 
         # 如果有现有数据，让用户选择处理方式
         if existing_data:
@@ -702,8 +701,7 @@ class ImportPrizeNameWindow(QWidget):
             action = "new"
 
         # 保存到文件
-        with open_file(pool_file, "w", encoding="utf-8") as f:
-            json.dump(all_items, f, ensure_ascii=False, indent=4)
+        write_json(pool_file, all_items)
 
         if action == "overwrite":
             logger.info(f"已覆盖奖池 '{pool_name}' 的数据，共 {len(all_items)} 项")
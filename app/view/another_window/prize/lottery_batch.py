@@ -0,0 +1,206 @@
+# ==================================================
+# 导入库
+# ==================================================
+from loguru import logger
+from PySide6.QtWidgets import *
+from PySide6.QtGui import *
+from PySide6.QtCore import *
+from qfluentwidgets import *
+
+from app.tools.variable import *
+from app.Language.obtain_language import *
+from app.tools.config import NotificationConfig, NotificationType, show_notification
+from app.common.data.list import export_lottery_batch_results
+
+
+class LotteryBatchWindow(QWidget):
+    """批量抽奖窗口
+
+    在抽奖页面当前的奖池、班级和筛选条件下连续抽取多轮，结果以表格展示并可导出。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.lottery_widget = None
+        self.batch_result = None
+        self.rows = []
+        self.init_ui()
+
+    def init_ui(self):
+        """初始化UI"""
+        self.main_layout = QVBoxLayout(self)
+        self.main_layout.setContentsMargins(20, 20, 20, 20)
+        self.main_layout.setSpacing(15)
+
+        # 控制区域
+        control_layout = QHBoxLayout()
+        control_layout.setSpacing(10)
+
+        control_layout.addWidget(
+            BodyLabel(get_content_name_async("lottery_batch", "rounds_label"))
+        )
+        self.rounds_spinbox = SpinBox()
+        self.rounds_spinbox.setRange(1, LOTTERY_BATCH_MAX_ROUNDS)
+        self.rounds_spinbox.setValue(LOTTERY_BATCH_DEFAULT_ROUNDS)
+        control_layout.addWidget(self.rounds_spinbox)
+
+        control_layout.addWidget(
+            BodyLabel(get_content_name_async("lottery_batch", "replay_label"))
+        )
+        self.replay_switch = SwitchButton()
+        self.replay_switch.setChecked(False)
+        control_layout.addWidget(self.replay_switch)
+
+        control_layout.addStretch()
+
+        self.start_button = PrimaryPushButton(
+            get_content_name_async("lottery_batch", "start_button")
+        )
+        self.start_button.clicked.connect(self.start_batch)
+        control_layout.addWidget(self.start_button)
+
+        self.export_button = PushButton(
+            get_content_name_async("lottery_batch", "export_button")
+        )
+        self.export_button.setEnabled(False)
+        self.export_button.clicked.connect(self.export_results)
+        control_layout.addWidget(self.export_button)
+
+        self.main_layout.addLayout(control_layout)
+
+        self.per_round_label = BodyLabel("")
+        self.main_layout.addWidget(self.per_round_label)
+
+        # 结果表格
+        self.result_table = TableWidget()
+        self.result_table.setWordWrap(False)
+        self.result_table.verticalHeader().setVisible(False)
+        self.result_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        header_keys = ("header_round", "header_prize", "header_student", "header_group")
+        headers = [get_content_name_async("lottery_batch", key) for key in header_keys]
+        self.result_table.setColumnCount(len(headers))
+        self.result_table.setHorizontalHeaderLabels(headers)
+        self.result_table.horizontalHeader().setStretchLastSection(True)
+        self.main_layout.addWidget(self.result_table)
+
+        # 状态栏
+        self.status_label = BodyLabel(
+            get_content_name_async("lottery_batch", "placeholder")
+        )
+        self.main_layout.addWidget(self.status_label)
+
+    def bind_lottery_widget(self, lottery_widget):
+        """绑定抽奖页面，批量抽取使用该页面当前的奖池和筛选条件"""
+        self.lottery_widget = lottery_widget
+        self.update_per_round_label()
+
+    def update_per_round_label(self):
+        count = getattr(self.lottery_widget, "current_count", 1)
+        self.per_round_label.setText(
+            get_content_name_async("lottery_batch", "per_round_label").format(
+                count=count
+            )
+        )
+
+    def start_batch(self):
+        """开始批量抽取"""
+        widget = self.lottery_widget
+        if widget is None:
+            return
+        if getattr(widget, "is_animating", False) or getattr(
+            widget, "_batch_replay_timer", None
+        ):
+            self.status_label.setText(get_content_name_async("lottery_batch", "busy"))
+            return
+        self.update_per_round_label()
+        widget.start_batch_draw(self.rounds_spinbox.value(), self.on_batch_finished)
+
+    def on_batch_finished(self, batch):
+        """批量抽取完成"""
+        self.batch_result = batch
+        self.rows = batch.rows()
+        self.fill_table(self.rows)
+        self.export_button.setEnabled(bool(self.rows))
+
+        status = get_content_name_async("lottery_batch", "summary").format(
+            done=len(batch.rounds),
+            requested=batch.requested,
+            prizes=len(self.rows),
+            ms=f"{batch.elapsed_ms:.0f}",
+        )
+        if batch.stopped_reason:
+            status += " | " + get_content_name_async(
+                "lottery_batch", f"stopped_{batch.stopped_reason}"
+            )
+        self.status_label.setText(status)
+
+        if self.replay_switch.isChecked() and batch.rounds:
+            self.start_button.setEnabled(False)
+            self.lottery_widget.replay_batch_results(
+                batch, on_finished=lambda: self.start_button.setEnabled(True)
+            )
+
+    def fill_table(self, rows):
+        self.result_table.setUpdatesEnabled(False)
+        try:
+            self.result_table.setRowCount(len(rows))
+            for i, row in enumerate(rows):
+                values = (
+                    row["round"],
+                    row["prize_name"],
+                    row["student_name"],
+                    row["group_name"],
+                )
+                for j, value in enumerate(values):
+                    self.result_table.setItem(i, j, QTableWidgetItem(str(value)))
+            self.result_table.resizeColumnsToContents()
+        finally:
+            self.result_table.setUpdatesEnabled(True)
+
+    def export_results(self):
+        """导出批量抽奖结果"""
+        if not self.rows:
+            return
+        pool_name = self.batch_result.pool_name if self.batch_result else ""
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            get_content_name_async("lottery_batch", "export_caption"),
+            f"{pool_name}_批量抽奖结果-SecRandom",
+            get_content_name_async("lottery_batch", "export_filter"),
+        )
+        if not file_path:
+            return
+
+        export_type = "csv" if "*.csv" in selected_filter else "excel"
+        success, message = export_lottery_batch_results(
+            self.rows, file_path, export_type
+        )
+        if success:
+            logger.info(f"批量抽奖结果已导出: {file_path}")
+            show_notification(
+                NotificationType.SUCCESS,
+                NotificationConfig(
+                    title=get_content_name_async("lottery_batch", "title"),
+                    content=get_content_name_async(
+                        "lottery_batch", "export_success"
+                    ).format(path=file_path),
+                ),
+                parent=self.window(),
+            )
+        else:
+            show_notification(
+                NotificationType.ERROR,
+                NotificationConfig(
+                    title=get_content_name_async("lottery_batch", "title"),
+                    content=get_content_name_async(
+                        "lottery_batch", "export_failed"
+                    ).format(message=message),
+                ),
+                parent=self.window(),
+            )
+
+    def stop_replay(self):
+        """停止回放（窗口关闭时调用）"""
+        if self.lottery_widget is not None:
+            self.lottery_widget.stop_batch_replay()
+        self.start_button.setEnabled(True)
@@ -2,7 +2,6 @@
 # 导入库
 # ==================================================
 import re
-import json
 
 from loguru import logger
 from PySide6.QtWidgets import *
@@ -17,6 +16,7 @@ from app.tools.settings_default import *
 from app.tools.settings_access import *
 from app.Language.obtain_language import *
 from app.tools.config import *
+from app.tools.json_store import discard_pending_write, write_json
 from app.common.data.list import *
 
 
@@ -272,6 +272,7 @@ class SetPoolNameWindow(QWidget):
                     deleted_count = 0
                     for pool_name in deleted_pools:
                         pool_file = lottery_list_dir / f"{pool_name}.json"
+                        discard_pending_write(pool_file)
                         if pool_file.exists():
                             pool_file.unlink()
                             deleted_count += 1
@@ -280,6 +281,7 @@ class SetPoolNameWindow(QWidget):
                         from app.common.history import get_history_file_path
 
                         history_file_path = get_history_file_path("lottery", pool_name)
+                        discard_pending_write(history_file_path)
                         if history_file_path.exists():
                             history_file_path.unlink()
                             logger.info(f"已删除奖池 '{pool_name}' 的抽奖历史记录")
@@ -306,8 +308,7 @@ class SetPoolNameWindow(QWidget):
                 pool_file = lottery_list_dir / f"{pool_name}.json"
                 if not pool_file.exists():
                     # 创建空的奖池文件
-                    with open_file(pool_file, "w", encoding="utf-8") as f:
-                        json.dump({}, f, ensure_ascii=False, indent=4)
+                    write_json(pool_file, {})
                     created_count += 1
 
             # 显示成功消息
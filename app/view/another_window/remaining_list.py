@@ -5,50 +5,79 @@
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from loguru import logger
 from PySide6.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QRect,
+    QSize,
     Qt,
     QThread,
     QTimer,
     Signal,
 )
-from PySide6.QtGui import QFont
+from PySide6.QtGui import QColor, QFont, QPainter, QPen
 from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QListView,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
     QVBoxLayout,
     QWidget,
 )
 from qfluentwidgets import (
     BodyLabel,
-    ElevatedCardWidget,
+    ListView,
     SubtitleLabel,
-    ScrollArea,
 )
+from qfluentwidgets.common.config import isDarkTheme
 
 from app.Language.obtain_language import (
     get_any_position_value_async,
     get_content_name_async,
 )
-from app.tools.config import read_drawn_record, read_drawn_record_simple
+from app.tools.config import (
+    get_drawn_record_key,
+    get_drawn_record_signals,
+    read_drawn_record,
+    read_drawn_record_simple,
+)
+from app.tools.json_store import read_json
 from app.tools.path_utils import get_data_path, get_path
 from app.tools.personalised import load_custom_font
 from app.tools.variable import (
     APP_INIT_DELAY,
+    REMAINING_LIST_BATCH_SIZE,
     STUDENT_CARD_FIXED_HEIGHT,
     STUDENT_CARD_FIXED_WIDTH,
     STUDENT_CARD_MARGIN,
+    STUDENT_CARD_RADIUS,
     STUDENT_CARD_SPACING,
+    STUDENT_GROUP_CARD_HEIGHT,
 )
-from app.view.components.center_flow_layout import CenterFlowLayout
+
+
+def _is_remaining(
+    student: Dict[str, Any], drawn_counts: Dict[str, int], half_repeat: int
+) -> bool:
+    """判断学生（或小组）在当前半重复设置下是否仍在剩余名单中"""
+    if half_repeat <= 0:
+        return True
+    if student.get("is_group"):
+        return any(
+            drawn_counts.get(member.get("name", ""), 0) < half_repeat
+            for member in student.get("members", [])
+        )
+    return drawn_counts.get(student.get("name", ""), 0) < half_repeat
 
 
 class StudentLoader(QThread):
     """在后台线程中加载并预处理学生数据。"""
 
-    finished = Signal(list)
+    finished = Signal(list, dict)  # (预处理后的学生列表, {名称: 已抽取次数})
 
     def __init__(
         self,
@@ -75,6 +104,7 @@ class StudentLoader(QThread):
 
     def run(self) -> None:
         """执行完整的数据准备流程。"""
+        drawn_counts: Dict[str, int] = {}
         try:
             students = self._load_students()
             if self.isInterruptionRequested():
@@ -88,7 +118,8 @@ class StudentLoader(QThread):
             if self.isInterruptionRequested():
                 return
 
-            students = self._apply_half_repeat(students)
+            drawn_counts = self._read_drawn_counts()
+            students = self._apply_half_repeat(students, drawn_counts)
             if self.isInterruptionRequested():
                 return
 
@@ -97,11 +128,10 @@ class StudentLoader(QThread):
             logger.exception("Failed to process remaining students: {}", exc)
             prepared = []
 
-        self.finished.emit(prepared)
+        self.finished.emit(prepared, drawn_counts)
 
     def _load_students(self) -> List[Dict[str, Any]]:
-        with open(self._students_file, "r", encoding="utf-8") as src:
-            raw_data = json.load(src)
+        raw_data = read_json(self._students_file)
 
         students: List[Dict[str, Any]] = []
         for name, payload in raw_data.items():
@@ -180,11 +210,9 @@ class StudentLoader(QThread):
             ]
         return []
 
-    def _apply_half_repeat(
-        self, students: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+    def _read_drawn_counts(self) -> Dict[str, int]:
         if self._half_repeat <= 0:
-            return students
+            return {}
 
         try:
             if self._is_lottery:
@@ -197,22 +225,19 @@ class StudentLoader(QThread):
             logger.exception("Failed to read drawn records: {}", exc)
             drawn_records = []
 
-        drawn_counts = {name: count for name, count in drawn_records}
-        remaining: List[Dict[str, Any]] = []
-        for student in students:
-            if student.get("is_group"):
-                members = student.get("members", [])
-                has_remaining = any(
-                    drawn_counts.get(member.get("name", ""), 0) < self._half_repeat
-                    for member in members
-                )
-                if has_remaining:
-                    remaining.append(student)
-            else:
-                name = student.get("name", "")
-                if drawn_counts.get(name, 0) < self._half_repeat:
-                    remaining.append(student)
-        return remaining
+        return {name: count for name, count in drawn_records}
+
+    def _apply_half_repeat(
+        self, students: List[Dict[str, Any]], drawn_counts: Dict[str, int]
+    ) -> List[Dict[str, Any]]:
+        if self._half_repeat <= 0:
+            return students
+
+        return [
+            student
+            for student in students
+            if _is_remaining(student, drawn_counts, self._half_repeat)
+        ]
 
     def _prepare_student(self, student: Dict[str, Any]) -> Dict[str, Any]:
         prepared = dict(student)
@@ -253,6 +278,257 @@ class StudentLoader(QThread):
             )
 
 
+class RemainingListModel(QAbstractListModel):
+    """剩余名单数据模型，每一行对应一个学生或小组的预处理字典"""
+
+    StudentRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._items: List[Dict[str, Any]] = []
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: B008
+        if parent.isValid():
+            return 0
+        return len(self._items)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._items):
+            return None
+        item = self._items[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return item.get("name", "")
+        if role == self.StudentRole:
+            return item
+        return None
+
+    def items(self) -> List[Dict[str, Any]]:
+        return self._items
+
+    def set_items(self, items: List[Dict[str, Any]]) -> None:
+        self.beginResetModel()
+        self._items = list(items)
+        self.endResetModel()
+
+    def remove_where(self, predicate: Callable[[Dict[str, Any]], bool]) -> int:
+        """移除满足条件的行，连续的行合并为一次移除
+
+        Returns:
+            int: 移除的行数
+        """
+        rows = [row for row, item in enumerate(self._items) if predicate(item)]
+        if not rows:
+            return 0
+
+        # 从后往前按连续区间移除，避免行号偏移
+        end = rows[-1]
+        start = end
+        for row in reversed(rows[:-1]):
+            if row == start - 1:
+                start = row
+                continue
+            self._remove_range(start, end)
+            start = end = row
+        self._remove_range(start, end)
+        return len(rows)
+
+    def _remove_range(self, start: int, end: int) -> None:
+        self.beginRemoveRows(QModelIndex(), start, end)
+        del self._items[start : end + 1]
+        self.endRemoveRows()
+
+
+class RemainingCardDelegate(QStyledItemDelegate):
+    """剩余名单卡片绘制委托，直接绘制卡片而不为每个学生创建组件"""
+
+    def __init__(
+        self,
+        font_family: Optional[str],
+        info_template: Optional[str],
+        parent=None,
+    ) -> None:
+        super().__init__(parent)
+        family = font_family or ""
+        self._info_template = info_template or "{id} {gender} {group}"
+        self._name_font = QFont(family, 14)
+        self._group_name_font = QFont(family, 16, QFont.Weight.Bold)
+        self._count_font = QFont(family, 10)
+        self._info_font = QFont(family, 9)
+
+    @staticmethod
+    def card_size(is_group: bool) -> QSize:
+        if is_group:
+            return QSize(STUDENT_CARD_FIXED_WIDTH, STUDENT_GROUP_CARD_HEIGHT)
+        return QSize(STUDENT_CARD_FIXED_WIDTH, STUDENT_CARD_FIXED_HEIGHT)
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        student = index.data(RemainingListModel.StudentRole) or {}
+        return self.card_size(bool(student.get("is_group", False)))
+
+    def paint(
+        self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex
+    ) -> None:
+        student = index.data(RemainingListModel.StudentRole)
+        if not student:
+            return
+
+        is_group = bool(student.get("is_group", False))
+        size = self.card_size(is_group)
+        rect = QRect(0, 0, size.width(), size.height())
+        rect.moveCenter(option.rect.center())
+
+        dark = isDarkTheme()
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        painter.setPen(QPen(QColor(255, 255, 255, 21) if dark else QColor(0, 0, 0, 19)))
+        painter.setBrush(
+            QColor(255, 255, 255, 13) if dark else QColor(255, 255, 255, 170)
+        )
+        painter.drawRoundedRect(
+            rect.adjusted(1, 1, -1, -1), STUDENT_CARD_RADIUS, STUDENT_CARD_RADIUS
+        )
+
+        painter.setPen(QColor(255, 255, 255) if dark else QColor(0, 0, 0))
+        content = rect.adjusted(
+            STUDENT_CARD_MARGIN,
+            STUDENT_CARD_MARGIN,
+            -STUDENT_CARD_MARGIN,
+            -STUDENT_CARD_MARGIN,
+        )
+        if is_group:
+            self._paint_group(painter, content, student)
+        else:
+            self._paint_student(painter, content, student)
+        painter.restore()
+
+    def _paint_student(
+        self, painter: QPainter, rect: QRect, student: Dict[str, Any]
+    ) -> None:
+        info_text = student.get("info_text_pre", "")
+        if not info_text:
+            try:
+                info_text = self._info_template.format(
+                    id=student.get("id", ""),
+                    gender=student.get("gender", ""),
+                    group=student.get("group", ""),
+                )
+            except Exception:
+                info_text = f"{student.get('id', '')} {student.get('gender', '')} {student.get('group', '')}"
+
+        name_height = rect.height() * 3 // 5
+        name_rect = QRect(rect.left(), rect.top(), rect.width(), name_height)
+        info_rect = QRect(
+            rect.left(),
+            rect.top() + name_height,
+            rect.width(),
+            rect.height() - name_height,
+        )
+
+        painter.setFont(self._name_font)
+        painter.drawText(
+            name_rect,
+            Qt.AlignmentFlag.AlignCenter,
+            painter.fontMetrics().elidedText(
+                student.get("name", ""), Qt.TextElideMode.ElideRight, rect.width()
+            ),
+        )
+        painter.setFont(self._info_font)
+        painter.drawText(
+            info_rect,
+            Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop,
+            painter.fontMetrics().elidedText(
+                info_text, Qt.TextElideMode.ElideRight, rect.width()
+            ),
+        )
+
+    def _paint_group(
+        self, painter: QPainter, rect: QRect, student: Dict[str, Any]
+    ) -> None:
+        members = student.get("members", [])
+        members_count = student.get("members_count") or len(members)
+        members_text = student.get("members_text_pre", "")
+        if not members_text and members:
+            members_names = [member.get("name", "") for member in members[:5]]
+            members_text = "、".join(members_names)
+            if len(members) > 5:
+                members_text += f" 等{len(members) - 5}名成员"
+
+        top = rect.top()
+        painter.setFont(self._group_name_font)
+        line_height = painter.fontMetrics().height()
+        painter.drawText(
+            QRect(rect.left(), top, rect.width(), line_height),
+            Qt.AlignmentFlag.AlignCenter,
+            painter.fontMetrics().elidedText(
+                student.get("name", ""), Qt.TextElideMode.ElideRight, rect.width()
+            ),
+        )
+        top += line_height + 8
+
+        painter.setFont(self._count_font)
+        line_height = painter.fontMetrics().height()
+        painter.drawText(
+            QRect(rect.left(), top, rect.width(), line_height),
+            Qt.AlignmentFlag.AlignCenter,
+            f"成员数量: {members_count}",
+        )
+        top += line_height + 8
+
+        painter.setFont(self._info_font)
+        painter.drawText(
+            QRect(rect.left(), top, rect.width(), max(0, rect.bottom() - top)),
+            Qt.AlignmentFlag.AlignLeft
+            | Qt.AlignmentFlag.AlignTop
+            | Qt.TextFlag.TextWordWrap,
+            members_text,
+        )
+
+
+class RemainingListView(ListView):
+    """剩余名单视图：按窗口宽度自动换行排列卡片，并使整行卡片水平居中"""
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._side_margin = -1
+        self.setViewMode(QListView.ViewMode.IconMode)
+        self.setFlow(QListView.Flow.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setMovement(QListView.Movement.Static)
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(REMAINING_LIST_BATCH_SIZE)
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.set_card_size(RemainingCardDelegate.card_size(False))
+
+    def set_card_size(self, size: QSize) -> None:
+        grid = QSize(
+            size.width() + STUDENT_CARD_SPACING, size.height() + STUDENT_CARD_SPACING
+        )
+        if grid != self.gridSize():
+            self.setGridSize(grid)
+            self._side_margin = -1
+            self._update_side_margin()
+
+    def resizeEvent(self, event) -> None:  # type: ignore[override]
+        super().resizeEvent(event)
+        self._update_side_margin()
+
+    def _update_side_margin(self) -> None:
+        grid_width = self.gridSize().width()
+        if grid_width <= 0:
+            return
+        available = self.width() - 2 * self.frameWidth()
+        columns = max(1, available // grid_width)
+        side_margin = max(0, (available - columns * grid_width) // 2)
+        if side_margin != self._side_margin:
+            self._side_margin = side_margin
+            self.setViewportMargins(side_margin, 0, side_margin, 0)
+
+
 class RemainingListPage(QWidget):
     """剩余名单页面类"""
 
@@ -270,23 +546,17 @@ class RemainingListPage(QWidget):
         self.group_index = 0
         self.gender_index = 0
         self.source = source
-        self.students: List[Dict[str, Any]] = []
-        self.cards: List[ElevatedCardWidget] = []
         self._loading_thread: Optional[StudentLoader] = None
 
+        # 已加载数据对应的参数与名单文件版本，参数不变时不再整体重新加载
+        self._loaded_key: Optional[tuple] = None
+        self._drawn_counts: Dict[str, int] = {}
+
         self._load_timer = QTimer(self)
         self._load_timer.setSingleShot(True)
         self._load_timer.timeout.connect(self.load_data)
         self._load_timer.start(APP_INIT_DELAY)
 
-        # 布局状态
-        self._last_layout_width = 0
-        self._last_card_count = 0
-        self._layout_update_in_progress = False
-        self._resize_timer = QTimer(self)
-        self._resize_timer.setSingleShot(True)
-        self._resize_timer.timeout.connect(self._delayed_update_layout)
-
         # 缓存资源
         try:
             self._font_family = load_custom_font()
@@ -300,6 +570,14 @@ class RemainingListPage(QWidget):
 
         self.init_ui()
 
+        record_signals = get_drawn_record_signals()
+        record_signals.recordUpdated.connect(self._on_drawn_record_updated)
+        record_signals.recordCleared.connect(self._on_drawn_record_cleared)
+
+    @property
+    def students(self) -> List[Dict[str, Any]]:
+        return self.model.items()
+
     # ------------------------------------------------------------------
     # 生命周期管理
     # ------------------------------------------------------------------
@@ -327,11 +605,6 @@ class RemainingListPage(QWidget):
                 self._load_timer.stop()
         except Exception:
             pass
-        try:
-            if self._resize_timer.isActive():
-                self._resize_timer.stop()
-        except Exception:
-            pass
         self.stop_loader()
         super().closeEvent(event)
 
@@ -368,26 +641,6 @@ class RemainingListPage(QWidget):
         self.count_label.setFont(QFont(self._font_family or "", 12))
         self.main_layout.addWidget(self.count_label)
 
-        # 滚动区域
-        self.scroll_area = ScrollArea(self)
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(
-            Qt.ScrollBarPolicy.ScrollBarAlwaysOff
-        )
-        self.main_layout.addWidget(self.scroll_area)
-
-        # 滚动区域内部容器
-        self.scroll_content = QWidget()
-        self.scroll_area.setWidget(self.scroll_content)
-
-        # 流式布局
-        self.flow_layout = CenterFlowLayout(self.scroll_content)
-        self.flow_layout.setHorizontalSpacing(STUDENT_CARD_SPACING)
-        self.flow_layout.setVerticalSpacing(STUDENT_CARD_SPACING)
-        self.flow_layout.setAlignment(Qt.AlignmentFlag.AlignHCenter)
-        self.flow_layout.setContentsMargins(10, 10, 10, 10)
-        self.scroll_content.setLayout(self.flow_layout)
-
         try:
             self._student_info_text = get_any_position_value_async(
                 "remaining_list", "student_info", "name"
@@ -395,6 +648,16 @@ class RemainingListPage(QWidget):
         except Exception:
             self._student_info_text = "{id} {gender} {group}"
 
+        # 模型/视图：只绘制可见的卡片
+        self.model = RemainingListModel(self)
+        self.delegate = RemainingCardDelegate(
+            self._font_family, self._student_info_text, self
+        )
+        self.list_view = RemainingListView(self)
+        self.list_view.setModel(self.model)
+        self.list_view.setItemDelegate(self.delegate)
+        self.main_layout.addWidget(self.list_view)
+
     # ------------------------------------------------------------------
     # 数据加载
     # ------------------------------------------------------------------
@@ -425,6 +688,23 @@ class RemainingListPage(QWidget):
         logger.warning("未找到班级/奖池对应的名单文件: {}", class_name)
         return None
 
+    def _build_loaded_key(self, data_file: Optional[Path]) -> tuple:
+        try:
+            mtime = data_file.stat().st_mtime_ns if data_file else None
+        except OSError:
+            mtime = None
+        return (
+            self.class_name,
+            self.group_filter,
+            self.gender_filter,
+            self.half_repeat,
+            self.group_index,
+            self.gender_index,
+            self.source,
+            str(data_file) if data_file else None,
+            mtime,
+        )
+
     def load_data(self) -> None:
         if self._closing:
             return
@@ -435,11 +715,13 @@ class RemainingListPage(QWidget):
         self.stop_loader()
         data_file = self.get_students_file()
         if not data_file:
-            self.students = []
-            self._clear_cards()
+            self._loaded_key = None
+            self._drawn_counts = {}
+            self.model.set_items([])
             self.count_label.setText(self._count_label_template.format(count=0))
             return
 
+        self._loaded_key = self._build_loaded_key(data_file)
         loader = StudentLoader(
             str(data_file),
             self.class_name,
@@ -456,15 +738,59 @@ class RemainingListPage(QWidget):
         self._loading_thread = loader
         loader.start()
 
-    def _on_students_loaded(self, students_list: List[Dict[str, Any]]) -> None:
+    def _on_students_loaded(
+        self, students_list: List[Dict[str, Any]], drawn_counts: Dict[str, int]
+    ) -> None:
         if self._closing:
             self._loading_thread = None
             return
-        self.students = list(students_list or [])
+        self._drawn_counts = dict(drawn_counts or {})
+        students = list(students_list or [])
+        if students:
+            self.list_view.set_card_size(
+                RemainingCardDelegate.card_size(bool(students[0].get("is_group")))
+            )
+        self.model.set_items(students)
         self.update_ui()
         self.count_changed.emit(self._calculate_remaining_count())
         self._loading_thread = None
 
+    # ------------------------------------------------------------------
+    # 增量更新
+    # ------------------------------------------------------------------
+    def _current_record_key(self) -> str:
+        return get_drawn_record_key(
+            self.source, self.class_name, self.gender_filter, self.group_filter
+        )
+
+    def _on_drawn_record_updated(self, record_key: str, counts: Dict[str, int]) -> None:
+        """抽取记录更新时只移除达到半重复次数的学生，不重新加载名单"""
+        if self._closing or not self.class_name or self.half_repeat <= 0:
+            return
+        if record_key != self._current_record_key():
+            return
+        if self._loading_thread is not None:
+            # 加载线程可能读到了写入前的记录，重新加载以保证一致
+            self.load_data()
+            return
+
+        self._drawn_counts.update(counts or {})
+        half_repeat = self.half_repeat
+        drawn_counts = self._drawn_counts
+        removed = self.model.remove_where(
+            lambda student: not _is_remaining(student, drawn_counts, half_repeat)
+        )
+        if removed:
+            self.update_ui()
+            self.count_changed.emit(self._calculate_remaining_count())
+
+    def _on_drawn_record_cleared(self, record_key: str) -> None:
+        if self._closing or not self.class_name:
+            return
+        if record_key and record_key != self._current_record_key():
+            return
+        self.refresh()
+
     # ------------------------------------------------------------------
     # UI 更新
     # ------------------------------------------------------------------
@@ -487,11 +813,12 @@ class RemainingListPage(QWidget):
             )
 
     def _calculate_remaining_count(self) -> int:
-        if not self.students:
+        students = self.students
+        if not students:
             return 0
-        if any(student.get("is_group", False) for student in self.students):
+        if any(student.get("is_group", False) for student in students):
             total = 0
-            for student in self.students:
+            for student in students:
                 if student.get("is_group"):
                     total += student.get("members_count") or len(
                         student.get("members", [])
@@ -499,7 +826,7 @@ class RemainingListPage(QWidget):
                 else:
                     total += 1
             return total
-        return len(self.students)
+        return len(students)
 
     def update_ui(self) -> None:
         self._ensure_templates()
@@ -511,166 +838,6 @@ class RemainingListPage(QWidget):
             self._count_label_template.format(count=remaining_count)
         )
 
-        # 清空现有卡片
-        self._clear_cards()
-
-        # 创建卡片
-        for student in self.students:
-            card = self._create_student_card(student)
-            if card:
-                self.cards.append(card)
-
-        # 更新布局
-        self._update_grid_layout()
-
-    def _clear_cards(self) -> None:
-        for card in self.cards:
-            try:
-                card.hide()
-                card.deleteLater()
-            except Exception:
-                pass
-        self.cards.clear()
-
-        if hasattr(self, "flow_layout") and self.flow_layout is not None:
-            self.flow_layout.removeAllWidgets()
-
-    def _update_grid_layout(self) -> None:
-        if not self.cards:
-            return
-
-        if not hasattr(self, "flow_layout") or self.flow_layout is None:
-            return
-
-        self.flow_layout.removeAllWidgets()
-        for card in self.cards:
-            self.flow_layout.addWidget(card)
-            card.show()
-
-        self._last_layout_width = self.scroll_area.width()
-        self._last_card_count = len(self.cards)
-
-    def _create_student_card(
-        self, student: Dict[str, Any]
-    ) -> Optional[ElevatedCardWidget]:
-        """创建学生卡片"""
-        is_group = student.get("is_group", False)
-
-        card = ElevatedCardWidget()
-        card.setProperty("is_group", is_group)
-
-        if is_group:
-            card.setMinimumSize(STUDENT_CARD_FIXED_WIDTH, 0)
-            card.setMaximumSize(STUDENT_CARD_FIXED_WIDTH, 500)
-            layout = QVBoxLayout(card)
-            layout.setContentsMargins(
-                STUDENT_CARD_MARGIN,
-                STUDENT_CARD_MARGIN,
-                STUDENT_CARD_MARGIN,
-                STUDENT_CARD_MARGIN,
-            )
-            layout.setSpacing(8)
-
-            # 小组名称
-            name_label = BodyLabel(student["name"])
-            if self._font_family:
-                name_label.setFont(QFont(self._font_family, 16, QFont.Weight.Bold))
-            name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            name_label.setWordWrap(True)
-            layout.addWidget(name_label)
-
-            # 成员数量
-            members = student.get("members", [])
-            count_label = BodyLabel(f"成员数量: {len(members)}")
-            if self._font_family:
-                count_label.setFont(QFont(self._font_family, 10))
-            count_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            layout.addWidget(count_label)
-
-            # 成员列表
-            members_text = student.get("members_text_pre", "")
-            if not members_text and members:
-                members_names = [member.get("name", "") for member in members[:5]]
-                members_text = "、".join(members_names)
-                if len(members) > 5:
-                    members_text += f" 等{len(members) - 5}名成员"
-
-            members_label = BodyLabel(members_text)
-            if self._font_family:
-                members_label.setFont(QFont(self._font_family, 9))
-            members_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
-            members_label.setWordWrap(True)
-            layout.addWidget(members_label)
-        else:
-            card.setFixedSize(STUDENT_CARD_FIXED_WIDTH, STUDENT_CARD_FIXED_HEIGHT)
-
-            layout = QVBoxLayout(card)
-            layout.setContentsMargins(
-                STUDENT_CARD_MARGIN,
-                STUDENT_CARD_MARGIN,
-                STUDENT_CARD_MARGIN,
-                STUDENT_CARD_MARGIN,
-            )
-            layout.setSpacing(5)
-
-            # 学生姓名
-            name_label = BodyLabel(student.get("name", ""))
-            if self._font_family:
-                name_label.setFont(QFont(self._font_family, 14))
-            else:
-                name_label.setFont(QFont("", 14))
-            name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            layout.addWidget(name_label)
-
-            # 学生信息
-            info_text = student.get("info_text_pre", "")
-            if not info_text:
-                template = self._student_info_text or "{id} {gender} {group}"
-                try:
-                    info_text = template.format(
-                        id=student.get("id", ""),
-                        gender=student.get("gender", ""),
-                        group=student.get("group", ""),
-                    )
-                except Exception:
-                    info_text = f"{student.get('id', '')} {student.get('gender', '')} {student.get('group', '')}"
-
-            info_label = BodyLabel(info_text)
-            if self._font_family:
-                info_label.setFont(QFont(self._font_family, 9))
-            else:
-                info_label.setFont(QFont("", 9))
-            info_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            layout.addWidget(info_label)
-
-        return card
-
-    # ------------------------------------------------------------------
-    # 窗口大小处理
-    # ------------------------------------------------------------------
-    def resizeEvent(self, event) -> None:  # type: ignore[override]
-        new_size = event.size()
-        old_size = event.oldSize()
-
-        if new_size == old_size:
-            return
-
-        width_change = abs(new_size.width() - self._last_layout_width)
-        if width_change < 5:
-            return
-
-        if self._resize_timer is not None:
-            self._resize_timer.stop()
-        self._resize_timer.start(200)
-        super().resizeEvent(event)
-
-    def _delayed_update_layout(self) -> None:
-        try:
-            if self.isVisible() and self.cards:
-                self._update_grid_layout()
-        except RuntimeError as e:
-            logger.exception(f"延迟布局更新错误: {e}")
-
     # ------------------------------------------------------------------
     # 外部接口
     # ------------------------------------------------------------------
@@ -692,14 +859,18 @@ class RemainingListPage(QWidget):
         self.group_index = group_index
         self.gender_index = gender_index
         self.source = source
-        self._last_layout_width = 0
-        self._last_card_count = 0
+
+        # 参数和名单文件均未变化时，抽取记录的变化已通过信号增量更新
+        if (
+            self._loaded_key is not None
+            and self._loading_thread is None
+            and self._loaded_key == self._build_loaded_key(self.get_students_file())
+        ):
+            return
         self.load_data()
 
     def refresh(self) -> None:
         if self.class_name:
-            self._last_layout_width = 0
-            self._last_card_count = 0
             self.load_data()
 
     def on_count_changed(self, count: int) -> None:  # noqa: ARG002
@@ -2,7 +2,6 @@
 # 导入库
 # ==================================================
 import re
-import json
 
 from loguru import logger
 from PySide6.QtWidgets import *
@@ -17,6 +16,7 @@ from app.tools.settings_default import *
 from app.tools.settings_access import *
 from app.Language.obtain_language import *
 from app.tools.config import *
+from app.tools.json_store import read_json, write_json
 from app.common.data.list import *
 
 
@@ -117,8 +117,7 @@ class GenderSettingWindow(QWidget):
                 return []
 
             # 读取文件内容
-            with open_file(list_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = read_json(list_file)
 
             # 获取所有性别（从每个学生的gender字段）
             genders = []
@@ -253,8 +252,7 @@ class GenderSettingWindow(QWidget):
             # 读取现有数据
             existing_data = {}
             if list_file.exists():
-                with open_file(list_file, "r", encoding="utf-8") as f:
-                    existing_data = json.load(f)
+                existing_data = read_json(list_file)
 
             # 如果性别没有新增
             existing_genders = []
@@ -284,8 +282,7 @@ class GenderSettingWindow(QWidget):
                     updated_data[student_name]["gender"] = ""
 
             # 保存到文件
-            with open_file(list_file, "w", encoding="utf-8") as f:
-                json.dump(updated_data, f, ensure_ascii=False, indent=4)
+            write_json(list_file, updated_data)
 
             # 显示保存成功通知
             config = NotificationConfig(
@@ -2,7 +2,6 @@
 # 导入库
 # ==================================================
 import re
-import json
 
 from loguru import logger
 from PySide6.QtWidgets import *
@@ -17,6 +16,7 @@ from app.tools.settings_default import *
 from app.tools.settings_access import *
 from app.Language.obtain_language import *
 from app.tools.config import *
+from app.tools.json_store import discard_pending_write, write_json
 from app.common.data.list import *
 
 
@@ -272,6 +272,7 @@ class SetClassNameWindow(QWidget):
                     deleted_count = 0
                     for class_name in deleted_classes:
                         class_file = roll_call_list_dir / f"{class_name}.json"
+                        discard_pending_write(class_file)
                         if class_file.exists():
                             class_file.unlink()
                             deleted_count += 1
@@ -282,6 +283,7 @@ class SetClassNameWindow(QWidget):
                         history_file_path = get_history_file_path(
                             "roll_call", class_name
                         )
+                        discard_pending_write(history_file_path)
                         if history_file_path.exists():
                             history_file_path.unlink()
                             logger.info(f"已删除班级 '{class_name}' 的点名历史记录")
@@ -308,8 +310,7 @@ class SetClassNameWindow(QWidget):
                 class_file = roll_call_list_dir / f"{class_name}.json"
                 if not class_file.exists():
                     # 创建空的班级文件
-                    with open_file(class_file, "w", encoding="utf-8") as f:
-                        json.dump({}, f, ensure_ascii=False, indent=4)
+                    write_json(class_file, {})
                     created_count += 1
 
             # 显示成功消息
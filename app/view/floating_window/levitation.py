@@ -20,13 +20,24 @@ from app.tools.settings_access import (
     update_settings,
     get_settings_signals,
 )
+from app.tools.json_store import flush_json_writes
+from app.tools.log_control import flush_log_queues
 from app.tools.path_utils import *
 from app.tools.variable import EXIT_CODE_RESTART, DEFAULT_ICON_CODEPOINT
 from app.Language.obtain_language import (
     get_content_name_async,
     get_content_combo_name_async,
 )
-from app.common.extraction.extract import _is_non_class_time
+from app.common.extraction.extract import (
+    _get_seconds_to_next_non_class_boundary,
+    _is_non_class_time,
+)
+from app.common.windows.foreground_watcher import (
+    ForegroundInfo,
+    get_foreground_watcher,
+    query_foreground_info,
+)
+from app.tools.event_scheduler import subscribe_boundary
 from app.common.safety.verify_ops import require_and_run
 from app.common.data.list import get_class_name_list, get_group_list, get_gender_list
 
@@ -168,13 +179,8 @@ class LevitationWindow(QWidget):
         )
 
     def _init_periodic_topmost_properties(self):
-        """初始化周期性置顶相关属性"""
-        self._periodic_topmost_timer = QTimer(self)
-        self._periodic_topmost_timer.timeout.connect(self._periodic_topmost)
-        self._periodic_topmost_interval = 100
-        self._uia_topmost_timer = QTimer(self)
-        self._uia_topmost_timer.timeout.connect(self._uia_keep_topmost)
-        self._uia_topmost_interval = 250
+        """初始化置顶相关属性（前台窗口变化时重新置顶，而非定时轮询）"""
+        self._topmost_subscription = None
         self._uiaccess_funcs = None
         self._uia_last_error_ms = 0
         self._uia_last_error_text = ""
@@ -222,17 +228,35 @@ class LevitationWindow(QWidget):
         if app is not None:
             app.exit(EXIT_CODE_RESTART)
             return
+        flush_json_writes()
+        flush_log_queues()
         os._exit(EXIT_CODE_RESTART)
 
     def _start_periodic_topmost(self):
-        """启动周期性置顶定时器"""
+        """启动置顶订阅"""
         self._apply_topmost_runtime()
 
     def _periodic_topmost(self):
-        """周期性将窗口置顶"""
+        """将窗口置顶"""
         if self.isVisible() and getattr(self, "_topmost_mode", 1) != 0:
             self.raise_()
 
+    def _on_topmost_foreground_changed(self, info: ForegroundInfo):
+        """其他窗口切换到前台时可能遮挡浮窗，此时重新置顶"""
+        self._periodic_topmost()
+        self._uia_keep_topmost()
+
+    def _set_topmost_subscribed(self, enabled: bool):
+        subscription = getattr(self, "_topmost_subscription", None)
+        if enabled:
+            if subscription is None or not subscription.active:
+                self._topmost_subscription = get_foreground_watcher().subscribe(
+                    self._on_topmost_foreground_changed, name="floating_topmost"
+                )
+        elif subscription is not None:
+            subscription.cancel()
+            self._topmost_subscription = None
+
     def _is_admin(self) -> bool:
         try:
             return bool(ctypes.windll.shell32.IsUserAnAdmin())
@@ -275,13 +299,8 @@ class LevitationWindow(QWidget):
         except Exception:
             pass
         if mode == 0:
-            if self._periodic_topmost_timer.isActive():
-                self._periodic_topmost_timer.stop()
-            if self._uia_topmost_timer.isActive():
-                self._uia_topmost_timer.stop()
+            self._set_topmost_subscribed(False)
         else:
-            if not self._periodic_topmost_timer.isActive():
-                self._periodic_topmost_timer.start(self._periodic_topmost_interval)
             if mode == 2 and self.isVisible():
                 _, is_uiaccess, _ = self._get_uiaccess_funcs()
                 if is_uiaccess is not None:
@@ -292,11 +311,8 @@ class LevitationWindow(QWidget):
                             return
                     except Exception:
                         pass
-                if not self._uia_topmost_timer.isActive():
-                    self._uia_topmost_timer.start(self._uia_topmost_interval)
-            else:
-                if self._uia_topmost_timer.isActive():
-                    self._uia_topmost_timer.stop()
+            # 隐藏时无需置顶，取消订阅以免空闲时被唤醒
+            self._set_topmost_subscribed(bool(self.isVisible()))
 
         if hasattr(self, "arrow_widget") and self.arrow_widget:
             try:
@@ -721,22 +737,25 @@ class LevitationWindow(QWidget):
         self._pre_class_hide_main_visible = False
         self._pre_class_hide_storage_visible = False
 
-        # 定时检查器（默认 30 秒）
-        self._class_hide_timer = QTimer(self)
-        self._class_hide_timer.setInterval(30 * 1000)
-        self._class_hide_timer.timeout.connect(self._check_class_end_hide)
-        self._apply_class_hide_timer_state()
+        # 只在上下课时间边界检查，边界之间不唤醒
+        self._class_hide_subscription = None
+        self._apply_class_hide_subscription_state()
 
-    def _apply_class_hide_timer_state(self):
+    def _apply_class_hide_subscription_state(self):
         try:
+            subscription = getattr(self, "_class_hide_subscription", None)
+            if subscription is not None:
+                subscription.cancel()
+                self._class_hide_subscription = None
             if bool(getattr(self, "_hide_on_class_end_enabled", False)):
-                if not self._class_hide_timer.isActive():
-                    self._class_hide_timer.start()
-                QTimer.singleShot(0, self._check_class_end_hide)
+                # 重新订阅会立即检查一次并重新计算下一个边界
+                self._class_hide_subscription = subscribe_boundary(
+                    "floating_class_end_hide",
+                    _get_seconds_to_next_non_class_boundary,
+                    self._check_class_end_hide,
+                    parent=self,
+                )
             else:
-                if hasattr(self, "_class_hide_timer") and self._class_hide_timer:
-                    if self._class_hide_timer.isActive():
-                        self._class_hide_timer.stop()
                 # 如果设置被关闭，确保恢复先前的可见性
                 self._apply_class_hidden(False)
         except Exception:
@@ -869,24 +888,23 @@ class LevitationWindow(QWidget):
         self._pre_foreground_hide_storage_visible = False
         self._suppress_visibility_tracking = False
 
-        self._foreground_hide_timer = QTimer(self)
-        self._foreground_hide_timer.setInterval(250)
-        self._foreground_hide_timer.timeout.connect(self._check_foreground_hide)
-        self._apply_foreground_hide_timer_state()
+        self._foreground_hide_subscription = None
+        self._apply_foreground_hide_subscription_state()
 
-    def _apply_foreground_hide_timer_state(self):
+    def _apply_foreground_hide_subscription_state(self):
         try:
+            subscription = getattr(self, "_foreground_hide_subscription", None)
+            if subscription is not None:
+                subscription.cancel()
+                self._foreground_hide_subscription = None
             if bool(getattr(self, "_hide_on_foreground_enabled", False)):
-                if not self._foreground_hide_timer.isActive():
-                    self._foreground_hide_timer.start()
-                QTimer.singleShot(0, self._check_foreground_hide)
+                # 配置了窗口标题时，同一窗口的标题变化也需要通知
+                self._foreground_hide_subscription = get_foreground_watcher().subscribe(
+                    self._check_foreground_hide,
+                    name="floating_foreground_hide",
+                    watch_titles=bool(self._hide_on_foreground_titles),
+                )
             else:
-                if (
-                    hasattr(self, "_foreground_hide_timer")
-                    and self._foreground_hide_timer
-                ):
-                    if self._foreground_hide_timer.isActive():
-                        self._foreground_hide_timer.stop()
                 self._apply_foreground_hidden(False)
         except Exception:
             pass
@@ -904,39 +922,18 @@ class LevitationWindow(QWidget):
         return items
 
     def _get_foreground_info(self) -> tuple[str, str, int]:
-        try:
-            user32 = ctypes.WinDLL("user32", use_last_error=True)
-            hwnd = user32.GetForegroundWindow()
-            if not hwnd:
-                return "", "", 0
-
-            length = int(user32.GetWindowTextLengthW(hwnd) or 0)
-            buf = ctypes.create_unicode_buffer(length + 1)
-            user32.GetWindowTextW(hwnd, buf, length + 1)
-            title = str(buf.value or "")
+        watcher = get_foreground_watcher()
+        info = watcher.current() if watcher.backend_name else query_foreground_info()
+        return info.title, info.process_name, info.pid
 
-            pid = ctypes.c_ulong(0)
-            user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
-            pid_int = int(pid.value or 0)
-
-            process_name = ""
-            try:
-                if pid_int and pid_int != os.getpid():
-                    import psutil
-
-                    process_name = str(psutil.Process(pid_int).name() or "")
-            except Exception:
-                process_name = ""
-
-            return title, process_name, pid_int
-        except Exception:
-            return "", "", 0
-
-    def _check_foreground_hide(self):
+    def _check_foreground_hide(self, info: ForegroundInfo | None = None):
         if not bool(getattr(self, "_hide_on_foreground_enabled", False)):
             return
 
-        title, proc, pid = self._get_foreground_info()
+        if info is None:
+            title, proc, pid = self._get_foreground_info()
+        else:
+            title, proc, pid = info.title, info.process_name, info.pid
         if pid == os.getpid():
             self._apply_foreground_hidden(False)
             return
@@ -1202,8 +1199,21 @@ class LevitationWindow(QWidget):
                 return
         except Exception:
             pass
+        self._cancel_event_subscriptions()
         return super().closeEvent(event)
 
+    def _cancel_event_subscriptions(self):
+        """取消置顶、下课隐藏和前台窗口隐藏的事件订阅"""
+        for attr in (
+            "_topmost_subscription",
+            "_class_hide_subscription",
+            "_foreground_hide_subscription",
+        ):
+            subscription = getattr(self, attr, None)
+            if subscription is not None:
+                subscription.cancel()
+                setattr(self, attr, None)
+
     def _apply_position(self):
         x = int(readme_settings_async("float_position", "x") or 100)
         y = int(readme_settings_async("float_position", "y") or 100)
@@ -3004,13 +3014,14 @@ class LevitationWindow(QWidget):
                     pass
             elif second == "hide_floating_window_on_foreground":
                 self._hide_on_foreground_enabled = bool(value)
-                self._apply_foreground_hide_timer_state()
+                self._apply_foreground_hide_subscription_state()
             elif second == "hide_floating_window_on_foreground_window_titles":
                 self._hide_on_foreground_title_raw = str(value or "")
                 self._hide_on_foreground_titles = self._split_match_list(
                     self._hide_on_foreground_title_raw
                 )
-                QTimer.singleShot(0, self._check_foreground_hide)
+                # 是否需要监听标题变化可能随之改变，重新订阅
+                self._apply_foreground_hide_subscription_state()
             elif second == "hide_floating_window_on_foreground_process_names":
                 self._hide_on_foreground_process_raw = str(value or "")
                 self._hide_on_foreground_processes = self._split_match_list(
@@ -3026,8 +3037,15 @@ class LevitationWindow(QWidget):
                     self._hide_on_class_end_enabled = bool(value)
                 except Exception:
                     self._hide_on_class_end_enabled = False
-                self._apply_class_hide_timer_state()
-            # 其他 linkage 设置目前不在此处处理
+                self._apply_class_hide_subscription_state()
+            elif second in (
+                "instant_draw_disable",
+                "data_source",
+                "pre_class_enable_time",
+                "post_class_disable_delay",
+            ) and bool(getattr(self, "_hide_on_class_end_enabled", False)):
+                # 影响上下课判断的设置变化后，重新检查并计算下一个边界
+                self._apply_class_hide_subscription_state()
             return
         elif first == "float_position":
             if second == "x":
@@ -83,9 +83,8 @@ class Lottery(QWidget):
     def closeEvent(self, event):
         """窗口关闭事件，清理资源"""
         try:
-            if hasattr(self, "file_watcher"):
-                self.file_watcher.removePaths(self.file_watcher.directories())
-                self.file_watcher.removePaths(self.file_watcher.files())
+            for subscription in getattr(self, "file_subscriptions", []):
+                subscription.cancel()
             # 停止长按定时器
             if hasattr(self, "press_timer"):
                 self.press_timer.stop()
@@ -225,6 +224,11 @@ class Lottery(QWidget):
         self._set_widget_font(self.start_button, 15)
         self.start_button.setFixedHeight(45)
         self.start_button.clicked.connect(lambda: self.start_draw())
+        # 右键菜单：批量抽取
+        self.start_button.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.start_button.customContextMenuRequested.connect(
+            self._show_start_button_menu
+        )
 
         self.pool_list_combobox = ComboBox()
         self._set_widget_font(self.pool_list_combobox, 12)
@@ -494,6 +498,32 @@ class Lottery(QWidget):
     def stop_animation(self):
         return lottery_manager.stop_animation(self)
 
+    def _show_start_button_menu(self, pos):
+        """显示开始按钮的右键菜单"""
+        menu = RoundMenu(parent=self.start_button)
+        menu.addAction(
+            Action(
+                get_content_name_async("lottery", "batch_draw"),
+                triggered=self.show_batch_draw,
+            )
+        )
+        menu.exec(self.start_button.mapToGlobal(pos))
+
+    def show_batch_draw(self):
+        """打开批量抽奖窗口"""
+        return lottery_manager.show_batch_draw_window(self)
+
+    def start_batch_draw(self, rounds, on_finished=None):
+        return lottery_manager.start_batch_draw(self, rounds, on_finished)
+
+    def replay_batch_results(self, batch, on_finished=None):
+        return lottery_manager.replay_batch_results(
+            self, batch, on_finished=on_finished
+        )
+
+    def stop_batch_replay(self):
+        return lottery_manager.stop_batch_replay(self)
+
     def play_voice_result(self):
         return lottery_manager.play_voice_result(self)
 
@@ -538,40 +568,8 @@ class Lottery(QWidget):
     def show_remaining_list(self):
         return lottery_manager.show_remaining_list(self)
 
-    def setup_file_watcher(self):
-        return lottery_manager.setup_file_watcher(self)
-
-    def on_directory_changed(self, path):
-        return lottery_manager.on_directory_changed(self, path)
-
-    def on_file_changed(self, path):
-        return lottery_manager.on_file_changed(self, path)
-
-    def _sync_watcher_files(self):
-        """同步奖池目录下的文件到文件监控器"""
-        try:
-            # 先移除已监控的文件，避免重复
-            files = (
-                list(self.file_watcher.files())
-                if hasattr(self.file_watcher, "files")
-                else []
-            )
-            if files:
-                try:
-                    self.file_watcher.removePaths(files)
-                except Exception:
-                    pass
-
-            # 重新添加当前目录中的所有JSON文件
-            lot_dir = get_data_path("list", "lottery_list")
-            if lot_dir.exists():
-                for fp in lot_dir.glob("*.json"):
-                    try:
-                        self.file_watcher.addPath(str(fp))
-                    except Exception:
-                        pass
-        except Exception as e:
-            logger.exception(f"同步奖池文件监控失败: {e}")
+    def on_list_files_changed(self, event):
+        return lottery_manager.on_list_files_changed(self, event)
 
     def refresh_pool_list(self):
         """刷新奖池列表下拉框"""
@@ -11,6 +11,12 @@ from app.common.history import *
 from app.tools.settings_access import *
 from app.common.music.music_player import music_player
 from app.common.roll_call.roll_call_utils import RollCallUtils
+from app.common.IPC_URL.event_stream import (
+    EVENT_DRAW_FINISHED,
+    EVENT_DRAW_STARTED,
+    publish_event,
+    result_entries,
+)
 from app.Language.obtain_language import get_content_combo_name_async
 from qfluentwidgets import FluentIcon
 from app.tools.config import show_notification, NotificationType, NotificationConfig
@@ -117,13 +123,6 @@ class QuickDrawAnimation(QObject):
 
         return class_name, group_index, group_filter, gender_index, gender_filter
 
-    def _build_selected_students(self, students):
-        selected_students = []
-        for s in students:
-            exist = s[4] if len(s) > 4 else True
-            selected_students.append((s[0], s[1], exist))
-        return selected_students
-
     def _set_final_result(self, result):
         self.final_selected_students = result["selected_students"]
         self.final_class_name = result["class_name"]
@@ -131,6 +130,18 @@ class QuickDrawAnimation(QObject):
         self.final_ipc_selected_students = result.get("ipc_selected_students")
         self.final_group_filter = result["group_filter"]
         self.final_gender_filter = result["gender_filter"]
+        publish_event(
+            EVENT_DRAW_FINISHED,
+            lambda: {
+                "kind": "quick_draw",
+                "class_name": self.final_class_name,
+                "group_filter": self.final_group_filter,
+                "gender_filter": self.final_gender_filter,
+                "results": result_entries(
+                    self.final_ipc_selected_students or self.final_selected_students
+                ),
+            },
+        )
 
     def _sync_final_result_to_widget(self):
         self.roll_call_widget.final_selected_students = self.final_selected_students
@@ -180,7 +191,7 @@ class QuickDrawAnimation(QObject):
         Args:
             quick_draw_settings: 闪抽设置字典
         """
-        logger.debug(f"start_animation: 开始闪抽动画，设置: {quick_draw_settings}")
+        logger.debug("start_animation: 开始闪抽动画，设置: {}", quick_draw_settings)
 
         self.roll_call_widget.is_quick_draw = True
 
@@ -216,10 +227,15 @@ class QuickDrawAnimation(QObject):
         autoplay_count = quick_draw_settings["autoplay_count"]
         if animation_mode in [0, 1]:
             self.roll_call_widget.manager.start_precompute_final(current_count)
+            self.roll_call_widget.manager.start_animation_frames(
+                current_count, quick_draw_settings.get("show_random", 0)
+            )
 
         if animation_mode == 1:
             logger.debug(
-                f"start_animation: 自动停止模式，动画间隔: {animation_interval}ms, 运行次数: {autoplay_count}"
+                "start_animation: 自动停止模式，动画间隔: {}ms, 运行次数: {}",
+                animation_interval,
+                autoplay_count,
             )
             self.is_animating = True
             self.animation_timer = QTimer()
@@ -243,6 +259,7 @@ class QuickDrawAnimation(QObject):
             self.animation_timer.stop()
         self.is_animating = False
         self.roll_call_widget.is_quick_draw = False
+        self.roll_call_widget.manager.stop_animation_frames()
 
         # 执行最终抽取
         current_count = readme_settings_async("quick_draw_settings", "draw_count")
@@ -344,11 +361,13 @@ class QuickDrawAnimation(QObject):
         current_count = readme_settings_async("quick_draw_settings", "draw_count")
 
         if self.is_animating:
-            # 动画过程中，使用管理器快速获取随机学生
-            students = self.roll_call_widget.manager.get_random_students(current_count)
-
-            self.final_selected_students = self._build_selected_students(students)
-            self.final_class_name = self.roll_call_widget.manager.current_class_name
+            # 动画帧从预计算缓冲区中取出，小组模式的显示文本已在帧中渲染完成
+            manager = self.roll_call_widget.manager
+            show_random = self.quick_draw_settings.get("show_random", 0)
+            self.final_selected_students = manager.next_animation_frame(
+                current_count, show_random
+            )
+            self.final_class_name = manager.current_class_name
         else:
             # 非动画状态（直接抽取），执行最终抽取
             result = self.roll_call_widget.manager.draw_final_students(current_count)
@@ -372,6 +391,7 @@ class QuickDrawAnimation(QObject):
 
         # 保存闪抽设置，用于动画过程中更新显示和浮窗通知
         self.quick_draw_settings = quick_draw_settings
+        publish_event(EVENT_DRAW_STARTED, {"kind": "quick_draw"})
 
         try:
             self.animation_finished.connect(
@@ -505,7 +525,12 @@ class QuickDrawAnimation(QObject):
             display_settings: 显示设置字典
             draw_count: 抽取人数
         """
-        student_labels = ResultDisplayUtils.create_student_label(
+        show_random = display_settings["show_random"]
+        if self.roll_call_widget.manager.current_group_index == 1:
+            # 动画帧中的文本已包含随机成员，不再重复读取小组成员
+            show_random = 0
+        ResultDisplayUtils.render_student_labels(
+            self.roll_call_widget.result_grid,
             class_name=class_name,
             selected_students=selected_students,
             draw_count=draw_count,
@@ -517,24 +542,6 @@ class QuickDrawAnimation(QObject):
             group_index=getattr(
                 self.roll_call_widget.range_combobox, "currentIndex", lambda: 0
             )(),
-            show_random=display_settings["show_random"],
+            show_random=show_random,
             settings_group="quick_draw_settings",
         )
-
-        cached_widgets = ResultDisplayUtils.collect_grid_widgets(
-            self.roll_call_widget.result_grid
-        )
-        if cached_widgets and len(cached_widgets) == len(student_labels):
-            updated = ResultDisplayUtils.update_grid_labels(
-                self.roll_call_widget.result_grid, student_labels, cached_widgets
-            )
-            if updated:
-                ResultDisplayUtils.dispose_widgets(student_labels)
-            else:
-                ResultDisplayUtils.display_results_in_grid(
-                    self.roll_call_widget.result_grid, student_labels
-                )
-        else:
-            ResultDisplayUtils.display_results_in_grid(
-                self.roll_call_widget.result_grid, student_labels
-            )
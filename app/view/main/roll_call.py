@@ -114,9 +114,8 @@ class roll_call(QWidget):
             event: 关闭事件对象
         """
         try:
-            if hasattr(self, "file_watcher"):
-                self.file_watcher.removePaths(self.file_watcher.directories())
-                self.file_watcher.removePaths(self.file_watcher.files())
+            for subscription in getattr(self, "file_subscriptions", []):
+                subscription.cancel()
             if hasattr(self, "press_timer"):
                 self.press_timer.stop()
         except Exception as e:
@@ -597,14 +596,8 @@ class roll_call(QWidget):
     def show_remaining_list(self):
         return roll_call_manager.show_remaining_list(self)
 
-    def setup_file_watcher(self):
-        return roll_call_manager.setup_file_watcher(self)
-
-    def on_directory_changed(self, path):
-        return roll_call_manager.on_directory_changed(self, path)
-
-    def on_file_changed(self, path):
-        return roll_call_manager.on_file_changed(self, path)
+    def on_list_files_changed(self, event):
+        return roll_call_manager.on_list_files_changed(self, event)
 
     def refresh_class_list(self):
         return roll_call_manager.refresh_class_list(self)
@@ -1150,6 +1150,11 @@ class MainWindow(FluentWindow):
     def _stop_ipc_client(self):
         """停止IPC客户端"""
         try:
+            from app.common.notification.classisland_send_queue import (
+                get_classisland_send_queue,
+            )
+
+            get_classisland_send_queue().close()
             CSharpIPCHandler.instance().stop_ipc_client()
             logger.debug("C# IPC 停止请求已发出")
         except Exception as e:
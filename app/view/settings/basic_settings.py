@@ -50,6 +50,7 @@ from app.common.windows.uiaccess import is_uiaccess_process
 from app.page_building.another_window import (
     create_log_viewer_window,
     create_backup_manager_window,
+    create_draw_telemetry_window,
 )
 
 
@@ -778,6 +779,12 @@ class basic_settings_data_management(GroupHeaderCardWidget):
         )
         self.log_viewer_button.clicked.connect(self.open_log_viewer)
 
+        # 抽取耗时按钮
+        self.draw_telemetry_button = PushButton(
+            get_content_pushbutton_name_async("basic_settings", "draw_telemetry")
+        )
+        self.draw_telemetry_button.clicked.connect(self.open_draw_telemetry)
+
         self.backup_manager_button = PushButton(
             get_content_pushbutton_name_async("basic_settings", "backup_manager")
         )
@@ -790,6 +797,12 @@ class basic_settings_data_management(GroupHeaderCardWidget):
             get_content_description_async("basic_settings", "log_viewer"),
             self.log_viewer_button,
         )
+        self.addGroup(
+            get_theme_icon("ic_fluent_timer_20_filled"),
+            get_content_name_async("basic_settings", "draw_telemetry"),
+            get_content_description_async("basic_settings", "draw_telemetry"),
+            self.draw_telemetry_button,
+        )
         self.addGroup(
             get_theme_icon("ic_fluent_save_20_filled"),
             get_content_name_async("basic_settings", "backup_manager"),
@@ -842,6 +855,21 @@ class basic_settings_data_management(GroupHeaderCardWidget):
                 parent=self.window(),
             )
 
+    def open_draw_telemetry(self):
+        """打开抽取耗时窗口"""
+        try:
+            create_draw_telemetry_window()
+        except Exception as e:
+            logger.exception("打开抽取耗时窗口失败: {}", e)
+            show_notification(
+                NotificationType.ERROR,
+                NotificationConfig(
+                    title=get_content_name_async("basic_settings", "draw_telemetry"),
+                    content=f"打开抽取耗时窗口失败: {str(e)}",
+                ),
+                parent=self.window(),
+            )
+
     def open_backup_manager(self):
         try:
             create_backup_manager_window()
@@ -16,6 +16,7 @@ from app.tools.personalised import *
 from app.tools.settings_default import *
 from app.tools.settings_access import *
 from app.tools.settings_access import get_safe_font_size
+from app.tools.file_change_service import FILE_KIND_ROSTER, subscribe_file_changes
 from app.Language.obtain_language import *
 from app.common.data.list import *
 
@@ -192,27 +193,18 @@ class lottery_extraction_function(GroupHeaderCardWidget):
             logger.exception(f"回填 lottery_settings 数据失败: {e}")
 
     def setup_file_watcher(self):
-        """设置文件系统监视器，监控奖池名单文件夹的变化"""
-        # 获取奖池名单文件夹路径
-        lottery_list_dir = get_data_path("list", "lottery_list")
-
-        # 确保目录存在
-        if not lottery_list_dir.exists():
-            lottery_list_dir.mkdir(parents=True, exist_ok=True)
-
-        # 创建文件系统监视器
-        self.file_watcher = QFileSystemWatcher()
-
-        # 监视目录
-        self.file_watcher.addPath(str(lottery_list_dir))
-
-        # 连接信号
-        self.file_watcher.directoryChanged.connect(self.on_directory_changed)
-
-    def on_directory_changed(self, path):
-        """当目录内容发生变化时调用此方法"""
-        # 延迟刷新，避免文件操作未完成
-        QTimer.singleShot(500, self.refresh_pool_list)
+        """订阅奖池名单文件夹的变化"""
+        self.file_subscription = subscribe_file_changes(
+            FILE_KIND_ROSTER,
+            self.on_list_files_changed,
+            widget=self,
+            directory=get_data_path("list", "lottery_list"),
+        )
+
+    def on_list_files_changed(self, event):
+        """奖池名单文件变化时调用，只有奖池增删时才需要刷新下拉框"""
+        if event.names_changed:
+            self.refresh_pool_list()
 
     def refresh_pool_list(self):
         """刷新奖池下拉框列表"""
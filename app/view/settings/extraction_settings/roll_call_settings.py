@@ -16,6 +16,7 @@ from app.tools.personalised import *
 from app.tools.settings_default import *
 from app.tools.settings_access import *
 from app.tools.settings_access import get_safe_font_size
+from app.tools.file_change_service import FILE_KIND_ROSTER, subscribe_file_changes
 from app.Language.obtain_language import *
 from app.common.data.list import *
 
@@ -165,27 +166,18 @@ class roll_call_extraction_function(GroupHeaderCardWidget):
         self.on_draw_mode_changed()
 
     def setup_file_watcher(self):
-        """设置文件系统监视器，监控班级名单文件夹的变化"""
-        # 获取班级名单文件夹路径
-        roll_call_list_dir = get_data_path("list", "roll_call_list")
-
-        # 确保目录存在
-        if not roll_call_list_dir.exists():
-            roll_call_list_dir.mkdir(parents=True, exist_ok=True)
-
-        # 创建文件系统监视器
-        self.file_watcher = QFileSystemWatcher()
-
-        # 监视目录
-        self.file_watcher.addPath(str(roll_call_list_dir))
-
-        # 连接信号
-        self.file_watcher.directoryChanged.connect(self.on_directory_changed)
-
-    def on_directory_changed(self, path):
-        """当目录内容发生变化时调用此方法"""
-        # 延迟刷新，避免文件操作未完成
-        QTimer.singleShot(500, self.refresh_class_list)
+        """订阅班级名单文件夹的变化"""
+        self.file_subscription = subscribe_file_changes(
+            FILE_KIND_ROSTER,
+            self.on_list_files_changed,
+            widget=self,
+            directory=get_data_path("list", "roll_call_list"),
+        )
+
+    def on_list_files_changed(self, event):
+        """班级名单文件变化时调用，只有班级增删时才需要刷新下拉框"""
+        if event.names_changed:
+            self.refresh_class_list()
 
     def refresh_class_list(self):
         """刷新班级下拉框列表"""
@@ -19,6 +19,8 @@ from app.tools.settings_access import *
 from app.Language.obtain_language import *
 from app.common.data.list import *
 from app.common.history import *
+from app.tools.json_store import discard_pending_write
+from app.tools.file_change_service import FILE_KIND_ROSTER, subscribe_file_changes
 
 
 # ==================================================
@@ -178,6 +180,7 @@ class roll_call_history(GroupHeaderCardWidget):
             try:
                 # 获取历史记录文件路径
                 history_file_path = get_history_file_path("roll_call", class_name)
+                discard_pending_write(history_file_path)
 
                 if history_file_path.exists():
                     os.remove(history_file_path)
@@ -215,34 +218,22 @@ class roll_call_history(GroupHeaderCardWidget):
                 )
 
     def setup_file_watcher(self):
-        """设置文件系统监视器，监控班级名单文件夹的变化"""
-        # 获取班级名单文件夹路径
-        roll_call_list_dir = get_data_path("list", "roll_call_list")
-
-        # 确保目录存在
-        if not roll_call_list_dir.exists():
-            logger.warning(f"班级名单文件夹不存在: {roll_call_list_dir}")
-            return
-
-        # 创建文件系统监视器
-        self.file_watcher = QFileSystemWatcher()
-
-        # 监视目录
-        self.file_watcher.addPath(str(roll_call_list_dir))
-
-        # 连接信号
-        self.file_watcher.directoryChanged.connect(self.on_directory_changed)
-        # logger.debug(f"已设置文件监视器，监控目录: {roll_call_list_dir}")
+        """订阅班级名单文件夹的变化"""
+        self.file_subscription = subscribe_file_changes(
+            FILE_KIND_ROSTER,
+            self.on_list_files_changed,
+            widget=self,
+            directory=get_data_path("list", "roll_call_list"),
+        )
 
-    def on_directory_changed(self, path):
-        """当目录内容发生变化时调用此方法
+    def on_list_files_changed(self, event):
+        """班级名单文件变化时调用，只有班级增删时才需要刷新下拉框
 
         Args:
-            path: 发生变化的目录路径
+            event: 文件变化事件
         """
-        # logger.debug(f"检测到目录变化: {path}")
-        # 延迟刷新，避免文件操作未完成
-        QTimer.singleShot(500, self.refresh_class_list)
+        if event.names_changed:
+            self.refresh_class_list()
 
     def refresh_class_list(self):
         """刷新班级下拉框列表"""
@@ -410,6 +401,7 @@ class lottery_history(GroupHeaderCardWidget):
             try:
                 # 获取历史记录文件路径
                 history_file_path = get_history_file_path("lottery", pool_name)
+                discard_pending_write(history_file_path)
 
                 if history_file_path.exists():
                     os.remove(history_file_path)
@@ -445,34 +437,22 @@ class lottery_history(GroupHeaderCardWidget):
                 )
 
     def setup_file_watcher(self):
-        """设置文件系统监视器，监控奖池名单文件夹的变化"""
-        # 获取奖池名单文件夹路径
-        lottery_list_dir = get_data_path("list/lottery_list")
-
-        # 确保目录存在
-        if not lottery_list_dir.exists():
-            logger.warning(f"奖池名单文件夹不存在: {lottery_list_dir}")
-            return
-
-        # 创建文件系统监视器
-        self.file_watcher = QFileSystemWatcher()
-
-        # 监视目录
-        self.file_watcher.addPath(str(lottery_list_dir))
-
-        # 连接信号
-        self.file_watcher.directoryChanged.connect(self.on_directory_changed)
-        # logger.debug(f"已设置文件监视器，监控目录: {lottery_list_dir}")
+        """订阅奖池名单文件夹的变化"""
+        self.file_subscription = subscribe_file_changes(
+            FILE_KIND_ROSTER,
+            self.on_list_files_changed,
+            widget=self,
+            directory=get_data_path("list", "lottery_list"),
+        )
 
-    def on_directory_changed(self, path):
-        """当目录内容发生变化时调用此方法
+    def on_list_files_changed(self, event):
+        """奖池名单文件变化时调用，只有奖池增删时才需要刷新下拉框
 
         Args:
-            path: 发生变化的目录路径
+            event: 文件变化事件
         """
-        # logger.debug(f"检测到目录变化: {path}")
-        # 延迟刷新，避免文件操作未完成导致的错误
-        QTimer.singleShot(500, self.refresh_pool_list)
+        if event.names_changed:
+            self.refresh_pool_list()
 
     def refresh_pool_list(self):
         """刷新奖池下拉框列表"""
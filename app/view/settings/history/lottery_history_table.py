@@ -1,7 +1,6 @@
 # ==================================================
 # 导入库
 # ==================================================
-import json
 
 from loguru import logger
 from PySide6.QtWidgets import *
@@ -15,6 +14,8 @@ from app.tools.path_utils import *
 from app.tools.personalised import *
 from app.tools.settings_default import *
 from app.tools.settings_access import *
+from app.tools.json_store import read_json
+from app.tools.file_change_service import FILE_KIND_HISTORY, subscribe_file_changes
 from app.Language.obtain_language import *
 from app.common.history import *
 from app.common.history.history_reader import (
@@ -63,9 +64,6 @@ class lottery_history_table(GroupHeaderCardWidget):
         # 创建表格区域
         QTimer.singleShot(APPLY_DELAY, self.create_table)
 
-        # 初始化奖池列表
-        QTimer.singleShot(APPLY_DELAY, self.refresh_pool_history)
-
         # 设置文件系统监视器
         QTimer.singleShot(APPLY_DELAY, self.setup_file_watcher)
 
@@ -634,24 +632,27 @@ class lottery_history_table(GroupHeaderCardWidget):
             Dialog("错误", f"加载统计数据失败: {e}", self).exec()
 
     def setup_file_watcher(self):
-        """设置文件系统监视器，监控奖池历史记录文件夹的变化"""
-        lottery_history_dir = get_data_path("history/lottery_history")
-        if not lottery_history_dir.exists():
-            logger.warning(f"奖池历史记录文件夹不存在: {lottery_history_dir}")
-            return
-        self.file_watcher = QFileSystemWatcher()
-        self.file_watcher.addPath(str(lottery_history_dir))
-        self.file_watcher.directoryChanged.connect(self.on_directory_changed)
-        # logger.debug(f"已设置文件监视器，监控目录: {lottery_history_dir}")
+        """订阅奖池历史记录文件夹的变化"""
+        self.file_subscription = subscribe_file_changes(
+            FILE_KIND_HISTORY,
+            self.on_history_files_changed,
+            widget=self,
+            directory=get_data_path("history/lottery_history"),
+            delay_ms=1000,
+        )
 
-    def on_directory_changed(self, path):
-        """当目录内容发生变化时调用此方法
+    def on_history_files_changed(self, event):
+        """历史记录文件变化：有增删时重建奖池列表，否则只在当前奖池的记录变化时刷新表格
 
         Args:
-            path: 发生变化的目录路径
+            event: 文件变化事件
         """
-        # logger.debug(f"检测到目录变化: {path}")
-        QTimer.singleShot(1000, self.refresh_pool_history)
+        if event.names_changed:
+            self.refresh_pool_history()
+        elif self.current_pool_name and event.touches(
+            get_data_path("history/lottery_history", f"{self.current_pool_name}.json")
+        ):
+            self.refresh_data()
 
     def refresh_pool_history(self):
         """刷新奖池下拉框列表"""
@@ -665,7 +666,8 @@ class lottery_history_table(GroupHeaderCardWidget):
         # 获取最新的奖池历史列表
         pool_history = get_all_history_names("lottery")
 
-        # 清空并重新填充下拉框
+        # 清空并重新填充下拉框，填充期间不触发刷新，完成后只刷新一次表格
+        self.pool_comboBox.blockSignals(True)
         self.pool_comboBox.clear()
         self.pool_comboBox.addItems(pool_history)
 
@@ -693,9 +695,11 @@ class lottery_history_table(GroupHeaderCardWidget):
             )
             # 更新current_pool_name
             self.current_pool_name = ""
+        self.pool_comboBox.blockSignals(False)
 
         if hasattr(self, "clear_button"):
             self.clear_button.setEnabled(bool(self.current_pool_name))
+        self.on_pool_changed(self.pool_comboBox.currentIndex())
 
     def on_pool_changed(self, index):
         """奖池选择变化时刷新表格数据"""
@@ -925,8 +929,7 @@ class lottery_history_table(GroupHeaderCardWidget):
                 self.available_subjects = []
                 return
 
-            with open_file(history_file, "r", encoding="utf-8") as f:
-                history_data = json.load(f)
+            history_data = read_json(history_file)
 
             # 收集所有课程名称
             subjects = set()
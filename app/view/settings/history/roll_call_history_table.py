@@ -1,7 +1,6 @@
 # ==================================================
 # 导入库
 # ==================================================
-import json
 
 from loguru import logger
 from PySide6.QtWidgets import *
@@ -15,6 +14,8 @@ from app.tools.path_utils import *
 from app.tools.personalised import *
 from app.tools.settings_default import *
 from app.tools.settings_access import *
+from app.tools.json_store import read_json
+from app.tools.file_change_service import FILE_KIND_HISTORY, subscribe_file_changes
 from app.Language.obtain_language import *
 from app.common.history import *
 from app.common.history.history_reader import (
@@ -65,9 +66,6 @@ class roll_call_history_table(GroupHeaderCardWidget):
         # 创建表格区域
         QTimer.singleShot(APPLY_DELAY, self.create_table)
 
-        # 初始化班级列表
-        QTimer.singleShot(APPLY_DELAY, self.refresh_class_history)
-
         # 设置文件系统监视器
         QTimer.singleShot(APPLY_DELAY, self.setup_file_watcher)
 
@@ -765,24 +763,29 @@ class roll_call_history_table(GroupHeaderCardWidget):
             logger.exception(f"加载统计数据失败: {e}")
 
     def setup_file_watcher(self):
-        """设置文件系统监视器，监控班级历史记录文件夹的变化"""
-        roll_call_history_dir = get_data_path("history/roll_call_history")
-        if not roll_call_history_dir.exists():
-            logger.warning(f"班级历史记录文件夹不存在: {roll_call_history_dir}")
-            return
-        self.file_watcher = QFileSystemWatcher()
-        self.file_watcher.addPath(str(roll_call_history_dir))
-        self.file_watcher.directoryChanged.connect(self.on_directory_changed)
-        # logger.debug(f"已设置文件监视器，监控目录: {roll_call_history_dir}")
+        """订阅班级历史记录文件夹的变化"""
+        self.file_subscription = subscribe_file_changes(
+            FILE_KIND_HISTORY,
+            self.on_history_files_changed,
+            widget=self,
+            directory=get_data_path("history/roll_call_history"),
+            delay_ms=1000,
+        )
 
-    def on_directory_changed(self, path):
-        """当目录内容发生变化时调用此方法
+    def on_history_files_changed(self, event):
+        """历史记录文件变化：有增删时重建班级列表，否则只在当前班级的记录变化时刷新表格
 
         Args:
-            path: 发生变化的目录路径
+            event: 文件变化事件
         """
-        # logger.debug(f"检测到目录变化: {path}")
-        QTimer.singleShot(1000, self.refresh_class_history)
+        if event.names_changed:
+            self.refresh_class_history()
+        elif self.current_class_name and event.touches(
+            get_data_path(
+                "history/roll_call_history", f"{self.current_class_name}.json"
+            )
+        ):
+            self.refresh_data()
 
     def refresh_class_history(self):
         """刷新班级下拉框列表"""
@@ -796,7 +799,8 @@ class roll_call_history_table(GroupHeaderCardWidget):
         # 获取最新的班级历史列表
         class_history = get_all_history_names("roll_call")
 
-        # 清空并重新填充下拉框
+        # 清空并重新填充下拉框，填充期间不触发刷新，完成后只刷新一次表格
+        self.class_comboBox.blockSignals(True)
         self.class_comboBox.clear()
         self.class_comboBox.addItems(class_history)
 
@@ -826,9 +830,11 @@ class roll_call_history_table(GroupHeaderCardWidget):
             )
             # 更新current_class_name
             self.current_class_name = ""
+        self.class_comboBox.blockSignals(False)
 
         if hasattr(self, "clear_button"):
             self.clear_button.setEnabled(bool(self.current_class_name))
+        self.on_class_changed(self.class_comboBox.currentIndex())
 
     def on_class_changed(self, index):
         """班级选择变化时刷新表格数据"""
@@ -876,8 +882,7 @@ class roll_call_history_table(GroupHeaderCardWidget):
                 self.available_subjects = []
                 return
 
-            with open_file(history_file, "r", encoding="utf-8") as f:
-                history_data = json.load(f)
+            history_data = read_json(history_file)
 
             # 收集所有课程名称
             subjects = set()
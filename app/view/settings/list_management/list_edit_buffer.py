@@ -0,0 +1,185 @@
+# ====================== 1. 名单编辑缓冲 ======================
+# - normalize_item_id()  - 统一条目 ID 的比较形式（忽略前导零）
+# - ListRowDiff          - 两份名单数据之间按行的差异
+# - ListEditBuffer       - 名单表格的内存数据和尚未保存的修改
+
+# ==================================================
+# 导入模块
+# ==================================================
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, NamedTuple
+
+from loguru import logger
+
+
+# ==================================================
+# 名单编辑缓冲
+# ==================================================
+def normalize_item_id(value: Any) -> str:
+    """统一条目 ID 的比较形式，"007" 与 7 视为同一条目"""
+    text = str(value).strip()
+    return text.lstrip("0") or text
+
+
+class ListRowDiff(NamedTuple):
+    """名单数据按行的差异，行以 normalize_item_id() 后的 ID 为键"""
+
+    changed: Dict[str, Dict[str, Any]]  # 内容有变化的行（变化后的整行）
+    added: List[Dict[str, Any]]  # 新增的行
+    removed: List[str]  # 被删除的行
+
+    def is_empty(self) -> bool:
+        return not (self.changed or self.added or self.removed)
+
+
+class ListEditBuffer:
+    """名单表格的内存数据和尚未保存的修改
+
+    rows 保存表格显示的每一行：name 为名单文件中的键，其余为条目的字段。
+    编辑只修改 rows 并记入待保存的修改；保存时把这些修改按 ID 应用到文件的最新内容上，
+    不会覆盖其它窗口在这期间对其它条目或字段的修改。
+    """
+
+    def __init__(self, fields: Mapping[str, Any]):
+        """
+        Args:
+            fields: 表格中显示的条目字段及其默认值（不含 name 和 id）
+        """
+        self.fields = dict(fields)
+        self.rows: Dict[str, Dict[str, Any]] = {}
+        self._edits: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def dirty(self) -> bool:
+        """是否有尚未保存的修改"""
+        return bool(self._edits)
+
+    def rows_from(self, data: Mapping[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """把名单文件的内容转换为以 ID 为键的行"""
+        rows = {}
+        for name, info in data.items():
+            if not isinstance(info, dict):
+                continue
+            row = {"name": name, "id": info.get("id", 0)}
+            for field, default in self.fields.items():
+                row[field] = info.get(field, default)
+            rows[normalize_item_id(row["id"])] = row
+        return rows
+
+    def sorted_rows(self) -> List[Dict[str, Any]]:
+        """按 ID 排序的全部行"""
+
+        def sort_key(row):
+            try:
+                return 0, int(row["id"]), ""
+            except (TypeError, ValueError):
+                return 1, 0, str(row["id"])
+
+        return sorted(self.rows.values(), key=sort_key)
+
+    def load(self, data: Mapping[str, Any]) -> None:
+        """用名单文件的内容替换全部行，丢弃尚未保存的修改"""
+        self.rows = self.rows_from(data)
+        self._edits.clear()
+
+    def row(self, item_id: Any) -> Dict[str, Any]:
+        """获取条目当前的行，不存在时返回空字典"""
+        return self.rows.get(normalize_item_id(item_id), {})
+
+    def set_value(self, item_id: Any, field: str, value: Any) -> bool:
+        """修改一个单元格
+
+        Args:
+            item_id: 条目 ID
+            field: 字段名，name 表示修改名单文件中的键
+            value: 新的值
+
+        Returns:
+            bool: 是否记入了修改；值未变化、条目不存在或名称与其它条目重复时返回 False
+        """
+        key = normalize_item_id(item_id)
+        row = self.rows.get(key)
+        if row is None or row.get(field) == value:
+            return False
+        if field == "name" and any(
+            other["name"] == value for k, other in self.rows.items() if k != key
+        ):
+            logger.warning(f"名称 {value} 已存在，忽略本次修改")
+            return False
+        row[field] = value
+        self._edits.setdefault(key, {})[field] = value
+        return True
+
+    def apply_to(self, data: Mapping[str, Any]) -> "OrderedDict[str, Any]":
+        """把尚未保存的修改应用到名单文件的最新内容上
+
+        Args:
+            data: 名单文件的最新内容（不会被修改）
+
+        Returns:
+            OrderedDict: 应写入文件的内容，条目顺序保持不变
+        """
+        result = OrderedDict(
+            (name, dict(info) if isinstance(info, dict) else info)
+            for name, info in data.items()
+        )
+        names = {
+            normalize_item_id(info.get("id", 0)): name
+            for name, info in result.items()
+            if isinstance(info, dict)
+        }
+        renames = {}
+        for key, changes in self._edits.items():
+            name = names.get(key)
+            if name is None:
+                # 条目已被其它窗口删除
+                continue
+            for field, value in changes.items():
+                if field == "name":
+                    renames[name] = value
+                else:
+                    result[name][field] = value
+        if not renames:
+            return result
+
+        taken = set(result) - set(renames)
+        renamed = OrderedDict()
+        for name, info in result.items():
+            new_name = renames.get(name, name)
+            if new_name != name and (new_name in taken or new_name in renamed):
+                logger.warning(f"名称 {new_name} 已存在，保留原名称 {name}")
+                new_name = name
+            renamed[new_name] = info
+        return renamed
+
+    def merge(self, data: Mapping[str, Any]) -> ListRowDiff:
+        """用名单文件的新内容更新 rows，尚未保存的修改优先保留
+
+        Returns:
+            ListRowDiff: 表格中需要更新的行
+        """
+        new_rows = self.rows_from(data)
+        for key, changes in self._edits.items():
+            if key in new_rows:
+                new_rows[key].update(changes)
+        diff = ListRowDiff(
+            changed={
+                key: row
+                for key, row in new_rows.items()
+                if key in self.rows and self.rows[key] != row
+            },
+            added=[row for key, row in new_rows.items() if key not in self.rows],
+            removed=[key for key in self.rows if key not in new_rows],
+        )
+        self.rows = new_rows
+        self._edits = {k: v for k, v in self._edits.items() if k in new_rows}
+        return diff
+
+    def commit(self, data: Mapping[str, Any]) -> ListRowDiff:
+        """保存成功后调用，data 为写入文件的内容
+
+        Returns:
+            ListRowDiff: 表格中需要更新的行（保存时合并进来的其它修改、被拒绝的重命名）
+        """
+        self._edits.clear()
+        return self.merge(data)
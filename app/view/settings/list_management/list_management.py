@@ -19,7 +19,7 @@ from app.tools.config import *
 from app.common.data.list import *
 
 from app.page_building.another_window import *
-from .shared_file_watcher import get_shared_file_watcher
+from app.tools.file_change_service import FILE_KIND_ROSTER, subscribe_file_changes
 
 
 # ==================================================
@@ -391,31 +391,22 @@ class roll_call_list(GroupHeaderCardWidget):
             logger.exception(f"学生名单导出失败: {message}")
 
     def setup_file_watcher(self):
-        """设置文件系统监视器，监控班级名单文件夹的变化 - 使用共享监视器"""
-        roll_call_list_dir = get_data_path("list", "roll_call_list")
-
-        # 确保目录存在
-        if not roll_call_list_dir.exists():
-            logger.warning(f"班级名单文件夹不存在: {roll_call_list_dir}")
-            return
-
-        # 使用共享文件系统监视器管理器
-        self._shared_watcher = get_shared_file_watcher()
-        self._shared_watcher.add_watcher(
-            str(roll_call_list_dir), self.on_directory_changed
+        """订阅班级名单文件夹的变化"""
+        self.file_subscription = subscribe_file_changes(
+            FILE_KIND_ROSTER,
+            self.on_list_files_changed,
+            widget=self,
+            directory=get_data_path("list", "roll_call_list"),
         )
 
-        # logger.debug(f"已设置共享文件监视器，监控目录: {roll_call_list_dir}")
-
-    def on_directory_changed(self, path):
-        """当目录内容发生变化时调用此方法
+    def on_list_files_changed(self, event):
+        """班级名单文件变化时调用，只有班级增删时才需要刷新下拉框
 
         Args:
-            path: 发生变化的目录路径
+            event: 文件变化事件
         """
-        # logger.debug(f"检测到目录变化: {path}")
-        # 延迟刷新，避免文件操作未完成
-        QTimer.singleShot(500, self.refresh_class_list)
+        if event.names_changed:
+            self.refresh_class_list()
 
     def update_button_states(self):
         """根据班级列表状态更新按钮禁用状态"""
@@ -474,13 +465,9 @@ class roll_call_list(GroupHeaderCardWidget):
             logger.exception(f"更新按钮状态时发生未知错误: {e}")
 
     def cleanup_file_watcher(self):
-        """清理文件系统监视器"""
-        if hasattr(self, "_shared_watcher"):
-            roll_call_list_dir = get_data_path("list", "roll_call_list")
-            if roll_call_list_dir.exists():
-                self._shared_watcher.remove_watcher(
-                    str(roll_call_list_dir), self.on_directory_changed
-                )
+        """取消文件变化订阅"""
+        if hasattr(self, "file_subscription"):
+            self.file_subscription.cancel()
 
     def __del__(self):
         """析构函数，确保清理文件监视器"""
@@ -853,32 +840,22 @@ class lottery_list(GroupHeaderCardWidget):
             logger.exception(f"奖品名单导出失败: {message}")
 
     def setup_file_watcher(self):
-        """设置文件系统监视器，监控奖池名单文件夹的变化 - 使用共享监视器"""
-        # 获取奖池名单文件夹路径
-        lottery_list_dir = get_data_path("list/lottery_list")
-
-        # 确保目录存在
-        if not lottery_list_dir.exists():
-            logger.warning(f"奖池名单文件夹不存在: {lottery_list_dir}")
-            return
-
-        # 使用共享文件系统监视器管理器
-        self._shared_watcher = get_shared_file_watcher()
-        self._shared_watcher.add_watcher(
-            str(lottery_list_dir), self.on_directory_changed
+        """订阅奖池名单文件夹的变化"""
+        self.file_subscription = subscribe_file_changes(
+            FILE_KIND_ROSTER,
+            self.on_list_files_changed,
+            widget=self,
+            directory=get_data_path("list", "lottery_list"),
         )
 
-        # logger.debug(f"已设置共享文件监视器，监控目录: {lottery_list_dir}")
-
-    def on_directory_changed(self, path):
-        """当目录内容发生变化时调用此方法
+    def on_list_files_changed(self, event):
+        """奖池名单文件变化时调用，只有奖池增删时才需要刷新下拉框
 
         Args:
-            path: 发生变化的目录路径
+            event: 文件变化事件
         """
-        # logger.debug(f"检测到目录变化: {path}")
-        # 延迟刷新，避免文件操作未完成导致的错误
-        QTimer.singleShot(500, self.refresh_pool_list)
+        if event.names_changed:
+            self.refresh_pool_list()
 
     def update_button_states(self):
         """根据奖池列表状态更新按钮禁用状态"""
@@ -928,13 +905,9 @@ class lottery_list(GroupHeaderCardWidget):
             logger.exception(f"更新奖池按钮状态时发生未知错误: {e}")
 
     def cleanup_file_watcher(self):
-        """清理文件系统监视器"""
-        if hasattr(self, "_shared_watcher"):
-            lottery_list_dir = get_data_path("list/lottery_list")
-            if lottery_list_dir.exists():
-                self._shared_watcher.remove_watcher(
-                    str(lottery_list_dir), self.on_directory_changed
-                )
+        """取消文件变化订阅"""
+        if hasattr(self, "file_subscription"):
+            self.file_subscription.cancel()
 
     def __del__(self):
         """析构函数，确保清理文件监视器"""
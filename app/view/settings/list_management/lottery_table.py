@@ -1,7 +1,6 @@
 # ==================================================
 # 导入库
 # ==================================================
-import json
 from collections import OrderedDict
 
 from loguru import logger
@@ -16,9 +15,15 @@ from app.tools.path_utils import *
 from app.tools.personalised import *
 from app.tools.settings_default import *
 from app.tools.settings_access import *
+from app.tools.json_store import read_json, write_json
+from app.tools.file_change_service import (
+    FILE_KIND_ROSTER,
+    make_write_origin,
+    subscribe_file_changes,
+)
 from app.Language.obtain_language import *
 from app.common.data.list import *
-from .shared_file_watcher import get_shared_file_watcher
+from .list_edit_buffer import ListEditBuffer, normalize_item_id
 
 
 # ==================================================
@@ -29,11 +34,28 @@ class lottery_table(GroupHeaderCardWidget):
 
     refresh_signal = Signal()
 
+    # 可编辑的列对应的奖品字段
+    COLUMN_FIELDS = {0: "exist", 2: "name", 3: "weight"}
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
         self.setTitle(get_content_name_async("lottery_table", "title"))
         self.setBorderRadius(8)
+
+        # 表格数据和尚未保存的修改
+        self._buffer = ListEditBuffer({"weight": 1, "exist": True})
+        self._buffer_file = None
+
+        # 编辑后延迟统一保存
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(LIST_TABLE_SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self.flush_pending_edits)
+
+        # 本表格保存时的写入来源，订阅名单变化时跳过自己的保存
+        self._write_origin = make_write_origin(self)
+
         # 创建抽奖名单选择区域
         QTimer.singleShot(APPLY_DELAY, self.create_lottery_selection)
 
@@ -120,32 +142,28 @@ class lottery_table(GroupHeaderCardWidget):
         self.layout().addWidget(self.table)
 
     def setup_file_watcher(self):
-        """设置文件系统监视器，监控奖池名单文件夹的变化 - 使用共享监视器"""
-        # 获取抽奖名单文件夹路径
-        lottery_list_dir = get_data_path("list/lottery_list")
-
-        # 确保目录存在
-        if not lottery_list_dir.exists():
-            logger.warning(f"奖池文件夹不存在: {lottery_list_dir}")
-            return
-
-        # 使用共享文件系统监视器管理器
-        self._shared_watcher = get_shared_file_watcher()
-        self._shared_watcher.add_watcher(
-            str(lottery_list_dir), self.on_directory_changed
+        """订阅奖池名单文件夹的变化（本表格自己的保存不会触发）"""
+        self.file_subscription = subscribe_file_changes(
+            FILE_KIND_ROSTER,
+            self.on_list_files_changed,
+            widget=self,
+            directory=get_data_path("list", "lottery_list"),
+            origin=self._write_origin,
+            delay_ms=LIST_TABLE_WATCH_DELAY_MS,
         )
 
-        # logger.debug(f"已设置共享文件监视器，监控目录: {lottery_list_dir}")
-
-    def on_directory_changed(self, path):
-        """当目录内容发生变化时调用此方法
+    def on_list_files_changed(self, event):
+        """奖池名单文件变化：奖池有增删时刷新下拉框，否则只合并当前奖池名单的变化
 
         Args:
-            path: 发生变化的目录路径
+            event: 文件变化事件
         """
-        # logger.debug(f"检测到目录变化: {path}")
-        # 延迟刷新，避免文件操作未完成
-        QTimer.singleShot(1000, self.refresh_lottery_list)
+        if event.names_changed:
+            self.refresh_lottery_list()
+            return
+        pool_file = self._current_pool_file()
+        if pool_file is not None and event.touches(pool_file):
+            self.merge_external_changes()
 
     def refresh_lottery_list(self):
         """刷新抽奖名单下拉框列表"""
@@ -155,11 +173,19 @@ class lottery_table(GroupHeaderCardWidget):
             return
 
         try:
-            # 保存当前选中的抽奖名单名称
-            current_lottery_name = self.lottery_comboBox.currentText()
-
             # 获取最新的抽奖名单列表
             lottery_list = get_pool_name_list()
+            current_items = [
+                self.lottery_comboBox.itemText(i)
+                for i in range(self.lottery_comboBox.count())
+            ]
+            if lottery_list and lottery_list == current_items:
+                # 奖池没有增减，只同步当前奖池名单的变化
+                self.merge_external_changes()
+                return
+
+            # 保存当前选中的抽奖名单名称
+            current_lottery_name = self.lottery_comboBox.currentText()
 
             # 清空并重新添加抽奖名单列表
             self.lottery_comboBox.clear()
@@ -184,8 +210,19 @@ class lottery_table(GroupHeaderCardWidget):
         except Exception as e:
             logger.exception(f"刷新抽奖名单列表时发生未知错误: {e}")
 
+    def _current_pool_file(self):
+        """当前选中奖池的名单文件，未选择奖池时返回 None"""
+        try:
+            pool_name = self.lottery_comboBox.currentText()
+        except RuntimeError:
+            logger.exception("抽奖名单下拉框已被销毁")
+            return None
+        if not pool_name:
+            return None
+        return get_data_path("list/lottery_list") / f"{pool_name}.json"
+
     def refresh_data(self):
-        """刷新抽奖名单数据"""
+        """重新加载当前奖池的全部表格数据"""
         # 确保表格已经创建
         if not hasattr(self, "table") or self.table is None:
             return
@@ -194,58 +231,34 @@ class lottery_table(GroupHeaderCardWidget):
         if not hasattr(self, "lottery_comboBox") or self.lottery_comboBox is None:
             return
 
-        try:
-            pool_name = self.lottery_comboBox.currentText()
-        except RuntimeError:
-            logger.exception("抽奖名单下拉框已被销毁")
-            return
+        # 先保存上一个奖池尚未保存的修改
+        self.flush_pending_edits()
 
-        if not pool_name:
+        pool_file = self._current_pool_file()
+        if pool_file is None:
+            self._buffer_file = None
+            self._buffer.load({})
             self.table.setRowCount(0)
             return
 
-        # 临时阻止信号，避免初始化时触发保存操作
+        # 临时阻止信号，避免初始化时触发保存操作；填充期间关闭排序，避免行位置变化
+        sorting = self.table.isSortingEnabled()
+        self.table.setSortingEnabled(False)
         self.table.blockSignals(True)
 
         try:
             # 获取抽奖池数据
-            pool = get_pool_list(pool_name)
-            if not pool:
-                self.table.setRowCount(0)
-                return
+            pool_data = read_json(
+                pool_file, default=OrderedDict(), object_pairs_hook=OrderedDict
+            )
+            self._buffer.load(pool_data)
+            self._buffer_file = pool_file
+            pool = self._buffer.sorted_rows()
 
-            # 设置表格行数
+            # 设置表格行数并填充表格数据
             self.table.setRowCount(len(pool))
-
-            # 填充表格数据
             for row, item in enumerate(pool):
-                # 是否存在勾选框
-                checkbox_item = QTableWidgetItem()
-                checkbox_item.setCheckState(
-                    Qt.CheckState.Checked
-                    if item.get("exist", True)
-                    else Qt.CheckState.Unchecked
-                )
-                checkbox_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, 0, checkbox_item)
-
-                # 奖品ID
-                id_item = QTableWidgetItem(str(item.get("id", row + 1)))
-                id_item.setFlags(
-                    id_item.flags() & ~Qt.ItemFlag.ItemIsEditable
-                )  # 学号不可编辑
-                id_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, 1, id_item)
-
-                # 奖品名称
-                name_item = QTableWidgetItem(item.get("name", ""))
-                name_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, 2, name_item)
-
-                # 奖品权重
-                weight_item = QTableWidgetItem(str(item.get("weight", 1)))
-                weight_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, 3, weight_item)
+                self._set_row(row, item)
 
             # 调整列宽
             self.table.horizontalHeader().resizeSection(0, 80)
@@ -262,111 +275,160 @@ class lottery_table(GroupHeaderCardWidget):
         finally:
             # 恢复信号
             self.table.blockSignals(False)
-
-    def save_table_data(self, row, col):
-        """保存表格编辑的数据"""
-        pool_name = self.lottery_comboBox.currentText()
-        if not pool_name:
+            self.table.setSortingEnabled(sorting)
+
+    def _set_row(self, row, prize):
+        """把一个奖品的数据写入表格的一行，只修改有变化的单元格"""
+        checkbox_item = self.table.item(row, 0)
+        if checkbox_item is None:
+            # 是否存在勾选框
+            checkbox_item = QTableWidgetItem()
+            checkbox_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.table.setItem(row, 0, checkbox_item)
+        state = Qt.CheckState.Unchecked
+        if prize.get("exist", True):
+            state = Qt.CheckState.Checked
+        if checkbox_item.checkState() != state:
+            checkbox_item.setCheckState(state)
+
+        # 奖品ID、名称、权重
+        values = {
+            1: str(prize.get("id", row + 1)),
+            2: str(prize.get("name", "")),
+            3: str(prize.get("weight", 1)),
+        }
+        for col, text in values.items():
+            item = self.table.item(row, col)
+            if item is None:
+                item = QTableWidgetItem(text)
+                if col == 1:
+                    item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                self.table.setItem(row, col, item)
+            elif item.text() != text:
+                item.setText(text)
+
+    def _table_rows(self):
+        """表格中每个奖品所在的行，以奖品ID为键"""
+        rows = {}
+        for row in range(self.table.rowCount()):
+            id_item = self.table.item(row, 1)
+            if id_item is not None:
+                rows[normalize_item_id(id_item.text())] = row
+        return rows
+
+    def _apply_row_diff(self, diff):
+        """按行更新表格，不重建其它行"""
+        if diff.is_empty():
             return
+        sorting = self.table.isSortingEnabled()
+        self.table.setSortingEnabled(False)
+        self.table.blockSignals(True)
+        try:
+            rows = self._table_rows()
+            for row in sorted(
+                (rows[key] for key in diff.removed if key in rows), reverse=True
+            ):
+                self.table.removeRow(row)
+            if diff.removed:
+                rows = self._table_rows()
+            added = list(diff.added)
+            for key, prize in diff.changed.items():
+                if key in rows:
+                    self._set_row(rows[key], prize)
+                else:
+                    added.append(prize)
+            for prize in added:
+                row = self.table.rowCount()
+                self.table.insertRow(row)
+                self._set_row(row, prize)
+        finally:
+            self.table.blockSignals(False)
+            self.table.setSortingEnabled(sorting)
 
-        # 获取当前单元格
-        item = self.table.item(row, col)
-        if not item:
+    def merge_external_changes(self):
+        """把其它窗口或程序对当前奖池名单的修改逐行合并到表格中"""
+        if not hasattr(self, "table") or self.table is None:
             return
-
-        # 获取当前行的奖品ID和名称
-        id_item = self.table.item(row, 1)
-        name_item = self.table.item(row, 2)
-        if not id_item or not name_item:
+        pool_file = self._current_pool_file()
+        if pool_file is None or pool_file != self._buffer_file:
+            self.refresh_data()
             return
-        item_id = id_item.text()
-        item_name = name_item.text()
-
-        # 加载当前抽奖池数据
-        pool_file = get_data_path("list/lottery_list") / f"{pool_name}.json"
         try:
-            with open_file(pool_file, "r", encoding="utf-8") as f:
-                pool_data = json.load(f, object_pairs_hook=OrderedDict)
+            pool_data = read_json(pool_file, object_pairs_hook=OrderedDict)
         except Exception as e:
             logger.exception(f"加载抽奖池数据失败: {str(e)}")
             return
+        if pool_data is None:
+            return
+        self._apply_row_diff(self._buffer.merge(pool_data))
 
-        # 通过奖品ID找到对应的奖品键
-        matched_key = None
-        for key, value in pool_data.items():
-            stored_id = value.get("id")
-            if str(stored_id).lstrip("0") == str(item_id).lstrip("0") or str(
-                stored_id
-            ) == str(item_id):
-                matched_key = key
-                break
-
-        if not matched_key:
-            logger.exception(f"未找到奖品ID为 {item_id} 的奖品，奖品名称: {item_name}")
+    def save_table_data(self, row, col):
+        """记录表格编辑的数据，停止编辑一段时间后统一保存"""
+        field = self.COLUMN_FIELDS.get(col)
+        item = self.table.item(row, col)
+        id_item = self.table.item(row, 1)
+        if field is None or not item or not id_item or self._buffer_file is None:
             return
 
-        # 根据列索引更新相应的字段
-        new_value = item.text()
-        if col == 2:  # 奖品名称列
-            # 直接更新奖品名称，不再使用括号标记
-            if new_value != matched_key:
-                new_pool_data = OrderedDict()
-                for key, value in pool_data.items():
-                    if key == matched_key:
-                        new_pool_data[new_value] = value
-                    else:
-                        new_pool_data[key] = value
-                pool_data = new_pool_data
-        elif col == 3:  # 奖品权重列
-            pool_data[matched_key]["weight"] = float(new_value)
-        elif col == 0:  # "存在"勾选框列
-            checkbox_item = self.table.item(row, 0)
-            if checkbox_item:
-                is_checked = checkbox_item.checkState() == Qt.CheckState.Checked
-                pool_data[matched_key]["exist"] = is_checked
-
-        # 保存更新后的数据
+        item_id = id_item.text()
         try:
-            # 使用共享文件监视器时，不需要手动移除和重新添加路径
-            # 共享监视器会自动处理多个回调，避免循环触发
-            with open_file(pool_file, "w", encoding="utf-8") as f:
-                json.dump(pool_data, f, ensure_ascii=False, indent=4)
-            # logger.debug(f"抽奖池数据更新成功: {pool_name}")
+            if col == 0:  # "存在"勾选框列
+                value = item.checkState() == Qt.CheckState.Checked
+            elif col == 3:  # 奖品权重列
+                value = float(item.text())
+            else:
+                value = item.text()
+        except ValueError:
+            logger.warning(f"奖品权重无效: {item.text()}")
+            value = None
 
-            # 保存成功后设置列宽
+        if value is not None and self._buffer.set_value(item_id, field, value):
+            self._save_timer.start()
+            return
+
+        # 修改无效（如权重不是数字、名称与其它奖品重复）时恢复为原来的值
+        prize = self._buffer.row(item_id)
+        if prize:
             self.table.blockSignals(True)
-            for i in range(1, 4):
-                self.table.horizontalHeader().setSectionResizeMode(
-                    i, QHeaderView.ResizeMode.Stretch
-                )
+            self._set_row(row, prize)
             self.table.blockSignals(False)
+
+    def flush_pending_edits(self):
+        """立即保存尚未保存的修改，一次写入全部修改过的奖品"""
+        self._save_timer.stop()
+        pool_file = self._buffer_file
+        if pool_file is None or not self._buffer.dirty:
+            return
+
+        try:
+            latest = read_json(
+                pool_file, default=OrderedDict(), object_pairs_hook=OrderedDict
+            )
+            pool_data = self._buffer.apply_to(latest)
+            write_json(pool_file, pool_data, origin=self._write_origin)
+            # logger.debug(f"抽奖池数据更新成功: {pool_file.stem}")
         except Exception as e:
             logger.exception(f"保存抽奖池数据失败: {str(e)}")
-            # 如果保存失败，恢复原来的值
-            self.table.blockSignals(True)  # 阻止信号，避免递归调用
-            if col == 2:  # 奖品名称列
-                item.setText(str(matched_key) if matched_key else item_name)
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            else:
-                original_value = ""
-                if matched_key:
-                    original_value = (
-                        pool_data[matched_key]["weight"] if col == 3 else ""
-                    )
-                item.setText(str(original_value))
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.blockSignals(False)  # 恢复信号
+            # 如果保存失败，恢复为文件中的内容
+            self._buffer.load({})
+            self._buffer_file = None
+            self.refresh_data()
+            return
 
-            # 共享文件监视器不需要手动重新启用
+        diff = self._buffer.commit(pool_data)
+        if hasattr(self, "table") and self.table is not None:
+            self._apply_row_diff(diff)
+
+    def hideEvent(self, event):
+        """页面隐藏时立即保存尚未保存的修改"""
+        self.flush_pending_edits()
+        super().hideEvent(event)
 
     def cleanup_file_watcher(self):
-        """清理文件系统监视器"""
-        if hasattr(self, "_shared_watcher"):
-            lottery_list_dir = get_data_path("list/lottery_list")
-            if lottery_list_dir.exists():
-                self._shared_watcher.remove_watcher(
-                    str(lottery_list_dir), self.on_directory_changed
-                )
+        """取消文件变化订阅"""
+        if hasattr(self, "file_subscription"):
+            self.file_subscription.cancel()
 
     def __del__(self):
         """析构函数，确保清理文件监视器"""
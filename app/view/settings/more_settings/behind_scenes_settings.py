@@ -20,9 +20,7 @@ from app.common.safety.secure_store import (
     write_behind_scenes_settings,
 )
 from app.common.behind_scenes.behind_scenes_utils import BehindScenesUtils
-from app.view.settings.list_management.shared_file_watcher import (
-    get_shared_file_watcher,
-)
+from app.tools.file_change_service import FILE_KIND_ROSTER, subscribe_file_changes
 
 
 # ==================================================
@@ -334,31 +332,15 @@ class behind_scenes_settings_table(GroupHeaderCardWidget):
         self.layout().addWidget(self.table)
 
     def setup_file_watcher(self):
-        """设置文件系统监视器，监控班级名单和奖池名单文件夹的变化"""
-        roll_call_list_dir = get_data_path("list", "roll_call_list")
-        lottery_list_dir = get_data_path("list", "lottery_list")
-
-        if not roll_call_list_dir.exists():
-            logger.warning(f"班级名单文件夹不存在: {roll_call_list_dir}")
-
-        if not lottery_list_dir.exists():
-            logger.warning(f"奖池名单文件夹不存在: {lottery_list_dir}")
-
-        self._shared_watcher = get_shared_file_watcher()
-
-        if roll_call_list_dir.exists():
-            self._shared_watcher.add_watcher(
-                str(roll_call_list_dir), self.on_directory_changed
-            )
-
-        if lottery_list_dir.exists():
-            self._shared_watcher.add_watcher(
-                str(lottery_list_dir), self.on_directory_changed
-            )
+        """订阅班级名单和奖池名单文件夹的变化"""
+        self.file_subscription = subscribe_file_changes(
+            FILE_KIND_ROSTER, self.on_list_files_changed, widget=self, delay_ms=1000
+        )
 
-    def on_directory_changed(self, path):
-        """当目录内容发生变化时调用此方法"""
-        QTimer.singleShot(1000, self.refresh_list)
+    def on_list_files_changed(self, event):
+        """名单文件变化时调用，只有名单增删时才需要刷新下拉框"""
+        if event.names_changed:
+            self.refresh_list()
 
     def refresh_list(self):
         """刷新名单下拉框列表"""
@@ -719,18 +701,9 @@ class behind_scenes_settings_table(GroupHeaderCardWidget):
         self.save_probability_data()
 
     def cleanup_file_watcher(self):
-        """清理文件系统监视器"""
-        if hasattr(self, "_shared_watcher"):
-            roll_call_list_dir = get_data_path("list", "roll_call_list")
-            if roll_call_list_dir.exists():
-                self._shared_watcher.remove_watcher(
-                    str(roll_call_list_dir), self.on_directory_changed
-                )
-            lottery_list_dir = get_data_path("list", "lottery_list")
-            if lottery_list_dir.exists():
-                self._shared_watcher.remove_watcher(
-                    str(lottery_list_dir), self.on_directory_changed
-                )
+        """取消文件变化订阅"""
+        if hasattr(self, "file_subscription"):
+            self.file_subscription.cancel()
 
     def closeEvent(self, event):
         """窗口关闭事件，确保线程被正确停止"""
@@ -23,6 +23,7 @@ from app.tools.variable import (
     SETTINGS_WINDOW_DEFAULT_HEIGHT,
     SETTINGS_WARMUP_DELAY_MS,
     SETTINGS_DEFAULT_PAGE_DELAY_MS,
+    SETTINGS_PRELOAD_MEMORY_BUDGET_MB,
 )
 from app.tools.path_utils import get_data_path
 from app.tools.personalised import get_theme_icon
@@ -31,6 +32,7 @@ from app.tools.settings_access import (
     update_settings,
 )
 from app.page_building.window_template import BackgroundLayer
+from app.page_building.page_preloader import PagePreloader
 from app.Language.obtain_language import get_content_name_async
 from app.common.IPC_URL.url_command_handler import URLCommandHandler
 from app.common.search.settings_search_controller import SettingsSearchController
@@ -92,6 +94,7 @@ class SettingsWindow(FluentWindow):
         self._deferred_factories_meta = {}
         self._created_pages = {}
         self._page_access_order = []
+        self._page_preloader = None
 
     def _setup_timers(self):
         """设置定时器"""
@@ -400,6 +403,8 @@ class SettingsWindow(FluentWindow):
         """
         self.hide()
         event.ignore()
+        if self._page_preloader is not None:
+            self._page_preloader.stats.save()
         is_maximized = self.isMaximized()
         update_settings("settings", "is_maximized", is_maximized)
         if not is_maximized:
@@ -791,9 +796,7 @@ class SettingsWindow(FluentWindow):
     def _setup_background_warmup(self):
         """设置后台预热"""
         try:
-            QTimer.singleShot(
-                SETTINGS_WARMUP_DELAY_MS, lambda: self._background_warmup_non_pivot()
-            )
+            self._setup_page_preloader()
         except Exception as e:
             logger.exception("Error during settings warmup: {}", e)
 
@@ -809,6 +812,27 @@ class SettingsWindow(FluentWindow):
         except Exception as e:
             logger.exception("Error scheduling background warmup pages: {}", e)
 
+    def _setup_page_preloader(self):
+        """创建页面预加载器并注册所有延迟创建的页面
+
+        预览模式不预加载；内存预算为 0 时预加载器不启用，沿用按数量卸载的策略。
+        """
+        budget_mb = 0
+        if not self.is_preview:
+            try:
+                budget_mb = float(
+                    readme_settings_async("settings", "preload_memory_budget_mb")
+                )
+            except (TypeError, ValueError):
+                budget_mb = SETTINGS_PRELOAD_MEMORY_BUDGET_MB
+        self._page_preloader = PagePreloader(self, budget_mb)
+        for name in list(self._deferred_factories):
+            self._page_preloader.register(
+                name,
+                build=lambda n=name: self._build_settings_page(n),
+                unload=lambda n=name: self._unload_settings_page(n),
+            )
+
     def initNavigation(self):
         """初始化导航系统
         根据用户设置构建个性化菜单导航"""
@@ -1014,16 +1038,9 @@ class SettingsWindow(FluentWindow):
                 and widget.layout()
                 and widget.layout().count() == 0
             ):
-                factory = self._deferred_factories.pop(name)
                 try:
                     logger.debug(f"正在创建页面 {name}，预览模式: {self.is_preview}")
-                    real_page = factory(is_preview=self.is_preview)
-                    widget.layout().addWidget(real_page)
-
-                    if not hasattr(self, "_created_pages"):
-                        self._created_pages = {}
-                    self._created_pages[name] = real_page
-
+                    self._create_settings_page(name)
                     logger.debug(
                         f"设置页面已按需创建: {name}, 预览模式: {self.is_preview}"
                     )
@@ -1032,12 +1049,53 @@ class SettingsWindow(FluentWindow):
         except Exception as e:
             logger.exception(f"处理堆叠窗口改变失败: {e}")
 
+    def _create_settings_page(self, name: str):
+        """创建设置页面，启用预加载器时由其测量页面的内存占用
+
+        Args:
+            name: 页面名称
+
+        Returns:
+            QWidget | None: 创建的页面
+        """
+        preloader = self._page_preloader
+        if preloader is not None and preloader.enabled:
+            return preloader.build(name, lambda: self._build_settings_page(name))
+        return self._build_settings_page(name)
+
+    def _build_settings_page(self, name: str):
+        """用延迟工厂创建真实页面并放入占位容器（按需创建和空闲预加载共用）
+
+        Args:
+            name: 页面名称
+
+        Returns:
+            QWidget | None: 创建的页面，页面已存在或无法创建时为 None
+        """
+        container = getattr(self, name, None)
+        if container is None or container.layout() is None:
+            return None
+        if name not in self._deferred_factories or container.layout().count() != 0:
+            return None
+        factory = self._deferred_factories.pop(name)
+        real_page = factory(is_preview=self.is_preview)
+        container.layout().addWidget(real_page)
+        self._created_pages[name] = real_page
+        return real_page
+
     def _unload_inactive_pages(self, current_page: str):
         """卸载不活动的页面以释放内存
 
+        启用预加载器时按内存预算卸载，否则最多保留 MAX_CACHED_SETTINGS_PAGES 个页面
+
         Args:
             current_page: 当前激活的页面名称
         """
+        preloader = self._page_preloader
+        if preloader is not None and preloader.enabled:
+            preloader.page_shown(current_page)
+            return
+
         MAX_CACHED_SETTINGS_PAGES = 2
 
         if not hasattr(self, "_created_pages"):
@@ -1085,6 +1143,8 @@ class SettingsWindow(FluentWindow):
             real_page.deleteLater()
 
             self._restore_page_factory(page_name, container)
+            if self._page_preloader is not None:
+                self._page_preloader.page_unloaded(page_name)
 
             logger.debug(f"已卸载设置页面 {page_name} 以释放内存")
         except RuntimeError as e:
@@ -1166,103 +1226,25 @@ class SettingsWindow(FluentWindow):
             name: 页面名称
         """
         try:
-            if name not in getattr(self, "_deferred_factories", {}):
-                return
-            factory = self._deferred_factories.pop(name)
-
-            container = self._find_container_by_name(name)
-            if container is None:
-                return
-
-            if not container or not hasattr(container, "layout"):
-                return
-            layout = container.layout()
-            if layout is None:
-                return
-
-            try:
-                real_page = factory(is_preview=self.is_preview)
-            except RuntimeError as e:
-                logger.exception(f"创建延迟页面 {name} 失败（父容器可能已销毁）: {e}")
-                return
-            except Exception as e:
-                logger.exception(f"创建延迟页面 {name} 失败: {e}")
-                return
-
-            try:
-                layout.addWidget(real_page)
-                logger.debug(f"后台预热创建设置页面: {name}")
-            except RuntimeError as e:
-                logger.exception(
-                    f"将延迟页面 {name} 插入容器失败（容器可能已销毁）: {e}"
-                )
-                return
+            if self._create_settings_page(name) is not None:
+                logger.debug(f"已创建设置页面: {name}")
+        except RuntimeError as e:
+            logger.exception(f"创建延迟页面 {name} 失败（父容器可能已销毁）: {e}")
         except Exception as e:
             logger.exception(f"_create_deferred_page 失败: {e}")
 
-    def _find_container_by_name(self, name: str):
-        """根据名称查找容器
-
-        Args:
-            name: 容器名称
-
-        Returns:
-            QWidget: 容器对象或None
-        """
-        container_attrs = [
-            "basicSettingsInterface",
-            "listManagementInterface",
-            "extractionSettingsInterface",
-            "floatingWindowManagementInterface",
-            "notificationSettingsInterface",
-            "safetySettingsInterface",
-            "customSettingsInterface",
-            "voiceSettingsInterface",
-            "historyInterface",
-            "moreSettingsInterface",
-            "courseSettingsInterface",
-            "updateInterface",
-            "aboutInterface",
-        ]
-
-        for attr in container_attrs:
-            container_obj = getattr(self, attr, None)
-            if container_obj and container_obj.objectName() == name:
-                return container_obj
-
-        return None
-
     # ==================================================
     # 后台预热
     # ==================================================
 
-    def _background_warmup_pages(
-        self,
-        interval_ms: int = 800,
-        max_preload: int = 1,
-    ):
-        """分批（间隔）创建剩余的设置页面，减少单次阻塞
-
-        内存优化：完全禁用后台预热，所有页面按需加载
+    def _background_warmup_pages(self):
+        """开始空闲预加载
 
-        Args:
-            interval_ms: 每个页面创建间隔（毫秒）（已禁用）
-            max_preload: 最大预加载数量（已禁用）
+        按访问频率在空闲时逐个创建页面，已创建页面的内存占用超过
+        preload_memory_budget_mb 时按最近最少访问顺序卸载；预算为 0 时所有页面按需加载。
         """
-        pass
-
-    def _background_warmup_non_pivot(self, interval_ms: int = 80):
-        """在设置窗口首次打开时，分批延时创建所有非 pivot（单页面）项
-
-        内存优化：禁用自动预热，完全按需加载
-
-        Args:
-            interval_ms: 每个页面创建的间隔毫秒数
-        """
-        try:
-            pass
-        except Exception as e:
-            logger.exception(f"后台预热非 pivot 页面失败: {e}")
+        if self._page_preloader is not None:
+            self._page_preloader.start()
 
     # ==================================================
     # 窗口显示
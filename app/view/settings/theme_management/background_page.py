@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import os
+import time
 
 from PySide6.QtCore import Qt, QEvent, QTimer
-from PySide6.QtGui import QColor, QImage, QLinearGradient, QMovie, QPainter, QPixmap
+from PySide6.QtGui import QColor, QLinearGradient, QMovie, QPainter, QPixmap
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
@@ -14,9 +15,6 @@ from PySide6.QtWidgets import (
     QSlider,
     QSizePolicy,
     QScroller,
-    QGraphicsBlurEffect,
-    QGraphicsPixmapItem,
-    QGraphicsScene,
 )
 from qfluentwidgets import (
     GroupHeaderCardWidget,
@@ -38,7 +36,11 @@ from app.Language.obtain_language import (
 )
 from app.tools.personalised import get_theme_icon
 from app.tools.settings_access import readme_settings_async, update_settings
-from app.tools.variable import SUPPORTED_IMAGE_EXTENSIONS
+from app.tools.variable import (
+    BACKGROUND_ANIMATION_MAX_FPS,
+    SUPPORTED_IMAGE_EXTENSIONS,
+)
+from app.common.display.background_render import blur_image
 
 
 class BackgroundManagementPage(QWidget):
@@ -112,6 +114,8 @@ class _BackgroundGroup(GroupHeaderCardWidget):
         self.setTitle(title)
         self.setBorderRadius(8)
         self._preview_movie: QMovie | None = None
+        self._preview_frame_time = 0.0
+        self._preview_frame_interval = 1.0 / BACKGROUND_ANIMATION_MAX_FPS
 
         self.modeCombo = ComboBox()
         self.modeCombo.addItems(
@@ -583,21 +587,8 @@ class _BackgroundGroup(GroupHeaderCardWidget):
         radius = int(radius)
         if radius <= 0:
             return pix
-
-        src = pix
-        scene = QGraphicsScene()
-        item = QGraphicsPixmapItem(src)
-        effect = QGraphicsBlurEffect()
-        effect.setBlurRadius(radius)
-        item.setGraphicsEffect(effect)
-        scene.addItem(item)
-
-        img = QImage(src.size(), QImage.Format.Format_ARGB32_Premultiplied)
-        img.fill(Qt.GlobalColor.transparent)
-        p = QPainter(img)
-        scene.render(p)
-        p.end()
-        return QPixmap.fromImage(img)
+        # 与窗口背景使用相同的模糊算法，预览效果与实际一致
+        return QPixmap.fromImage(blur_image(pix.toImage(), radius))
 
     def _stop_preview_movie(self):
         movie = getattr(self, "_preview_movie", None)
@@ -629,6 +620,11 @@ class _BackgroundGroup(GroupHeaderCardWidget):
             return
 
         self._stop_preview_movie()
+        fps = readme_settings_async("background_management", "animation_max_fps")
+        try:
+            self._preview_frame_interval = 1.0 / max(1, int(fps))
+        except (TypeError, ValueError):
+            self._preview_frame_interval = 1.0 / BACKGROUND_ANIMATION_MAX_FPS
         movie = QMovie(path)
         movie.setCacheMode(QMovie.CacheMode.CacheNone)
         movie.frameChanged.connect(self._on_preview_movie_frame_changed)
@@ -642,6 +638,11 @@ class _BackgroundGroup(GroupHeaderCardWidget):
         movie = getattr(self, "_preview_movie", None)
         if movie is None:
             return
+        # 与窗口背景一样按 animation_max_fps 节流，模糊预览不必每帧重新渲染
+        now = time.monotonic()
+        if _frame and now - self._preview_frame_time < self._preview_frame_interval:
+            return
+        self._preview_frame_time = now
         frame = movie.currentPixmap()
         if frame.isNull():
             return
@@ -14,6 +14,8 @@ from app.tools.path_utils import *
 from app.tools.personalised import *
 from app.tools.settings_default import *
 from app.tools.settings_access import *
+from app.tools.json_store import read_json, write_json
+from app.tools.file_change_service import FILE_KIND_ROSTER, subscribe_file_changes
 from app.Language.obtain_language import *
 from app.common.data.list import (
     get_class_name_list,
@@ -276,8 +278,7 @@ class voice_announcement_main(GroupHeaderCardWidget):
             # 读取现有音频设置数据
             audio_data = {}
             if audio_file.exists():
-                with open_file(audio_file, "r", encoding="utf-8") as f:
-                    audio_data = json.load(f)
+                audio_data = read_json(audio_file)
 
             # 更新音频设置数据（只保存需要的字段，不保存学号/序号）
             audio_data[name_field] = {
@@ -288,8 +289,7 @@ class voice_announcement_main(GroupHeaderCardWidget):
             }
 
             # 保存到音频设置文件
-            with open_file(audio_file, "w", encoding="utf-8") as f:
-                json.dump(audio_data, f, indent=4, ensure_ascii=False)
+            write_json(audio_file, audio_data)
 
             item_type = "学生" if self.current_mode == 0 else "奖品"
             logger.debug(f"已更新{item_type} {name_field} 的语音播报设置")
@@ -297,23 +297,27 @@ class voice_announcement_main(GroupHeaderCardWidget):
             logger.exception(f"更新语音播报设置失败: {e}")
 
     def setup_file_watcher(self):
-        """设置文件系统监视器，监控历史记录文件夹的变化"""
-        if self.current_mode == 0:  # 点名模式
-            history_dir = get_data_path("history/roll_call_history")
-        else:  # 抽奖模式
-            history_dir = get_data_path("history/lottery_history")
-
-        if not history_dir.exists():
-            logger.warning(f"历史记录文件夹不存在: {history_dir}")
-            return
+        """订阅班级名单和奖池名单文件夹的变化（下拉框和表格的内容都来自名单）"""
+        self.file_subscription = subscribe_file_changes(
+            FILE_KIND_ROSTER, self.on_list_files_changed, widget=self, delay_ms=1000
+        )
 
-        self.file_watcher = QFileSystemWatcher()
-        self.file_watcher.addPath(str(history_dir))
-        self.file_watcher.directoryChanged.connect(self.on_directory_changed)
+    def on_list_files_changed(self, event):
+        """名单文件变化：当前模式的名单有增删时重建下拉框，否则只在当前名单变化时刷新表格
 
-    def on_directory_changed(self, path):
-        """当目录内容发生变化时调用此方法"""
-        QTimer.singleShot(1000, self.refresh_class_history)
+        Args:
+            event: 文件变化事件
+        """
+        if self.current_mode == 0:  # 点名模式
+            list_dir = get_data_path("list", "roll_call_list")
+        else:  # 抽奖模式
+            list_dir = get_data_path("list", "lottery_list")
+        if any(path.parent == list_dir for path in event.added + event.removed):
+            self.refresh_class_history()
+        elif self.current_class_name and event.touches(
+            list_dir / f"{self.current_class_name}.json"
+        ):
+            self.refresh_data()
 
     def refresh_class_history(self):
         """刷新下拉框列表"""
@@ -394,8 +398,7 @@ class voice_announcement_main(GroupHeaderCardWidget):
             audio_data = {}
             audio_file = get_audio_path(f"{class_name}.json")
             if audio_file.exists():
-                with open_file(audio_file, "r", encoding="utf-8") as f:
-                    audio_data = json.load(f)
+                audio_data = read_json(audio_file)
 
             # 设置表格行数
             self.table.setRowCount(len(cleaned_items))
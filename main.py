@@ -13,6 +13,9 @@ from loguru import logger
 
 from app.tools.path_utils import get_app_root
 from app.tools.config import configure_logging
+from app.tools.json_store import flush_json_writes, recover_interrupted_writes
+from app.tools.log_control import flush_log_queues
+from app.tools.memory_monitor import start_memory_monitor
 from app.tools.settings_default import manage_settings_file
 from app.tools.settings_access import readme_settings_async, get_or_create_user_id
 from app.tools.variable import (
@@ -329,6 +332,9 @@ def cleanup_resources(
         cs_ipc_handler: CS IPC 处理器对象
         update_check_thread: 更新检查线程对象
     """
+    # os._exit 不会执行 atexit，在这里写出尚未写出的 JSON 修改
+    flush_json_writes()
+
     if cs_ipc_handler:
         cs_ipc_handler.stop_ipc_client()
 
@@ -367,6 +373,7 @@ def restart_application(program_dir):
 
     if not os.path.exists(executable):
         logger.critical(f"重启失败：无法找到可执行文件: {executable}")
+        flush_log_queues()
         os._exit(1)
 
     try:
@@ -402,6 +409,7 @@ def restart_application(program_dir):
                     time.sleep(0.8)
                 if bool(start_elevated_process(cmd, cwd=program_dir)):
                     logger.info("Windows 平台：已请求管理员启动新进程")
+                    flush_log_queues()
                     os._exit(0)
 
             if need_uiaccess and start_uiaccess_process is not None:
@@ -425,6 +433,7 @@ def restart_application(program_dir):
                 pid = int(start_uiaccess_process(normalized) or 0)
                 if pid > 0:
                     logger.info("Windows 平台：UIAccess 进程已启动")
+                    flush_log_queues()
                     os._exit(0)
 
             startup_info = subprocess.STARTUPINFO()
@@ -437,13 +446,16 @@ def restart_application(program_dir):
                 startupinfo=startup_info,
             )
             logger.info("Windows 平台：新进程已启动")
+            flush_log_queues()
             os._exit(0)
         else:
             # Linux/Unix/macOS 平台使用 os.execl 替换当前进程
             logger.info("Linux/Unix/macOS 平台：使用 execl 重启应用程序")
+            flush_log_queues()
             os.execl(executable, executable, *filtered_args)
     except Exception as e:
         logger.exception(f"重启应用程序失败: {e}")
+        flush_log_queues()
         os._exit(1)
 
 
@@ -474,6 +486,7 @@ def handle_exit(
     )
 
     logger.info("程序退出流程已完成，正在结束进程")
+    flush_log_queues()
     if sys.stdout:
         sys.stdout.flush()
     if sys.stderr:
@@ -519,6 +532,7 @@ def main():
     if not is_first_instance:
         handle_existing_instance(shared_memory)
 
+    recover_interrupted_writes()
     manage_settings_file()
 
     app, window_manager, url_handler, cs_ipc_handler, local_server = (
@@ -531,6 +545,8 @@ def main():
         sys.exit(1)
 
     initialize_app_components(window_manager)
+    # 设置了 SECRANDOM_MEMORY_MONITOR 时定时记录内存增长，否则不做任何事
+    start_memory_monitor()
 
     if VERSION == DEV_VERSION:
         setup_dev_hints(app)
@@ -552,6 +568,7 @@ def main():
             shared_memory.detach()
         if local_server:
             local_server.close()
+        flush_log_queues()
         if sys.stdout:
             sys.stdout.flush()
         if sys.stderr:
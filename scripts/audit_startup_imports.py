@@ -0,0 +1,112 @@
+"""审计关键启动路径的导入耗时，并在导入了重型依赖时以非零状态退出。
+
+使用 ``python -X importtime`` 在子进程中导入启动时必经的模块（无界面，offscreen），
+解析每个模块的导入耗时；若 STARTUP_FORBIDDEN_MODULES 中的包出现在导入链中则审计失败。
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from app.tools.variable import STARTUP_FORBIDDEN_MODULES
+
+# 主窗口显示前必然会被导入的模块
+CRITICAL_STARTUP_MODULES = (
+    "main",
+    "app.view.main.window",
+    "app.view.floating_window.levitation",
+    "app.view.tray.tray",
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="审计关键启动路径的导入耗时。")
+    parser.add_argument(
+        "-m",
+        "--module",
+        action="append",
+        dest="modules",
+        help="要审计的模块，可多次指定。默认为主窗口显示前必经的模块",
+    )
+    parser.add_argument(
+        "-n",
+        "--top",
+        type=int,
+        default=20,
+        help="输出累计耗时最高的前 N 个模块。默认为20",
+    )
+    return parser.parse_args()
+
+
+def measure_imports(modules: list[str]) -> list[tuple[str, int, int]]:
+    """在子进程中导入模块并解析 -X importtime 输出
+
+    Returns:
+        list[tuple[str, int, int]]: (模块名, 自身耗时us, 累计耗时us)
+    """
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    code = "; ".join(f"import {name}" for name in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=str(ROOT_DIR),
+        env=env,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"导入关键启动模块失败：\n{proc.stderr[-4000:]}")
+
+    records: list[tuple[str, int, int]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0].strip())
+            cumulative_us = int(parts[1].strip())
+        except ValueError:
+            continue
+        records.append((parts[2].strip(), self_us, cumulative_us))
+    return records
+
+
+def main() -> None:
+    args = parse_args()
+    modules = args.modules or list(CRITICAL_STARTUP_MODULES)
+
+    records = measure_imports(modules)
+    total_us = sum(self_us for _, self_us, _ in records)
+
+    print(f"已导入 {len(records)} 个模块，总耗时 {total_us / 1000:.1f}ms")
+    for name, _, cumulative_us in sorted(records, key=lambda r: r[2], reverse=True)[
+        : args.top
+    ]:
+        print(f"  {cumulative_us / 1000:>9.1f}ms  {name}")
+
+    leaked = sorted(
+        {
+            name.split(".")[0]
+            for name, _, _ in records
+            if name.split(".")[0] in STARTUP_FORBIDDEN_MODULES
+        }
+    )
+    if leaked:
+        print(f"审计失败：关键启动路径中导入了重型依赖 {', '.join(leaked)}")
+        sys.exit(1)
+    print("审计通过：关键启动路径中未导入重型依赖。")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""测量日志对抽取的开销：在不同日志等级和输出方式下重复执行抽取，比较每次抽取的耗时。
+
+抽取使用正式的 apply_avg_gap_protection()（平均值差值保护开启，每次都会输出十余条调试日志），
+但设置和历史记录替换为内存中的固定数据，因此不需要设置文件和界面。依次测量：
+
+- off            不添加任何输出目标
+- sync-<等级>    与之前相同，在调用方线程中直接写入日志文件
+- queued-<等级>  通过 add_queued_file_sink() 放入队列，由后台线程写入
+
+每种方式先预热再计时，输出每次抽取耗时的平均值和 p99，以及相对 off 增加的开销；
+队列方式还输出结束时等待后台写完的时间和丢弃的条数。
+
+示例：
+    python scripts/benchmark_draw_logging.py --draws 2000 --students 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from loguru import logger
+
+import app.common.fair_draw.avg_gap_protection as avg_gap_protection
+from app.tools import log_control
+from app.tools.log_control import LOG_FILE_FORMAT, add_queued_file_sink
+
+LEVELS = ("DEBUG", "INFO", "WARNING")
+FAIR_DRAW_SETTINGS = {
+    "enable_avg_gap_protection": True,
+    "gap_threshold": 1,
+    "min_pool_size": 5,
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="测量日志对抽取的开销。")
+    parser.add_argument(
+        "-n",
+        "--draws",
+        type=int,
+        default=2000,
+        help="每种方式计时的抽取次数。默认为2000",
+    )
+    parser.add_argument(
+        "--students",
+        type=int,
+        default=60,
+        help="名单中的学生数量。默认为60",
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=3,
+        help="每次抽取的人数。默认为3",
+    )
+    return parser.parse_args()
+
+
+def install_fixed_data(students: int) -> list[dict]:
+    """把设置和历史记录替换为内存中的固定数据，返回候选学生"""
+    rng = random.Random(0)
+    history = {
+        "students": {
+            f"学生{i}": {"total_count": rng.randint(0, 6)} for i in range(students)
+        }
+    }
+    avg_gap_protection.readme_settings_async = lambda group, key: FAIR_DRAW_SETTINGS[
+        key
+    ]
+    avg_gap_protection.load_history_data = lambda history_type, class_name: history
+    return [{"id": i + 1, "name": f"学生{i}"} for i in range(students)]
+
+
+def run_draws(candidates: list[dict], args: argparse.Namespace, draws: int):
+    rng = random.Random(1)
+    timings = []
+    for _ in range(draws):
+        start = time.perf_counter()
+        pool = avg_gap_protection.apply_avg_gap_protection(
+            candidates, args.count, "基准班级"
+        )
+        rng.sample(pool, min(args.count, len(pool)))
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return timings
+
+
+def measure(name: str, candidates, args, setup) -> dict:
+    logger.remove()
+    log_control.set_log_level("TRACE")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        sink = setup(Path(temp_dir))
+        run_draws(candidates, args, max(10, args.draws // 10))
+        timings = sorted(run_draws(candidates, args, args.draws))
+        start = time.perf_counter()
+        log_control.flush_log_queues()
+        drain_ms = (time.perf_counter() - start) * 1000
+        logger.remove()
+    return {
+        "name": name,
+        "mean_us": statistics.fmean(timings),
+        "p99_us": timings[int(len(timings) * 0.99) - 1],
+        "drain_ms": drain_ms if sink is not None else None,
+        "dropped": sink.stats["dropped"] if sink is not None else None,
+    }
+
+
+def sync_setup(level: str):
+    def setup(root: Path):
+        log_control.set_log_level(level)
+        logger.add(root / "sync.log", format=LOG_FILE_FORMAT, level=level)
+
+    return setup
+
+
+def queued_setup(level: str):
+    def setup(root: Path):
+        log_control.set_log_level(level)
+        add_queued_file_sink(root / "queued.log", level)
+        return log_control.get_queued_sinks()[-1]
+
+    return setup
+
+
+def main() -> int:
+    args = parse_args()
+    errors: list[str] = []
+    candidates = install_fixed_data(args.students)
+    # 第一次执行包含导入和缓存建立的开销，不计入任何一种方式
+    logger.remove()
+    run_draws(candidates, args, max(10, args.draws // 10))
+
+    results = [measure("off", candidates, args, lambda root: None)]
+    for level in LEVELS:
+        results.append(measure(f"sync-{level}", candidates, args, sync_setup(level)))
+        results.append(
+            measure(f"queued-{level}", candidates, args, queued_setup(level))
+        )
+
+    baseline = results[0]["mean_us"]
+    print(f"{'方式':<16}{'平均(µs)':>10}{'p99(µs)':>10}{'开销(µs)':>10}  后台")
+    for result in results:
+        extra = ""
+        if result["drain_ms"] is not None:
+            extra = f"写完 {result['drain_ms']:.1f}ms，丢弃 {result['dropped']} 条"
+        print(
+            f"{result['name']:<16}{result['mean_us']:>10.1f}{result['p99_us']:>10.1f}"
+            f"{result['mean_us'] - baseline:>10.1f}  {extra}"
+        )
+        if result["name"].startswith("queued") and result["drain_ms"] > 2000:
+            errors.append(f"{result['name']} 退出前没有在 2 秒内写完日志")
+
+    for error in errors:
+        print(f"  错误: {error}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,388 @@
+"""IPC 压力测试：在进程内启动带桩命令处理器的 IPC 服务器，用多个并发客户端测量吞吐和延迟。
+
+服务器与正式运行时相同（URLIPCHandler，每个连接一个线程），命令处理使用 URLCommandHandler，
+但安全验证和上课时间判断替换为固定结果，控制信号只计数不执行，因此不需要设置文件和界面。
+客户端通过 send_ipc_message_by_name 发送请求（每个请求一个新连接），按权重混合以下消息：
+
+- ping   服务器内置的 ping
+- url    URL 命令（解析 → 解析命令名 → 命令处理器）
+- batch  4 条命令的批量请求（经主线程执行）
+- echo   原样返回指定大小的负载（测量传输本身）
+
+结果以 JSON 输出（吞吐、p50/p99/p999 延迟、错误数、线程数、内存），可保存后作为基线；
+指定 --baseline 时与基线比较，吞吐下降或 p99 上升超过 --max-regression 时以非零状态退出。
+
+示例：
+    python scripts/benchmark_ipc.py --clients 8 --requests 200 --output ipc.json
+    python scripts/benchmark_ipc.py --baseline ipc.json --max-regression 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QCoreApplication, QTimer
+
+from app.common.IPC_URL.url_command_handler import URLCommandHandler
+from app.common.IPC_URL.url_ipc_handler import URLIPCHandler
+from app.tools.lazy_import import lazy_import, module_available
+
+psutil = lazy_import("psutil", optional=True)
+
+RESULT_SCHEMA = 1
+URL_COMMANDS = (
+    "secrandom://roll_call/set_count?count=2",
+    "secrandom://roll_call/start",
+    "secrandom://roll_call/stop",
+    "secrandom://lottery/set_pool?pool_name=pool",
+    "secrandom://window/main?action=show",
+    "secrandom://quick_draw",
+)
+BATCH_COMMANDS = [
+    "secrandom://roll_call/set_list?class_name=class",
+    "secrandom://roll_call/set_count?count=3",
+    "secrandom://roll_call/start",
+    "secrandom://roll_call/stop",
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="IPC 压力测试与延迟基准。")
+    parser.add_argument(
+        "-c",
+        "--clients",
+        type=int,
+        default=8,
+        help="并发客户端数量。默认为8",
+    )
+    parser.add_argument(
+        "-n",
+        "--requests",
+        type=int,
+        default=200,
+        help="每个客户端发送的请求数。默认为200",
+    )
+    parser.add_argument(
+        "--mix",
+        default="ping=1,url=4,batch=1,echo=2",
+        help="消息类型及权重，逗号分隔。默认为 ping=1,url=4,batch=1,echo=2",
+    )
+    parser.add_argument(
+        "--payload-bytes",
+        default="64,1024,16384",
+        help="echo 消息的负载大小（字节），逗号分隔，随机选用。默认为 64,1024,16384",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=10.0,
+        help="单个请求的超时时间（秒）。默认为10",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="随机数种子。默认为0",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        help="把结果保存为 JSON 文件",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        help="与之比较的基线结果 JSON 文件",
+    )
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="允许的吞吐下降和 p99 延迟上升比例。默认为0.2",
+    )
+    return parser.parse_args()
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in ("ping", "url", "batch", "echo"):
+            raise SystemExit(f"未知的消息类型: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """最近秩百分位数"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), round(fraction * len(sorted_values) + 0.5)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies_ms: list[float], errors: int, elapsed_s: float) -> dict:
+    values = sorted(latencies_ms)
+    return {
+        "requests": len(values) + errors,
+        "errors": errors,
+        "throughput_rps": round(len(values) / elapsed_s, 2) if elapsed_s else 0.0,
+        "mean_ms": round(statistics.mean(values), 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 0.50), 3),
+        "p99_ms": round(percentile(values, 0.99), 3),
+        "p999_ms": round(percentile(values, 0.999), 3),
+        "max_ms": round(values[-1], 3) if values else 0.0,
+    }
+
+
+def rss_mb() -> float | None:
+    if module_available(psutil):
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    try:
+        import resource
+
+        # Linux 上 ru_maxrss 的单位是 KB，macOS 上是字节
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        return None
+
+
+class StubCommandHandler(URLCommandHandler):
+    """命令处理器桩：不弹出验证窗口、不读取设置，控制信号只计数"""
+
+    def __init__(self):
+        super().__init__()
+        self.emitted = 0
+        for signal in (
+            self.showSettingsRequested,
+            self.showMainPageRequested,
+            self.showTrayActionRequested,
+        ):
+            signal.connect(self._count)
+        for signal in (
+            self.rollCallActionRequested,
+            self.lotteryActionRequested,
+            self.windowActionRequested,
+        ):
+            signal.connect(self._count)
+
+    def _count(self, *args) -> None:
+        self.emitted += 1
+
+    def _requires_verification(self, command: str) -> bool:
+        return False
+
+    def _get_linkage_verification_policy(self, kind: str) -> dict:
+        return {"is_non_class_time": False, "verification_required": False}
+
+
+def start_server(ipc_name: str) -> tuple[URLIPCHandler, StubCommandHandler]:
+    server = URLIPCHandler("SecRandomBenchmark", "secrandombench", ipc_name=ipc_name)
+    # url 消息走服务器自带的处理流程，只替换其中的命令处理器
+    commands = StubCommandHandler()
+    server.command_handler = commands
+    server.register_message_handler(
+        "batch",
+        lambda payload: commands.handle_batch(
+            payload.get("commands") or [], atomic=bool(payload.get("atomic"))
+        ),
+    )
+    server.register_message_handler("echo", lambda payload: payload)
+    if not server.start_ipc_server():
+        raise SystemExit("启动 IPC 服务器失败")
+    return server, commands
+
+
+def build_message(kind: str, rng: random.Random, payload_sizes: list[int]) -> dict:
+    if kind == "ping":
+        return {"type": "ping"}
+    if kind == "url":
+        return {"type": "url", "payload": {"url": rng.choice(URL_COMMANDS)}}
+    if kind == "batch":
+        payload = {"commands": BATCH_COMMANDS, "atomic": True}
+        return {"type": "batch", "payload": payload}
+    return {"type": "echo", "payload": {"data": "x" * rng.choice(payload_sizes)}}
+
+
+def is_ok(kind: str, response: dict | None) -> bool:
+    if not response or not response.get("success"):
+        return False
+    if kind in ("url", "batch"):
+        return (response.get("result") or {}).get("status") == "success"
+    return True
+
+
+def run_client(
+    index: int,
+    args: argparse.Namespace,
+    client: URLIPCHandler,
+    ipc_name: str,
+    mix: dict[str, float],
+    payload_sizes: list[int],
+    samples: dict[str, list[float]],
+    errors: dict[str, int],
+    lock: threading.Lock,
+) -> None:
+    rng = random.Random(args.seed * 1000 + index)
+    kinds = list(mix)
+    weights = [mix[k] for k in kinds]
+    local: dict[str, list[float]] = {k: [] for k in kinds}
+    local_errors = dict.fromkeys(kinds, 0)
+    for _ in range(args.requests):
+        kind = rng.choices(kinds, weights)[0]
+        message = build_message(kind, rng, payload_sizes)
+        start = time.perf_counter()
+        response = client.send_ipc_message_by_name(
+            message, target_ipc_name=ipc_name, timeout=args.timeout
+        )
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if is_ok(kind, response):
+            local[kind].append(elapsed_ms)
+        else:
+            local_errors[kind] += 1
+    with lock:
+        for kind in kinds:
+            samples[kind].extend(local[kind])
+            errors[kind] += local_errors[kind]
+
+
+def run_benchmark(args: argparse.Namespace) -> dict:
+    app = QCoreApplication(sys.argv)
+    mix = parse_mix(args.mix)
+    payload_sizes = [int(size) for size in args.payload_bytes.split(",") if size]
+    ipc_name = f"secrandom-bench-{os.getpid()}"
+    server, commands = start_server(ipc_name)
+    client = URLIPCHandler("SecRandomBenchmark", "secrandombench", ipc_name=ipc_name)
+
+    samples: dict[str, list[float]] = {kind: [] for kind in mix}
+    errors = dict.fromkeys(mix, 0)
+    lock = threading.Lock()
+    threads_baseline = threading.active_count()
+    rss_start = rss_mb()
+    peak = {"threads": threads_baseline, "rss": rss_start}
+
+    workers = [
+        threading.Thread(
+            target=run_client,
+            args=(i, args, client, ipc_name, mix, payload_sizes, samples, errors, lock),
+            daemon=True,
+        )
+        for i in range(max(1, args.clients))
+    ]
+
+    def sample_and_maybe_quit() -> None:
+        peak["threads"] = max(peak["threads"], threading.active_count())
+        rss = rss_mb()
+        if rss is not None:
+            peak["rss"] = max(peak["rss"] or 0.0, rss)
+        if not any(worker.is_alive() for worker in workers):
+            app.quit()
+
+    # 批量命令需要在主线程中执行，客户端运行期间主线程保持事件循环
+    sampler = QTimer()
+    sampler.timeout.connect(sample_and_maybe_quit)
+    sampler.start(20)
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    app.exec()
+    elapsed_s = time.perf_counter() - start
+    sampler.stop()
+    server.stop_ipc_server()
+
+    all_samples = [value for values in samples.values() for value in values]
+    return {
+        "schema": RESULT_SCHEMA,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "config": {
+            "clients": args.clients,
+            "requests_per_client": args.requests,
+            "mix": mix,
+            "payload_bytes": payload_sizes,
+            "seed": args.seed,
+        },
+        "elapsed_s": round(elapsed_s, 3),
+        "overall": summarize(all_samples, sum(errors.values()), elapsed_s),
+        "by_type": {
+            kind: summarize(samples[kind], errors[kind], elapsed_s) for kind in mix
+        },
+        "threads": {"baseline": threads_baseline, "peak": peak["threads"]},
+        "memory_mb": {
+            "rss_start": round(rss_start, 1) if rss_start is not None else None,
+            "rss_peak": round(peak["rss"], 1) if peak["rss"] is not None else None,
+        },
+        "signals_emitted": commands.emitted,
+    }
+
+
+def compare(result: dict, baseline: dict, max_regression: float) -> list[str]:
+    """与基线比较，返回超出阈值的项目"""
+    failures = []
+    if baseline.get("schema") != result["schema"]:
+        return [
+            f"基线格式版本 {baseline.get('schema')} 与当前 {result['schema']} 不一致"
+        ]
+    if baseline.get("config") != result["config"]:
+        print("警告: 基线与本次的测试配置不同，比较结果仅供参考")
+
+    sections = [("overall", result["overall"], baseline.get("overall") or {})]
+    for kind, current in result["by_type"].items():
+        sections.append((kind, current, (baseline.get("by_type") or {}).get(kind, {})))
+    for name, current, base in sections:
+        base_rps = base.get("throughput_rps") or 0
+        if base_rps and current["throughput_rps"] < base_rps * (1 - max_regression):
+            failures.append(
+                f"{name} 吞吐 {current['throughput_rps']:.1f} 低于基线 {base_rps:.1f}"
+            )
+        base_p99 = base.get("p99_ms") or 0
+        if base_p99 and current["p99_ms"] > base_p99 * (1 + max_regression):
+            failures.append(
+                f"{name} p99 {current['p99_ms']:.2f}ms 高于基线 {base_p99:.2f}ms"
+            )
+        base_errors = base.get("errors", 0)
+        if current["errors"] > base_errors:
+            failures.append(f"{name} 错误数 {current['errors']} 多于基线 {base_errors}")
+    return failures
+
+
+def main() -> int:
+    args = parse_args()
+    result = run_benchmark(args)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.output:
+        args.output.write_text(
+            json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+
+    failed = result["overall"]["errors"] > 0
+    if failed:
+        print(f"出现 {result['overall']['errors']} 个错误")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        failures = compare(result, baseline, args.max_regression)
+        for failure in failures:
+            print(f"  回归: {failure}")
+        failed = failed or bool(failures)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""用本地模拟接收端检查 ClassIsland 通知发送队列的行为，检查失败时以非零状态退出。
+
+模拟接收端可以设置处理延迟、随机丢包（抛出异常）以及重启（一段时间内调用卡住不返回）。
+依次检查：
+1. 入队耗时与接收端延迟无关，动画过程中的中间结果被合并，每个模式最终收到的是最新结果；
+2. 丢包时按退避重试，每条最终结果要么送达，要么触发失败回调；
+3. 接收端重启期间熔断生效，卡住的接收端只被调用有限次，重启完成后恢复发送。
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from app.common.notification.classisland_send_queue import (
+    CircuitBreaker,
+    ClassIslandSendQueue,
+    OutboundNotification,
+)
+
+SETTINGS_GROUPS = (
+    "roll_call_notification_settings",
+    "quick_draw_notification_settings",
+    "lottery_notification_settings",
+)
+
+
+class FakeReceiver:
+    """模拟的 ClassIsland 接收端"""
+
+    def __init__(self, latency_s: float, drop_rate: float, seed: int):
+        self.latency_s = latency_s
+        self.drop_rate = drop_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._restart_until = 0.0
+        self.calls = 0
+        self.received: list[OutboundNotification] = []
+
+    def restart(self, duration_s: float) -> None:
+        """模拟重启：duration_s 秒内的调用卡住直到重启完成"""
+        self._restart_until = time.monotonic() + duration_s
+
+    def __call__(self, item: OutboundNotification) -> bool:
+        with self._lock:
+            self.calls += 1
+            drop = self._rng.random() < self.drop_rate
+        remaining = self._restart_until - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+            raise ConnectionError("接收端正在重启")
+        time.sleep(self.latency_s)
+        if drop:
+            raise ConnectionError("模拟丢包")
+        with self._lock:
+            self.received.append(item)
+        return True
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="检查 ClassIsland 通知发送队列。")
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.05,
+        help="接收端处理延迟（秒）。默认为0.05",
+    )
+    parser.add_argument(
+        "--drop-rate",
+        type=float,
+        default=0.3,
+        help="丢包场景下的丢包率。默认为0.3",
+    )
+    parser.add_argument(
+        "--frames",
+        type=int,
+        default=60,
+        help="每次抽取的动画中间结果数量。默认为60",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="随机数种子。默认为0",
+    )
+    return parser.parse_args()
+
+
+def make_item(group: str, index: int, is_animating: bool, failures: list):
+    return OutboundNotification(
+        class_name="测试班级",
+        selected_students=[{"student_id": index, "student_name": f"学生{index}"}],
+        settings_group=group,
+        is_animating=is_animating,
+        on_failure=failures.append,
+    )
+
+
+def check_coalescing(args: argparse.Namespace, errors: list[str]) -> None:
+    receiver = FakeReceiver(args.latency, 0.0, args.seed)
+    queue = ClassIslandSendQueue(receiver, timeout_s=1.0)
+    failures: list = []
+    enqueue_us = []
+    finals = {}
+    for group in SETTINGS_GROUPS:
+        for frame in range(args.frames):
+            item = make_item(group, frame, frame < args.frames - 1, failures)
+            start = time.perf_counter()
+            queue.enqueue(item)
+            enqueue_us.append((time.perf_counter() - start) * 1e6)
+            time.sleep(0.002)
+        finals[group] = item
+    queue.wait_idle(timeout=10)
+    stats = queue.get_stats()
+    queue.close()
+
+    last = {}
+    for item in receiver.received:
+        last[item.key] = item
+    print(
+        f"[合并] 入队 {stats.get('enqueued', 0)} 条，合并 {stats.get('coalesced', 0)} 条，"
+        f"实际发送 {stats.get('sent', 0)} 条；入队耗时 平均 "
+        f"{statistics.mean(enqueue_us):.1f}us / 最大 {max(enqueue_us):.1f}us"
+    )
+    if statistics.mean(enqueue_us) > 200:
+        errors.append("入队平均耗时超过 200us")
+    if stats.get("sent", 0) >= stats.get("enqueued", 0):
+        errors.append("中间结果没有被合并")
+    for group, final in finals.items():
+        if last.get(group) is not final:
+            errors.append(f"{group} 最后收到的不是最新结果")
+    if failures:
+        errors.append(f"健康接收端出现 {len(failures)} 次失败回调")
+
+
+def check_drops(args: argparse.Namespace, errors: list[str]) -> None:
+    receiver = FakeReceiver(0.0, args.drop_rate, args.seed)
+    breaker = CircuitBreaker(failure_threshold=1000, cooldown_s=0.0)
+    queue = ClassIslandSendQueue(
+        receiver, timeout_s=0.5, max_retries=3, retry_backoff_s=0.001, breaker=breaker
+    )
+    failures: list = []
+    finals = []
+    for index in range(100):
+        item = make_item(SETTINGS_GROUPS[index % 3], index, False, failures)
+        finals.append(item)
+        queue.enqueue(item)
+        queue.wait_idle(timeout=5)
+    stats = queue.get_stats()
+    queue.close()
+
+    delivered = {id(item) for item in receiver.received}
+    failed = {id(item) for item in failures}
+    print(
+        f"[丢包] 发送 {stats.get('sent', 0)} 条，重试 {stats.get('retried', 0)} 次，"
+        f"失败回调 {len(failures)} 次"
+    )
+    for item in finals:
+        if (id(item) in delivered) == (id(item) in failed):
+            errors.append(
+                f"结果 {item.selected_students} 既未送达也未回调（或两者都有）"
+            )
+            break
+    if not stats.get("retried"):
+        errors.append("丢包时没有重试")
+
+
+def check_restart(args: argparse.Namespace, errors: list[str]) -> None:
+    receiver = FakeReceiver(0.0, 0.0, args.seed)
+    breaker = CircuitBreaker(failure_threshold=2, cooldown_s=0.5)
+    queue = ClassIslandSendQueue(
+        receiver, timeout_s=0.1, max_retries=1, retry_backoff_s=0.01, breaker=breaker
+    )
+    failures: list = []
+
+    receiver.restart(1.5)
+    restart_end = time.monotonic() + 1.5
+    index = 0
+    while time.monotonic() < restart_end:
+        queue.enqueue(make_item(SETTINGS_GROUPS[index % 3], index, False, failures))
+        index += 1
+        time.sleep(0.02)
+    calls_during_restart = receiver.calls
+    enqueued_during_restart = index
+    state_during_restart = breaker.state
+
+    # 重启完成后等待冷却结束，新的结果应能送达
+    recovered = False
+    deadline = time.monotonic() + 3.0
+    while time.monotonic() < deadline:
+        item = make_item(SETTINGS_GROUPS[0], index, False, failures)
+        index += 1
+        queue.enqueue(item)
+        queue.wait_idle(timeout=1)
+        if receiver.received and receiver.received[-1] is item:
+            recovered = True
+            break
+        time.sleep(0.05)
+    stats = queue.get_stats()
+    queue.close()
+
+    print(
+        f"[重启] 重启期间入队 {enqueued_during_restart} 条，调用接收端 {calls_during_restart} 次，"
+        f"熔断快速失败 {stats.get('short_circuited', 0)} 次，恢复: {'是' if recovered else '否'}"
+    )
+    if state_during_restart == CircuitBreaker.CLOSED:
+        errors.append("接收端重启期间熔断器没有打开")
+    if calls_during_restart > 6:
+        errors.append(f"接收端重启期间被调用了 {calls_during_restart} 次")
+    if not recovered:
+        errors.append("接收端重启完成后没有恢复发送")
+
+
+def main() -> int:
+    args = parse_args()
+    errors: list[str] = []
+    check_coalescing(args, errors)
+    check_drops(args, errors)
+    check_restart(args, errors)
+    for error in errors:
+        print(f"  错误: {error}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""用假时钟驱动倒计时引擎，检查显示刷新时机是否准确，并统计刷新次数。
+
+不依赖真实时间：每次按引擎给出的下一次刷新间隔推进假时钟（可叠加随机的提前/延迟触发），
+检查每个显示秒数是否恰好在整秒边界出现、是否有漏跳，以及非警告阶段的刷新次数
+是否接近每秒一次。检查失败时以非零状态退出。
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from PySide6.QtCore import QCoreApplication
+
+from app.tools.variable import COUNTDOWN_SMOOTH_INTERVAL_MS, COUNTDOWN_WARNING_MS
+from app.view.another_window.countdown_timer import _TimerEngine
+
+
+class FakeClock:
+    """可手动推进的单调时钟（毫秒）"""
+
+    def __init__(self, start_ms: int = 0):
+        self.now_ms = int(start_ms)
+
+    def __call__(self) -> int:
+        return self.now_ms
+
+    def advance(self, ms: int) -> None:
+        self.now_ms += max(0, int(ms))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="用假时钟检查倒计时刷新时机。")
+    parser.add_argument(
+        "-s",
+        "--seconds",
+        type=int,
+        default=45 * 60,
+        help="倒计时总秒数。默认为2700（一节课）",
+    )
+    parser.add_argument(
+        "--late",
+        type=int,
+        default=0,
+        help="定时器最多延迟触发的毫秒数。默认为0",
+    )
+    parser.add_argument(
+        "--early",
+        type=int,
+        default=0,
+        help="定时器最多提前触发的毫秒数。默认为0",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="随机抖动的种子。默认为0",
+    )
+    return parser.parse_args()
+
+
+def simulate(seconds: int, late: int, early: int, seed: int) -> int:
+    rng = random.Random(seed)
+    clock = FakeClock(start_ms=1_000_000)
+    engine = _TimerEngine(clock=clock)
+    engine.set_total_seconds(seconds)
+
+    start_ms = clock()
+    total_ms = seconds * 1000
+    shown = {"value": seconds, "ticks": 0, "normal_ticks": 0}
+    errors: list[str] = []
+    max_lateness = 0
+
+    def on_updated() -> None:
+        nonlocal max_lateness
+        if not engine.is_running():
+            return
+        shown["ticks"] += 1
+        if not engine.warning():
+            shown["normal_ticks"] += 1
+        value = math.ceil(engine.current_ms() / 1000)
+        if value == shown["value"]:
+            return
+        if value != shown["value"] - 1:
+            errors.append(f"显示从 {shown['value']} 跳到了 {value}")
+        # 显示 value 应在剩余时间恰好为 value 秒时出现
+        expected_ms = start_ms + total_ms - value * 1000
+        lateness = clock() - expected_ms
+        if lateness < 0:
+            errors.append(f"显示 {value} 提前了 {-lateness}ms")
+        # 非警告阶段按整秒边界刷新，只允许定时器本身的延迟；警告阶段按帧刷新
+        if value * 1000 >= COUNTDOWN_WARNING_MS:
+            max_lateness = max(max_lateness, lateness)
+            if lateness > late + 1:
+                errors.append(f"显示 {value} 延迟了 {lateness}ms")
+        elif lateness > COUNTDOWN_SMOOTH_INTERVAL_MS + late:
+            errors.append(f"警告阶段显示 {value} 延迟了 {lateness}ms")
+        shown["value"] = value
+
+    engine.updated.connect(on_updated)
+    engine.start()
+    while engine.is_running():
+        delay = engine.next_tick_delay_ms()
+        jitter = rng.randint(-early, late) if (early or late) else 0
+        clock.advance(max(0, delay + jitter))
+        engine._on_tick()
+
+    normal_seconds = max(0, seconds - COUNTDOWN_WARNING_MS // 1000)
+    print(f"倒计时 {seconds} 秒，共刷新 {shown['ticks']} 次")
+    print(f"非警告阶段刷新 {shown['normal_ticks']} 次（{normal_seconds} 个整秒）")
+    print(f"非警告阶段显示变化最大延迟 {max_lateness}ms")
+
+    if shown["value"] != 0:
+        errors.append(f"结束时显示为 {shown['value']}")
+    # 提前触发时允许每秒多一次补偿刷新
+    allowed = normal_seconds * (2 if early else 1) + 1
+    if shown["normal_ticks"] > allowed:
+        errors.append(f"非警告阶段刷新 {shown['normal_ticks']} 次，超过 {allowed} 次")
+
+    for error in errors[:20]:
+        print(f"  错误: {error}")
+    return 1 if errors else 0
+
+
+def main() -> int:
+    args = parse_args()
+    app = QCoreApplication(sys.argv)  # noqa: F841  引擎中的 QTimer 需要应用实例
+    return simulate(args.seconds, args.late, args.early, args.seed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""检查抽取耗时统计：百分位数、滚动窗口、异常时的记录和计时本身的开销，
+检查失败时以非零状态退出。
+
+依次检查：
+1. 已知耗时序列的 p50/p95/最大值，超过窗口后只统计最近的记录；
+2. 阶段内抛出异常时仍记录耗时，异常照常传递；
+3. 多个线程同时记录时次数不丢失；
+4. draw_stage() 每次调用的开销（抽取每次约记录十几个阶段）；
+5. 文本报告包含全部阶段。
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from app.tools.draw_telemetry import (
+    DrawTelemetry,
+    draw_stage,
+    format_draw_telemetry,
+    get_draw_telemetry,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="检查抽取耗时统计。")
+    parser.add_argument(
+        "-n",
+        "--calls",
+        type=int,
+        default=100000,
+        help="测量开销时 draw_stage() 的调用次数。默认为100000",
+    )
+    parser.add_argument(
+        "--max-overhead-us",
+        type=float,
+        default=20.0,
+        help="每次调用允许的最大开销（微秒）。默认为20",
+    )
+    return parser.parse_args()
+
+
+def check_percentiles(errors: list[str]):
+    telemetry = DrawTelemetry(window=100)
+    for i in range(1, 101):
+        telemetry.record("roll_call", "sample", float(i), i % 3)
+    summary = telemetry.snapshot()["roll_call"]["sample"]
+    print(f"[百分位] 1..100ms: {summary}")
+    if (summary["p50_ms"], summary["p95_ms"], summary["max_ms"]) != (51.0, 96.0, 100.0):
+        errors.append(f"1..100ms 的百分位数不正确: {summary}")
+
+    for _ in range(100):
+        telemetry.record("roll_call", "sample", 1.0, 0)
+    summary = telemetry.snapshot()["roll_call"]["sample"]
+    if summary["count"] != 200 or summary["window"] != 100 or summary["max_ms"] != 1.0:
+        errors.append(f"超过窗口后应只统计最近 100 次: {summary}")
+
+    telemetry.reset()
+    if telemetry.snapshot():
+        errors.append("清空后仍有统计")
+
+
+def check_exception(errors: list[str]):
+    telemetry = get_draw_telemetry()
+    telemetry.reset()
+    try:
+        with draw_stage("roll_call", "finalize"):
+            time.sleep(0.01)
+            raise ValueError("阶段失败")
+    except ValueError:
+        pass
+    else:
+        errors.append("阶段内的异常没有向外传递")
+    summary = telemetry.snapshot().get("roll_call", {}).get("finalize")
+    print(f"[异常] {summary}")
+    if not summary or summary["last_ms"] < 10:
+        errors.append("阶段抛出异常时没有记录耗时")
+
+
+def check_threads(errors: list[str]):
+    telemetry = DrawTelemetry()
+
+    def worker():
+        for _ in range(1000):
+            telemetry.record("lottery", "draw", 1.0, 0)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    count = telemetry.snapshot()["lottery"]["draw"]["count"]
+    if count != 8000:
+        errors.append(f"8 个线程各记录 1000 次，实际为 {count}")
+
+
+def check_overhead(args: argparse.Namespace, errors: list[str]):
+    telemetry = get_draw_telemetry()
+    telemetry.reset()
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        pass
+    empty = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        with draw_stage("roll_call", "sample"):
+            pass
+    elapsed = time.perf_counter() - start
+    overhead_us = (elapsed - empty) / args.calls * 1_000_000
+    print(f"[开销] draw_stage() 每次 {overhead_us:.2f}µs")
+    if overhead_us > args.max_overhead_us:
+        errors.append(
+            f"draw_stage() 每次开销 {overhead_us:.2f}µs，超过 {args.max_overhead_us}µs"
+        )
+
+
+def check_report(errors: list[str]):
+    telemetry = get_draw_telemetry()
+    telemetry.reset()
+    stages = ("draw", "candidates", "avg_gap", "sample")
+    for stage in stages:
+        with draw_stage("roll_call", stage):
+            sum(range(1000))
+    report = format_draw_telemetry(telemetry.snapshot())
+    print(report)
+    missing = [stage for stage in stages if f"\n{stage} " not in report]
+    if missing:
+        errors.append(f"报告中缺少阶段: {missing}")
+
+
+def main() -> int:
+    args = parse_args()
+    errors: list[str] = []
+    check_percentiles(errors)
+    check_exception(errors)
+    check_threads(errors)
+    check_overhead(args, errors)
+    check_report(errors)
+    for error in errors:
+        print(f"  错误: {error}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
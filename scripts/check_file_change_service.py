@@ -0,0 +1,172 @@
+"""检查文件变化通知服务的变化检测：目录快照比较、识别本应用自己的写入、
+防抖期间多次变化的合并，检查失败时以非零状态退出。
+
+所有文件都写在临时目录中，不影响真实数据。依次检查：
+1. 新增、修改、删除的文件都能识别，写入服务的临时文件和非 JSON 文件不计入；
+2. 带写入来源的写入只对同一来源的订阅视为自己的变化，其它订阅照常收到；
+3. 同一文件合并了多个来源的写入时，任何一个来源都不会跳过这次变化；
+4. 写入之后文件又被其它程序修改时，不再视为自己的变化；
+5. 防抖期间同一文件先新增后删除不分发，先删除后新增视为修改。
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from app.tools.file_change_service import (
+    ADDED,
+    MODIFIED,
+    REMOVED,
+    FILE_KIND_ROSTER,
+    FileChangeTracker,
+    _PendingChanges,
+    is_own_change,
+)
+from app.tools.json_store import JsonStore
+from app.tools.variable import JSON_WRITE_TEMP_SUFFIX
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="检查文件变化通知服务的变化检测。")
+    parser.add_argument(
+        "--files",
+        type=int,
+        default=50,
+        help="目录中预先存在的名单文件数量。默认为50",
+    )
+    return parser.parse_args()
+
+
+def touch_later(path: Path, text: str) -> None:
+    """写入文件并确保修改时间与之前不同（部分文件系统的时间精度较低）"""
+    before = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(text, encoding="utf-8")
+    if path.stat().st_mtime_ns == before:
+        os.utime(path, ns=(before + 1_000_000, before + 1_000_000))
+
+
+def summarize(changes) -> list[tuple[str, str]]:
+    return sorted((change.action, change.path.name) for change in changes)
+
+
+def check_detection(args: argparse.Namespace, root: Path, errors: list[str]):
+    for i in range(args.files):
+        (root / f"{i}.json").write_text("{}", encoding="utf-8")
+    tracker = FileChangeTracker()
+    tracker.reset(root)
+
+    start = time.perf_counter()
+    unchanged = tracker.rescan(root)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"[检测] 比较 {args.files} 个文件的快照耗时 {elapsed_ms:.2f}ms")
+    if unchanged:
+        errors.append(f"文件没有变化时报告了变化: {summarize(unchanged)}")
+
+    touch_later(root / "0.json", '{"a": 1}')
+    (root / "new.json").write_text("{}", encoding="utf-8")
+    (root / "1.json").unlink()
+    (root / f"2.json{JSON_WRITE_TEMP_SUFFIX}").write_text("{", encoding="utf-8")
+    (root / "notes.txt").write_text("x", encoding="utf-8")
+    changes = summarize(tracker.rescan(root))
+    expected = [(ADDED, "new.json"), (MODIFIED, "0.json"), (REMOVED, "1.json")]
+    print(f"[检测] 变化 {changes}")
+    if changes != sorted(expected):
+        errors.append(f"识别的变化不正确: {changes}")
+
+
+def check_own_writes(root: Path, errors: list[str]):
+    path = root / "一班.json"
+    path.write_text("{}", encoding="utf-8")
+    tracker = FileChangeTracker()
+    tracker.reset(root)
+    store = JsonStore(0)
+    store.add_write_listener(tracker.note_write)
+
+    store.write(path, {"学生": 1}, origin="table")
+    changes = tracker.rescan(root)
+    origins = changes[0].origins if len(changes) == 1 else frozenset()
+    print(f"[来源] 表格保存后的变化来源 {sorted(map(str, origins))}")
+    if not is_own_change(origins, "table"):
+        errors.append("同一来源的订阅没有跳过自己的写入")
+    if is_own_change(origins, "main_window") or is_own_change(origins, None):
+        errors.append("其它订阅跳过了表格的写入")
+
+    store.write(path, {"学生": 2})
+    changes = tracker.rescan(root)
+    if len(changes) != 1 or is_own_change(changes[0].origins, "table"):
+        errors.append("未注明来源的写入被当作表格自己的写入")
+
+    coalesced = JsonStore(60_000)
+    coalesced.add_write_listener(tracker.note_write)
+    coalesced.write(path, {"学生": 3}, origin="table")
+    coalesced.write(path, {"学生": 4}, origin="import")
+    coalesced.flush()
+    changes = tracker.rescan(root)
+    if len(changes) != 1 or is_own_change(changes[0].origins, "table"):
+        errors.append("合并了其它来源的写入时仍被跳过")
+
+    store.write(path, {"学生": 5}, origin="table")
+    touch_later(path, '{"外部": true}')
+    changes = tracker.rescan(root)
+    print(f"[来源] 写入后被外部修改，变化来源 {sorted(map(str, changes[0].origins))}")
+    if len(changes) != 1 or is_own_change(changes[0].origins, "table"):
+        errors.append("写入后又被外部修改时仍被当作自己的写入")
+
+
+def check_pending_merge(root: Path, errors: list[str]):
+    tracker = FileChangeTracker()
+    tracker.reset(root)
+    temp = root / "temp.json"
+    temp.write_text("{}", encoding="utf-8")
+    added = tracker.rescan(root)
+    temp.unlink()
+    removed = tracker.rescan(root)
+    pending = _PendingChanges()
+    for change in added + removed:
+        pending.add(change)
+    if not pending.is_empty():
+        errors.append("防抖期间新增后又删除的文件仍被分发")
+
+    existing = root / "二班.json"
+    existing.write_text("{}", encoding="utf-8")
+    tracker.reset(root)
+    existing.unlink()
+    removed = tracker.rescan(root)
+    existing.write_text('{"b": 1}', encoding="utf-8")
+    added = tracker.rescan(root)
+    for change in removed + added:
+        pending.add(change)
+    event = pending.take(FILE_KIND_ROSTER)
+    print(
+        f"[合并] 删除后重建：新增 {len(event.added)}，修改 {len(event.modified)}，"
+        f"删除 {len(event.removed)}"
+    )
+    if event.names_changed or not event.touches(existing):
+        errors.append("删除后又新建的文件没有合并为一次修改")
+
+
+def main() -> int:
+    args = parse_args()
+    errors: list[str] = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        for name in ("detection", "origins", "merge"):
+            (root / name).mkdir()
+        check_detection(args, root / "detection", errors)
+        check_own_writes(root / "origins", errors)
+        check_pending_merge(root / "merge", errors)
+    for error in errors:
+        print(f"  错误: {error}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
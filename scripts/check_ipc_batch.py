@@ -0,0 +1,248 @@
+"""检查 URL/IPC 批量命令：顺序、逐条结果、原子语义、跨线程转交和命令解析缓存。
+
+不弹出验证窗口、不依赖设置文件：脚本中把处理器实例的安全验证和上课时间判断替换为固定结果，
+只检查批量执行本身。依次检查：
+1. 一批命令在主线程中按顺序执行，控制信号顺序与命令顺序一致，每条命令都有结果；
+2. 原子批量中任一命令失败时，不发出任何控制信号、不执行后续命令；非原子批量照常执行其余命令；
+3. 需要安全验证的命令在批量中直接判定失败；
+4. 原子批量执行期间，其他线程同时执行的单条命令的控制信号照常立即发出，
+   不会被本批暂存、丢弃或排到本批之后；
+5. 从其他线程提交时只转交一次主线程；主线程超时未处理时整批取消且之后不会执行；
+6. 模糊匹配的命令只解析一次，注册新命令后缓存失效。
+任一检查失败时以非零状态退出。
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from PySide6.QtCore import QCoreApplication, QThread, Qt
+
+import app.common.IPC_URL.url_command_handler as url_command_handler
+from app.common.IPC_URL.url_command_handler import URLCommandHandler
+
+ORCHESTRATION = [
+    "secrandom://roll_call/set_list?class_name=一班",
+    {"command": "roll_call/set_count", "query": {"count": "3"}},
+    "secrandom://roll_call/start",
+    "secrandom://roll_call/stop",
+    {"command": "check/read"},
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="检查 URL/IPC 批量命令。")
+    parser.add_argument(
+        "-n",
+        "--iterations",
+        type=int,
+        default=500,
+        help="测量批量执行耗时的次数。默认为500",
+    )
+    return parser.parse_args()
+
+
+def build_handler(protected: tuple[str, ...] = ()) -> tuple[URLCommandHandler, list]:
+    """创建处理器并记录发出的控制信号 (线程, 动作)"""
+    handler = URLCommandHandler()
+    handler._requires_verification = lambda command: command in protected
+    handler._get_linkage_verification_policy = lambda kind: {
+        "is_non_class_time": False,
+        "verification_required": False,
+    }
+    handler.register_command(
+        "check/read", lambda params: {"status": "success", "data": "ok"}
+    )
+    emitted: list = []
+
+    def record(action, params):
+        emitted.append((QThread.currentThread(), action))
+
+    handler.rollCallActionRequested.connect(record)
+    handler.lotteryActionRequested.connect(record)
+    return handler, emitted
+
+
+def check_order(args: argparse.Namespace, errors: list[str]) -> None:
+    handler, emitted = build_handler()
+    result = handler.handle_batch(ORCHESTRATION)
+    actions = [action for _, action in emitted]
+    print(f"[顺序] 结果: {result['status']}，控制信号: {actions}")
+    if actions != ["set_list", "set_count", "start", "stop"]:
+        errors.append(f"控制信号顺序错误: {actions}")
+    if [r["index"] for r in result.get("results", [])] != list(range(5)):
+        errors.append("逐条结果与命令不对应")
+    if result.get("status") != "success" or not result.get("applied"):
+        errors.append(f"正常批量没有全部成功: {result.get('message')}")
+
+    samples = []
+    for _ in range(max(1, args.iterations)):
+        start = time.perf_counter()
+        handler.handle_batch(ORCHESTRATION, atomic=True)
+        samples.append((time.perf_counter() - start) * 1e6)
+    print(
+        f"[耗时] {len(ORCHESTRATION)} 条命令的原子批量平均 {statistics.mean(samples):.1f}us"
+    )
+
+
+def check_atomic(errors: list[str]) -> None:
+    batch = [
+        "secrandom://roll_call/set_list?class_name=一班",
+        "secrandom://roll_call/set_count?count=0",
+        "secrandom://roll_call/start",
+    ]
+    handler, emitted = build_handler()
+    result = handler.handle_batch(batch, atomic=True)
+    print(
+        f"[原子] 生效: {result.get('applied')}，执行 {result.get('executed')} 条，"
+        f"跳过 {result.get('skipped')} 条，控制信号 {len(emitted)} 个"
+    )
+    if emitted or result.get("applied") or result.get("skipped") != 1:
+        errors.append("原子批量中有命令失败时仍然生效或继续执行")
+
+    handler, emitted = build_handler()
+    result = handler.handle_batch(batch)
+    if [action for _, action in emitted] != ["set_list", "start"]:
+        errors.append("非原子批量没有执行失败命令之外的其余命令")
+    if [r["ok"] for r in result.get("results", [])] != [True, False, True]:
+        errors.append("非原子批量的逐条结果不正确")
+
+    handler, emitted = build_handler(protected=("roll_call/start",))
+    result = handler.handle_batch(batch[:1] + batch[2:], atomic=True)
+    last = (result.get("results") or [{}])[-1].get("result", {})
+    if emitted or not last.get("requires_verification"):
+        errors.append("需要验证的命令在原子批量中没有被拒绝")
+
+
+def check_concurrent_single(errors: list[str]) -> None:
+    handler, _ = build_handler()
+    # 直接连接：在发出信号的线程中立即记录，不等主线程处理事件
+    emitted: list = []
+    for signal in (handler.rollCallActionRequested, handler.lotteryActionRequested):
+        signal.connect(
+            lambda action, params: emitted.append((QThread.currentThread(), action)),
+            Qt.DirectConnection,
+        )
+    single: dict = {}
+
+    def run_single(params):
+        # 批量执行到一半时，另一个 IPC 连接线程执行一条单独的命令
+        worker = threading.Thread(
+            target=lambda: single.update(
+                handler.handle_url_command("secrandom://lottery/start")
+            )
+        )
+        worker.start()
+        worker.join(timeout=5)
+        return {"status": "success"}
+
+    handler.register_command("check/single", run_single)
+    batch = [
+        "secrandom://roll_call/start",
+        {"command": "check/single"},
+        "secrandom://roll_call/set_count?count=0",
+    ]
+    result = handler.handle_batch(batch, atomic=True)
+    actions = [action for _, action in emitted]
+    print(
+        f"[并发] 批量生效: {result.get('applied')}，单条命令: {single.get('status')}，"
+        f"控制信号: {actions}"
+    )
+    if single.get("status") != "success" or actions != ["start"]:
+        errors.append(f"原子批量期间其他线程的单条命令信号被暂存或丢弃: {actions}")
+    if result.get("applied"):
+        errors.append("含失败命令的原子批量仍然生效")
+
+    emitted.clear()
+    result = handler.handle_batch(batch[:2], atomic=True)
+    actions = [action for _, action in emitted]
+    if not result.get("applied") or actions != ["start", "start"]:
+        errors.append(f"成功的原子批量与单条命令的信号数量或顺序错误: {actions}")
+    if len(emitted) == 2 and emitted[0][0] == emitted[1][0]:
+        errors.append("单条命令的信号被排到了原子批量之后")
+
+
+def check_thread_hop(app: QCoreApplication, errors: list[str]) -> None:
+    handler, emitted = build_handler()
+    hops = []
+    original = handler._run_batch_job
+    handler._run_batch_job = lambda job: (hops.append(job), original(job))
+    handler._batchRequested.disconnect()
+    handler._batchRequested.connect(handler._run_batch_job)
+
+    outcome: dict = {}
+    worker = threading.Thread(
+        target=lambda: outcome.update(handler.handle_batch(ORCHESTRATION))
+    )
+    worker.start()
+    deadline = time.monotonic() + 5
+    while worker.is_alive() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+    worker.join(timeout=1)
+    main_thread = QThread.currentThread()
+    print(f"[转交] 主线程处理 {len(hops)} 次，结果: {outcome.get('status')}")
+    if len(hops) != 1:
+        errors.append(f"批量命令转交主线程 {len(hops)} 次（应为 1 次）")
+    if any(thread != main_thread for thread, _ in emitted):
+        errors.append("控制信号没有在主线程中发出")
+    if outcome.get("status") != "success":
+        errors.append("跨线程提交的批量命令没有成功")
+
+    # 主线程不处理事件时超时取消，之后处理事件也不会再执行
+    emitted.clear()
+    url_command_handler.IPC_BATCH_TIMEOUT_S = 0.1
+    worker = threading.Thread(
+        target=lambda: outcome.update(handler.handle_batch(ORCHESTRATION))
+    )
+    worker.start()
+    worker.join(timeout=2)
+    app.processEvents()
+    print(f"[超时] 结果: {outcome.get('message')}，之后发出控制信号 {len(emitted)} 个")
+    if outcome.get("applied") is not False or emitted:
+        errors.append("超时取消的批量命令仍被执行")
+
+
+def check_resolve_cache(errors: list[str]) -> None:
+    handler, _ = build_handler()
+    calls = []
+    original = handler._fuzzy_match_command
+    handler._fuzzy_match_command = lambda command: (
+        calls.append(command),
+        original(command),
+    )[1]
+    for _ in range(100):
+        handler.handle_batch(["secrandom://quick_draw"])
+    if len(calls) != 1:
+        errors.append(f"模糊匹配执行了 {len(calls)} 次（应为 1 次）")
+    handler.register_command("quick_draw", lambda params: {"status": "success"})
+    result = handler.handle_batch(["secrandom://quick_draw"])
+    if result["results"][0]["result"] != {"status": "success"}:
+        errors.append("注册新命令后仍在使用旧的解析结果")
+    print(f"[缓存] 模糊匹配 {len(calls)} 次")
+
+
+def main() -> int:
+    args = parse_args()
+    app = QCoreApplication(sys.argv)
+    errors: list[str] = []
+    check_order(args, errors)
+    check_atomic(errors)
+    check_concurrent_single(errors)
+    check_thread_hop(app, errors)
+    check_resolve_cache(errors)
+    for error in errors:
+        print(f"  错误: {error}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""在进程内启动 IPC 服务器并用订阅端检查事件推送，检查失败时以非零状态退出。
+
+依次检查：
+1. 订阅全部事件后按发布顺序收到各类事件，敏感设置分组不附带取值，统计类分组不产生事件；
+2. 只订阅部分事件类型时不会收到其他类型；
+3. 订阅端不读取时发布方不被阻塞，缓冲满后丢弃最早的事件，订阅端收到 dropped 通知，
+   且 收到的事件数 + 丢弃数 = 发布数；
+4. 订阅端断开后服务器及时移除订阅者；订阅者数量达到上限时拒绝新的订阅；
+5. 服务器停止时订阅连接随之关闭。
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from app.common.IPC_URL.event_stream import (
+    EVENT_DRAW_FINISHED,
+    EVENT_DRAW_STARTED,
+    EVENT_LIST_CHANGED,
+    EVENT_SETTING_CHANGED,
+    get_event_bus,
+    publish_event,
+    publish_setting_changed,
+)
+from app.common.IPC_URL.url_ipc_handler import URLIPCHandler
+from app.tools.variable import IPC_EVENT_MAX_SUBSCRIBERS
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="检查 IPC 事件订阅推送。")
+    parser.add_argument(
+        "--events",
+        type=int,
+        default=5000,
+        help="积压测试中发布的事件数。默认为5000",
+    )
+    parser.add_argument(
+        "--payload",
+        type=int,
+        default=2048,
+        help="积压测试中每条事件的数据大小（字节）。默认为2048",
+    )
+    parser.add_argument(
+        "--max-publish-us",
+        type=float,
+        default=100.0,
+        help="订阅端不读取时允许的平均发布耗时（微秒）。默认为100",
+    )
+    return parser.parse_args()
+
+
+def wait_until(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def read_events(client, count: int) -> list:
+    messages = []
+    for message in client:
+        messages.append(message)
+        if len(messages) >= count:
+            break
+    return messages
+
+
+def check_delivery(handler: URLIPCHandler, errors: list[str]) -> None:
+    bus = get_event_bus()
+    client = handler.open_event_stream(timeout=5)
+    if client is None:
+        errors.append("订阅失败")
+        return
+    with client:
+        wait_until(bus.has_subscribers)
+        publish_event(EVENT_DRAW_STARTED, {"kind": "roll_call", "class_name": "一班"})
+        publish_setting_changed("user_info", "total_runtime_seconds", 10)
+        publish_setting_changed("basic_safety_settings", "safety_switch", True)
+        publish_setting_changed("roll_call_settings", "draw_mode", 1)
+        publish_event(EVENT_LIST_CHANGED, {"kind": "roll_call", "path": "list"})
+        publish_event(
+            EVENT_DRAW_FINISHED,
+            lambda: {"kind": "roll_call", "results": [{"id": 1, "name": "张三"}]},
+        )
+        messages = read_events(client, 5)
+
+    names = [m.get("event") for m in messages]
+    print(f"[推送] 收到: {names}")
+    expected = [
+        EVENT_DRAW_STARTED,
+        EVENT_SETTING_CHANGED,
+        EVENT_SETTING_CHANGED,
+        EVENT_LIST_CHANGED,
+        EVENT_DRAW_FINISHED,
+    ]
+    if names != expected:
+        errors.append(f"事件顺序或类型不符: {names}")
+        return
+    seqs = [m["seq"] for m in messages]
+    if seqs != sorted(seqs):
+        errors.append("事件序号不是递增的")
+    safety = messages[1]["data"]
+    if "value" in safety or not safety.get("redacted"):
+        errors.append("安全设置的变更事件附带了取值")
+    if messages[2]["data"].get("value") != 1:
+        errors.append("普通设置的变更事件缺少取值")
+    if messages[4]["data"]["results"][0]["name"] != "张三":
+        errors.append("抽取完成事件的结果不正确")
+
+
+def check_filter(handler: URLIPCHandler, errors: list[str]) -> None:
+    bus = get_event_bus()
+    client = handler.open_event_stream(events=[EVENT_DRAW_FINISHED], timeout=5)
+    if client is None:
+        errors.append("按类型订阅失败")
+        return
+    with client:
+        wait_until(bus.has_subscribers)
+        publish_event(EVENT_DRAW_STARTED, {"kind": "lottery"})
+        publish_event(EVENT_LIST_CHANGED, {"kind": "lottery"})
+        publish_event(EVENT_DRAW_FINISHED, {"kind": "lottery"})
+        message = client.read()
+    if (message or {}).get("event") != EVENT_DRAW_FINISHED:
+        errors.append(f"按类型订阅收到了其他事件: {message}")
+    if handler.open_event_stream(events=["unknown"], timeout=5) is not None:
+        errors.append("订阅未知事件类型没有被拒绝")
+
+
+def check_backpressure(
+    args: argparse.Namespace, handler: URLIPCHandler, errors: list[str]
+) -> None:
+    bus = get_event_bus()
+    client = handler.open_event_stream(buffer=16, timeout=10)
+    if client is None:
+        errors.append("积压测试订阅失败")
+        return
+    with client:
+        wait_until(bus.has_subscribers)
+        payload = "x" * max(0, args.payload)
+        samples = []
+        for index in range(args.events):
+            start = time.perf_counter()
+            publish_event(EVENT_DRAW_FINISHED, {"index": index, "payload": payload})
+            samples.append((time.perf_counter() - start) * 1e6)
+
+        received = 0
+        dropped = 0
+        last_index = -1
+        while last_index < args.events - 1:
+            message = client.read()
+            if message is None:
+                break
+            if message.get("type") == "dropped":
+                dropped += message["count"]
+            elif message.get("type") == "event":
+                received += 1
+                last_index = message["data"]["index"]
+
+    mean_us = statistics.mean(samples)
+    print(
+        f"[积压] 发布 {args.events} 条，平均发布耗时 {mean_us:.1f}us / "
+        f"最大 {max(samples):.1f}us；收到 {received} 条，丢弃 {dropped} 条"
+    )
+    if mean_us > args.max_publish_us:
+        errors.append(f"订阅端不读取时平均发布耗时超过 {args.max_publish_us:.0f}us")
+    if not dropped:
+        errors.append("缓冲满后没有丢弃事件或没有收到 dropped 通知")
+    if received + dropped != args.events:
+        errors.append(f"收到 {received} + 丢弃 {dropped} 不等于发布的 {args.events}")
+
+
+def check_lifecycle(handler: URLIPCHandler, errors: list[str]) -> None:
+    bus = get_event_bus()
+    client = handler.open_event_stream(timeout=5)
+    wait_until(bus.has_subscribers)
+    client.close()
+    publish_event(EVENT_LIST_CHANGED, {"kind": "roll_call"})
+    if not wait_until(lambda: not bus.has_subscribers()):
+        errors.append("订阅端断开后订阅者没有被移除")
+
+    clients = [
+        handler.open_event_stream(timeout=5) for _ in range(IPC_EVENT_MAX_SUBSCRIBERS)
+    ]
+    extra = handler.open_event_stream(timeout=5)
+    if None in clients or extra is not None:
+        errors.append("订阅者数量上限没有生效")
+    if extra is not None:
+        extra.close()
+
+    start = time.perf_counter()
+    handler.stop_ipc_server()
+    closed = all(client is not None and client.read() is None for client in clients)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    for client in clients:
+        if client is not None:
+            client.close()
+    print(
+        f"[生命周期] 服务器停止后订阅连接全部关闭: {'是' if closed else '否'}"
+        f"（{elapsed_ms:.0f}ms）"
+    )
+    if not closed:
+        errors.append("服务器停止后订阅连接没有关闭")
+    if not wait_until(lambda: not bus.has_subscribers()):
+        errors.append("服务器停止后仍有订阅者")
+
+
+def main() -> int:
+    args = parse_args()
+    start = time.perf_counter()
+    for _ in range(100000):
+        publish_event(EVENT_DRAW_STARTED, {"kind": "roll_call"})
+    idle_ns = (time.perf_counter() - start) * 1e9 / 100000
+    print(f"[空闲] 没有订阅者时发布一次 {idle_ns:.0f}ns")
+
+    handler = URLIPCHandler(
+        "SecRandomEventCheck",
+        "secrandomeventcheck",
+        ipc_name=f"event-check-{os.getpid()}",
+    )
+    if not handler.start_ipc_server():
+        print("启动 IPC 服务器失败")
+        return 1
+    errors: list[str] = []
+    try:
+        check_delivery(handler, errors)
+        check_filter(handler, errors)
+        check_backpressure(args, handler, errors)
+        check_lifecycle(handler, errors)
+    finally:
+        handler.stop_ipc_server()
+    for error in errors:
+        print(f"  错误: {error}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""检查 IPC 安全验证的派生密钥缓存和会话令牌，并测量每条命令的验证耗时。
+
+检查项目：
+1. 同一密码只派生一次，之后的验证不再经过 PBKDF2；错误密码始终被拒绝；
+2. 修改密码后缓存和已签发的会话全部失效，旧密码无法通过验证；
+3. 缓存条目空闲超时后失效；
+4. 会话签名：正常请求通过，重放、篡改内容、伪造会话、时间戳过期、会话过期均被拒绝；
+5. 通过 URLIPCHandler 完整走一遍“密码验证 → 签发会话 → 会话签名请求”。
+任一检查失败或会话验证平均耗时超过阈值时以非零状态退出。
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from app.common.IPC_URL.security_verifier import (
+    DerivedKeyCache,
+    KeyDerivation,
+    SessionTokenManager,
+    SimplePasswordVerifier,
+    sign_session_request,
+)
+from app.common.IPC_URL.url_ipc_handler import URLIPCHandler
+
+
+class FakeClock:
+    """可手动推进的时钟（秒）"""
+
+    def __init__(self, start: float = 1_700_000_000.0):
+        self.now = float(start)
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="检查 IPC 安全验证缓存与会话令牌。")
+    parser.add_argument(
+        "-n",
+        "--iterations",
+        type=int,
+        default=2000,
+        help="测量验证耗时的次数。默认为2000",
+    )
+    parser.add_argument(
+        "--max-session-us",
+        type=float,
+        default=200.0,
+        help="允许的会话验证平均耗时（微秒）。默认为200",
+    )
+    return parser.parse_args()
+
+
+def timed_us(func, iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.mean(samples)
+
+
+def check_kdf_cache(args: argparse.Namespace, errors: list[str]) -> None:
+    KeyDerivation.invalidate_cache()
+    start = time.perf_counter()
+    verifier = SimplePasswordVerifier("correct horse")
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    warm_us = timed_us(
+        lambda: verifier._perform_verification("correct horse", {}), args.iterations
+    )
+    start = time.perf_counter()
+    wrong = verifier._perform_verification("wrong horse", {})
+    wrong_ms = (time.perf_counter() - start) * 1000
+    print(
+        f"[派生缓存] 首次派生 {cold_ms:.1f}ms，缓存后验证 {warm_us:.1f}us，"
+        f"新的错误密码 {wrong_ms:.1f}ms"
+    )
+    if wrong:
+        errors.append("错误密码通过了验证")
+    if not verifier._perform_verification("correct horse", {}):
+        errors.append("正确密码没有通过验证")
+    if warm_us > cold_ms * 1000 / 10:
+        errors.append("缓存后的验证没有明显快于首次派生")
+
+    session = verifier.sessions.issue()
+    verifier.set_password("battery staple")
+    if verifier._perform_verification("correct horse", {}):
+        errors.append("修改密码后旧密码仍能通过验证")
+    if not verifier._perform_verification("battery staple", {}):
+        errors.append("修改密码后新密码没有通过验证")
+    if verifier.sessions.verify(sign_session_request(session, "x"), "x"):
+        errors.append("修改密码后旧会话仍然有效")
+
+    clock = FakeClock()
+    cache = DerivedKeyCache(max_entries=2, idle_s=10, clock=clock)
+    keys = [cache.fingerprint(f"s{i}", b"salt") for i in range(3)]
+    for key in keys:
+        cache.put(key, b"derived")
+    if len(cache) != 2 or cache.get(keys[0]) is not None:
+        errors.append("派生密钥缓存没有按上限淘汰最早的条目")
+    clock.advance(11)
+    if cache.get(keys[2]) is not None:
+        errors.append("派生密钥缓存条目空闲超时后没有失效")
+    if cache.fingerprint("s", b"a") == DerivedKeyCache().fingerprint("s", b"a"):
+        errors.append("不同缓存实例的指纹相同（应使用进程内随机密钥）")
+
+
+def check_sessions(args: argparse.Namespace, errors: list[str]) -> None:
+    clock = FakeClock()
+    manager = SessionTokenManager(ttl_s=100, idle_s=50, clock_skew_s=5, clock=clock)
+    session = manager.issue()
+    url = "secrandom://roll_call/start?count=1"
+
+    def signed(content=url, **kwargs):
+        return sign_session_request(session, content, timestamp=int(clock()), **kwargs)
+
+    cases = {
+        "正常请求": (signed(nonce="a"), url, True),
+        "重放请求": (signed(nonce="a"), url, False),
+        "篡改内容": (signed(nonce="b"), url + "0", False),
+        "伪造会话": ({**signed(nonce="c"), "session": "forged"}, url, False),
+        "篡改签名": ({**signed(nonce="d"), "mac": "0" * 64}, url, False),
+    }
+    for name, (verification, content, expected) in cases.items():
+        if manager.verify(verification, content) != expected:
+            errors.append(f"会话检查“{name}”的结果不是 {expected}")
+
+    stale = signed(nonce="e")
+    clock.advance(6)
+    if manager.verify(stale, url):
+        errors.append("时间戳过期的请求通过了验证")
+
+    payload = {"url": url, "args": [1, 2]}
+    if not manager.verify(signed(payload, nonce="f"), dict(reversed(payload.items()))):
+        errors.append("字典内容的签名与键顺序有关")
+
+    clock.advance(51)
+    if manager.verify(signed(nonce="g"), url):
+        errors.append("空闲超时的会话仍然有效")
+
+    session = manager.issue()
+    counter = iter(range(10**9))
+    session_us = timed_us(
+        lambda: manager.verify(
+            sign_session_request(
+                session, url, timestamp=int(clock()), nonce=str(next(counter))
+            ),
+            url,
+        ),
+        args.iterations,
+    )
+    print(f"[会话令牌] 签名+验证平均 {session_us:.1f}us")
+    if session_us > args.max_session_us:
+        errors.append(f"会话验证平均耗时超过 {args.max_session_us:.0f}us")
+
+
+def check_handler(errors: list[str]) -> None:
+    handler = URLIPCHandler("SecRandomCheck", "secrandomcheck", password="pw-check")
+    url = "secrandomcheck://ping"
+    verified, session = handler._verify_request(
+        {"command": "check", "password": "pw-check", "request_session": True}, url
+    )
+    if not verified or not session:
+        errors.append("密码验证通过后没有签发会话")
+        return
+    verified, _ = handler._verify_request(sign_session_request(session, url), url)
+    if not verified:
+        errors.append("使用会话签名的请求没有通过验证")
+    verified, _ = handler._verify_request({"command": "check", "password": "x"}, url)
+    if verified:
+        errors.append("错误密码通过了 URLIPCHandler 的验证")
+    print("[URLIPCHandler] 密码验证 → 签发会话 → 会话请求 检查完成")
+
+
+def main() -> int:
+    args = parse_args()
+    errors: list[str] = []
+    check_kdf_cache(args, errors)
+    check_sessions(args, errors)
+    check_handler(errors)
+    for error in errors:
+        print(f"  错误: {error}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""检查 JSON 写入服务：合并写入、读取尚未写出的内容、原子替换和遗留临时文件的恢复，
+检查失败时以非零状态退出。
+
+所有文件都写在临时目录中，不影响真实数据。依次检查：
+1. 时间窗口内对同一文件的多次写入只落盘一次，写出的是最后一次的内容；
+2. 写出之前 read_json 能读到最新内容，flush 返回时内容已在磁盘上；
+3. 新文件立即写入，丢弃待写内容后文件不会被写回；
+4. 写入失败时目标文件保持旧内容；
+5. 遗留的临时文件：目标文件损坏时用它恢复，目标文件完好时删除。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from app.tools import json_store
+from app.tools.json_store import JsonStore, recover_interrupted_writes
+from app.tools.variable import JSON_WRITE_TEMP_SUFFIX
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="检查 JSON 写入服务。")
+    parser.add_argument(
+        "--writes",
+        type=int,
+        default=200,
+        help="合并检查中连续写入同一文件的次数。默认为200",
+    )
+    parser.add_argument(
+        "--coalesce-ms",
+        type=float,
+        default=200,
+        help="检查使用的合并时间窗口（毫秒）。默认为200",
+    )
+    return parser.parse_args()
+
+
+def read_file(path: Path):
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def check_coalescing(args: argparse.Namespace, root: Path, errors: list[str]):
+    store = JsonStore(args.coalesce_ms)
+    path = root / "settings.json"
+    store.write(path, {"n": -1})
+    if store.write_count != 1 or read_file(path) != {"n": -1}:
+        errors.append("新文件没有立即写入")
+
+    start = time.perf_counter()
+    for i in range(args.writes):
+        store.write(path, {"n": i})
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    pending = store.pending_text(path)
+    if pending is None or json.loads(pending) != {"n": args.writes - 1}:
+        errors.append("待写内容不是最后一次写入的内容")
+    if read_file(path) != {"n": -1}:
+        errors.append("时间窗口结束前文件已被写入")
+
+    deadline = time.monotonic() + args.coalesce_ms / 1000 * 10
+    while store.pending_text(path) is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    print(
+        f"[合并] {args.writes} 次写入耗时 {elapsed_ms:.1f}ms，"
+        f"实际落盘 {store.write_count - 1} 次"
+    )
+    if store.pending_text(path) is not None:
+        errors.append("后台线程没有在时间窗口结束后写出")
+    if store.write_count != 2:
+        errors.append(f"合并后落盘次数不正确: {store.write_count - 1}")
+    if read_file(path) != {"n": args.writes - 1}:
+        errors.append("合并后写出的内容不正确")
+
+
+def check_read_through(root: Path, errors: list[str]):
+    store = JsonStore(60_000)
+    json_store._json_store = store
+    path = root / "list.json"
+    json_store.write_json(path, {"a": 1})
+    json_store.write_json(path, {"a": 2})
+    if json_store.read_json(path) != {"a": 2}:
+        errors.append("read_json 没有读到尚未写出的内容")
+    if read_file(path) != {"a": 1}:
+        errors.append("时间窗口内文件被提前写入")
+    json_store.flush_json_writes()
+    print(f"[读取] 写出前读取到最新内容，flush 后文件内容 {read_file(path)}")
+    if read_file(path) != {"a": 2} or store.pending_text(path) is not None:
+        errors.append("flush 返回时内容没有写入磁盘")
+
+    json_store.write_json(path, {"a": 3})
+    json_store.discard_pending_write(path)
+    path.unlink()
+    json_store.flush_json_writes()
+    if path.exists():
+        errors.append("丢弃待写内容后文件又被写回")
+
+
+def check_failed_write(root: Path, errors: list[str]):
+    store = JsonStore(0)
+    path = root / "history.json"
+    store.write(path, {"ok": True})
+    temp_path = path.with_name(path.name + JSON_WRITE_TEMP_SUFFIX)
+    temp_path.mkdir()
+    try:
+        store.write(path, {"ok": False})
+        errors.append("写入失败时没有抛出异常")
+    except OSError:
+        pass
+    finally:
+        temp_path.rmdir()
+    print(f"[原子] 写入失败后文件内容 {read_file(path)}")
+    if read_file(path) != {"ok": True}:
+        errors.append("写入失败后目标文件内容被破坏")
+    if store.pending_text(path) is not None:
+        errors.append("写入失败的内容仍留在待写队列中")
+
+
+def check_recovery(root: Path, errors: list[str]):
+    data_dir = root / "data"
+    data_dir.mkdir()
+    broken = data_dir / "broken.json"
+    broken.write_text('{"name": ', encoding="utf-8")
+    broken.with_name(broken.name + JSON_WRITE_TEMP_SUFFIX).write_text(
+        '{"name": "new"}', encoding="utf-8"
+    )
+    intact = data_dir / "intact.json"
+    intact.write_text('{"name": "old"}', encoding="utf-8")
+    intact.with_name(intact.name + JSON_WRITE_TEMP_SUFFIX).write_text(
+        '{"name": ', encoding="utf-8"
+    )
+    other = data_dir / "other.tmp"
+    other.write_text("keep", encoding="utf-8")
+
+    recovered = recover_interrupted_writes([data_dir])
+    leftovers = sorted(
+        name for name in os.listdir(data_dir) if name.endswith(JSON_WRITE_TEMP_SUFFIX)
+    )
+    print(f"[恢复] 恢复 {recovered} 个文件，剩余临时文件 {leftovers}")
+    if recovered != 1 or read_file(broken) != {"name": "new"}:
+        errors.append("没有用临时文件恢复损坏的目标文件")
+    if read_file(intact) != {"name": "old"}:
+        errors.append("目标文件完好时被临时文件覆盖")
+    if leftovers:
+        errors.append(f"遗留的临时文件没有被清理: {leftovers}")
+    if not other.exists():
+        errors.append("删除了不属于写入服务的文件")
+
+
+def main() -> int:
+    args = parse_args()
+    errors: list[str] = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        check_coalescing(args, root, errors)
+        check_read_through(root, errors)
+        check_failed_write(root, errors)
+        check_recovery(root, errors)
+    for error in errors:
+        print(f"  错误: {error}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""检查名单表格的编辑缓冲：批量编辑只写一次文件、保存时不覆盖其它窗口的修改、
+外部修改逐行合并，检查失败时以非零状态退出。
+
+只检查不涉及界面的 ListEditBuffer，名单文件写在临时目录中。依次检查：
+1. 连续修改 N 名学生的性别后统一保存，名单文件只写入一次，内容正确；
+2. 保存前其它窗口修改了名单文件，保存时保留这些修改，未保存的修改也不丢失；
+3. 外部修改只返回有变化的行，新增、删除的行单独列出；
+4. 重命名为已存在的名称会被拒绝。
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from app.tools.json_store import JsonStore
+from app.view.settings.list_management.list_edit_buffer import ListEditBuffer
+
+FIELDS = {"gender": "", "group": "", "exist": True}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="检查名单表格的编辑缓冲。")
+    parser.add_argument(
+        "--students",
+        type=int,
+        default=300,
+        help="名单中的学生数量。默认为300",
+    )
+    return parser.parse_args()
+
+
+def make_roster(students: int) -> OrderedDict:
+    return OrderedDict(
+        (
+            f"学生{i}",
+            {"id": i + 1, "gender": "", "group": f"{i % 4 + 1}组", "exist": True},
+        )
+        for i in range(students)
+    )
+
+
+def check_batched_save(args: argparse.Namespace, root: Path, errors: list[str]):
+    path = root / "一班.json"
+    store = JsonStore(0)
+    store.write(path, make_roster(args.students))
+    buffer = ListEditBuffer(FIELDS)
+    buffer.load(make_roster(args.students))
+
+    for i in range(args.students):
+        buffer.set_value(f"{i + 1:03d}", "gender", "男" if i % 2 else "女")
+    writes_before = store.write_count
+    data = buffer.apply_to(make_roster(args.students))
+    store.write(path, data)
+    diff = buffer.commit(data)
+    writes = store.write_count - writes_before
+    print(f"[批量] 修改 {args.students} 个单元格，写入文件 {writes} 次")
+    if writes != 1:
+        errors.append(f"批量修改写入了 {writes} 次")
+    genders = [info["gender"] for info in data.values()]
+    if genders[:2] != ["女", "男"] or "" in genders:
+        errors.append("保存的性别不正确")
+    if not diff.is_empty() or buffer.dirty:
+        errors.append("保存后仍有待保存的修改或需要更新的行")
+
+
+def check_concurrent_edit(errors: list[str]):
+    buffer = ListEditBuffer(FIELDS)
+    buffer.load(make_roster(5))
+    buffer.set_value(1, "gender", "女")
+    buffer.set_value(2, "name", "新名字")
+
+    # 保存前其它窗口修改了学生1的小组，并新增了一名学生
+    latest = make_roster(5)
+    latest["学生0"]["group"] = "9组"
+    latest["学生5"] = {"id": 6, "gender": "男", "group": "1组", "exist": True}
+    data = buffer.apply_to(latest)
+    diff = buffer.commit(data)
+    print(
+        f"[合并保存] 保存后需要更新 {len(diff.changed)} 行，新增 {len(diff.added)} 行"
+    )
+    if data["学生0"] != {"id": 1, "gender": "女", "group": "9组", "exist": True}:
+        errors.append("保存时覆盖了其它窗口的修改")
+    if list(data)[1] != "新名字" or "学生1" in data:
+        errors.append("重命名没有保持原来的顺序")
+    if "学生5" not in data or len(diff.added) != 1:
+        errors.append("保存时丢失了其它窗口新增的学生")
+    if list(diff.changed) != ["1"]:
+        errors.append(f"需要更新的行不正确: {list(diff.changed)}")
+
+
+def check_external_merge(errors: list[str]):
+    buffer = ListEditBuffer(FIELDS)
+    buffer.load(make_roster(50))
+    buffer.set_value(10, "group", "本地")
+
+    external = make_roster(50)
+    external["学生3"]["exist"] = False
+    external["学生9"]["group"] = "外部"
+    del external["学生20"]
+    diff = buffer.merge(external)
+    print(
+        f"[外部修改] 变化 {sorted(diff.changed)}，新增 {len(diff.added)}，"
+        f"删除 {diff.removed}"
+    )
+    if sorted(diff.changed) != ["4"]:
+        errors.append(f"外部修改的行不正确: {sorted(diff.changed)}")
+    if diff.removed != ["21"] or diff.added:
+        errors.append("新增或删除的行不正确")
+    if buffer.row(10)["group"] != "本地" or not buffer.dirty:
+        errors.append("外部修改覆盖了尚未保存的修改")
+
+
+def check_rename_conflict(errors: list[str]):
+    buffer = ListEditBuffer(FIELDS)
+    buffer.load(make_roster(3))
+    if buffer.set_value(1, "name", "学生2"):
+        errors.append("重命名为已存在的名称没有被拒绝")
+    if buffer.set_value(1, "gender", ""):
+        errors.append("值没有变化时仍记为修改")
+
+
+def main() -> int:
+    args = parse_args()
+    errors: list[str] = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        check_batched_save(args, Path(temp_dir), errors)
+    check_concurrent_edit(errors)
+    check_external_merge(errors)
+    check_rename_conflict(errors)
+    for error in errors:
+        print(f"  错误: {error}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""检查日志查看窗口使用的行索引：先读取文件末尾、后台建立索引和过滤、增量读取新增内容，
+检查失败时以非零状态退出。
+
+日志写在临时目录中，不影响真实日志。依次检查：
+1. 生成指定大小的日志，读取文件末尾、建立行索引、按等级过滤的耗时；
+2. 行索引与逐行读取的结果一致，过滤结果与 is_log_line_visible() 一致；
+3. 追加内容后只为新增部分建立索引，末尾不完整的行等写完再计入；
+4. 文件被截断时报告错误，取消标志能中止索引和过滤。
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from app.tools.log_index import (
+    LOG_LEVEL_VALUES,
+    LogScanCancelled,
+    filter_log_lines,
+    is_log_line_visible,
+    read_log_lines,
+    read_log_tail,
+    scan_line_ends,
+)
+from app.tools.variable import LOG_VIEWER_TAIL_BYTES
+
+LEVELS = list(LOG_LEVEL_VALUES)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="检查日志查看窗口使用的行索引。")
+    parser.add_argument(
+        "--size-mb",
+        type=int,
+        default=20,
+        help="生成的日志大小（MB）。默认为20",
+    )
+    return parser.parse_args()
+
+
+def make_line(i: int) -> str:
+    level = LEVELS[i % len(LEVELS)]
+    message = "读取内幕设置" if i % 97 == 0 else f"处理第 {i} 项，结果正常"
+    line = (
+        f"2026-01-01 08:00:00.000 | {level:<8} | app.module:func:{i % 500} - "
+        f"{message}\n"
+    )
+    if i % 211 == 0:
+        line += "Traceback (most recent call last):\n  ValueError: 异常堆栈\n"
+    return line
+
+
+def write_log(path: Path, size: int) -> int:
+    """写入约 size 字节的日志，返回写入的条数"""
+    written = 0
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        while written < size:
+            block = "".join(make_line(count + k) for k in range(1000))
+            f.write(block)
+            written += len(block.encode("utf-8"))
+            count += 1000
+    return count
+
+
+def timed(label: str, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    print(f"[耗时] {label} {(time.perf_counter() - start) * 1000:.1f}ms")
+    return result
+
+
+def check_large_log(args: argparse.Namespace, root: Path, errors: list[str]):
+    path = root / "large.log"
+    write_log(path, args.size_mb * 1024 * 1024)
+    size = path.stat().st_size
+    print(f"[大文件] 日志大小 {size / 1024 / 1024:.1f}MB")
+
+    tail, tail_size = timed("读取文件末尾", read_log_tail, path, LOG_VIEWER_TAIL_BYTES)
+    ends = timed("建立行索引", scan_line_ends, path)
+    bounds = array("Q", [0]) + ends
+    rows = timed("过滤 WARNING 及以上", filter_log_lines, path, bounds, 0, 2)
+    print(f"[大文件] 共 {len(ends)} 行，显示 {len(rows)} 行")
+
+    with open(path, "rb") as f:
+        lines = f.read().decode("utf-8").splitlines()
+    if tail_size != size or tail != lines[-len(tail) :]:
+        errors.append("文件末尾的预览与文件内容不一致")
+    if len(ends) != len(lines) or ends[-1] != size:
+        errors.append(f"行索引有 {len(ends)} 行，文件有 {len(lines)} 行")
+    for min_level in (0, 2):
+        expected = [
+            i for i, line in enumerate(lines) if is_log_line_visible(line, min_level)
+        ]
+        actual = filter_log_lines(path, bounds, 0, min_level)
+        if list(actual) != expected:
+            errors.append(f"等级 {min_level} 的过滤结果与逐行判断不一致")
+    sample = [0, len(lines) // 2, len(lines) - 1]
+    texts = read_log_lines(path, [(bounds[i], bounds[i + 1]) for i in sample])
+    if texts != [lines[i] for i in sample]:
+        errors.append("按行范围读取的内容不正确")
+
+
+def check_incremental(root: Path, errors: list[str]):
+    path = root / "tail.log"
+    path.write_text("".join(make_line(i) for i in range(10)), encoding="utf-8")
+    bounds = array("Q", [0]) + scan_line_ends(path)
+    line_count = len(bounds) - 1
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(make_line(10) + "2026-01-01 08:00:01.000 | ERROR    | 未写完")
+    new_ends = scan_line_ends(path, bounds[-1])
+    if len(new_ends) != 1:
+        errors.append(f"新增内容应有 1 个完整行，实际为 {len(new_ends)}")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("的一行\n")
+    new_ends += scan_line_ends(path, new_ends[-1])
+    tail_bounds = array("Q", [bounds[-1]]) + new_ends
+    rows = filter_log_lines(path, tail_bounds, line_count, 3)
+    print(f"[增量] 新增 {len(new_ends)} 行，显示行号 {list(rows)}")
+    if len(new_ends) != 2 or new_ends[-1] != path.stat().st_size:
+        errors.append("补全最后一行后新增内容的索引不正确")
+    if list(rows) != [line_count + 1]:
+        errors.append(f"新增内容的过滤结果不正确: {list(rows)}")
+
+    path.write_text("", encoding="utf-8")
+    try:
+        scan_line_ends(path, new_ends[-1])
+        errors.append("文件被清空后没有报告错误")
+    except ValueError:
+        pass
+
+    cancel = threading.Event()
+    cancel.set()
+    path.write_text(make_line(0), encoding="utf-8")
+    for func, call_args in (
+        (scan_line_ends, (path, 0, cancel)),
+        (filter_log_lines, (path, array("Q", [0, path.stat().st_size]), 0, 0, cancel)),
+    ):
+        try:
+            func(*call_args)
+            errors.append(f"{func.__name__} 没有响应取消")
+        except LogScanCancelled:
+            pass
+
+
+def main() -> int:
+    args = parse_args()
+    errors: list[str] = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        check_large_log(args, Path(temp_dir), errors)
+        check_incremental(Path(temp_dir), errors)
+    for error in errors:
+        print(f"  错误: {error}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+"""检查批量抽奖：结果与依次抽取一致、每个文件只写一次、出错时回滚，检查失败时以非零状态退出。
+
+脚本把应用根目录指向临时目录，奖池、班级名单、历史记录和抽取记录都写在临时目录中，
+不影响真实数据；抽取阈值在脚本中直接指定，随机源使用确定性种子。依次检查：
+1. 相同种子下，批量抽取 N 轮与调用 N 次 finalize_draw 的结果、历史记录和抽取记录完全相同；
+2. 批量抽取期间每个文件只写一次（依次抽取时每轮都要写）；
+3. 库存抽完时提前停止且不超发；
+4. 中途出错时所有文件保持批量开始前的内容。
+"""
+
+from __future__ import annotations
+
+import argparse
+import builtins
+import json
+import re
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+import app.common.lottery.lottery_utils as lottery_utils
+import app.common.lottery.prize_inventory as prize_inventory
+from app.common.behind_scenes.behind_scenes_utils import BehindScenesUtils
+from app.common.lottery.lottery_manager import LotteryManager
+from app.common.roll_call.roll_call_utils import RollCallUtils
+from app.tools.json_store import get_json_store
+from app.tools.path_utils import get_data_path, path_manager
+from app.tools.random_source import set_deterministic_seed
+from app.tools.variable import JSON_WRITE_TEMP_SUFFIX
+
+POOL_NAME = "批量"
+CLASS_NAME = "一班"
+TIME_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="检查批量抽奖。")
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=25,
+        help="对比检查的抽取轮数。默认为25",
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=2,
+        help="每轮抽取的奖品数量。默认为2",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=2024,
+        help="确定性随机源的种子。默认为2024",
+    )
+    return parser.parse_args()
+
+
+def set_threshold(threshold) -> None:
+    prize_inventory.get_prize_draw_threshold = lambda: threshold
+    lottery_utils.get_prize_draw_threshold = lambda: threshold
+
+
+def setup_data(tiers: int, students: int) -> None:
+    pool_path = get_data_path("list/lottery_list") / f"{POOL_NAME}.json"
+    pool_path.parent.mkdir(parents=True, exist_ok=True)
+    pool = {
+        f"奖品{i}": {"id": i + 1, "weight": 1 + i % 5, "exist": True}
+        for i in range(tiers)
+    }
+    pool_path.write_text(json.dumps(pool, ensure_ascii=False), encoding="utf-8")
+
+    class_path = get_data_path("list/roll_call_list") / f"{CLASS_NAME}.json"
+    class_path.parent.mkdir(parents=True, exist_ok=True)
+    roster = {
+        f"学生{i}": {
+            "id": i + 1,
+            "gender": "男" if i % 2 else "女",
+            "group": f"{i % 4 + 1}组",
+            "exist": True,
+        }
+        for i in range(students)
+    }
+    class_path.write_text(json.dumps(roster, ensure_ascii=False), encoding="utf-8")
+
+
+def new_manager() -> LotteryManager:
+    prize_inventory.clear_prize_inventories()
+    RollCallUtils._drawn_record_cache.clear()
+    BehindScenesUtils._settings_cache = {}
+    BehindScenesUtils._cache_timestamp = time.time()
+    BehindScenesUtils._cache_ttl = float("inf")
+    manager = LotteryManager()
+    manager.load_data(POOL_NAME, CLASS_NAME, "抽取全部学生", "抽取全部性别", 0, 0)
+    return manager
+
+
+def snapshot_files(root: Path) -> dict:
+    """读取临时目录下的记录文件（不含名单），抽取时间统一替换，避免跨秒时不一致"""
+    return {
+        str(path.relative_to(root)): TIME_PATTERN.sub(
+            "<time>", path.read_text(encoding="utf-8")
+        )
+        for path in sorted(root.rglob("*.json"))
+        if "list" not in path.relative_to(root).parts
+    }
+
+
+class WriteCounter:
+    """统计临时目录下以写模式打开的 JSON 文件次数（原子写入时打开的是临时文件）"""
+
+    def __init__(self, root: Path):
+        self.root = str(root)
+        self.counts: Counter = Counter()
+        self._open = builtins.open
+
+    def __enter__(self):
+        def counting_open(file, mode="r", *args, **kwargs):
+            path = str(file).removesuffix(JSON_WRITE_TEMP_SUFFIX)
+            if "w" in mode and path.startswith(self.root) and path.endswith(".json"):
+                self.counts[Path(path).name] += 1
+            return self._open(file, mode, *args, **kwargs)
+
+        builtins.open = counting_open
+        return self
+
+    def __exit__(self, *exc):
+        builtins.open = self._open
+
+
+def result_names(results: list) -> list:
+    return [
+        [
+            (p.get("name"), p.get("student_name"))
+            for p in result.get("selected_prizes_dict") or []
+        ]
+        for result in results
+    ]
+
+
+def run_sequential(args: argparse.Namespace, root: Path):
+    setup_data(20, 30)
+    set_deterministic_seed(args.seed)
+    manager = new_manager()
+    results = []
+    with WriteCounter(root) as counter:
+        for _ in range(args.rounds):
+            results.append(manager.finalize_draw(args.count))
+    return results, snapshot_files(root), counter.counts
+
+
+def run_batch(args: argparse.Namespace, root: Path):
+    setup_data(20, 30)
+    set_deterministic_seed(args.seed)
+    manager = new_manager()
+    with WriteCounter(root) as counter:
+        batch = manager.draw_batch(args.rounds, args.count)
+    return batch, snapshot_files(root), counter.counts
+
+
+def check_equivalence(args: argparse.Namespace, errors: list[str]) -> None:
+    set_threshold(3)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        path_manager._app_root = root
+        sequential, sequential_files, sequential_writes = run_sequential(args, root)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        path_manager._app_root = root
+        batch, batch_files, batch_writes = run_batch(args, root)
+
+    print(
+        f"[一致性] {args.rounds} 轮 × {args.count} 个：依次抽取写文件 "
+        f"{sum(sequential_writes.values())} 次，批量 {sum(batch_writes.values())} 次，"
+        f"批量耗时 {batch.elapsed_ms:.1f}ms"
+    )
+    if batch.stopped_reason or len(batch.rounds) != args.rounds:
+        errors.append(f"批量抽取提前停止: {batch.stopped_reason}")
+    if result_names(batch.rounds) != result_names(sequential):
+        errors.append("批量抽取结果与依次抽取不一致")
+    if batch_files != sequential_files:
+        changed = sorted(
+            set(batch_files) ^ set(sequential_files)
+            | {k for k in batch_files if batch_files.get(k) != sequential_files.get(k)}
+        )
+        errors.append(f"批量抽取写出的文件与依次抽取不一致: {changed}")
+    if not batch_files:
+        errors.append("批量抽取没有写出任何记录")
+    repeated = {name: n for name, n in batch_writes.items() if n != 1}
+    if repeated:
+        errors.append(f"批量抽取中有文件被写入多次: {repeated}")
+    expected_rows = sum(len(r.get("selected_prizes_dict") or []) for r in sequential)
+    if len(batch.rows()) != expected_rows:
+        errors.append("结果表格的行数不正确")
+
+
+def check_stock_limit(errors: list[str]) -> None:
+    set_threshold(1)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path_manager._app_root = Path(temp_dir)
+        setup_data(10, 30)
+        set_deterministic_seed(1)
+        manager = new_manager()
+        batch = manager.draw_batch(100, 3)
+        awarded = Counter(row["prize_name"] for row in batch.rows())
+        record = json.loads(
+            prize_inventory.get_drawn_prize_record_path(POOL_NAME).read_text(
+                encoding="utf-8"
+            )
+        )
+    print(
+        f"[库存] 10 种奖品抽取 100 轮：完成 {len(batch.rounds)} 轮，"
+        f"发放 {sum(awarded.values())} 个，停止原因 {batch.stopped_reason}"
+    )
+    if batch.stopped_reason != "reset_required":
+        errors.append("库存抽完后没有提前停止")
+    if any(n != 1 for n in awarded.values()) or len(awarded) != 10:
+        errors.append(f"不重复模式下奖品发放次数不正确: {dict(awarded)}")
+    if record != dict(awarded):
+        errors.append("抽取记录与发放结果不一致")
+
+
+def check_rollback(errors: list[str]) -> None:
+    set_threshold(2)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        path_manager._app_root = root
+        setup_data(20, 30)
+        set_deterministic_seed(2)
+        manager = new_manager()
+        manager.finalize_draw(2)
+        before = snapshot_files(root)
+        remaining = prize_inventory.get_prize_inventory(POOL_NAME).remaining_count()
+
+        original = manager.save_result
+        calls = {"n": 0}
+
+        def failing_save_result(*a, **kw):
+            calls["n"] += 1
+            if calls["n"] == 5:
+                raise RuntimeError("模拟保存失败")
+            return original(*a, **kw)
+
+        manager.save_result = failing_save_result
+        batch = manager.draw_batch(10, 2)
+        manager.save_result = original
+        after = snapshot_files(root)
+        remaining_after = prize_inventory.get_prize_inventory(
+            POOL_NAME
+        ).remaining_count()
+    print(
+        f"[回滚] 第 5 轮出错：停止原因 {batch.stopped_reason}，"
+        f"剩余奖数 {remaining} -> {remaining_after}"
+    )
+    if batch.stopped_reason != "error" or batch.rounds:
+        errors.append("出错时没有返回 error")
+    if before != after:
+        errors.append("出错后文件内容发生了变化")
+    if remaining != remaining_after:
+        errors.append("出错后库存没有恢复")
+
+
+def main() -> int:
+    args = parse_args()
+    errors: list[str] = []
+    # 不合并写入，每次写入立即落盘，才能统计实际的写入次数
+    get_json_store().coalesce_ms = 0
+    try:
+        check_equivalence(args, errors)
+        check_stock_limit(errors)
+        check_rollback(errors)
+    finally:
+        set_deterministic_seed(None)
+    for error in errors:
+        print(f"  错误: {error}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
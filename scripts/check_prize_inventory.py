@@ -0,0 +1,305 @@
+"""检查奖池库存：树状数组、按权重抽样、库存扣减和抽取耗时，检查失败时以非零状态退出。
+
+脚本把应用根目录指向临时目录，奖池文件和抽取记录都写在临时目录中，不影响真实数据；
+抽取阈值和内幕设置在脚本中直接指定。依次检查：
+1. 树状数组的前缀和与定位结果和逐项累加一致；
+2. 抽样频率与奖品权重成正比，同一次抽取内不重复；
+3. 半重复模式下反复抽取并发放，每个奖品恰好发放阈值次，之后要求重置，没有超发；
+4. 多个线程同时在 transaction() 内抽取并发放，不会超发；已抽完的奖品在发放时被拒绝；
+5. 内幕设置的排除 / 必中生效；外部删除抽取记录后库存随之恢复；
+6. 大奖池下每次抽取的耗时（与逐项重建权重列表的做法对比）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+import app.common.lottery.prize_inventory as prize_inventory
+from app.common.behind_scenes.behind_scenes_utils import BehindScenesUtils
+from app.common.lottery.prize_inventory import FenwickTree, PrizeInventory
+from app.tools.path_utils import get_data_path, path_manager
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="检查奖池库存与抽样。")
+    parser.add_argument(
+        "--tiers",
+        type=int,
+        default=500,
+        help="耗时测试的奖品种类数。默认为500",
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=10,
+        help="耗时测试中每次抽取的数量。默认为10",
+    )
+    parser.add_argument(
+        "--draws",
+        type=int,
+        default=2000,
+        help="耗时测试的抽取次数。默认为2000",
+    )
+    return parser.parse_args()
+
+
+def write_pool(pool_name: str, weights: list[float]) -> None:
+    path = get_data_path("list/lottery_list") / f"{pool_name}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        f"奖品{i}": {"id": i + 1, "weight": weight, "exist": True}
+        for i, weight in enumerate(weights)
+    }
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+def set_behind_scenes(settings: dict) -> None:
+    BehindScenesUtils._settings_cache = settings
+    BehindScenesUtils._cache_timestamp = time.time()
+    BehindScenesUtils._cache_ttl = float("inf")
+
+
+def check_fenwick(errors: list[str]) -> None:
+    rng = random.Random(1)
+    values = [rng.randrange(0, 50) for _ in range(257)]
+    tree = FenwickTree(values)
+    for _ in range(2000):
+        index = rng.randrange(len(values))
+        values[index] = rng.randrange(0, 50)
+        tree.set(index, values[index])
+    prefix = 0
+    for i, value in enumerate(values):
+        if tree.prefix_sum(i) != prefix:
+            errors.append(f"树状数组前 {i} 项之和不正确")
+            return
+        for target in (prefix, prefix + value - 1):
+            if value and tree.find(target) != i:
+                errors.append(f"树状数组定位 {target} 不正确")
+                return
+        prefix += value
+    print(f"[树状数组] {len(values)} 项，总和 {tree.total()}")
+
+
+def check_distribution(errors: list[str]) -> None:
+    prize_inventory.get_prize_draw_threshold = lambda: None
+    set_behind_scenes({})
+    weights = [1, 2, 3, 4]
+    write_pool("分布", weights)
+    inventory = PrizeInventory("分布")
+    rng = random.Random(2)
+    rounds = 40000
+    counts: Counter = Counter()
+    duplicated = False
+    for _ in range(rounds):
+        names = [p[1] for p in inventory.sample(1, rng)["selected_prizes"]]
+        counts.update(names)
+    for _ in range(500):
+        names = [p[1] for p in inventory.sample(3, rng)["selected_prizes"]]
+        duplicated = duplicated or len(set(names)) != len(names)
+    total = sum(weights)
+    shares = {f"奖品{i}": counts[f"奖品{i}"] / rounds for i in range(len(weights))}
+    print(
+        "[分布] " + "，".join(f"{name} {share:.3f}" for name, share in shares.items())
+    )
+    for i, weight in enumerate(weights):
+        if abs(shares[f"奖品{i}"] - weight / total) > 0.01:
+            errors.append(f"奖品{i} 的抽中比例与权重不符")
+    if duplicated:
+        errors.append("同一次抽取中出现重复奖品")
+
+
+def check_stock(errors: list[str]) -> None:
+    threshold = 2
+    prize_inventory.get_prize_draw_threshold = lambda: threshold
+    set_behind_scenes({})
+    tiers = 50
+    weight_rng = random.Random(3)
+    write_pool("库存", [weight_rng.uniform(0.1, 5) for _ in range(tiers)])
+    inventory = PrizeInventory("库存")
+    rng = random.Random(4)
+    awarded: Counter = Counter()
+    overdrawn = []
+    rounds = 0
+    while rounds < tiers * threshold:
+        result = inventory.sample(3, rng)
+        if result.get("reset_required"):
+            break
+        names = [p[1] for p in result["selected_prizes"]]
+        if not names:
+            errors.append("还有库存时抽取结果为空")
+            break
+        overdrawn += inventory.award(names)
+        awarded.update(names)
+        rounds += 1
+    print(
+        f"[库存] 抽取 {rounds} 次，发放 {sum(awarded.values())} 个，"
+        f"剩余 {inventory.remaining_count()}，超发 {len(overdrawn)}"
+    )
+    if overdrawn or any(count != threshold for count in awarded.values()):
+        errors.append("有奖品的发放次数不等于阈值")
+    if len(awarded) != tiers or not inventory.sample(1, rng).get("reset_required"):
+        errors.append("全部发完后没有要求重置")
+
+    # 重新构建的库存从抽取记录恢复出相同的剩余次数
+    if PrizeInventory("库存").remaining_count() != 0:
+        errors.append("从抽取记录恢复的剩余数量不正确")
+
+    # 外部删除抽取记录（重置）后库存恢复
+    prize_inventory.get_drawn_prize_record_path("库存").unlink()
+    if inventory.remaining_count() != tiers:
+        errors.append("删除抽取记录后库存没有恢复")
+
+
+def check_concurrent(errors: list[str]) -> None:
+    """多个线程同时抽取并发放，每次都在 transaction() 内完成，不应超发"""
+    threshold = 1
+    prize_inventory.get_prize_draw_threshold = lambda: threshold
+    set_behind_scenes({})
+    tiers = 20
+    write_pool("并发", [1] * tiers)
+    inventory = PrizeInventory("并发")
+    awarded: Counter = Counter()
+    rejected = []
+    lock = threading.Lock()
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        while True:
+            with inventory.transaction():
+                result = inventory.sample(1, rng)
+                if result.get("reset_required"):
+                    return
+                names = [p[1] for p in result["selected_prizes"]]
+                refused = inventory.award(names)
+            with lock:
+                awarded.update(n for n in names if n not in refused)
+                rejected.extend(refused)
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(
+        f"[并发] 4 个线程发放 {sum(awarded.values())} 个，"
+        f"被拒绝 {len(rejected)}，剩余 {inventory.remaining_count()}"
+    )
+    if rejected or len(awarded) != tiers or max(awarded.values()) != threshold:
+        errors.append("并发抽取时奖品被重复抽中或超发")
+
+    # 不在 transaction() 内时，已抽完的奖品在发放时被拒绝，不计入抽取记录
+    if inventory.award(["奖品0"]) != ["奖品0"]:
+        errors.append("已抽完的奖品没有在发放时被拒绝")
+    if dict(prize_inventory.read_drawn_record_simple("并发")).get("奖品0") != 1:
+        errors.append("被拒绝的奖品计入了抽取记录")
+
+
+def check_behind_scenes(errors: list[str]) -> None:
+    prize_inventory.get_prize_draw_threshold = lambda: 1
+    write_pool("内幕", [1, 1, 1, 1])
+    inventory = PrizeInventory("内幕")
+    rng = random.Random(5)
+
+    set_behind_scenes(
+        {"奖品0": {"lottery": {"内幕": {"enabled": True, "probability": 0}}}}
+    )
+    picked = set()
+    for _ in range(200):
+        picked.update(p[1] for p in inventory.sample(1, rng)["selected_prizes"])
+    if "奖品0" in picked:
+        errors.append("内幕设置排除的奖品仍被抽中")
+
+    set_behind_scenes(
+        {"奖品2": {"lottery": {"内幕": {"enabled": True, "probability": 1000}}}}
+    )
+    result = inventory.sample(2, rng)
+    if [p[1] for p in result["selected_prizes"]] != ["奖品2"]:
+        errors.append(f"必中奖品没有被直接选中: {result['selected_prizes']}")
+    inventory.award(["奖品2"])
+    result = inventory.sample(1, rng)
+    if [p[1] for p in result["selected_prizes"]] == ["奖品2"]:
+        errors.append("必中奖品发完后仍被选中")
+    print(
+        f"[内幕] 排除后抽中: {sorted(picked)}，"
+        f"必中发完后抽中: {result['selected_prizes']}"
+    )
+
+
+def naive_draw(items: list[dict], drawn: dict, threshold: int, count: int, rng):
+    """逐项过滤并重建权重列表的抽取方式，作为耗时对比"""
+    items = [i for i in items if drawn.get(i["name"], 0) < threshold]
+    weights = [float(i["weight"]) for i in items]
+    selected = []
+    for _ in range(min(count, len(items))):
+        rv = rng.uniform(0, sum(weights))
+        cum = 0
+        idx = 0
+        for i, w in enumerate(weights):
+            cum += w
+            if rv <= cum:
+                idx = i
+                break
+        selected.append(items.pop(idx))
+        weights.pop(idx)
+    return selected
+
+
+def check_speed(args: argparse.Namespace, errors: list[str]) -> None:
+    prize_inventory.get_prize_draw_threshold = lambda: 1_000_000
+    set_behind_scenes({})
+    weight_rng = random.Random(6)
+    weights = [weight_rng.uniform(0.1, 10) for _ in range(args.tiers)]
+    write_pool("耗时", weights)
+    inventory = PrizeInventory("耗时")
+    inventory.sample(1, random.Random(0))
+    rng = random.Random(7)
+
+    samples = []
+    for _ in range(args.draws):
+        start = time.perf_counter()
+        inventory.sample(args.count, rng)
+        samples.append((time.perf_counter() - start) * 1e6)
+
+    items = prize_inventory.get_pool_list("耗时")
+    naive = []
+    for _ in range(max(1, args.draws // 10)):
+        start = time.perf_counter()
+        naive_draw(items, {}, 1_000_000, args.count, rng)
+        naive.append((time.perf_counter() - start) * 1e6)
+    print(
+        f"[耗时] {args.tiers} 种奖品抽取 {args.count} 个：库存 "
+        f"{statistics.median(samples):.1f}us，逐项重建 {statistics.median(naive):.1f}us"
+        f"（不含读取文件）"
+    )
+
+
+def main() -> int:
+    args = parse_args()
+    errors: list[str] = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path_manager._app_root = Path(temp_dir)
+        check_fenwick(errors)
+        check_distribution(errors)
+        check_stock(errors)
+        check_concurrent(errors)
+        check_behind_scenes(errors)
+        check_speed(args, errors)
+    for error in errors:
+        print(f"  错误: {error}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
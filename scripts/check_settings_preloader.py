@@ -0,0 +1,166 @@
+"""检查设置页面预加载的决策：访问频率排序、内存预算内的 LRU 卸载、统计持久化，
+检查失败时以非零状态退出。
+
+只检查不涉及界面的 PageUsageStats 和 PreloadPlanner，统计文件写在临时目录中。依次检查：
+1. 预加载顺序按访问分数从高到低，分数过低的页面不预加载；
+2. 放不下时按最近最少访问顺序卸载，且不为低频页面卸载高频页面；
+3. 超出预算时不卸载当前显示的页面；
+4. 子页面的内存占用计入所属页面，放不下的子页面不预加载；
+5. 测得的内存增量不为正时丢弃，偏离之前的记录过多时截断；
+6. 访问分数和内存占用保存后可以重新读取。
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from app.page_building.page_preloader import PageUsageStats, PreloadPlanner
+from app.tools.variable import (
+    SETTINGS_PRELOAD_COST_OUTLIER_RATIO,
+    SETTINGS_PRELOAD_MIN_SCORE,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="检查设置页面预加载的决策。")
+    parser.add_argument(
+        "--budget-mb",
+        type=float,
+        default=30,
+        help="检查使用的内存预算（MB）。默认为30",
+    )
+    return parser.parse_args()
+
+
+def visit(stats: PageUsageStats, sequence: str) -> None:
+    for key in sequence.split():
+        stats.record_visit(key)
+
+
+def check_ranking(stats: PageUsageStats, budget_kb: float, errors: list[str]):
+    planner = PreloadPlanner(stats, budget_kb)
+    order = []
+    available = ["basic", "list", "extraction", "voice", "about"]
+    while True:
+        choice = planner.next_candidate(available)
+        if choice is None:
+            break
+        key, evict = choice
+        if evict:
+            errors.append(f"预算充足时预加载 {key} 却需要卸载 {evict}")
+        planner.mark_loaded(key, 1024)
+        order.append(key)
+    print(f"[排序] 预加载顺序: {order}")
+    if order != ["list", "extraction", "basic"]:
+        errors.append(f"预加载顺序不正确: {order}")
+    if stats.score("voice") >= SETTINGS_PRELOAD_MIN_SCORE:
+        errors.append("长期未访问的页面分数没有衰减")
+
+
+def check_eviction(stats: PageUsageStats, budget_kb: float, errors: list[str]):
+    planner = PreloadPlanner(stats, budget_kb)
+    third = budget_kb / 3
+    for key in ("extraction", "basic", "list"):
+        planner.mark_loaded(key, third)
+    planner.touch("extraction")
+    stats.record_cost("voice", third)
+
+    evict = planner.evictions_for(third, protected=("list",))
+    print(f"[卸载] 放入新页面需要卸载: {evict}")
+    if evict != ["basic"]:
+        errors.append(f"没有按最近最少访问顺序卸载: {evict}")
+
+    low = planner.evictions_for(third, below_score=stats.score("basic") / 2)
+    if low is not None:
+        errors.append(f"为低频页面卸载了高频页面: {low}")
+
+    planner.mark_loaded("voice", third * 2)
+    over = planner.over_budget(protected=("voice",))
+    for key in over:
+        planner.mark_unloaded(key)
+    print(f"[预算] 超出预算后卸载: {over}，剩余 {list(planner.loaded)}")
+    if "voice" in over:
+        errors.append("超出预算时卸载了当前显示的页面")
+    if planner.used_kb() > budget_kb:
+        errors.append(f"卸载后仍超出预算: {planner.used_kb():.0f}KB")
+
+
+def check_subpage_cost(stats: PageUsageStats, budget_kb: float, errors: list[str]):
+    planner = PreloadPlanner(stats, budget_kb)
+    half = budget_kb / 2
+    planner.mark_loaded("list", half)
+    planner.mark_loaded("basic", half / 2)
+    planner.add_cost("list", half / 2)
+    planner.add_cost("voice", half)
+    print(
+        f"[子页面] list 计入 {planner.loaded['list']:.0f}KB，"
+        f"共 {planner.used_kb():.0f}KB"
+    )
+    if planner.loaded["list"] != half * 1.5 or "voice" in planner.loaded:
+        errors.append("子页面的内存占用没有只计入已构建的所属页面")
+    if planner.fits(1):
+        errors.append("预算已满时仍允许预加载子页面")
+    over = planner.over_budget(protected=("list",))
+    if over:
+        errors.append(f"预算恰好用满时卸载了页面: {over}")
+    planner.add_cost("list", 1)
+    if planner.over_budget(protected=("list",)) != ["basic"]:
+        errors.append("子页面使所属页面超出预算后没有卸载其它页面")
+
+
+def check_measurement(stats: PageUsageStats, errors: list[str]):
+    """常驻内存增量中的异常值：不为正时丢弃，偏离之前的记录过多时截断"""
+    first = stats.record_measurement("measure", 4096)
+    dropped = stats.record_measurement("measure", -2048)
+    clamped = stats.record_measurement("measure", 4096 * 100)
+    limit = 4096 * SETTINGS_PRELOAD_COST_OUTLIER_RATIO
+    print(
+        f"[测量] 首次 {first}KB，负增量 {dropped}，异常增量截断为 {clamped}KB，"
+        f"平均 {stats.cost_kb('measure'):.0f}KB"
+    )
+    if first != 4096 or dropped is not None:
+        errors.append("不为正的内存增量没有被丢弃")
+    if clamped != limit:
+        errors.append(f"异常的内存增量没有截断到 {limit}KB: {clamped}")
+
+
+def check_persistence(stats: PageUsageStats, path: Path, errors: list[str]):
+    stats.save()
+    reloaded = PageUsageStats(path)
+    for key in ("list", "extraction", "basic", "voice"):
+        if abs(reloaded.score(key) - stats.score(key)) > 1e-3:
+            errors.append(f"重新读取后 {key} 的访问分数不一致")
+    if reloaded.cost_kb("voice") is None:
+        errors.append("重新读取后缺少内存占用")
+    print(f"[持久化] 统计文件 {path.stat().st_size} 字节")
+
+
+def main() -> int:
+    args = parse_args()
+    budget_kb = args.budget_mb * 1024
+    errors: list[str] = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "settings_page_usage.json"
+        stats = PageUsageStats(path)
+        # voice 只在最早访问过一次，之后的访问使其分数衰减到阈值以下
+        visit(stats, "voice")
+        for _ in range(5):
+            visit(stats, "list extraction list basic list extraction")
+        check_ranking(stats, budget_kb, errors)
+        check_eviction(stats, budget_kb, errors)
+        check_subpage_cost(stats, budget_kb, errors)
+        check_measurement(stats, errors)
+        check_persistence(stats, path, errors)
+    for error in errors:
+        print(f"  错误: {error}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
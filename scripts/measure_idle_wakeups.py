@@ -0,0 +1,111 @@
+"""测量浮窗可见性逻辑在空闲时的唤醒次数，超过阈值时以非零状态退出。
+
+订阅与浮窗相同的下课隐藏（时间边界）和前台窗口（系统事件）事件，在不操作电脑的情况下
+运行指定时长，统计各订阅的唤醒次数。原先的轮询实现每分钟约唤醒 1082 次
+（250ms 前台检测 + 100ms/250ms 置顶 + 30s 下课检测）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QApplication
+
+from app.common.extraction.extract import (
+    _get_seconds_to_next_non_class_boundary,
+    _is_non_class_time,
+)
+from app.common.windows.foreground_watcher import get_foreground_watcher
+from app.tools.event_scheduler import (
+    get_wakeup_stats,
+    reset_wakeup_stats,
+    subscribe_boundary,
+)
+
+# 原轮询实现每分钟的唤醒次数
+LEGACY_WAKEUPS_PER_MINUTE = (
+    60 * 1000 // 250  # 前台窗口检测
+    + 60 * 1000 // 100  # 周期性置顶
+    + 60 * 1000 // 250  # UIA 置顶
+    + 60 // 30  # 下课检测
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="测量浮窗可见性逻辑的空闲唤醒次数。")
+    parser.add_argument(
+        "-d",
+        "--duration",
+        type=float,
+        default=60.0,
+        help="测量时长（秒）。默认为60",
+    )
+    parser.add_argument(
+        "--max-per-minute",
+        type=float,
+        default=2.0,
+        help="允许的每分钟最大唤醒次数（不含订阅时的首次检查）。默认为2",
+    )
+    parser.add_argument(
+        "--watch-titles",
+        action="store_true",
+        help="同时监听前台窗口标题变化（对应配置了窗口标题匹配的情况）",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    app = QApplication(sys.argv)
+
+    watcher = get_foreground_watcher()
+    subscriptions = [
+        subscribe_boundary(
+            "floating_class_end_hide",
+            _get_seconds_to_next_non_class_boundary,
+            _is_non_class_time,
+        ),
+        watcher.subscribe(
+            lambda info: None,
+            name="floating_foreground_hide",
+            watch_titles=args.watch_titles,
+        ),
+        watcher.subscribe(lambda info: None, name="floating_topmost"),
+    ]
+
+    def start_measuring() -> None:
+        # 订阅时的首次检查不计入空闲唤醒
+        reset_wakeup_stats()
+        QTimer.singleShot(int(args.duration * 1000), app.quit)
+
+    QTimer.singleShot(500, start_measuring)
+    print(
+        f"前台窗口事件源: {watcher.backend_name or '无'}，测量 {args.duration:.0f} 秒……"
+    )
+    app.exec()
+
+    for subscription in subscriptions:
+        subscription.cancel()
+
+    stats = get_wakeup_stats()
+    total = sum(stats.values())
+    per_minute = total * 60.0 / max(args.duration, 1e-6)
+    for name, count in sorted(stats.items()):
+        print(f"  {name:<28} {count}")
+    print(f"空闲唤醒: {total} 次，约 {per_minute:.2f} 次/分钟")
+    print(f"原轮询实现: 约 {LEGACY_WAKEUPS_PER_MINUTE} 次/分钟")
+
+    if per_minute > args.max_per_minute:
+        print(f"超过阈值 {args.max_per_minute:.2f} 次/分钟")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""测量抽取结果通知从调用到可见（以及首次绘制）的耗时，比较冷启动与预建窗口。
+
+建议在离屏平台下运行（QT_QPA_PLATFORM=offscreen）。先在未预建的显示模式上测一次冷启动
+（按需创建窗口和单元格），再预建各显示模式的隐藏窗口，交替显示不同模式和不同结果，
+统计预建后的耗时以及新建单元格的数量。预建后的平均可见耗时超过阈值或仍有新建单元格时
+以非零状态退出。
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QEvent, QObject
+from PySide6.QtWidgets import QApplication
+
+from app.common.display.result_display import ResultDisplayUtils
+from app.common.notification.notification_service import FloatingNotificationManager
+
+COLD_SETTINGS_GROUP = "lottery_notification_settings"
+WARM_SETTINGS_GROUPS = (
+    "roll_call_notification_settings",
+    "quick_draw_notification_settings",
+)
+
+
+class PaintProbe(QObject):
+    """记录窗口收到首个绘制事件的时间"""
+
+    def __init__(self):
+        super().__init__()
+        self.painted_at = None
+
+    def reset(self) -> None:
+        self.painted_at = None
+
+    def eventFilter(self, obj, event) -> bool:
+        if event.type() == QEvent.Paint and self.painted_at is None:
+            self.painted_at = time.perf_counter()
+        return False
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="测量结果通知的显示耗时。")
+    parser.add_argument(
+        "-n",
+        "--iterations",
+        type=int,
+        default=50,
+        help="预建窗口后的显示次数。默认为50",
+    )
+    parser.add_argument(
+        "--max-visible-ms",
+        type=float,
+        default=20.0,
+        help="预建窗口后允许的平均可见耗时（毫秒）。默认为20",
+    )
+    parser.add_argument(
+        "--animation",
+        action="store_true",
+        help="启用显示动画（默认关闭，只测量绑定内容和显示本身）",
+    )
+    return parser.parse_args()
+
+
+def build_settings(animation: bool) -> dict:
+    return {
+        "font_size": 50,
+        "animation_color_theme": 0,
+        "display_format": 0,
+        "student_image": False,
+        "show_random": 0,
+        "animation": animation,
+        "transparency": 0.8,
+        "enabled_monitor": "OFF",
+        "window_position": 0,
+        "horizontal_offset": 0,
+        "vertical_offset": 0,
+        "notification_display_duration": 5,
+    }
+
+
+def show_once(
+    app: QApplication,
+    manager: FloatingNotificationManager,
+    settings_group: str,
+    students: list,
+    settings: dict,
+) -> tuple[float, float]:
+    """显示一次通知，返回 (可见耗时, 首次绘制耗时)，单位毫秒"""
+    window = manager._get_window(settings_group)
+    probe = getattr(window, "_latency_probe", None)
+    if probe is None:
+        probe = PaintProbe()
+        window.installEventFilter(probe)
+        window._latency_probe = probe
+    probe.reset()
+
+    start = time.perf_counter()
+    manager._show_secrandom_notification(
+        "测试班级",
+        students,
+        draw_count=len(students),
+        settings=settings,
+        settings_group=settings_group,
+    )
+    visible_at = time.perf_counter() if window.isVisible() else None
+
+    deadline = start + 1.0
+    while probe.painted_at is None and time.perf_counter() < deadline:
+        app.processEvents()
+    if visible_at is None:
+        visible_at = time.perf_counter() if window.isVisible() else deadline
+    painted_at = probe.painted_at or deadline
+    return (visible_at - start) * 1000, (painted_at - start) * 1000
+
+
+def created_cells(manager: FloatingNotificationManager) -> int:
+    return sum(
+        ResultDisplayUtils.get_cell_pool(window.content_layout).created_count
+        for window in manager.notification_windows.values()
+    )
+
+
+def main() -> int:
+    args = parse_args()
+    app = QApplication(sys.argv)
+    manager = FloatingNotificationManager()
+    settings = build_settings(args.animation)
+
+    cold_visible, cold_paint = show_once(
+        app, manager, COLD_SETTINGS_GROUP, [(1, "张三", True)], settings
+    )
+    manager._get_window(COLD_SETTINGS_GROUP).hide_immediately()
+
+    for settings_group in WARM_SETTINGS_GROUPS:
+        _, font_settings_group = manager._determine_font_settings_group(settings_group)
+        manager._get_window(settings_group).prewarm(font_settings_group)
+    app.processEvents()
+
+    created_before = created_cells(manager)
+    visible_ms = []
+    paint_ms = []
+    for i in range(max(1, args.iterations)):
+        settings_group = WARM_SETTINGS_GROUPS[i % len(WARM_SETTINGS_GROUPS)]
+        count = 1 if i % 4 else 3
+        students = [(i * 3 + k + 1, f"学生{i}-{k}", True) for k in range(count)]
+        visible, paint = show_once(app, manager, settings_group, students, settings)
+        visible_ms.append(visible)
+        paint_ms.append(paint)
+    new_cells = created_cells(manager) - created_before
+
+    manager.close_all_notifications()
+
+    print(
+        f"平台: {QApplication.platformName()}，动画: {'开' if args.animation else '关'}"
+    )
+    print(f"冷启动: 可见 {cold_visible:.2f}ms，首次绘制 {cold_paint:.2f}ms")
+    print(
+        f"预建窗口（{len(visible_ms)} 次）: 可见 平均 {statistics.mean(visible_ms):.2f}ms / "
+        f"最大 {max(visible_ms):.2f}ms，首次绘制 平均 {statistics.mean(paint_ms):.2f}ms / "
+        f"最大 {max(paint_ms):.2f}ms"
+    )
+    print(f"预建后新建单元格: {new_cells} 个")
+
+    failed = False
+    if statistics.mean(visible_ms) > args.max_visible_ms:
+        print(f"平均可见耗时超过阈值 {args.max_visible_ms:.2f}ms")
+        failed = True
+    if new_cells:
+        print("预建后仍新建了单元格")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
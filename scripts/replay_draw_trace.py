@@ -0,0 +1,317 @@
+"""回放抽取轨迹：按轨迹重建数据目录并重新执行点名和抽奖，对比每次抽取的耗时。
+
+轨迹在运行时设置环境变量 SECRANDOM_DRAW_TRACE=1 后生成，位于日志目录下的 draw_traces 中，
+名单、历史记录中的名称均已匿名化，可以收集起来作为抽取性能的基准语料。
+可以传入多个轨迹文件或目录（目录中的全部 .jsonl），每份轨迹独立回放：
+1. 把应用根目录指向临时目录，按轨迹顺序写入设置、名单、历史记录和已抽取记录；
+2. 依次调用 RollCallUtils.draw_random_students / LotteryUtils.draw_random_prizes，
+   并像程序中一样保存结果、在抽完时按设置清除记录，使数据随抽取增长；
+3. 重复 --runs 次（每次使用新的临时目录），每次抽取取最短耗时，
+   按抽取类型和阶段与录制时的中位数对比。
+
+默认使用与程序相同的随机源，耗时可以和录制值直接对比；指定 --seed 时改用确定性随机源，
+每次回放的抽取结果和数据变化完全相同，但其生成随机数较慢，抽样阶段的耗时会偏高。
+内幕设置不在轨迹中，回放时不启用。
+录制和回放通常不在同一台机器上，比值以同一份轨迹在不同代码版本之间的变化为准。
+指定 --max-slowdown 时，任一轨迹的抽取耗时中位数超过录制值的该倍数则以非零状态退出。
+
+示例：
+    python scripts/replay_draw_trace.py logs/draw_traces --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from app.tools.variable import DRAW_TRACE_ENV
+
+# 回放时不再记录轨迹
+os.environ.pop(DRAW_TRACE_ENV, None)
+
+import app.common.lottery.prize_inventory as prize_inventory
+from app.common.behind_scenes.behind_scenes_utils import BehindScenesUtils
+from app.common.history import save_lottery_history
+from app.common.lottery.lottery_utils import LotteryUtils
+from app.common.roll_call.roll_call_utils import RollCallUtils
+from app.tools.config import (
+    check_clear_record,
+    delete_drawn_prize_record_files,
+    remove_record,
+)
+from app.tools.draw_telemetry import collect_draw_stages
+from app.tools.draw_trace import draw_trace_data_path, read_draw_trace
+from app.tools.json_store import get_json_store, write_json
+from app.tools.path_utils import get_settings_path, path_manager
+from app.tools.random_source import set_deterministic_seed
+
+KIND_NAMES = {"roll_call": "点名", "lottery": "抽奖"}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="回放抽取轨迹并对比耗时。")
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        type=Path,
+        help="轨迹文件或包含轨迹文件（.jsonl）的目录",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=3,
+        help="每份轨迹回放的次数，每次抽取取最短耗时。默认为3",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="使用确定性随机源及其种子，不指定时使用程序的随机源",
+    )
+    parser.add_argument(
+        "--max-slowdown",
+        type=float,
+        default=None,
+        help="抽取耗时中位数允许达到录制值的倍数，不指定时只输出报告",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="把对比结果写入该 JSON 文件",
+    )
+    return parser.parse_args()
+
+
+def collect_trace_files(paths: list[Path]) -> list[Path]:
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(path.glob("*.jsonl")))
+        else:
+            files.append(path)
+    return files
+
+
+def reset_caches() -> None:
+    """清空按名称缓存的名单、已抽取记录和奖池库存，每次回放从头开始"""
+    RollCallUtils._student_data_cache.clear()
+    RollCallUtils._drawn_record_cache.clear()
+    RollCallUtils._behind_scenes_cache.clear()
+    prize_inventory.clear_prize_inventories()
+    BehindScenesUtils._settings_cache = {}
+    BehindScenesUtils._cache_timestamp = time.time()
+    BehindScenesUtils._cache_ttl = float("inf")
+
+
+def write_data(event: dict) -> None:
+    path = draw_trace_data_path(
+        event["role"],
+        event["kind"],
+        event["name"],
+        event.get("gender", ""),
+        event.get("group", ""),
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_json(path, event["data"])
+
+
+def handle_reset(kind: str, args: dict) -> None:
+    """抽完时像程序中一样按设置清除已抽取记录"""
+    if kind == "roll_call":
+        class_name = args["class_name"]
+        gender, group = args["gender_filter"], args["group_filter"]
+        remove_record(class_name, gender, group)
+        RollCallUtils._drawn_record_cache.pop(f"{class_name}_{gender}_{group}", None)
+    elif check_clear_record("lottery_settings") in ("all", "until"):
+        delete_drawn_prize_record_files(args["pool_name"])
+
+
+def replay_draw(kind: str, args: dict):
+    if kind == "roll_call":
+        return RollCallUtils.draw_random_students(**args)
+    return LotteryUtils.draw_random_prizes(**args)
+
+
+def replay_save(kind: str, args: dict, draw_args: dict, result: dict) -> None:
+    """像程序中一样保存抽取结果"""
+    if kind == "roll_call":
+        RollCallUtils.record_drawn_students(
+            draw_args["class_name"],
+            result.get("selected_students") or [],
+            result.get("selected_students_dict") or [],
+            args.get("gender_filter", ""),
+            args.get("group_filter", ""),
+            args.get("half_repeat", 0),
+        )
+        return
+    pool_name = draw_args["pool_name"]
+    prizes = result.get("selected_prizes_dict") or []
+    if args.get("save_temp"):
+        names = [p.get("name", "") for p in prizes if isinstance(p, dict)]
+        prize_inventory.get_prize_inventory(pool_name).award(names)
+    save_lottery_history(
+        pool_name, prizes, args.get("group_filter", ""), args.get("gender_filter", "")
+    )
+
+
+def replay_once(events: list[dict], seed: int | None) -> dict[int, dict]:
+    """在新的临时目录中回放一次，返回 {序号: 耗时和阶段耗时}"""
+    timings: dict[int, dict] = {}
+    draws: dict[int, tuple[dict, dict]] = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path_manager._app_root = Path(temp_dir)
+        reset_caches()
+        if seed is not None:
+            set_deterministic_seed(seed)
+        for event in events:
+            event_type = event.get("type")
+            if event_type == "settings":
+                settings_path = get_settings_path()
+                settings_path.parent.mkdir(parents=True, exist_ok=True)
+                write_json(settings_path, event["settings"])
+            elif event_type == "data":
+                write_data(event)
+            elif event_type == "draw" and "error" not in event:
+                kind, args = event["kind"], event["args"]
+                with collect_draw_stages() as stages:
+                    start = time.perf_counter()
+                    result = replay_draw(kind, args)
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                timings[event["seq"]] = {"elapsed_ms": elapsed_ms, "stages": stages}
+                if isinstance(result, dict) and result.get("reset_required"):
+                    handle_reset(kind, args)
+                else:
+                    draws[event["seq"]] = (args, result or {})
+            elif event_type == "save" and event.get("draw") in draws:
+                draw_args, result = draws.pop(event["draw"])
+                replay_save(event["kind"], event["args"], draw_args, result)
+        if seed is not None:
+            set_deterministic_seed(None)
+    return timings
+
+
+def stage_rows(draw_events: list[dict], best: dict[int, dict]) -> list[dict]:
+    """按抽取类型和阶段汇总录制和回放耗时的中位数"""
+    samples: dict[tuple[str, str], tuple[list, list]] = {}
+    for event in draw_events:
+        replay = best.get(event["seq"])
+        if replay is None:
+            continue
+        kind = event["kind"]
+        pairs = [("total", event["elapsed_ms"], replay["elapsed_ms"])]
+        for stage, recorded_ms in event.get("stages", {}).items():
+            if stage in replay["stages"]:
+                pairs.append((stage, recorded_ms, replay["stages"][stage]))
+        for stage, recorded_ms, replay_ms in pairs:
+            recorded, replayed = samples.setdefault((kind, stage), ([], []))
+            recorded.append(recorded_ms)
+            replayed.append(replay_ms)
+
+    rows = []
+    for (kind, stage), (recorded, replayed) in samples.items():
+        recorded_p50 = statistics.median(recorded)
+        replay_p50 = statistics.median(replayed)
+        rows.append(
+            {
+                "kind": kind,
+                "stage": stage,
+                "count": len(recorded),
+                "recorded_p50_ms": round(recorded_p50, 3),
+                "replay_p50_ms": round(replay_p50, 3),
+                "ratio": round(replay_p50 / recorded_p50, 3) if recorded_p50 else None,
+            }
+        )
+    return rows
+
+
+def replay_trace(path: Path, args: argparse.Namespace) -> dict:
+    events = read_draw_trace(path)
+    header = events[0]
+    draw_events = [e for e in events if e.get("type") == "draw" and "error" not in e]
+
+    best: dict[int, dict] = {}
+    for _ in range(max(1, args.runs)):
+        for seq, timing in replay_once(events, args.seed).items():
+            if seq not in best or timing["elapsed_ms"] < best[seq]["elapsed_ms"]:
+                best[seq] = timing
+
+    counts = dict.fromkeys(KIND_NAMES, 0)
+    for event in draw_events:
+        counts[event["kind"]] = counts.get(event["kind"], 0) + 1
+    return {
+        "trace": str(path),
+        "version": header.get("version"),
+        "created": header.get("created"),
+        "draws": counts,
+        "stages": stage_rows(draw_events, best),
+    }
+
+
+def print_report(report: dict) -> None:
+    counts = "，".join(
+        f"{KIND_NAMES.get(kind, kind)} {count} 次"
+        for kind, count in report["draws"].items()
+        if count
+    )
+    print(
+        f"[{report['trace']}] 录制于 {report['created']}（{report['version']}），{counts}"
+    )
+    print(
+        f"  {'kind':<11}{'stage':<16}{'count':>7}{'recorded':>11}"
+        f"{'replay':>11}{'ratio':>9}"
+    )
+    for row in report["stages"]:
+        ratio = f"{row['ratio']:.2f}x" if row["ratio"] is not None else "-"
+        print(
+            f"  {row['kind']:<11}{row['stage']:<16}{row['count']:>7}"
+            f"{row['recorded_p50_ms']:>11.3f}{row['replay_p50_ms']:>11.3f}{ratio:>9}"
+        )
+
+
+def main() -> int:
+    args = parse_args()
+    errors: list[str] = []
+    get_json_store().coalesce_ms = 0
+
+    reports = []
+    for path in collect_trace_files(args.paths):
+        try:
+            report = replay_trace(path, args)
+        except (OSError, ValueError) as e:
+            errors.append(f"无法回放 {path}: {e}")
+            continue
+        reports.append(report)
+        print_report(report)
+        if args.max_slowdown is None:
+            continue
+        for row in report["stages"]:
+            if row["stage"] == "total" and (row["ratio"] or 0) > args.max_slowdown:
+                errors.append(
+                    f"{path} 中{KIND_NAMES.get(row['kind'], row['kind'])}耗时中位数为"
+                    f"录制值的 {row['ratio']:.2f} 倍，超过 {args.max_slowdown} 倍"
+                )
+
+    if not reports and not errors:
+        errors.append("没有找到轨迹文件")
+    if args.output is not None:
+        args.output.write_text(
+            json.dumps(reports, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+
+    for error in errors:
+        print(f"  错误: {error}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
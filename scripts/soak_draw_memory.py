@@ -0,0 +1,288 @@
+"""内存浸泡测试：在离屏 Qt 中重复“抽取 → 显示结果 → 显示通知 → 清空”，
+比较预热后与结束时的内存，增长超过阈值时以非零状态退出。
+
+脚本把应用根目录指向临时目录，班级名单写在临时目录中，不影响真实数据。
+先预热若干轮（建立缓存、对象池和通知窗口，并填满抽取种子记录和抽取耗时统计等有界缓冲），
+采集基准快照，再执行指定轮数，比较：
+- 存活的窗口部件和 QObject 数量（默认不允许增长）；
+- 结果单元格的新建数量（对象池应复用单元格，默认不允许增长）；
+- tracemalloc 统计的 Python 分配每轮的增长（不含 tracemalloc 和 linecache 自身的分配）；
+- 结果单元格对象池、头像和颜色缓存不超过各自的上限。
+期间每完成五分之一输出一次与上一次相比增长最多的分配位置和对象类型。
+每轮的增长取这五段各自每轮增长的中位数：持续的泄漏每一段都会增长，而字典扩容这类一次性的
+增长（例如驻留字符串表在反复驻留、释放路径片段后扩容一次，约 1.8MB）只出现在其中一段。
+
+每新建一个单元格，qfluentwidgets 的标签都会在全局 themeChanged 信号上留下一个不会断开的
+连接，所以单元格反复销毁重建时分配会持续增长。预热轮数少于最大的有界缓冲时，缓冲在计时期间
+仍在增长，会被误报为泄漏。--max-bytes-per-cycle 的默认值按 PySide6 6.10 下的实测设置：
+每段每轮约 10 字节（布局 setAlignment 的少量分配），留有余量。
+
+示例：
+    python scripts/soak_draw_memory.py --cycles 5000 --students 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QCoreApplication, QEvent
+from PySide6.QtWidgets import QApplication, QWidget
+from qfluentwidgets import FlowLayout
+
+from app.common.display.result_display import ResultDisplayUtils
+from app.common.notification.notification_service import FloatingNotificationManager
+from app.common.roll_call.roll_call_utils import RollCallUtils
+from app.tools.memory_monitor import (
+    compare_snapshots,
+    format_memory_report,
+    take_memory_snapshot,
+)
+from app.tools.path_utils import get_data_path, path_manager
+from app.tools.random_source import set_deterministic_seed
+from app.tools.variable import (
+    AVATAR_PIXMAP_CACHE_SIZE,
+    DRAW_SEED_LOG_SIZE,
+    DRAW_TELEMETRY_WINDOW,
+    MEMORY_MONITOR_TRACE_FRAMES,
+    RESULT_CELL_POOL_MAX_IDLE,
+)
+
+CLASS_NAME = "浸泡测试"
+SETTINGS_GROUP = "roll_call_notification_settings"
+# 每轮向抽取种子记录和各阶段耗时统计各追加一条，预热轮数需要超过其中最大的容量
+MIN_WARMUP = max(DRAW_SEED_LOG_SIZE, DRAW_TELEMETRY_WINDOW)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="抽取、显示和通知的内存浸泡测试。")
+    parser.add_argument(
+        "-n",
+        "--cycles",
+        type=int,
+        default=3000,
+        help="计时的轮数（抽取、显示、通知、清空为一轮）。默认为3000",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=MIN_WARMUP + 100,
+        help=f"采集基准快照前的预热轮数，不应少于 {MIN_WARMUP}。"
+        f"默认为{MIN_WARMUP + 100}",
+    )
+    parser.add_argument(
+        "--students",
+        type=int,
+        default=60,
+        help="名单中的学生数量。默认为60",
+    )
+    parser.add_argument(
+        "--max-count",
+        type=int,
+        default=5,
+        help="每轮抽取人数在 1 到该值之间轮换。默认为5",
+    )
+    parser.add_argument(
+        "--cleanup-every",
+        type=int,
+        default=50,
+        help="每隔多少轮调用一次 ResultDisplayUtils.cleanup_memory()。默认为50",
+    )
+    parser.add_argument(
+        "--max-bytes-per-cycle",
+        type=float,
+        default=64.0,
+        help="Python 分配每轮允许增长的字节数（各段的中位数）。默认为64",
+    )
+    parser.add_argument(
+        "--max-object-growth",
+        type=int,
+        default=0,
+        help="允许增长的窗口部件和 QObject 数量。默认为0",
+    )
+    return parser.parse_args()
+
+
+def setup_roster(students: int) -> None:
+    class_path = get_data_path("list/roll_call_list") / f"{CLASS_NAME}.json"
+    class_path.parent.mkdir(parents=True, exist_ok=True)
+    roster = {
+        f"学生{i}": {
+            "id": i + 1,
+            "gender": "男" if i % 2 else "女",
+            "group": f"{i % 6 + 1}组",
+            "exist": True,
+        }
+        for i in range(students)
+    }
+    class_path.write_text(json.dumps(roster, ensure_ascii=False), encoding="utf-8")
+
+
+def notification_settings() -> dict:
+    return {
+        "font_size": 50,
+        "animation_color_theme": 0,
+        "display_format": 0,
+        "student_image": False,
+        "show_random": 0,
+        "animation": False,
+        "transparency": 0.8,
+        "enabled_monitor": "OFF",
+        "window_position": 0,
+        "horizontal_offset": 0,
+        "vertical_offset": 0,
+        "notification_display_duration": 5,
+    }
+
+
+def settle(app: QApplication) -> None:
+    """处理挂起的事件和 deleteLater，使快照只包含真正存活的对象"""
+    for _ in range(3):
+        app.processEvents()
+        QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+
+class SoakRunner:
+    def __init__(self, app: QApplication, args: argparse.Namespace):
+        self.app = app
+        self.args = args
+        self.host = QWidget()
+        self.grid = FlowLayout(self.host)
+        self.host.resize(800, 600)
+        self.host.show()
+        self.notifications = FloatingNotificationManager()
+        self.settings = notification_settings()
+        self.cycle = 0
+
+    def run_cycle(self) -> None:
+        count = self.cycle % self.args.max_count + 1
+        result = RollCallUtils.draw_random_students(
+            CLASS_NAME, 0, "抽取全部学生", 0, "抽取全部性别", count, 0
+        )
+        selected = result.get("selected_students") or []
+
+        RollCallUtils.display_result(self.grid, CLASS_NAME, selected, count, 0)
+
+        self.notifications._show_secrandom_notification(
+            CLASS_NAME,
+            selected,
+            draw_count=count,
+            settings=self.settings,
+            settings_group=SETTINGS_GROUP,
+        )
+        self.notifications._get_window(SETTINGS_GROUP).hide_immediately()
+
+        ResultDisplayUtils.clear_grid(self.grid)
+        self.cycle += 1
+        if self.cycle % self.args.cleanup_every == 0:
+            ResultDisplayUtils.cleanup_memory()
+        self.app.processEvents()
+
+    def run(self, cycles: int) -> float:
+        start = time.perf_counter()
+        for _ in range(cycles):
+            self.run_cycle()
+        settle(self.app)
+        return time.perf_counter() - start
+
+
+def check_caches(snapshot, errors: list[str]) -> None:
+    caches = snapshot.caches
+    pools = len(ResultDisplayUtils._cell_pools)
+    limits = {
+        "result_cells_idle": RESULT_CELL_POOL_MAX_IDLE * max(1, pools),
+        "avatar_images": AVATAR_PIXMAP_CACHE_SIZE,
+        "result_colors": ResultDisplayUtils._max_cache_size,
+    }
+    for name, limit in limits.items():
+        if caches.get(name, 0) > limit:
+            errors.append(f"缓存 {name} 有 {caches[name]} 项，超过上限 {limit}")
+
+
+def main() -> int:
+    args = parse_args()
+    errors: list[str] = []
+    if args.warmup <= MIN_WARMUP:
+        print(
+            f"警告: 预热轮数 {args.warmup} 不超过有界缓冲的容量 {MIN_WARMUP}，"
+            "缓冲在计时期间的增长会计入结果"
+        )
+    app = QApplication(sys.argv)
+    set_deterministic_seed(0)
+    tracemalloc.start(MEMORY_MONITOR_TRACE_FRAMES)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path_manager._app_root = Path(temp_dir)
+        setup_roster(args.students)
+        runner = SoakRunner(app, args)
+
+        runner.run(args.warmup)
+        baseline = take_memory_snapshot()
+        previous = baseline
+        chunk = max(1, args.cycles // 5)
+        elapsed = 0.0
+        done = 0
+        rates: list[float] = []
+        while done < args.cycles:
+            step = min(chunk, args.cycles - done)
+            elapsed += runner.run(step)
+            done += step
+            snapshot = take_memory_snapshot()
+            growth = compare_snapshots(previous, snapshot)
+            rates.append(growth["traced_delta"] / step)
+            print(f"[{done}/{args.cycles}] {format_memory_report(growth)}")
+            # 基准快照只需要总量，分配位置用完即释放
+            previous.trace = None
+            previous = snapshot
+
+        report = compare_snapshots(baseline, previous)
+        runner.notifications.close_all_notifications()
+        set_deterministic_seed(None)
+
+    per_cycle = statistics.median(rates)
+    print(
+        f"共 {args.cycles} 轮，平均每轮 {elapsed / max(1, args.cycles) * 1000:.2f}ms；"
+        f"Python 分配共 {report['traced_delta']:+d} 字节，"
+        f"各段每轮 {', '.join(f'{rate:+.1f}' for rate in rates)} 字节，"
+        f"中位数 {per_cycle:+.1f}，"
+        f"窗口部件 {report['widgets_delta']:+d}，QObject {report['qobjects_delta']:+d}"
+    )
+    if per_cycle > args.max_bytes_per_cycle:
+        errors.append(
+            f"Python 分配每轮增长 {per_cycle:.1f} 字节（各段的中位数），"
+            f"超过 {args.max_bytes_per_cycle} 字节"
+        )
+    if report["widgets_delta"] > args.max_object_growth:
+        errors.append(
+            f"窗口部件增长了 {report['widgets_delta']} 个: {report['widget_growth']}"
+        )
+    if report["qobjects_delta"] > args.max_object_growth:
+        errors.append(
+            f"QObject 增长了 {report['qobjects_delta']} 个: {report['qobject_growth']}"
+        )
+    created = previous.caches.get("result_cells_created", 0) - baseline.caches.get(
+        "result_cells_created", 0
+    )
+    if created > args.max_object_growth:
+        errors.append(f"预热后又新建了 {created} 个结果单元格，对象池没有复用")
+    check_caches(previous, errors)
+
+    for error in errors:
+        print(f"  错误: {error}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())